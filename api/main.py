@@ -10,19 +10,31 @@ import os
 import asyncio
 import json
 import logging
+import time
 from src.database import PEPCDatabase
+from src.db_pool import get_db_pool, get_pool_stats
+from src.fts_index import build_match_query, combine_match_queries, fts_rank_subquery
+from src.async_db import get_async_db
+from src.bulk_upsert import DISCOVERED_PDFS, get_bulk_upserter
+from src.log_writer import get_log_writer
+from src.archive import get_archive_manager
+from src.http_client import get_http_registry
+from src.rate_limiter import get_rate_limiter
+from src.metrics import get_dashboard_stats, get_timeseries
+from src.pagination import KeysetSort, PaginationError, keyset_page, count_rows, resolve_count_mode, page_info
 from src.pepc_discovery import PEPCDiscovery
 from src.serper_client import SerperClient
 from src.multi_search import MultiSearchCoordinator
 from src.keywords import DOCUMENT_KEYWORDS, PREMIUM_SITES, EXCLUDED_DOMAINS
-from src.utils import setup_logging, get_multiple_pdf_sizes, extract_brand_from_query, map_doc_type_to_category, get_category_label
-from src.config import THUMBNAIL_DIR, SEARCH_ENGINES, DATABASE_PATH
+from src.utils import setup_logging, get_multiple_pdf_sizes, map_doc_type_to_category, get_category_label
+from src.config import THUMBNAIL_DIR, SEARCH_ENGINES, DATABASE_PATH, CACHE_WARMUP_ON_STARTUP, CACHE_WARMUP_INTERVAL_HOURS, CACHE_EVICTION_INTERVAL_SECONDS, CACHE_RECOMPRESS_INTERVAL_HOURS, ARCHIVE_INTERVAL_HOURS, DISCOVERED_PDFS_FILTERS_CACHE_SECONDS
 
 # Yeni modüler yapı
 from src.data.brands import BRAND_LIST, BRAND_ALIASES, get_brand_aliases
 from src.data.categories import SEARCH_TERMS, CATEGORY_LABELS, get_category_terms, get_all_categories
 from src.data.domains import PREMIUM_DOMAINS, is_premium_domain, is_excluded_domain
 from src.search.query_builder import build_search_query, build_or_clause
+from src.search.query_plan import QueryPlan, build_multi_search_plan
 from src.search.aggregator import MultiEngineAggregator, get_aggregator
 from src.pdf.head_checker import get_bulk_pdf_info, enrich_results_with_size
 from src.pdf.size_filter import SIZE_PRESETS, filter_by_size, get_available_filters
@@ -55,6 +67,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(PaginationError)
+async def pagination_error_handler(request: Request, exc: PaginationError):
+    """Geçersiz cursor / count parametresi"""
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
 db = PEPCDatabase()
 discovery = PEPCDiscovery()
 
@@ -64,6 +81,12 @@ credit_manager = get_credit_manager()
 settings_manager = get_settings_manager()
 paytr_client = get_paytr_client()
 
+# Bloklayan sqlite3 çağrıları event loop dışında (okuma executor'ı + tek yazıcı thread)
+async_db = get_async_db()
+bulk_upserter = get_bulk_upserter()
+log_writer = get_log_writer()
+archive_manager = get_archive_manager()
+
 # Statik dosyaları sunmak için frontend klasörünü bağla
 app.mount("/static", StaticFiles(directory="frontend"), name="static")
 
@@ -296,7 +319,9 @@ CONTENT_TERMS = {
 @app.post("/live-search")
 async def live_search(request: LiveSearchRequest):
     """İnternette çok dilli canlı arama - Premium siteler hariç"""
-    client = SerperClient()
+    global multi_search_coordinator
+    if not multi_search_coordinator:
+        multi_search_coordinator = MultiSearchCoordinator(use_cache=True)
     
     # Sadece İngilizce arama
     all_languages = ["en"]
@@ -311,57 +336,68 @@ async def live_search(request: LiveSearchRequest):
     # Elektrik/şema grubu mu kontrol et (boyut filtresi için)
     is_diagram_search = request.doc_type == "electrical"
     
-    try:
-        for doc_type in doc_types:
-            doc_keywords = DOCUMENT_KEYWORDS.get(doc_type, {})
-            content_term = CONTENT_TERMS.get(doc_type, "part number")
-            
-            for lang in languages:
-                keywords = doc_keywords.get(lang, doc_keywords.get("en", ["parts catalog"]))
-                keyword = keywords[0] if keywords else "parts catalog"
-                
-                # Sorgu 1: Marka + keyword + model
-                query1 = f"{request.brand} {keyword}"
-                if request.model:
-                    query1 += f" {request.model}"
-                
-                # Sorgu 2: Marka + model + içerik terimi
-                query2 = f"{request.brand} {content_term}"
-                if request.model:
-                    query2 += f" {request.model}"
-                
-                for query in [query1, query2]:
-                    results = await client.search_pdfs(query=query, num=15, hl=lang)
-                    
-                    for r in results:
-                        if r.url not in seen_urls and not is_premium_site(r.url) and not is_excluded_site(r.url):
-                            if not is_promotional_content(r.title, r.snippet):
-                                seen_urls.add(r.url)
-                                brand_match = check_brand_match(request.brand, r.title, r.snippet, r.url)
-                                all_results.append({
-                                    "title": r.title,
-                                    "url": r.url,
-                                    "snippet": r.snippet,
-                                    "domain": r.domain,
-                                    "language": lang,
-                                    "doc_type": doc_type,
-                                    "is_diagram": is_diagram_search,
-                                    "brand_match": brand_match
-                                })
-        
-        # Önce marka eşleşenler, sonra diğerleri
-        all_results.sort(key=lambda x: (0 if x['brand_match'] else 1, 0 if x['language'] == 'en' else 1))
-        
-        # Dosya boyutlarını paralel olarak al
-        if all_results:
-            urls = [r['url'] for r in all_results]
-            sizes = await get_multiple_pdf_sizes(urls)
-            for result in all_results:
-                result['file_size'] = sizes.get(result['url'])
+    # doc_type × dil × 2 sorgu kalıbı tek plan; aynı gruptaki doc_type'ların
+    # ortak sorguları (ör. "part number") bir kez aranır
+    plan = QueryPlan()
+    for doc_type in doc_types:
+        doc_keywords = DOCUMENT_KEYWORDS.get(doc_type, {})
+        content_term = CONTENT_TERMS.get(doc_type, "part number")
         
-        return all_results
-    finally:
-        await client.close()
+        for lang in languages:
+            keywords = doc_keywords.get(lang, doc_keywords.get("en", ["parts catalog"]))
+            keyword = keywords[0] if keywords else "parts catalog"
+            
+            # Sorgu 1: Marka + keyword + model
+            query1 = f"{request.brand} {keyword}"
+            if request.model:
+                query1 += f" {request.model}"
+            
+            # Sorgu 2: Marka + model + içerik terimi
+            query2 = f"{request.brand} {content_term}"
+            if request.model:
+                query2 += f" {request.model}"
+            
+            for query in [query1, query2]:
+                plan.add((doc_type, lang), "serper", query, lang, count=15)
+    
+    # Canlı arama: cache okunmaz, istekler aynı anda Serper limiter'ı ile gider
+    await multi_search_coordinator.run_plan(plan, use_cache=False)
+    
+    for item in plan.items:
+        if item.result is None:
+            continue
+        doc_type, lang = item.tag
+        
+        for r in item.result["results"]:
+            url = r.get("url", "")
+            title = r.get("title", "")
+            snippet = r.get("description", "")
+            if url not in seen_urls and not is_premium_site(url) and not is_excluded_site(url):
+                if not is_promotional_content(title, snippet):
+                    seen_urls.add(url)
+                    brand_match = check_brand_match(request.brand, title, snippet, url)
+                    all_results.append({
+                        "title": title,
+                        "url": url,
+                        "snippet": snippet,
+                        "domain": url.split("/")[2] if "/" in url else "",
+                        "language": lang,
+                        "doc_type": doc_type,
+                        "is_diagram": is_diagram_search,
+                        "brand_match": brand_match
+                    })
+    
+    # Önce marka eşleşenler, sonra diğerleri
+    all_results.sort(key=lambda x: (0 if x['brand_match'] else 1, 0 if x['language'] == 'en' else 1))
+    
+    # Dosya boyutlarını paralel olarak al
+    if all_results:
+        urls = [r['url'] for r in all_results]
+        sizes = await get_multiple_pdf_sizes(urls)
+        for result in all_results:
+            result['file_size'] = sizes.get(result['url'])
+    
+    return all_results
 
 @app.post("/premium-search")
 async def premium_search(request: LiveSearchRequest):
@@ -581,9 +617,6 @@ async def scan_source(request: ScanSourceRequest):
                         })
                 
                 logger.info(f"  -> Sayfa {page + 1}: {page_count} yeni PDF")
-                
-                # Rate limiting için kısa bekleme
-                await asyncio.sleep(0.3)
             
             scanned_levels.append({"pattern": label, "found": level_count})
             logger.info(f"Toplam {label}: {level_count} PDF")
@@ -613,20 +646,22 @@ async def scan_source(request: ScanSourceRequest):
 @app.get("/search")
 async def search_database(
     brand: Optional[str] = None,
+    model: Optional[str] = None,
     doc_type: Optional[str] = None,
     language: Optional[str] = None,
     keyword: Optional[str] = None,
     limit: int = Query(20, le=100),
     offset: int = 0
 ):
-    """Veritabanında arama yap (kayıtlı PDF'ler)"""
+    """Veritabanında arama yap (kayıtlı PDF'ler, metin filtreleri bm25 ile sıralanır)"""
     filters = {
         "brand": brand,
+        "model": model,
         "doc_type": doc_type,
         "language": language,
         "title": keyword
     }
-    results = db.search_catalog(filters, limit, offset)
+    results = await async_db.run(db.search_catalog, filters, limit, offset)
     return results
 
 @app.post("/discover")
@@ -642,20 +677,11 @@ async def start_discovery(request: DiscoveryRequest, background_tasks: Backgroun
 
 @app.get("/tasks")
 async def get_tasks(limit: int = 10):
-    conn = db.get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM task_queue ORDER BY created_at DESC LIMIT ?", (limit,))
-    tasks = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    return tasks
+    return await async_db.fetch_all("SELECT * FROM task_queue ORDER BY created_at DESC LIMIT ?", (limit,))
 
 @app.get("/thumbnail/{pdf_id}")
 async def get_thumbnail(pdf_id: int):
-    conn = db.get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT thumbnail_path FROM pdf_catalog WHERE id = ?", (pdf_id,))
-    row = cursor.fetchone()
-    conn.close()
+    row = await async_db.fetch_one("SELECT thumbnail_path FROM pdf_catalog WHERE id = ?", (pdf_id,))
     
     if not row or not row['thumbnail_path']:
         raise HTTPException(status_code=404, detail="Thumbnail bulunamadı")
@@ -668,21 +694,25 @@ async def get_thumbnail(pdf_id: int):
 
 @app.get("/stats")
 async def get_stats():
-    conn = db.get_connection()
-    cursor = conn.cursor()
-    
-    stats = {}
-    cursor.execute("SELECT COUNT(*) FROM pdf_catalog")
-    stats['total_pdfs'] = cursor.fetchone()[0]
-    
-    cursor.execute("SELECT status, COUNT(*) FROM pdf_catalog GROUP BY status")
-    stats['status_distribution'] = dict(cursor.fetchall())
-    
-    cursor.execute("SELECT COUNT(*) FROM task_queue WHERE status = 'pending'")
-    stats['pending_tasks'] = cursor.fetchone()[0]
+    def _stats():
+        conn = db.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            stats = {}
+            cursor.execute("SELECT COUNT(*) FROM pdf_catalog")
+            stats['total_pdfs'] = cursor.fetchone()[0]
+            
+            cursor.execute("SELECT status, COUNT(*) FROM pdf_catalog GROUP BY status")
+            stats['status_distribution'] = dict(cursor.fetchall())
+            
+            cursor.execute("SELECT COUNT(*) FROM task_queue WHERE status = 'pending'")
+            stats['pending_tasks'] = cursor.fetchone()[0]
+            return stats
+        finally:
+            conn.close()
     
-    conn.close()
-    return stats
+    return await async_db.run(_stats)
 
 
 # =============================================================================
@@ -701,6 +731,7 @@ class MultiSearchRequest(BaseModel):
     size_filter: str = "all"  # Boyut filtresi: all, 1mb+, 5mb+, 10mb+, 20mb+
     page: int = 1
     per_page: int = 20  # Sayfa başına sonuç
+    deadline: Optional[float] = None  # Motor süre bütçesi (saniye), None = SEARCH_DEADLINE_SECONDS
 
 class MultiScanRequest(BaseModel):
     url: str
@@ -714,12 +745,129 @@ async def init_multi_search():
     global multi_search_coordinator
     multi_search_coordinator = MultiSearchCoordinator(use_cache=True)
 
+async def cache_warmup_worker():
+    """search_logs popülerliğine göre cache'i periyodik olarak ön ısıt"""
+    from src.cache_warmer import CacheWarmer
+    
+    # Uygulama açılışını geciktirme
+    await asyncio.sleep(60)
+    
+    while True:
+        try:
+            if multi_search_coordinator:
+                await CacheWarmer(multi_search_coordinator).run()
+        except Exception as e:
+            logger.error(f"Cache ön ısıtma hatası: {e}")
+        await asyncio.sleep(CACHE_WARMUP_INTERVAL_HOURS * 3600)
+
+async def cache_rekey_worker():
+    """Kanonik sorgu biçimi değiştiyse eski key'li cache kayıtlarını yeni key'lere taşı"""
+    await asyncio.sleep(90)
+    
+    try:
+        if multi_search_coordinator and multi_search_coordinator.cache:
+            if await async_db.run(multi_search_coordinator.cache.outdated_key_count):
+                stats = await async_db.write_bulk(multi_search_coordinator.rekey_cache)
+                logger.info(f"Cache rekey: {stats}")
+    except Exception as e:
+        logger.error(f"Cache rekey hatası: {e}")
+
+@app.on_event("startup")
+async def start_cache_rekey():
+    asyncio.create_task(cache_rekey_worker())
+
+@app.on_event("startup")
+async def start_cache_warmup():
+    if CACHE_WARMUP_ON_STARTUP:
+        asyncio.create_task(cache_warmup_worker())
+
+async def cache_eviction_worker():
+    """search_cache'i CACHE_MAX_BYTES altında tut (GDSF, batch'ler halinde)"""
+    while True:
+        await asyncio.sleep(CACHE_EVICTION_INTERVAL_SECONDS)
+        try:
+            if multi_search_coordinator and multi_search_coordinator.cache:
+                evicted = await multi_search_coordinator.cache.eviction.run()
+                if evicted:
+                    logger.info(f"Cache tahliye: {evicted} kayıt silindi")
+        except Exception as e:
+            logger.error(f"Cache tahliye hatası: {e}")
+
+@app.on_event("startup")
+async def start_cache_eviction():
+    asyncio.create_task(cache_eviction_worker())
+
+async def cache_recompress_worker():
+    """Eski JSON satırlarını sıkıştırılmış formata periyodik olarak taşı"""
+    await asyncio.sleep(120)
+    
+    while True:
+        try:
+            if multi_search_coordinator and multi_search_coordinator.cache:
+                stats = await multi_search_coordinator.cache.recompress_all()
+                if stats.get("recompressed"):
+                    logger.info(f"Cache sıkıştırma: {stats['recompressed']} satır yeniden kodlandı")
+        except Exception as e:
+            logger.error(f"Cache sıkıştırma hatası: {e}")
+        await asyncio.sleep(CACHE_RECOMPRESS_INTERVAL_HOURS * 3600)
+
+@app.on_event("startup")
+async def start_cache_recompress():
+    asyncio.create_task(cache_recompress_worker())
+
+async def archive_worker():
+    """Saklama süresini geçen log / geçmiş satırlarını aylık arşiv dosyalarına taşı"""
+    await asyncio.sleep(180)
+    
+    while True:
+        try:
+            await archive_manager.run(async_db.write_bulk)
+        except Exception as e:
+            logger.error(f"Arşivleme hatası: {e}")
+        await asyncio.sleep(ARCHIVE_INTERVAL_HOURS * 3600)
+
+@app.on_event("startup")
+async def start_archive_worker():
+    asyncio.create_task(archive_worker())
+
 @app.on_event("shutdown")
 async def cleanup_multi_search():
     global multi_search_coordinator
     if multi_search_coordinator:
         await multi_search_coordinator.close()
 
+@app.on_event("startup")
+async def start_bulk_upsert():
+    asyncio.create_task(bulk_upserter.run(async_db.write_bulk))
+
+@app.on_event("shutdown")
+async def flush_bulk_upsert():
+    # Tamponda kalan arama sonuçlarını yaz
+    await async_db.write_bulk(bulk_upserter.flush)
+
+@app.on_event("startup")
+async def start_log_writer():
+    asyncio.create_task(log_writer.run(async_db.write_bulk))
+
+@app.on_event("shutdown")
+async def flush_log_writer():
+    # Tamponda kalan search_logs / admin_logs satırlarını yaz
+    await async_db.write_bulk(log_writer.flush)
+
+@app.on_event("shutdown")
+async def shutdown_async_db():
+    # Yazıcı kuyruğundaki işler tamamlanana kadar bekle
+    await asyncio.get_running_loop().run_in_executor(None, async_db.shutdown)
+
+@app.on_event("startup")
+async def start_http_clients():
+    # Paylaşımlı HTTP oturumları (bağlantı havuzu, DNS cache) istekler arasında korunur
+    await get_http_registry().start()
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    await get_http_registry().close()
+
 @app.get("/engines")
 async def get_available_engines():
     """Kullanılabilir arama motorlarını listele"""
@@ -793,31 +941,63 @@ async def multi_engine_search(
     all_engine_results = {}
     all_merged_results = []
     seen_urls = set()
-    total_search_time = 0
-    
-    for lang in languages:
-        # Her dil için ayrı sorgu oluştur (dil bazlı varyantlar)
-        query = build_search_query(
-            brand=request.brand,
-            model=request.model or request.query_text,
-            category=category,
-            max_terms=4,
-            engine="google",
-            language=lang
-        )
-        
-        # Multi-engine arama - Motor başına 50 sonuç limiti, sayfa bazlı cache
-        result = await multi_search_coordinator.search_all_engines(
-            query=query,
-            count_per_engine=50,  # Her motor için 50 sonuç
-            language=lang,
-            doc_type=category,
-            engines=request.engines,
-            use_cache=request.use_cache,
-            page=request.page  # Sayfa bazlı cache key
-        )
-                
-        total_search_time += result.get("search_time", 0)
+    pending_engines = set()  # Süre bütçesinde yetişmeyen motorlar
+    
+    # Premium site araması (Scribd, Issuu, vb.) ana aramayla eşzamanlı çalışır
+    premium_sites = [
+        "scribd.com", "issuu.com", "pdfcoffee.com", "slideshare.net",
+        "academia.edu", "manualzz.com", "yumpu.com", "calameo.com"
+    ]
+    
+    # Premium arama için basit query oluştur
+    premium_query_parts = []
+    if request.brand:
+        premium_query_parts.append(request.brand)
+    if request.model:
+        premium_query_parts.append(request.model)
+    if request.query_text:
+        premium_query_parts.append(request.query_text)
+    
+    # Kategori keyword ekle
+    category_keywords = {
+        "parts_catalog": "parts catalog",
+        "service_manual": "service manual",
+        "electrical_diagram": "wiring diagram",
+        "hydraulic_diagram": "hydraulic diagram"
+    }
+    premium_query_parts.append(category_keywords.get(category, "parts catalog"))
+    premium_base_query = " ".join(premium_query_parts)
+    
+    # Site başına 5 sayfa x 10 sonuç, sayfa bazlı cache
+    premium_task = asyncio.create_task(multi_search_coordinator.search_premium_sites(
+        base_query=premium_base_query,
+        sites=premium_sites,
+        pages=5,
+        per_page=10,
+        use_cache=request.use_cache,
+        deadline=request.deadline
+    ))
+    
+    # Tüm dil × motor sorguları tek plan: her dil için dil varyantlı sorgu,
+    # hepsi aynı anda çalışır (N dil ≈ tek tur). Motor başına 50 sonuç,
+    # sayfa bazlı cache
+    plan_started = time.monotonic()
+    plan = build_multi_search_plan(
+        brand=request.brand,
+        model=request.model or request.query_text,
+        category=category,
+        languages=languages,
+        engines=multi_search_coordinator.resolve_engines(request.engines),
+        count=50,  # Her motor için 50 sonuç
+        page=request.page  # Sayfa bazlı cache key
+    )
+    await multi_search_coordinator.run_plan(plan, use_cache=request.use_cache, deadline=request.deadline)
+    total_search_time = time.monotonic() - plan_started
+    
+    for lang in dict.fromkeys(languages):
+        # Dilin motor sonuçları plan sırasıyla (kararlı birleştirme)
+        result = multi_search_coordinator.summarize_plan(plan.tagged(lang), None, lang, category)
+        pending_engines.update(result.get("pending_engines", []))
         
         # Motor sonuçlarını birleştir
         for engine_name, engine_result in result.get("engines", {}).items():
@@ -887,71 +1067,29 @@ async def multi_engine_search(
     # Toplam sonuç limiti: max 100
     all_merged_results = all_merged_results[:100]
     
-    # Premium site araması ekle (Scribd, Issuu, vb.)
-    premium_sites = [
-        "scribd.com", "issuu.com", "pdfcoffee.com", "slideshare.net",
-        "academia.edu", "manualzz.com", "yumpu.com", "calameo.com"
-    ]
-    
-    # Premium arama için basit query oluştur
-    premium_query_parts = []
-    if request.brand:
-        premium_query_parts.append(request.brand)
-    if request.model:
-        premium_query_parts.append(request.model)
-    if request.query_text:
-        premium_query_parts.append(request.query_text)
-    
-    # Kategori keyword ekle
-    category_keywords = {
-        "parts_catalog": "parts catalog",
-        "service_manual": "service manual",
-        "electrical_diagram": "wiring diagram",
-        "hydraulic_diagram": "hydraulic diagram"
-    }
-    premium_query_parts.append(category_keywords.get(category, "parts catalog"))
-    premium_base_query = " ".join(premium_query_parts)
+    # Premium site araması (arka planda başlatıldı) - ana sonuçlarla tekrar edenleri at
+    premium = await premium_task
+    if premium["partial"]:
+        pending_engines.add("serper_premium")
     
-    # Her premium site için arama yap (pagination ile)
     premium_search_results = []
-    serper_client = SerperClient()
-    
-    try:
-        for site in premium_sites:  # Tüm premium siteler
-            site_query = f"site:{site} {premium_base_query}"
-            
-            # Pagination ile 50 sonuç al (5 sayfa x 10)
-            for page in range(5):
-                response = await serper_client.search(site_query, num=10, page=page+1)
-                organic = response.get('organic', [])
-                
-                if not organic:
-                    break
-                
-                for item in organic:
-                    url = item.get('link', '')
-                    if url and url not in seen_urls:
-                        seen_urls.add(url)
-                        premium_search_results.append({
-                            "title": item.get('title', ''),
-                            "url": url,
-                            "snippet": item.get('snippet', ''),
-                            "domain": url.split('/')[2] if '/' in url else '',
-                            "language": "en",
-                            "category": category,
-                            "doc_type": category,
-                            "is_diagram": is_diagram_search,
-                            "brand_match": True,
-                            "engine": "serper",
-                            "is_premium": True
-                        })
-                
-                if len(organic) < 10:
-                    break
-    except Exception as e:
-        print(f"Premium arama hatası: {e}")
-    finally:
-        await serper_client.close()
+    for item in premium["results"]:
+        url = item.get('url', '')
+        if url and url not in seen_urls:
+            seen_urls.add(url)
+            premium_search_results.append({
+                "title": item.get('title', ''),
+                "url": url,
+                "snippet": item.get('description', ''),
+                "domain": url.split('/')[2] if '/' in url else '',
+                "language": "en",
+                "category": category,
+                "doc_type": category,
+                "is_diagram": is_diagram_search,
+                "brand_match": True,
+                "engine": "serper",
+                "is_premium": True
+            })
     
     # Premium ve normal sonuçları ayır
     premium_results = premium_search_results  # Premium site aramasından gelenler
@@ -980,84 +1118,35 @@ async def multi_engine_search(
     premium_paginated = premium_results[premium_start:premium_end]
     
     # Arama sonuçlarını veritabanına kaydet (benzersiz PDF'ler)
-    try:
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        
-        # Tüm sonuçları kaydet (free + premium)
-        all_to_save = regular_results + premium_results
-        new_saved = 0
-        
-        for result in all_to_save:
-            url = result.get('url', '')
-            if not url:
-                continue
-            
-            import hashlib
-            url_hash = hashlib.md5(url.lower().split('?')[0].encode()).hexdigest()
-            
-            # Var mı kontrol et
-            cursor.execute("SELECT id FROM discovered_pdfs WHERE url_hash = ?", (url_hash,))
-            if cursor.fetchone():
-                # Güncelle
-                cursor.execute("""
-                    UPDATE discovered_pdfs SET last_checked = CURRENT_TIMESTAMP WHERE url_hash = ?
-                """, (url_hash,))
-            else:
-                # Yeni kayıt
-                domain = url.split('/')[2] if '/' in url else ''
-                cursor.execute("""
-                    INSERT INTO discovered_pdfs 
-                    (url_hash, url, title, domain, brand, model, category, is_valid)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, 1)
-                """, (
-                    url_hash, url, result.get('title', '')[:500], domain,
-                    request.brand, request.model, category
-                ))
-                new_saved += 1
-        
-        conn.commit()
-        logger.info(f"Arama sonuçları kaydedildi: {new_saved} yeni PDF")
-    except Exception as e:
-        logger.error(f"Sonuç kaydetme hatası: {e}")
+    # Toplu upsert tamponuna alınır, yanıt kaydı beklemez
+    bulk_upserter.enqueue(DISCOVERED_PDFS, [
+        {
+            "url": result.get('url', ''),
+            "title": result.get('title', '')[:500],
+            "domain": result['url'].split('/')[2] if '/' in result.get('url', '') else '',
+            "brand": request.brand,
+            "model": request.model,
+            "category": category
+        }
+        for result in regular_results + premium_results
+    ])
     
-    # Arama logunu veritabanına kaydet
-    try:
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        
-        # Kullanılan motorları JSON olarak kaydet
-        engines_used = json.dumps(request.engines) if request.engines else json.dumps([])
-        
-        # IP adresi al
-        ip_address = req.client.host if req.client else None
-        user_agent = req.headers.get("user-agent", "")
-        
-        # Cache kullanıldı mı kontrol et
-        is_cached = any(
-            engine_data.get("cached_count", 0) > 0 
-            for engine_data in all_engine_results.values()
-        )
-        
-        cursor.execute("""
-            INSERT INTO search_logs 
-            (user_id, query, doc_type, engines_used, result_count, credits_used, is_cached, ip_address, user_agent)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            user["id"] if user else None,
-            (request.brand or request.query_text or "") + (" " + request.model if request.model else ""),
-            request.doc_type,
-            engines_used,
-            len(all_merged_results),
-            0,  # credits_used - şimdilik 0
-            is_cached,
-            ip_address,
-            user_agent[:500] if user_agent else None  # Max 500 karakter
-        ))
-        conn.commit()
-        conn.close()
-    except Exception as e:
-        logger.error(f"Arama logu kaydetme hatası: {e}")
+    # Arama logunu kaydet (write-behind tampon, toplu yazılır)
+    is_cached = any(
+        engine_data.get("cached_count", 0) > 0 
+        for engine_data in all_engine_results.values()
+    )
+    log_writer.log_search(
+        user_id=user["id"] if user else None,
+        query=(request.brand or request.query_text or "") + (" " + request.model if request.model else ""),
+        doc_type=category,  # Cache key'indeki çözümlenmiş kategori (ön ısıtma bunu okur)
+        engines_used=request.engines,
+        result_count=len(all_merged_results),
+        credits_used=0,  # şimdilik 0
+        is_cached=is_cached,
+        ip_address=req.client.host if req.client else None,
+        user_agent=req.headers.get("user-agent", "")
+    )
     
     # Tüm sonuçları birleştir (free + premium)
     all_combined_results = regular_results + premium_results
@@ -1092,6 +1181,8 @@ async def multi_engine_search(
                 "total_pages": all_total_pages
             },
             "engines": all_engine_results,
+            "partial": bool(pending_engines),  # Bazı motorlar süre bütçesini aştı
+            "pending_engines": sorted(pending_engines),
             "total": all_total,
             "results": all_merged_results,  # Tüm sonuçlar (geriye uyumluluk için)
             "all": {
@@ -1168,34 +1259,16 @@ async def multi_engine_scan_source(
         # Boyuta göre sırala
         result["merged_results"].sort(key=lambda x: (x.get('file_size') or 0), reverse=True)
     
-    # Kaynak tarama logunu veritabanına kaydet
-    try:
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        
-        engines_used = json.dumps(request.engines) if request.engines else json.dumps([])
-        ip_address = req.client.host if req.client else None
-        user_agent = req.headers.get("user-agent", "")
-        
-        cursor.execute("""
-            INSERT INTO search_logs 
-            (user_id, query, doc_type, engines_used, result_count, credits_used, is_cached, ip_address, user_agent)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            user["id"] if user else None,
-            f"site:{domain} {query}".strip(),
-            "scan_source",
-            engines_used,
-            result.get("total_results", 0),
-            0,
-            False,
-            ip_address,
-            user_agent[:500] if user_agent else None
-        ))
-        conn.commit()
-        conn.close()
-    except Exception as e:
-        logger.error(f"Kaynak tarama logu kaydetme hatası: {e}")
+    # Kaynak tarama logunu kaydet (write-behind tampon)
+    log_writer.log_search(
+        user_id=user["id"] if user else None,
+        query=f"site:{domain} {query}".strip(),
+        doc_type="scan_source",
+        engines_used=request.engines,
+        result_count=result.get("total_results", 0),
+        ip_address=req.client.host if req.client else None,
+        user_agent=req.headers.get("user-agent", "")
+    )
     
     return {
         "source": domain,
@@ -1214,7 +1287,8 @@ async def get_cache_stats():
     if not multi_search_coordinator:
         return {"message": "Multi-search henüz başlatılmadı"}
     
-    return multi_search_coordinator.get_cache_stats()
+    # Sayımlar ve tahliye istatistikleri SQLite okur, okuma thread'inde çalışır
+    return await async_db.run(multi_search_coordinator.get_cache_stats)
 
 @app.post("/cache/clear")
 async def clear_cache(engine: Optional[str] = None):
@@ -1224,12 +1298,40 @@ async def clear_cache(engine: Optional[str] = None):
     if not multi_search_coordinator:
         return {"message": "Multi-search henüz başlatılmadı", "cleared": 0}
     
-    cleared = multi_search_coordinator.clear_cache(engine)
+    # Sonuç satırlarını siler; cache store'una yazan toplu yazıcı thread'inde çalışır
+    cleared = await async_db.write_bulk(multi_search_coordinator.clear_cache, engine)
     return {
         "message": f"{'Tüm cache' if not engine else f'{engine} cache'} temizlendi",
         "cleared": cleared
     }
 
+@app.post("/cache/rekey")
+async def rekey_cache(admin: dict = Depends(get_admin_user)):
+    """
+    Cache kayıtlarını kanonik sorgu key'ine taşı, aynı sorguya düşenleri birleştir (Admin)
+    
+    Kanonik biçim değiştiğinde açılışta otomatik de çalışır (cache_rekey_worker).
+    """
+    global multi_search_coordinator
+    
+    if not multi_search_coordinator:
+        return {"message": "Multi-search henüz başlatılmadı"}
+    
+    # Tüm cache'i tarayıp yeniden yazar; toplu yazıcı thread'inde çalışır
+    stats = await async_db.write_bulk(multi_search_coordinator.rekey_cache)
+    return {"message": "Cache key'leri kanonikleştirildi", **stats}
+
+@app.post("/cache/recompress")
+async def recompress_cache(retrain: bool = False, admin: dict = Depends(get_admin_user)):
+    """Cache sonuç satırlarını aktif sıkıştırma formatına taşı (retrain: yeni sözlük eğit) (Admin)"""
+    global multi_search_coordinator
+    
+    if not multi_search_coordinator or not multi_search_coordinator.cache:
+        return {"message": "Multi-search henüz başlatılmadı"}
+    
+    stats = await multi_search_coordinator.cache.recompress_all(retrain=retrain)
+    return {"message": "Cache sıkıştırma tamamlandı", **stats}
+
 @app.post("/cache/refresh")
 async def refresh_cache():
     """Süresi dolmuş cache kayıtlarını temizle"""
@@ -1336,39 +1438,42 @@ async def forgot_password(data: ForgotPasswordRequest):
     import secrets
     from datetime import datetime, timedelta
     
-    conn = db.get_connection()
-    cursor = conn.cursor()
-    
-    try:
-        # Kullanıcıyı bul
-        cursor.execute("SELECT id, email, username FROM users WHERE email = ?", (data.email,))
-        user = cursor.fetchone()
+    def _create_token():
+        conn = db.get_connection()
+        cursor = conn.cursor()
         
-        if not user:
-            # Güvenlik: Email bulunamasa bile başarılı mesajı dön
-            return {"message": "Eğer e-posta kayıtlıysa, şifre sıfırlama linki gönderildi."}
+        try:
+            # Kullanıcıyı bul
+            cursor.execute("SELECT id, email, username FROM users WHERE email = ?", (data.email,))
+            user = cursor.fetchone()
         
-        # Token oluştur
-        token = secrets.token_urlsafe(32)
-        expires_at = datetime.now() + timedelta(hours=1)  # 1 saat geçerli
-        
-        # Token'ı kaydet
-        cursor.execute(
-            """INSERT INTO password_reset_tokens (user_id, token, expires_at)
-               VALUES (?, ?, ?)""",
-            (user["id"], token, expires_at.isoformat())
-        )
-        conn.commit()
+            if not user:
+                # Güvenlik: Email bulunamasa bile başarılı mesajı dön
+                return {"message": "Eğer e-posta kayıtlıysa, şifre sıfırlama linki gönderildi."}
         
-        # Gerçek uygulamada burada email gönderilir
-        # Şimdilik token'ı response'da dönelim (TEST için)
-        return {
-            "message": "Eğer e-posta kayıtlıysa, şifre sıfırlama linki gönderildi.",
-            "token": token  # PROD'da bu kaldırılacak, sadece TEST için
-        }
+            # Token oluştur
+            token = secrets.token_urlsafe(32)
+            expires_at = datetime.now() + timedelta(hours=1)  # 1 saat geçerli
         
-    finally:
-        conn.close()
+            # Token'ı kaydet
+            cursor.execute(
+                """INSERT INTO password_reset_tokens (user_id, token, expires_at)
+                   VALUES (?, ?, ?)""",
+                (user["id"], token, expires_at.isoformat())
+            )
+            conn.commit()
+        
+            # Gerçek uygulamada burada email gönderilir
+            # Şimdilik token'ı response'da dönelim (TEST için)
+            return {
+                "message": "Eğer e-posta kayıtlıysa, şifre sıfırlama linki gönderildi.",
+                "token": token  # PROD'da bu kaldırılacak, sadece TEST için
+            }
+        
+        finally:
+            conn.close()
+        
+    return await async_db.write(_create_token)
 
 
 @app.post("/api/auth/reset-password")
@@ -1377,54 +1482,57 @@ async def reset_password(data: ResetPasswordRequest):
     from datetime import datetime
     from src.auth import get_password_hash
     
-    conn = db.get_connection()
-    cursor = conn.cursor()
-    
-    try:
-        # Token'ı kontrol et
-        cursor.execute(
-            """SELECT prt.id, prt.user_id, prt.expires_at, prt.used
-               FROM password_reset_tokens prt
-               WHERE prt.token = ?""",
-            (data.token,)
-        )
-        token_data = cursor.fetchone()
+    def _reset():
+        conn = db.get_connection()
+        cursor = conn.cursor()
         
-        if not token_data:
-            raise HTTPException(400, "Geçersiz token")
+        try:
+            # Token'ı kontrol et
+            cursor.execute(
+                """SELECT prt.id, prt.user_id, prt.expires_at, prt.used
+                   FROM password_reset_tokens prt
+                   WHERE prt.token = ?""",
+                (data.token,)
+            )
+            token_data = cursor.fetchone()
         
-        token_id = token_data["id"]
-        user_id = token_data["user_id"]
-        expires_at = datetime.fromisoformat(token_data["expires_at"])
-        used = token_data["used"]
+            if not token_data:
+                raise HTTPException(400, "Geçersiz token")
         
-        # Token kullanılmış mı?
-        if used:
-            raise HTTPException(400, "Bu token zaten kullanıldı")
+            token_id = token_data["id"]
+            user_id = token_data["user_id"]
+            expires_at = datetime.fromisoformat(token_data["expires_at"])
+            used = token_data["used"]
         
-        # Token süresi dolmuş mu?
-        if datetime.now() > expires_at:
-            raise HTTPException(400, "Token süresi dolmuş")
+            # Token kullanılmış mı?
+            if used:
+                raise HTTPException(400, "Bu token zaten kullanıldı")
         
-        # Şifreyi hashle ve güncelle
-        hashed_password = get_password_hash(data.new_password)
-        cursor.execute(
-            "UPDATE users SET hashed_password = ? WHERE id = ?",
-            (hashed_password, user_id)
-        )
+            # Token süresi dolmuş mu?
+            if datetime.now() > expires_at:
+                raise HTTPException(400, "Token süresi dolmuş")
         
-        # Token'ı kullanılmış olarak işaretle
-        cursor.execute(
-            "UPDATE password_reset_tokens SET used = 1 WHERE id = ?",
-            (token_id,)
-        )
+            # Şifreyi hashle ve güncelle
+            hashed_password = get_password_hash(data.new_password)
+            cursor.execute(
+                "UPDATE users SET hashed_password = ? WHERE id = ?",
+                (hashed_password, user_id)
+            )
         
-        conn.commit()
+            # Token'ı kullanılmış olarak işaretle
+            cursor.execute(
+                "UPDATE password_reset_tokens SET used = 1 WHERE id = ?",
+                (token_id,)
+            )
         
-        return {"message": "Şifreniz başarıyla güncellendi"}
+            conn.commit()
         
-    finally:
-        conn.close()
+            return {"message": "Şifreniz başarıyla güncellendi"}
+        
+        finally:
+            conn.close()
+        
+    return await async_db.write(_reset)
 
 
 # =============================================================================
@@ -1484,7 +1592,7 @@ async def payment_callback(request: Request):
 @app.get("/api/payment/history")
 async def get_payment_history(user: dict = Depends(get_current_user)):
     """Kullanıcının ödeme geçmişi"""
-    return paytr_client.get_user_payments(user["id"])
+    return await async_db.run(paytr_client.get_user_payments, user["id"])
 
 
 # Ödeme sonuç sayfaları
@@ -1538,104 +1646,115 @@ class AddFavoriteRequest(BaseModel):
 @app.post("/api/favorites/add")
 async def add_favorite(data: AddFavoriteRequest, user: dict = Depends(get_current_user)):
     """Favorilere ekle"""
-    conn = db.get_connection()
-    cursor = conn.cursor()
-    
-    try:
-        cursor.execute(
-            """INSERT OR IGNORE INTO favorites (user_id, pdf_url, title, snippet, file_size)
-               VALUES (?, ?, ?, ?, ?)""",
-            (user["id"], data.pdf_url, data.title, data.snippet, data.file_size)
-        )
-        conn.commit()
+    def _add():
+        conn = db.get_connection()
+        cursor = conn.cursor()
         
-        if cursor.rowcount > 0:
-            return {"message": "Favorilere eklendi"}
-        else:
-            return {"message": "Zaten favorilerde"}
+        try:
+            cursor.execute(
+                """INSERT OR IGNORE INTO favorites (user_id, pdf_url, title, snippet, file_size)
+                   VALUES (?, ?, ?, ?, ?)""",
+                (user["id"], data.pdf_url, data.title, data.snippet, data.file_size)
+            )
+            conn.commit()
             
-    finally:
-        conn.close()
+            if cursor.rowcount > 0:
+                return {"message": "Favorilere eklendi"}
+            else:
+                return {"message": "Zaten favorilerde"}
+                
+        finally:
+            conn.close()
+    
+    return await async_db.write(_add)
 
 
 @app.delete("/api/favorites/remove")
 async def remove_favorite(pdf_url: str, user: dict = Depends(get_current_user)):
     """Favorilerden çıkar"""
-    conn = db.get_connection()
-    cursor = conn.cursor()
-    
-    try:
-        cursor.execute(
-            "DELETE FROM favorites WHERE user_id = ? AND pdf_url = ?",
-            (user["id"], pdf_url)
-        )
-        conn.commit()
+    def _remove():
+        conn = db.get_connection()
+        cursor = conn.cursor()
         
-        if cursor.rowcount > 0:
-            return {"message": "Favorilerden kaldırıldı"}
-        else:
-            raise HTTPException(404, "Favori bulunamadı")
+        try:
+            cursor.execute(
+                "DELETE FROM favorites WHERE user_id = ? AND pdf_url = ?",
+                (user["id"], pdf_url)
+            )
+            conn.commit()
             
-    finally:
-        conn.close()
+            if cursor.rowcount > 0:
+                return {"message": "Favorilerden kaldırıldı"}
+            else:
+                raise HTTPException(404, "Favori bulunamadı")
+                
+        finally:
+            conn.close()
+    
+    return await async_db.write(_remove)
+
 
+FAVORITES_SORT = KeysetSort(column="added_at", key="added_at", nullable=True)
 
 @app.get("/api/favorites/list")
 async def list_favorites(
     page: int = 1,
     per_page: int = 20,
+    cursor: Optional[str] = Query(None, description="Önceki yanıtın next_cursor'ı"),
+    count: Optional[str] = Query(None, description="Toplam: exact, estimate, none"),
     user: dict = Depends(get_current_user)
 ):
     """Favorileri listele"""
-    conn = db.get_connection()
-    cursor = conn.cursor()
+    count_mode = resolve_count_mode(count, cursor)
     
-    try:
-        offset = (page - 1) * per_page
-        
-        cursor.execute(
-            """SELECT COUNT(*) FROM favorites WHERE user_id = ?""",
-            (user["id"],)
-        )
-        total = cursor.fetchone()[0]
-        
-        cursor.execute(
-            """SELECT * FROM favorites WHERE user_id = ? 
-               ORDER BY added_at DESC LIMIT ? OFFSET ?""",
-            (user["id"], per_page, offset)
-        )
-        
-        favorites = [dict(row) for row in cursor.fetchall()]
-        
-        return {
-            "favorites": favorites,
-            "total": total,
-            "page": page,
-            "per_page": per_page,
-            "total_pages": (total + per_page - 1) // per_page
-        }
+    def _list():
+        conn = db.get_connection()
+        db_cursor = conn.cursor()
         
-    finally:
-        conn.close()
+        try:
+            conditions = ["user_id = ?"]
+            params = [user["id"]]
+            
+            total = count_rows(db_cursor, "FROM favorites", conditions, params, count_mode)
+            
+            rows, next_cursor = keyset_page(
+                db_cursor, "SELECT * FROM favorites", conditions, params,
+                FAVORITES_SORT, after=cursor, page=page, per_page=per_page
+            )
+            
+            favorites = [dict(row) for row in rows]
+            
+            return {
+                "favorites": favorites,
+                **page_info(total, page, per_page, next_cursor, count_mode, pages_key="total_pages")
+            }
+            
+        finally:
+            conn.close()
+    
+    return await async_db.run(_list)
 
 
 @app.get("/api/favorites/check")
 async def check_favorite(pdf_url: str, user: dict = Depends(get_current_user)):
     """Favoride mi kontrol et"""
-    conn = db.get_connection()
-    cursor = conn.cursor()
-    
-    try:
-        cursor.execute(
-            "SELECT COUNT(*) FROM favorites WHERE user_id = ? AND pdf_url = ?",
-            (user["id"], pdf_url)
-        )
-        count = cursor.fetchone()[0]
-        
-        return {"is_favorite": count > 0}
+    def _check():
+        conn = db.get_connection()
+        cursor = conn.cursor()
         
-    finally:
-        conn.close()
+        try:
+            cursor.execute(
+                "SELECT COUNT(*) FROM favorites WHERE user_id = ? AND pdf_url = ?",
+                (user["id"], pdf_url)
+            )
+            count = cursor.fetchone()[0]
+            
+            return {"is_favorite": count > 0}
+            
+        finally:
+            conn.close()
+    
+    return await async_db.run(_check)
 
 
 # =============================================================================
@@ -1646,47 +1765,71 @@ async def check_favorite(pdf_url: str, user: dict = Depends(get_current_user)):
 async def get_search_logs(
     page: int = 1,
     per_page: int = 20,
+    include_archived: bool = False,
     user: dict = Depends(get_current_user)
 ):
-    """Kullanıcının arama geçmişi"""
-    conn = db.get_connection()
-    cursor = conn.cursor()
+    """
+    Kullanıcının arama geçmişi
     
-    try:
-        offset = (page - 1) * per_page
-        
-        cursor.execute(
-            """SELECT COUNT(*) FROM search_logs WHERE user_id = ?""",
-            (user["id"],)
-        )
-        total = cursor.fetchone()[0]
-        
-        cursor.execute(
-            """SELECT * FROM search_logs WHERE user_id = ? 
-               ORDER BY created_at DESC LIMIT ? OFFSET ?""",
-            (user["id"], per_page, offset)
-        )
-        
-        logs = [dict(row) for row in cursor.fetchall()]
-        
-        # Engines JSON'u parse et
-        for log in logs:
-            if log.get("engines_used"):
-                try:
-                    log["engines_used"] = json.loads(log["engines_used"])
-                except:
-                    log["engines_used"] = []
-        
-        return {
-            "logs": logs,
-            "total": total,
-            "page": page,
-            "per_page": per_page,
-            "total_pages": (total + per_page - 1) // per_page
-        }
+    Saklama süresini geçen loglar aylık arşiv dosyalarına taşınır; varsayılan
+    olarak yalnızca canlı tablo döner ve yanıttaki archived_before bu sınırı
+    bildirir. include_archived=true ile arşivdeki eski kayıtlar da sayılır
+    ve canlı sayfalardan sonra gelen sayfalarda döner.
+    """
+    def _list():
+        conn = db.get_connection()
+        cursor = conn.cursor()
         
-    finally:
-        conn.close()
+        try:
+            offset = (page - 1) * per_page
+            
+            cursor.execute(
+                """SELECT COUNT(*) FROM search_logs WHERE user_id = ?""",
+                (user["id"],)
+            )
+            total = cursor.fetchone()[0]
+            
+            cursor.execute(
+                """SELECT * FROM search_logs WHERE user_id = ? 
+                   ORDER BY created_at DESC LIMIT ? OFFSET ?""",
+                (user["id"], per_page, offset)
+            )
+            
+            logs = [dict(row) for row in cursor.fetchall()]
+            
+            # Arşivdeki loglar canlı tablodakilerden eskidir, onlardan sonra gelir
+            if include_archived:
+                live_total = total
+                total += archive_manager.count("search_logs", "user_id = ?", (user["id"],))
+                if total > live_total and len(logs) < per_page:
+                    logs += archive_manager.page(
+                        "search_logs", "user_id = ?", (user["id"],),
+                        limit=per_page - len(logs), offset=max(offset - live_total, 0)
+                    )
+            
+            # Engines JSON'u parse et
+            for log in logs:
+                if log.get("engines_used"):
+                    try:
+                        log["engines_used"] = json.loads(log["engines_used"])
+                    except:
+                        log["engines_used"] = []
+            
+            return {
+                "logs": logs,
+                "total": total,
+                "page": page,
+                "per_page": per_page,
+                "total_pages": (total + per_page - 1) // per_page,
+                "include_archived": include_archived,
+                # Bu tarihten eski loglar arşivde (include_archived=false iken sayılmaz)
+                "archived_before": archive_manager.retention_cutoff("search_logs")
+            }
+            
+        finally:
+            conn.close()
+    
+    return await async_db.run(_list)
 
 
 # =============================================================================
@@ -1713,243 +1856,186 @@ async def get_saved_searches(
         page: Sayfa numarası
         per_page: Sayfa başına sonuç
     """
-    conn = db.get_connection()
-    cursor = conn.cursor()
-    
-    try:
-        # WHERE koşulları
-        where_conditions = []
-        params = []
-        
-        if brand:
-            where_conditions.append("query LIKE ?")
-            params.append(f"%{brand}%")
-        
-        if category:
-            # Category mapping
-            mapped_category = map_doc_type_to_category(category)
-            where_conditions.append("doc_type = ?")
-            params.append(mapped_category)
-        
-        if search:
-            where_conditions.append("query LIKE ?")
-            params.append(f"%{search}%")
-        
-        where_clause = "WHERE " + " AND ".join(where_conditions) if where_conditions else ""
-        
-        # Sıralama
-        order_by = {
-            "recent": "created_at DESC",
-            "popular": "search_count DESC",
-            "brand": "brand ASC, created_at DESC"
-        }.get(sort, "created_at DESC")
-        
-        # Toplam sayı
-        count_query = f"""
-            SELECT COUNT(DISTINCT query) 
-            FROM search_logs 
-            {where_clause}
-        """
-        cursor.execute(count_query, params)
-        total = cursor.fetchone()[0]
-        
-        # Marka ve kategori çıkarma ile gruplandırılmış sorgu
-        # Her unique query için marka ve kategori çıkar
-        offset = (page - 1) * per_page
-        
-        # Önce tüm kayıtları al, sonra Python'da işle
-        query_sql = f"""
-            SELECT 
-                id,
-                query,
-                doc_type,
-                result_count,
-                created_at,
-                user_id,
-                engines_used
-            FROM search_logs
-            {where_clause}
-            ORDER BY created_at DESC
-            LIMIT ? OFFSET ?
-        """
-        
-        cursor.execute(query_sql, params + [per_page, offset])
-        rows = cursor.fetchall()
-        
-        # Marka ve kategori çıkar, gruplandır
-        searches = []
-        seen_queries = {}  # Aynı query'yi tekrar gösterme
+    def _list(brand, category):
+        conn = db.get_connection()
+        cursor = conn.cursor()
         
-        for row in rows:
-            row_dict = dict(row)
-            query = row_dict.get("query", "")
+        try:
+            # WHERE koşulları (query_stats: sorgu + kategori başına tek satır)
+            where_conditions = []
+            params = []
             
-            # Aynı query'yi atla (en yenisini tut)
-            if query in seen_queries:
-                continue
-            seen_queries[query] = True
+            if brand:
+                where_conditions.append("brand = ?")
+                params.append(brand)
             
-            # Marka çıkar
-            brand_extracted = extract_brand_from_query(query)
+            if category:
+                # Category mapping
+                where_conditions.append("category = ?")
+                params.append(map_doc_type_to_category(category))
             
-            # Kategori çıkar
-            doc_type = row_dict.get("doc_type")
-            category_extracted = map_doc_type_to_category(doc_type)
-            category_label = get_category_label(category_extracted)
+            if search:
+                where_conditions.append("query_key LIKE ?")
+                params.append(f"%{search.lower()}%")
             
-            # Aynı query'nin kaç kez arandığını say
-            cursor.execute(
-                "SELECT COUNT(*) FROM search_logs WHERE query = ?",
-                (query,)
-            )
-            search_count = cursor.fetchone()[0]
+            where_clause = "WHERE " + " AND ".join(where_conditions) if where_conditions else ""
             
-            searches.append({
-                "id": row_dict.get("id"),
-                "query": query,
-                "brand": brand_extracted,
-                "category": category_extracted,
-                "category_label": category_label,
-                "result_count": row_dict.get("result_count", 0),
-                "created_at": row_dict.get("created_at"),
-                "user_id": row_dict.get("user_id"),
-                "search_count": search_count,
-                "engines_used": json.loads(row_dict.get("engines_used", "[]")) if row_dict.get("engines_used") else []
-            })
-        
-        # Sıralama uygula
-        if sort == "popular":
-            searches.sort(key=lambda x: x["search_count"], reverse=True)
-        elif sort == "brand":
-            searches.sort(key=lambda x: (x["brand"] or "", x["created_at"] or ""), reverse=True)
-        # recent zaten DESC sıralı
-        
-        # Marka ve kategori listelerini oluştur
-        all_brands = set()
-        all_categories = set()
-        brand_counts = {}
-        category_counts = {}
-        
-        cursor.execute(f"SELECT query, doc_type FROM search_logs {where_clause}", params)
-        all_rows = cursor.fetchall()
-        
-        for row in all_rows:
-            query = row[0]
-            doc_type = row[1]
+            # Sıralama
+            order_by = {
+                "recent": "last_seen DESC",
+                "popular": "search_count DESC, last_seen DESC",
+                "brand": "brand IS NULL, brand ASC, last_seen DESC"
+            }.get(sort, "last_seen DESC")
             
-            brand = extract_brand_from_query(query)
-            if brand:
-                all_brands.add(brand)
-                brand_counts[brand] = brand_counts.get(brand, 0) + 1
+            # Toplam sayı
+            cursor.execute(f"SELECT COUNT(*) FROM query_stats {where_clause}", params)
+            total = cursor.fetchone()[0]
             
-            category = map_doc_type_to_category(doc_type)
-            all_categories.add(category)
-            category_counts[category] = category_counts.get(category, 0) + 1
-        
-        return {
-            "searches": searches,
-            "brands": sorted(list(all_brands)),
-            "categories": sorted(list(all_categories)),
-            "stats": {
-                "total": total,
-                "by_brand": brand_counts,
-                "by_category": category_counts
-            },
-            "pagination": {
-                "page": page,
-                "per_page": per_page,
-                "total": total,
-                "total_pages": (total + per_page - 1) // per_page
+            offset = (page - 1) * per_page
+            cursor.execute(f"""
+                SELECT 
+                    rowid AS id,
+                    query,
+                    brand,
+                    category,
+                    last_result_count,
+                    last_seen,
+                    last_user_id,
+                    search_count,
+                    last_engines_used
+                FROM query_stats
+                {where_clause}
+                ORDER BY {order_by}
+                LIMIT ? OFFSET ?
+            """, params + [per_page, offset])
+            
+            searches = []
+            for row in cursor.fetchall():
+                row_dict = dict(row)
+                category_extracted = row_dict["category"]
+                engines_used = row_dict.get("last_engines_used")
+                
+                searches.append({
+                    "id": row_dict.get("id"),
+                    "query": row_dict.get("query", ""),
+                    "brand": row_dict.get("brand"),
+                    "category": category_extracted,
+                    "category_label": get_category_label(category_extracted),
+                    "result_count": row_dict.get("last_result_count", 0),
+                    "created_at": row_dict.get("last_seen"),
+                    "user_id": row_dict.get("last_user_id"),
+                    "search_count": row_dict.get("search_count", 0),
+                    "engines_used": json.loads(engines_used) if engines_used else []
+                })
+            
+            # Marka ve kategori dağılımı (arama sayısı toplamları)
+            cursor.execute(f"""
+                SELECT brand, SUM(search_count) FROM query_stats
+                {where_clause}
+                GROUP BY brand
+            """, params)
+            brand_counts = {row[0]: row[1] for row in cursor.fetchall() if row[0]}
+            
+            cursor.execute(f"""
+                SELECT category, SUM(search_count) FROM query_stats
+                {where_clause}
+                GROUP BY category
+            """, params)
+            category_counts = {row[0]: row[1] for row in cursor.fetchall()}
+            
+            return {
+                "searches": searches,
+                "brands": sorted(brand_counts),
+                "categories": sorted(category_counts),
+                "stats": {
+                    "total": total,
+                    "by_brand": brand_counts,
+                    "by_category": category_counts
+                },
+                "pagination": {
+                    "page": page,
+                    "per_page": per_page,
+                    "total": total,
+                    "total_pages": (total + per_page - 1) // per_page
+                }
             }
-        }
-        
-    finally:
-        conn.close()
+            
+        finally:
+            conn.close()
+    
+    return await async_db.run(_list, brand, category)
 
 
 @app.get("/api/saved-searches/stats")
 async def get_saved_searches_stats():
     """Kayıtlı aramalar istatistikleri"""
-    conn = db.get_connection()
-    cursor = conn.cursor()
-    
-    try:
-        # Toplam arama sayısı
-        cursor.execute("SELECT COUNT(*) FROM search_logs")
-        total_searches = cursor.fetchone()[0]
-        
-        # Unique markalar
-        cursor.execute("SELECT DISTINCT query FROM search_logs")
-        all_queries = [row[0] for row in cursor.fetchall()]
-        
-        unique_brands = set()
-        brand_counts = {}
-        
-        for query in all_queries:
-            brand = extract_brand_from_query(query)
-            if brand:
-                unique_brands.add(brand)
-                brand_counts[brand] = brand_counts.get(brand, 0) + 1
-        
-        # Unique kategoriler
-        cursor.execute("SELECT DISTINCT doc_type FROM search_logs WHERE doc_type IS NOT NULL")
-        all_doc_types = [row[0] for row in cursor.fetchall()]
-        
-        unique_categories = set()
-        category_counts = {}
-        
-        for doc_type in all_doc_types:
-            category = map_doc_type_to_category(doc_type)
-            unique_categories.add(category)
-            category_counts[category] = category_counts.get(category, 0) + 1
-        
-        # En çok aranan markalar (top 10)
-        most_searched_brands = sorted(
-            brand_counts.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:10]
-        
-        # En çok aranan kategoriler
-        most_searched_categories = sorted(
-            category_counts.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )
+    def _stats():
+        conn = db.get_connection()
+        cursor = conn.cursor()
         
-        # Son 10 arama
-        cursor.execute("""
-            SELECT query, created_at, result_count
-            FROM search_logs
-            ORDER BY created_at DESC
-            LIMIT 10
-        """)
-        recent_searches = [
-            {
-                "query": row[0],
-                "created_at": row[1],
-                "result_count": row[2]
+        try:
+            # Toplam arama sayısı
+            cursor.execute("SELECT COALESCE(SUM(search_count), 0) FROM query_stats")
+            total_searches = cursor.fetchone()[0]
+            
+            # Marka başına farklı sorgu sayısı
+            cursor.execute("""
+                SELECT brand, COUNT(DISTINCT query_key) AS n FROM query_stats
+                WHERE brand IS NOT NULL
+                GROUP BY brand
+                ORDER BY n DESC
+            """)
+            brand_counts = [(row[0], row[1]) for row in cursor.fetchall()]
+            
+            # Kategori başına farklı sorgu sayısı
+            cursor.execute("""
+                SELECT category, COUNT(*) AS n FROM query_stats
+                GROUP BY category
+                ORDER BY n DESC
+            """)
+            category_counts = [(row[0], row[1]) for row in cursor.fetchall()]
+            
+            # En çok aranan markalar (top 10)
+            most_searched_brands = brand_counts[:10]
+            
+            # En çok aranan kategoriler
+            most_searched_categories = category_counts
+            
+            # Son 10 arama
+            cursor.execute("""
+                SELECT query, created_at, result_count
+                FROM search_logs
+                ORDER BY created_at DESC
+                LIMIT 10
+            """)
+            recent_searches = [
+                {
+                    "query": row[0],
+                    "created_at": row[1],
+                    "result_count": row[2]
+                }
+                for row in cursor.fetchall()
+            ]
+            
+            return {
+                "total_searches": total_searches,
+                "unique_brands": len(brand_counts),
+                "unique_categories": len(category_counts),
+                "most_searched_brands": [
+                    {"brand": brand, "count": count}
+                    for brand, count in most_searched_brands
+                ],
+                "most_searched_categories": [
+                    {"category": category, "label": get_category_label(category), "count": count}
+                    for category, count in most_searched_categories
+                ],
+                "recent_searches": recent_searches
             }
-            for row in cursor.fetchall()
-        ]
-        
-        return {
-            "total_searches": total_searches,
-            "unique_brands": len(unique_brands),
-            "unique_categories": len(unique_categories),
-            "most_searched_brands": [
-                {"brand": brand, "count": count}
-                for brand, count in most_searched_brands
-            ],
-            "most_searched_categories": [
-                {"category": category, "label": get_category_label(category), "count": count}
-                for category, count in most_searched_categories
-            ],
-            "recent_searches": recent_searches
-        }
-        
-    finally:
-        conn.close()
+            
+        finally:
+            conn.close()
+    
+    return await async_db.run(_stats)
 
 
 # =============================================================================
@@ -1958,72 +2044,107 @@ async def get_saved_searches_stats():
 
 @app.get("/api/admin/dashboard")
 async def admin_dashboard(admin: dict = Depends(get_admin_user)):
-    """Admin dashboard istatistikleri"""
-    import sqlite3
-    from datetime import datetime
-    
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    today = datetime.now().date().isoformat()
-    
-    # Toplam kullanıcı
-    cursor.execute("SELECT COUNT(*) FROM users")
-    total_users = cursor.fetchone()[0]
-    
-    # Aktif abonelikler
-    cursor.execute("SELECT COUNT(*) FROM users WHERE subscription_tier != 'free'")
-    active_subs = cursor.fetchone()[0]
-    
-    # Bugünkü aramalar
-    cursor.execute("SELECT COUNT(*) FROM search_logs WHERE DATE(created_at) = ?", (today,))
-    today_searches = cursor.fetchone()[0]
-    
-    # Bugünkü gelir
-    cursor.execute("""
-        SELECT COALESCE(SUM(amount), 0) FROM payments 
-        WHERE DATE(created_at) = ? AND status = 'success'
-    """, (today,))
-    today_revenue = cursor.fetchone()[0]
-    
-    # Cache kayıtları
-    cursor.execute("SELECT COUNT(*) FROM search_cache")
-    cache_entries = cursor.fetchone()[0]
+    """Admin dashboard istatistikleri (rollup tablolarından, bugün = UTC günü)"""
+    def _stats():
+        conn = get_db_pool().acquire(row_factory=None)
+        try:
+            return get_dashboard_stats(conn.cursor())
+        finally:
+            conn.close()
     
-    # Tier dağılımı
-    cursor.execute("""
-        SELECT subscription_tier, COUNT(*) FROM users 
-        GROUP BY subscription_tier
-    """)
-    tier_distribution = dict(cursor.fetchall())
+    return await async_db.run(_stats)
+
+
+@app.get("/api/admin/metrics/timeseries")
+async def admin_metrics_timeseries(
+    metrics: str = Query("searches,revenue,signups", description="Virgülle ayrılmış metrikler (engine:* tüm motorlar)"),
+    start: Optional[str] = Query(None, description="Başlangıç (ISO tarih/saat, UTC)"),
+    end: Optional[str] = Query(None, description="Bitiş (ISO tarih/saat, UTC, dahil)"),
+    granularity: str = Query("day", description="hour veya day"),
+    admin: dict = Depends(get_admin_user)
+):
+    """Metrik zaman serisi (saatlik / günlük rollup'lardan)"""
+    from datetime import datetime
     
-    conn.close()
+    try:
+        start_at = datetime.fromisoformat(start) if start else None
+        end_at = datetime.fromisoformat(end) if end else None
+    except ValueError:
+        raise HTTPException(400, "Geçersiz tarih (ISO biçimi bekleniyor)")
+    names = [m.strip() for m in metrics.split(",") if m.strip()]
+    
+    def _series():
+        conn = get_db_pool().acquire(row_factory=None)
+        try:
+            return get_timeseries(conn.cursor(), names, start_at, end_at, granularity)
+        finally:
+            conn.close()
     
+    try:
+        return await async_db.run(_series)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
+@app.get("/api/admin/db-pool")
+async def admin_db_pool_stats(admin: dict = Depends(get_admin_user)):
+    """SQLite bağlantı havuzu ve async executor istatistikleri (bekleme süresi, yeniden kullanım)"""
     return {
-        "total_users": total_users,
-        "active_subscriptions": active_subs,
-        "today_searches": today_searches,
-        "today_revenue": today_revenue,
-        "cache_entries": cache_entries,
-        "tier_distribution": tier_distribution
+        "pools": get_pool_stats(),
+        "executor": async_db.get_stats(),
+        "bulk_upsert": bulk_upserter.get_stats(),
+        "log_writer": log_writer.get_stats()
     }
 
 
+@app.get("/api/admin/http-clients")
+async def admin_http_client_stats(admin: dict = Depends(get_admin_user)):
+    """Paylaşımlı HTTP oturumları: havuz limitleri, bağlantı ve DNS yeniden kullanımı"""
+    return get_http_registry().get_stats()
+
+
+@app.get("/api/admin/rate-limits")
+async def admin_rate_limit_stats(admin: dict = Depends(get_admin_user)):
+    """Motor başına rate limiter: kısıtlanan istekler, bekleme, güncel eşzamanlılık penceresi"""
+    return get_rate_limiter().get_stats()
+
+
+@app.get("/api/admin/archive")
+async def admin_archive_stats(admin: dict = Depends(get_admin_user)):
+    """Arşivleme durumu: saklama süreleri, taşınan satırlar, aylık arşiv dosyaları"""
+    return await async_db.run(archive_manager.get_stats)
+
+
+@app.post("/api/admin/archive/run")
+async def admin_archive_run(req: Request, admin: dict = Depends(get_admin_user)):
+    """Arşivlemeyi hemen başlat (arka planda, batch'ler halinde)"""
+    if archive_manager.get_stats()["running"]:
+        return {"started": False, "message": "Arşivleme zaten çalışıyor"}
+    
+    asyncio.create_task(archive_manager.run(async_db.write_bulk))
+    log_writer.log_admin(admin["id"], "archive_run", ip_address=get_client_ip(req))
+    return {"started": True}
+
+
 @app.get("/api/admin/users")
 async def admin_list_users(
     page: int = 1,
     per_page: int = 20,
     tier: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="Önceki yanıtın next_cursor'ı"),
+    count: Optional[str] = Query(None, description="Toplam: exact, estimate, none"),
     admin: dict = Depends(get_admin_user)
 ):
     """Kullanıcı listesi"""
-    return user_manager.list_users(page=page, per_page=per_page, tier=tier)
+    return await async_db.run(
+        user_manager.list_users,
+        page=page, per_page=per_page, tier=tier, cursor=cursor, count=count
+    )
 
 
 @app.get("/api/admin/users/{user_id}")
 async def admin_get_user(user_id: int, admin: dict = Depends(get_admin_user)):
     """Kullanıcı detayı"""
-    user = user_manager.get_user_by_id(user_id)
+    user = await async_db.run(user_manager.get_user_by_id, user_id)
     if not user:
         raise HTTPException(404, "Kullanıcı bulunamadı")
     
@@ -2035,12 +2156,19 @@ async def admin_get_user(user_id: int, admin: dict = Depends(get_admin_user)):
 async def admin_update_user(
     user_id: int,
     updates: dict,
+    req: Request,
     admin: dict = Depends(get_admin_user)
 ):
     """Kullanıcı güncelle"""
-    success = user_manager.update_user(user_id, **updates)
+    success = await async_db.write(user_manager.update_user, user_id, **updates)
     if not success:
         raise HTTPException(400, "Güncelleme başarısız")
+    
+    log_writer.log_admin(
+        admin["id"], "update_user", "users", user_id,
+        new_value={k: v for k, v in updates.items() if "password" not in k},
+        ip_address=get_client_ip(req)
+    )
     return {"message": "Kullanıcı güncellendi"}
 
 
@@ -2048,19 +2176,25 @@ async def admin_update_user(
 async def admin_adjust_credits(
     user_id: int,
     amount: int,
+    req: Request,
     reason: str = "",
     admin: dict = Depends(get_admin_user)
 ):
     """Kredi ekle/çıkar"""
     if amount > 0:
-        success = credit_manager.add_credits(user_id, amount, reason)
+        success = await async_db.write(credit_manager.add_credits, user_id, amount, reason)
     else:
-        success = credit_manager.deduct_credits(user_id, abs(amount), reason)
+        success = await async_db.write(credit_manager.deduct_credits, user_id, abs(amount), reason)
     
     if not success:
         raise HTTPException(400, "Kredi işlemi başarısız")
     
-    new_balance = credit_manager.get_balance(user_id)
+    new_balance = await async_db.run(credit_manager.get_balance, user_id)
+    log_writer.log_admin(
+        admin["id"], "adjust_credits", "users", user_id,
+        new_value={"amount": amount, "reason": reason, "balance": new_balance},
+        ip_address=get_client_ip(req)
+    )
     return {"message": "Kredi güncellendi", "new_balance": new_balance}
 
 
@@ -2071,13 +2205,13 @@ async def admin_get_settings(
     admin: dict = Depends(get_admin_user)
 ):
     """Tüm ayarları getir"""
-    return settings_manager.get_all(category=category, masked=True)
+    return await async_db.run(settings_manager.get_all, category=category, masked=True)
 
 
 @app.get("/api/admin/settings/{key}")
 async def admin_get_setting(key: str, admin: dict = Depends(get_admin_user)):
     """Tek ayar getir (şifre çözülmüş)"""
-    value = settings_manager.get(key)
+    value = await async_db.run(settings_manager.get, key)
     return {"key": key, "value": value}
 
 
@@ -2085,111 +2219,118 @@ async def admin_get_setting(key: str, admin: dict = Depends(get_admin_user)):
 async def admin_update_setting(
     key: str,
     value: str,
+    req: Request,
     admin: dict = Depends(get_admin_user)
 ):
     """Ayar güncelle"""
-    success = settings_manager.set(key, value, admin_id=admin["id"])
+    success = await async_db.write(settings_manager.set, key, value, admin_id=admin["id"])
     if not success:
         raise HTTPException(400, "Ayar güncellenemedi")
+    
+    # Değer loglanmaz (API anahtarları şifreli saklanır)
+    log_writer.log_admin(admin["id"], "update_setting", "settings", new_value={"key": key}, ip_address=get_client_ip(req))
     return {"message": "Ayar güncellendi"}
 
 
 # Payments API
+PAYMENTS_SORT = KeysetSort(column="p.created_at", key="created_at", nullable=True, id_column="p.id")
+
 @app.get("/api/admin/payments")
 async def admin_list_payments(
     page: int = 1,
     per_page: int = 20,
     status: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="Önceki yanıtın next_cursor'ı"),
+    count: Optional[str] = Query(None, description="Toplam: exact, estimate, none"),
     admin: dict = Depends(get_admin_user)
 ):
     """Ödeme listesi"""
-    import sqlite3
-    
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
-    # Count
-    count_query = "SELECT COUNT(*) FROM payments WHERE 1=1"
-    list_query = """
-        SELECT p.*, u.email, u.username 
-        FROM payments p 
-        LEFT JOIN users u ON p.user_id = u.id 
-        WHERE 1=1
-    """
-    params = []
+    count_mode = resolve_count_mode(count, cursor)
     
-    if status:
-        count_query += " AND status = ?"
-        list_query += " AND p.status = ?"
-        params.append(status)
-    
-    cursor.execute(count_query, params)
-    total = cursor.fetchone()[0]
-    
-    list_query += " ORDER BY p.created_at DESC LIMIT ? OFFSET ?"
-    params.extend([per_page, (page - 1) * per_page])
-    
-    cursor.execute(list_query, params)
-    payments = [dict(row) for row in cursor.fetchall()]
-    
-    conn.close()
+    def _list():
+        conn = get_db_pool().acquire()
+        db_cursor = conn.cursor()
+        
+        conditions = []
+        params = []
+        
+        if status:
+            conditions.append("p.status = ?")
+            params.append(status)
+        
+        # Count
+        total = count_rows(db_cursor, "FROM payments p", conditions, params, count_mode)
+        
+        rows, next_cursor = keyset_page(
+            db_cursor,
+            """
+            SELECT p.*, u.email, u.username 
+            FROM payments p 
+            LEFT JOIN users u ON p.user_id = u.id 
+            """,
+            conditions, params, PAYMENTS_SORT,
+            after=cursor, page=page, per_page=per_page
+        )
+        payments = [dict(row) for row in rows]
+        
+        conn.close()
+        
+        return {
+            "items": payments,
+            **page_info(total, page, per_page, next_cursor, count_mode)
+        }
     
-    return {
-        "items": payments,
-        "total": total,
-        "page": page,
-        "per_page": per_page,
-        "pages": (total + per_page - 1) // per_page
-    }
+    return await async_db.run(_list)
 
 
 # Search Logs API
+SEARCH_LOGS_SORT = KeysetSort(column="sl.created_at", key="created_at", nullable=True, id_column="sl.id")
+
 @app.get("/api/admin/search-logs")
 async def admin_list_search_logs(
     page: int = 1,
     per_page: int = 50,
     user_id: Optional[int] = None,
+    cursor: Optional[str] = Query(None, description="Önceki yanıtın next_cursor'ı"),
+    count: Optional[str] = Query(None, description="Toplam: exact, estimate, none"),
     admin: dict = Depends(get_admin_user)
 ):
     """Arama logları"""
-    import sqlite3
-    
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
-    count_query = "SELECT COUNT(*) FROM search_logs WHERE 1=1"
-    list_query = """
-        SELECT sl.*, u.email, u.username 
-        FROM search_logs sl 
-        LEFT JOIN users u ON sl.user_id = u.id 
-        WHERE 1=1
-    """
-    params = []
+    count_mode = resolve_count_mode(count, cursor)
     
-    if user_id:
-        count_query += " AND user_id = ?"
-        list_query += " AND sl.user_id = ?"
-        params.append(user_id)
-    
-    cursor.execute(count_query, params)
-    total = cursor.fetchone()[0]
-    
-    list_query += " ORDER BY sl.created_at DESC LIMIT ? OFFSET ?"
-    params.extend([per_page, (page - 1) * per_page])
-    
-    cursor.execute(list_query, params)
-    logs = [dict(row) for row in cursor.fetchall()]
-    
-    conn.close()
+    def _list():
+        conn = get_db_pool().acquire()
+        db_cursor = conn.cursor()
+        
+        conditions = []
+        params = []
+        
+        if user_id:
+            conditions.append("sl.user_id = ?")
+            params.append(user_id)
+        
+        total = count_rows(db_cursor, "FROM search_logs sl", conditions, params, count_mode)
+        
+        rows, next_cursor = keyset_page(
+            db_cursor,
+            """
+            SELECT sl.*, u.email, u.username 
+            FROM search_logs sl 
+            LEFT JOIN users u ON sl.user_id = u.id 
+            """,
+            conditions, params, SEARCH_LOGS_SORT,
+            after=cursor, page=page, per_page=per_page
+        )
+        logs = [dict(row) for row in rows]
+        
+        conn.close()
+        
+        return {
+            "items": logs,
+            **page_info(total, page, per_page, next_cursor, count_mode)
+        }
     
-    return {
-        "items": logs,
-        "total": total,
-        "page": page,
-        "per_page": per_page
-    }
+    return await async_db.run(_list)
 
 
 # Admin sayfası
@@ -2214,44 +2355,47 @@ async def create_credit_request(
     user: dict = Depends(get_current_user)
 ):
     """Yeni kredi talebi oluştur"""
-    import sqlite3
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    try:
-        cursor.execute("""
-            INSERT INTO credit_requests (user_id, package_type, credit_amount, price_amount)
-            VALUES (?, ?, ?, ?)
-        """, (user["id"], data.package_type, data.credit_amount, data.price_amount))
-        
-        request_id = cursor.lastrowid
-        conn.commit()
+    def _create():
+        conn = get_db_pool().acquire(row_factory=None)
+        cursor = conn.cursor()
         
-        return {"message": "Kredi talebiniz alındı. Admin onayı bekleniyor.", "request_id": request_id}
-    except Exception as e:
-        raise HTTPException(500, f"Talep oluşturulamadı: {str(e)}")
-    finally:
-        conn.close()
+        try:
+            cursor.execute("""
+                INSERT INTO credit_requests (user_id, package_type, credit_amount, price_amount)
+                VALUES (?, ?, ?, ?)
+            """, (user["id"], data.package_type, data.credit_amount, data.price_amount))
+            
+            request_id = cursor.lastrowid
+            conn.commit()
+            
+            return {"message": "Kredi talebiniz alındı. Admin onayı bekleniyor.", "request_id": request_id}
+        except Exception as e:
+            raise HTTPException(500, f"Talep oluşturulamadı: {str(e)}")
+        finally:
+            conn.close()
+    
+    return await async_db.write(_create)
 
 
 @app.get("/api/credit-requests/my")
 async def my_credit_requests(user: dict = Depends(get_current_user)):
     """Kullanıcının kendi kredi taleplerini listele"""
-    import sqlite3
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT * FROM credit_requests 
-        WHERE user_id = ? 
-        ORDER BY created_at DESC
-    """, (user["id"],))
-    
-    requests = [dict(row) for row in cursor.fetchall()]
-    conn.close()
+    def _list():
+        conn = get_db_pool().acquire()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            SELECT * FROM credit_requests 
+            WHERE user_id = ? 
+            ORDER BY created_at DESC
+        """, (user["id"],))
+        
+        requests = [dict(row) for row in cursor.fetchall()]
+        conn.close()
+        
+        return {"requests": requests}
     
-    return {"requests": requests}
+    return await async_db.run(_list)
 
 
 @app.get("/api/admin/credit-requests")
@@ -2260,31 +2404,32 @@ async def admin_list_credit_requests(
     admin: dict = Depends(get_admin_user)
 ):
     """Admin: Tüm kredi taleplerini listele"""
-    import sqlite3
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
-    if status:
-        cursor.execute("""
-            SELECT cr.*, u.username, u.email, u.phone, u.credit_balance
-            FROM credit_requests cr
-            JOIN users u ON cr.user_id = u.id
-            WHERE cr.status = ?
-            ORDER BY cr.created_at DESC
-        """, (status,))
-    else:
-        cursor.execute("""
-            SELECT cr.*, u.username, u.email, u.phone, u.credit_balance
-            FROM credit_requests cr
-            JOIN users u ON cr.user_id = u.id
-            ORDER BY cr.created_at DESC
-        """)
-    
-    requests = [dict(row) for row in cursor.fetchall()]
-    conn.close()
+    def _list():
+        conn = get_db_pool().acquire()
+        cursor = conn.cursor()
+        
+        if status:
+            cursor.execute("""
+                SELECT cr.*, u.username, u.email, u.phone, u.credit_balance
+                FROM credit_requests cr
+                JOIN users u ON cr.user_id = u.id
+                WHERE cr.status = ?
+                ORDER BY cr.created_at DESC
+            """, (status,))
+        else:
+            cursor.execute("""
+                SELECT cr.*, u.username, u.email, u.phone, u.credit_balance
+                FROM credit_requests cr
+                JOIN users u ON cr.user_id = u.id
+                ORDER BY cr.created_at DESC
+            """)
+        
+        requests = [dict(row) for row in cursor.fetchall()]
+        conn.close()
+        
+        return {"requests": requests}
     
-    return {"requests": requests}
+    return await async_db.run(_list)
 
 
 class CreditRequestAction(BaseModel):
@@ -2295,62 +2440,69 @@ class CreditRequestAction(BaseModel):
 async def admin_process_credit_request(
     request_id: int,
     data: CreditRequestAction,
+    req: Request,
     admin: dict = Depends(get_admin_user)
 ):
     """Admin: Kredi talebini onayla veya reddet"""
-    import sqlite3
-    from datetime import datetime
-    
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
-    try:
-        # Talebi al
-        cursor.execute("SELECT * FROM credit_requests WHERE id = ?", (request_id,))
-        request = cursor.fetchone()
+    def _process():
+        from datetime import datetime
         
-        if not request:
-            raise HTTPException(404, "Talep bulunamadı")
-        
-        if request["status"] != "pending":
-            raise HTTPException(400, "Bu talep zaten işlenmiş")
+        conn = get_db_pool().acquire()
+        cursor = conn.cursor()
         
-        if data.action == "approve":
-            # Kredi ekle
-            cursor.execute("""
-                UPDATE users SET credit_balance = credit_balance + ?
-                WHERE id = ?
-            """, (request["credit_amount"], request["user_id"]))
-            
-            # Talebi güncelle
-            cursor.execute("""
-                UPDATE credit_requests 
-                SET status = 'approved', admin_note = ?, processed_by = ?, processed_at = ?
-                WHERE id = ?
-            """, (data.admin_note, admin["id"], datetime.now().isoformat(), request_id))
+        try:
+            # Talebi al
+            cursor.execute("SELECT * FROM credit_requests WHERE id = ?", (request_id,))
+            request = cursor.fetchone()
             
-            conn.commit()
-            return {"message": f"{request['credit_amount']} kredi başarıyla eklendi"}
+            if not request:
+                raise HTTPException(404, "Talep bulunamadı")
             
-        elif data.action == "reject":
-            cursor.execute("""
-                UPDATE credit_requests 
-                SET status = 'rejected', admin_note = ?, processed_by = ?, processed_at = ?
-                WHERE id = ?
-            """, (data.admin_note, admin["id"], datetime.now().isoformat(), request_id))
+            if request["status"] != "pending":
+                raise HTTPException(400, "Bu talep zaten işlenmiş")
             
-            conn.commit()
-            return {"message": "Talep reddedildi"}
-        else:
-            raise HTTPException(400, "Geçersiz aksiyon")
-            
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(500, f"İşlem hatası: {str(e)}")
-    finally:
-        conn.close()
+            if data.action == "approve":
+                # Kredi ekle
+                cursor.execute("""
+                    UPDATE users SET credit_balance = credit_balance + ?
+                    WHERE id = ?
+                """, (request["credit_amount"], request["user_id"]))
+                
+                # Talebi güncelle
+                cursor.execute("""
+                    UPDATE credit_requests 
+                    SET status = 'approved', admin_note = ?, processed_by = ?, processed_at = ?
+                    WHERE id = ?
+                """, (data.admin_note, admin["id"], datetime.now().isoformat(), request_id))
+                
+                conn.commit()
+                return {"message": f"{request['credit_amount']} kredi başarıyla eklendi"}
+                
+            elif data.action == "reject":
+                cursor.execute("""
+                    UPDATE credit_requests 
+                    SET status = 'rejected', admin_note = ?, processed_by = ?, processed_at = ?
+                    WHERE id = ?
+                """, (data.admin_note, admin["id"], datetime.now().isoformat(), request_id))
+                
+                conn.commit()
+                return {"message": "Talep reddedildi"}
+            else:
+                raise HTTPException(400, "Geçersiz aksiyon")
+                
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(500, f"İşlem hatası: {str(e)}")
+        finally:
+            conn.close()
+    
+    result = await async_db.write(_process)
+    log_writer.log_admin(
+        admin["id"], f"credit_request_{data.action}", "credit_requests", request_id,
+        new_value={"admin_note": data.admin_note}, ip_address=get_client_ip(req)
+    )
+    return result
 
 
 # Legal sayfaları
@@ -2448,10 +2600,12 @@ async def run_catalog_analysis(catalog_id: int):
 async def list_user_catalogs(
     page: int = 1,
     per_page: int = 20,
+    cursor: Optional[str] = Query(None, description="Önceki yanıtın next_cursor'ı"),
+    count: Optional[str] = Query(None, description="Toplam: exact, estimate, none"),
     user: dict = Depends(get_current_user)
 ):
     """Kullanıcının kataloglarını listele"""
-    return catalog_service.get_user_catalogs(user["id"], page, per_page)
+    return await async_db.run(catalog_service.get_user_catalogs, user["id"], page, per_page, cursor, count)
 
 
 @app.get("/api/catalogs/{catalog_id}")
@@ -2460,7 +2614,7 @@ async def get_catalog_detail(
     user: dict = Depends(get_current_user)
 ):
     """Katalog detayını al"""
-    catalog = catalog_service.get_catalog_by_id(catalog_id, user["id"])
+    catalog = await async_db.run(catalog_service.get_catalog_by_id, catalog_id, user["id"])
     if not catalog:
         raise HTTPException(404, "Katalog bulunamadı")
     return catalog
@@ -2487,7 +2641,7 @@ async def get_catalog_progress_sse(
                 break
             
             # İlerleme durumunu al
-            progress = catalog_service.get_progress(catalog_id)
+            progress = await async_db.run(catalog_service.get_progress, catalog_id)
             
             if progress:
                 # Değişiklik varsa gönder
@@ -2641,11 +2795,12 @@ async def scan_all_pending(user: dict = Depends(get_admin_user)):
 @app.get("/api/admin/sources/{source_id}/pdfs")
 async def get_source_pdfs(
     source_id: int,
+    q: Optional[str] = Query(None, description="Başlık/marka/model/snippet içinde tam metin arama"),
     user: dict = Depends(get_admin_user)
 ):
     """Bir kaynaktan bulunan PDF'leri getir (Admin)"""
     scanner = SourceScanner(db)
-    pdfs = scanner.get_scanned_pdfs(source_id)
+    pdfs = await async_db.run(scanner.get_scanned_pdfs, source_id, q)
     return {"pdfs": pdfs, "total": len(pdfs)}
 
 
@@ -2679,102 +2834,163 @@ async def reset_source(
 async def get_discovered_pdfs(
     page: int = Query(1, ge=1, description="Sayfa numarası"),
     per_page: int = Query(50, ge=10, le=200, description="Sayfa başına sonuç"),
+    q: Optional[str] = Query(None, description="Başlık/marka/model/domain içinde tam metin arama"),
     domain: Optional[str] = Query(None, description="Domain filtresi"),
     brand: Optional[str] = Query(None, description="Marka filtresi"),
     min_size: Optional[float] = Query(None, description="Minimum boyut (MB)"),
     max_size: Optional[float] = Query(None, description="Maksimum boyut (MB)"),
-    sort_by: str = Query("size_mb", description="Sıralama: size_mb, title, discovered_at"),
+    sort_by: Optional[str] = Query(None, description="Sıralama: relevance, size_mb, title, discovered_at (q varsa varsayılan relevance)"),
     sort_order: str = Query("desc", description="Sıralama yönü: asc, desc"),
+    cursor: Optional[str] = Query(None, description="Önceki yanıtın next_cursor'ı (relevance dışındaki sıralamalar)"),
+    count: Optional[str] = Query(None, description="Toplam: exact, estimate, none"),
     user: dict = Depends(get_admin_user)
 ):
     """Keşfedilen PDF'leri listele - Sayfalama, filtreleme ve sıralama (Admin)"""
-    conn = db.get_connection()
-    cursor = conn.cursor()
+    count_mode = resolve_count_mode(count, cursor)
+    after = cursor
     
-    try:
-        # Filtre koşulları
-        conditions = ["is_valid = 1"]
-        params = []
+    def _list():
+        sort_column = sort_by
+        conn = db.get_connection()
+        cursor = conn.cursor()
         
-        if domain:
-            conditions.append("domain LIKE ?")
-            params.append(f"%{domain}%")
-        
-        if brand:
-            conditions.append("brand LIKE ?")
-            params.append(f"%{brand}%")
-        
-        if min_size is not None:
-            conditions.append("size_mb >= ?")
-            params.append(min_size)
-        
-        if max_size is not None:
-            conditions.append("size_mb <= ?")
-            params.append(max_size)
-        
-        where_clause = " AND ".join(conditions)
-        
-        # Sıralama validasyonu
-        valid_sort_columns = ["size_mb", "title", "discovered_at", "domain"]
-        if sort_by not in valid_sort_columns:
-            sort_by = "size_mb"
-        sort_direction = "DESC" if sort_order.lower() == "desc" else "ASC"
-        
-        # Toplam sayı
-        cursor.execute(f"SELECT COUNT(*) FROM discovered_pdfs WHERE {where_clause}", params)
-        total = cursor.fetchone()[0]
-        
-        # Sayfalama
-        offset = (page - 1) * per_page
-        total_pages = (total + per_page - 1) // per_page if total > 0 else 1
-        
-        # Sonuçları çek
-        cursor.execute(f"""
-            SELECT id, url, title, domain, size_bytes, size_mb, brand, model, 
-                   category, discovered_at, last_checked
-            FROM discovered_pdfs 
-            WHERE {where_clause}
-            ORDER BY {sort_by} {sort_direction} NULLS LAST
-            LIMIT ? OFFSET ?
-        """, params + [per_page, offset])
-        
-        pdfs = []
-        for row in cursor.fetchall():
-            pdfs.append({
-                "id": row[0],
-                "url": row[1],
-                "title": row[2],
-                "domain": row[3],
-                "size_bytes": row[4],
-                "size_mb": row[5],
-                "size_formatted": f"{row[5]:.1f} MB" if row[5] else None,
-                "brand": row[6],
-                "model": row[7],
-                "category": row[8],
-                "discovered_at": row[9],
-                "last_checked": row[10]
-            })
+        try:
+            # Filtre koşulları
+            conditions = ["is_valid = 1"]
+            params = []
+        
+            # Metin filtreleri FTS5 indeksinden (bm25 skoru ile)
+            match = None
+            if db.fts_enabled:
+                match = combine_match_queries(
+                    build_match_query(q),
+                    build_match_query(domain, ["domain"]),
+                    build_match_query(brand, ["brand"])
+                )
+            elif q:
+                conditions.append("(title LIKE ? OR brand LIKE ? OR model LIKE ? OR domain LIKE ?)")
+                params.extend([f"%{q}%"] * 4)
+        
+            if domain and not db.fts_enabled:
+                conditions.append("domain LIKE ?")
+                params.append(f"%{domain}%")
+        
+            if brand and not db.fts_enabled:
+                conditions.append("brand LIKE ?")
+                params.append(f"%{brand}%")
+        
+            if min_size is not None:
+                conditions.append("size_mb >= ?")
+                params.append(min_size)
+        
+            if max_size is not None:
+                conditions.append("size_mb <= ?")
+                params.append(max_size)
+        
+            from_clause = "discovered_pdfs"
+            if match:
+                from_clause += f" JOIN {fts_rank_subquery('discovered_pdfs')} fts ON fts.rowid = discovered_pdfs.id"
+                params = [match] + params
+            select_sql = f"""
+                SELECT id, url, title, domain, size_bytes, size_mb, brand, model, 
+                       category, discovered_at, last_checked
+                FROM {from_clause} 
+            """
+        
+            # Toplam sayı (filtresizken estimate stat_counters'tan, 017 migration)
+            total = count_rows(
+                cursor, f"FROM {from_clause}", conditions, params, count_mode,
+                counter="discovered_pdfs" if conditions == ["is_valid = 1"] and not match else None
+            )
         
-        # Benzersiz domain ve brand listesi (filtreleme için)
-        cursor.execute("SELECT DISTINCT domain FROM discovered_pdfs WHERE is_valid = 1 ORDER BY domain")
-        domains = [r[0] for r in cursor.fetchall() if r[0]]
+            # Sıralama validasyonu
+            valid_sort_columns = ["size_mb", "title", "discovered_at", "domain"]
+            next_cursor = None
+            if sort_column == "relevance" or (sort_column is None and q):
+                # bm25 skoru sorguya göre hesaplanır, keyset yerine OFFSET
+                order_clause = "fts.rank ASC, size_mb DESC NULLS LAST" if match else "size_mb DESC NULLS LAST"
+                cursor.execute(f"""
+                    {select_sql}
+                    WHERE {" AND ".join(conditions)}
+                    ORDER BY {order_clause}, id DESC
+                    LIMIT ? OFFSET ?
+                """, params + [per_page, (page - 1) * per_page])
+                rows = cursor.fetchall()
+            else:
+                if sort_column not in valid_sort_columns:
+                    sort_column = "size_mb"
+                # (sıralama kolonu, id) üzerinden keyset: 012 index'leriyle sabit süreli sayfalar
+                sort = KeysetSort(
+                    column=sort_column,
+                    key=sort_column,
+                    descending=sort_order.lower() == "desc",
+                    nullable=sort_column != "domain"
+                )
+                rows, next_cursor = keyset_page(
+                    cursor, select_sql, conditions, params, sort,
+                    after=after, page=page, per_page=per_page
+                )
         
-        cursor.execute("SELECT DISTINCT brand FROM discovered_pdfs WHERE is_valid = 1 AND brand IS NOT NULL ORDER BY brand")
-        brands = [r[0] for r in cursor.fetchall() if r[0]]
+            pdfs = []
+            for row in rows:
+                pdfs.append({
+                    "id": row[0],
+                    "url": row[1],
+                    "title": row[2],
+                    "domain": row[3],
+                    "size_bytes": row[4],
+                    "size_mb": row[5],
+                    "size_formatted": f"{row[5]:.1f} MB" if row[5] else None,
+                    "brand": row[6],
+                    "model": row[7],
+                    "category": row[8],
+                    "discovered_at": row[9],
+                    "last_checked": row[10]
+                })
         
-        return {
-            "items": pdfs,
-            "total": total,
-            "page": page,
-            "per_page": per_page,
-            "total_pages": total_pages,
-            "filters": {
-                "domains": domains,
-                "brands": brands
+            # Filtre seçenekleri ayrı endpoint'ten (/api/admin/discovered-pdfs/filters)
+            return {
+                "items": pdfs,
+                **page_info(total, page, per_page, next_cursor, count_mode, pages_key="total_pages")
             }
-        }
-    finally:
-        conn.close()
+        finally:
+            conn.close()
+        
+    return await async_db.run(_list)
+
+
+# Filtre seçenekleri → (zaman, {"domains": [...], "brands": [...]})
+_discovered_pdfs_filters: dict = {}
+
+@app.get("/api/admin/discovered-pdfs/filters")
+async def get_discovered_pdf_filters(user: dict = Depends(get_admin_user)):
+    """
+    Kayıtlı link listesinin domain / marka filtre seçenekleri (Admin)
+    
+    DISTINCT taramaları tablo boyutunda olduğu için liste sayfalarından
+    ayrıdır; panel ilk yüklemede bir kez ister ve sonuç en fazla
+    DISCOVERED_PDFS_FILTERS_CACHE_SECONDS saniye önbellekte tutulur.
+    """
+    cached = _discovered_pdfs_filters.get("value")
+    if cached and time.monotonic() - cached[0] < DISCOVERED_PDFS_FILTERS_CACHE_SECONDS:
+        return cached[1]
+    
+    def _filters():
+        conn = db.get_connection()
+        try:
+            domains = [r[0] for r in conn.execute(
+                "SELECT DISTINCT domain FROM discovered_pdfs WHERE is_valid = 1 ORDER BY domain"
+            ) if r[0]]
+            brands = [r[0] for r in conn.execute(
+                "SELECT DISTINCT brand FROM discovered_pdfs WHERE is_valid = 1 AND brand IS NOT NULL ORDER BY brand"
+            ) if r[0]]
+            return {"domains": domains, "brands": brands}
+        finally:
+            conn.close()
+    
+    filters = await async_db.run(_filters)
+    _discovered_pdfs_filters["value"] = (time.monotonic(), filters)
+    return filters
 
 
 @app.delete("/api/admin/discovered-pdfs/{pdf_id}")
@@ -2783,14 +2999,8 @@ async def delete_discovered_pdf(
     user: dict = Depends(get_admin_user)
 ):
     """Keşfedilen PDF'i sil (Admin)"""
-    conn = db.get_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute("DELETE FROM discovered_pdfs WHERE id = ?", (pdf_id,))
-        conn.commit()
-        return {"success": cursor.rowcount > 0}
-    finally:
-        conn.close()
+    rowcount, _ = await async_db.execute("DELETE FROM discovered_pdfs WHERE id = ?", (pdf_id,))
+    return {"success": rowcount > 0}
 
 
 # ================================================================
@@ -0,0 +1,188 @@
+"""
+Async DB Latency Benchmark - event loop üzerinde sqlite3 vs executor cephesi
+
+Eşzamanlı istek yükü altında iki modu karşılaştırır:
+    blocking : sorgular doğrudan event loop'ta (eski endpoint davranışı)
+    executor : sorgular src.async_db üzerinden (okuma thread'leri + tek yazıcı)
+
+Yük: saved-searches benzeri ağır okumalar, favorites benzeri hafif okumalar ve
+search_logs yazmaları karışımı. Aynı anda 5 ms'de bir uyanan bir "ping"
+görevi event loop gecikmesini ölçer; bloklayan sorgular bu gecikmeyi
+doğrudan büyütür (yavaş bir sorgu hafif istekleri de bekletir).
+
+Kullanım:
+    python -m benchmarks.async_db_latency
+    python -m benchmarks.async_db_latency --concurrency 64 --requests 2000 --rows 200000
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Dict, List
+
+from src.async_db import AsyncDatabase
+from src.db_pool import get_db_pool
+
+HEAVY_SQL = '''
+    SELECT query, COUNT(*) AS n FROM search_logs
+    WHERE query LIKE ? GROUP BY query ORDER BY n DESC LIMIT 20
+'''
+LIGHT_SQL = "SELECT * FROM favorites WHERE user_id = ? ORDER BY added_at DESC LIMIT 20"
+WRITE_SQL = "INSERT INTO search_logs (user_id, query, doc_type, result_count) VALUES (?, ?, ?, ?)"
+
+BRANDS = ["komatsu", "caterpillar", "volvo", "hitachi", "jcb", "doosan", "liebherr", "case"]
+
+
+def build_db(path: str, rows: int) -> None:
+    conn = get_db_pool(path).acquire()
+    try:
+        conn.executescript('''
+            CREATE TABLE search_logs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER, query TEXT,
+                doc_type TEXT, result_count INTEGER, created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE TABLE favorites (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER, pdf_url TEXT,
+                title TEXT, added_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE INDEX idx_fav_user ON favorites(user_id, added_at);
+        ''')
+        rnd = random.Random(7)
+        conn.executemany(
+            "INSERT INTO search_logs (user_id, query, doc_type, result_count) VALUES (?, ?, ?, ?)",
+            [
+                (rnd.randint(1, 500), f"{rnd.choice(BRANDS)} PC{rnd.randint(50, 900)}", "parts_catalog", rnd.randint(0, 100))
+                for _ in range(rows)
+            ]
+        )
+        conn.executemany(
+            "INSERT INTO favorites (user_id, pdf_url, title) VALUES (?, ?, ?)",
+            [(rnd.randint(1, 500), f"https://example.com/{i}.pdf", f"PDF {i}") for i in range(rows // 10)]
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _blocking_query(path: str, sql: str, params) -> List:
+    conn = get_db_pool(path).acquire()
+    try:
+        cursor = conn.execute(sql, params)
+        if sql.lstrip().upper().startswith("INSERT"):
+            conn.commit()
+            return []
+        return cursor.fetchall()
+    finally:
+        conn.close()
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run_load(mode: str, path: str, adb: AsyncDatabase, args) -> Dict[str, float]:
+    rnd = random.Random(11)
+    plan = []
+    for _ in range(args.requests):
+        r = rnd.random()
+        if r < args.heavy_ratio:
+            plan.append(("read", HEAVY_SQL, (f"%{rnd.choice(BRANDS)}%",)))
+        elif r < args.heavy_ratio + args.write_ratio:
+            plan.append(("write", WRITE_SQL, (rnd.randint(1, 500), f"{rnd.choice(BRANDS)} EC210", "parts_catalog", 10)))
+        else:
+            plan.append(("read", LIGHT_SQL, (rnd.randint(1, 500),)))
+
+    latencies = {"heavy": [], "light": [], "write": []}
+    lags: List[float] = []
+    done = asyncio.Event()
+
+    async def ping():
+        interval = 0.005
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            lags.append((time.perf_counter() - start - interval) * 1000)
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for item in plan:
+        queue.put_nowait(item)
+
+    async def client():
+        while not queue.empty():
+            kind, sql, params = queue.get_nowait()
+            label = "write" if kind == "write" else ("heavy" if sql is HEAVY_SQL else "light")
+            start = time.perf_counter()
+            if mode == "blocking":
+                _blocking_query(path, sql, params)
+                await asyncio.sleep(0)  # Handler'ın geri kalanı (yanıt yazma vb.)
+            elif kind == "write":
+                await adb.execute(sql, params)
+            else:
+                await adb.fetch_all(sql, params)
+            latencies[label].append((time.perf_counter() - start) * 1000)
+
+    pinger = asyncio.create_task(ping())
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await pinger
+
+    result = {"throughput": args.requests / elapsed}
+    for label, values in latencies.items():
+        result[f"{label}_p50"] = statistics.median(values) if values else 0.0
+        result[f"{label}_p99"] = percentile(values, 99)
+    result["lag_p99"] = percentile(lags, 99)
+    result["lag_max"] = max(lags) if lags else 0.0
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Async DB gecikme benchmark")
+    parser.add_argument("--rows", type=int, default=100000, help="search_logs satır sayısı")
+    parser.add_argument("--requests", type=int, default=1000, help="Toplam istek")
+    parser.add_argument("--concurrency", type=int, default=32, help="Eşzamanlı istemci")
+    parser.add_argument("--heavy-ratio", type=float, default=0.1, help="Ağır okuma oranı")
+    parser.add_argument("--write-ratio", type=float, default=0.2, help="Yazma oranı")
+    parser.add_argument("--read-workers", type=int, default=4, help="Okuma thread sayısı")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        build_db(path, args.rows)
+        adb = AsyncDatabase(path, read_workers=args.read_workers)
+        try:
+            results = {
+                mode: asyncio.run(run_load(mode, path, adb, args))
+                for mode in ("blocking", "executor")
+            }
+        finally:
+            adb.shutdown()
+        get_db_pool(path).close_thread_connections()
+
+    print(f"Satır: {args.rows}, istek: {args.requests}, eşzamanlı: {args.concurrency}, "
+          f"okuma thread: {args.read_workers}")
+    print(f"{'':<26}{'blocking':>12}{'executor':>12}")
+    rows = [
+        ("Throughput (istek/s)", "throughput", "{:>12.0f}"),
+        ("Hafif okuma p50 (ms)", "light_p50", "{:>12.2f}"),
+        ("Hafif okuma p99 (ms)", "light_p99", "{:>12.2f}"),
+        ("Ağır okuma p50 (ms)", "heavy_p50", "{:>12.2f}"),
+        ("Ağır okuma p99 (ms)", "heavy_p99", "{:>12.2f}"),
+        ("Yazma p50 (ms)", "write_p50", "{:>12.2f}"),
+        ("Yazma p99 (ms)", "write_p99", "{:>12.2f}"),
+        ("Loop gecikmesi p99 (ms)", "lag_p99", "{:>12.2f}"),
+        ("Loop gecikmesi max (ms)", "lag_max", "{:>12.2f}"),
+    ]
+    for label, field, fmt in rows:
+        print(f"{label:<26}" + fmt.format(results["blocking"][field]) + fmt.format(results["executor"][field]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Cache Sıkıştırma Benchmark - JSON metni vs zlib + paylaşımlı sözlük
+
+Aynı sonuç satırlarını iki ayrı SQLite dosyasına yazar (format 0 ve 1),
+disk boyutunu, kodlama/çözme süresini ve bir cache key'in tüm sonuçlarını
+okuma süresini karşılaştırır. Çözme maliyeti, kazanılan baytların diskten
+okunma süresiyle (--disk-mbps) kıyaslanır.
+
+Kullanım:
+    python -m benchmarks.cache_compression
+    python -m benchmarks.cache_compression --source-db data/pepc.db --keys 200
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from typing import Dict, List
+
+from src.cache_codec import CacheCodec
+
+DOMAINS = [
+    "parts.cat.com", "www.komatsu.com", "manuals.volvoce.com", "www.hitachicm.eu",
+    "jcb.com", "cdn.doosan.com", "www.scribd.com", "docs.example.ru", "pdf.example.cn",
+]
+DICTIONARY_TABLE_SQL = '''
+    CREATE TABLE IF NOT EXISTS cache_dictionaries (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, dictionary BLOB NOT NULL,
+        sample_count INTEGER, created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+WORDS = [
+    "parts", "catalog", "service", "manual", "hydraulic", "excavator", "engine",
+    "wiring", "diagram", "loader", "каталог", "запчастей", "parça", "kataloğu",
+]
+
+
+def synthetic_results(keys: int, per_key: int) -> Dict[str, List[Dict]]:
+    """Motor sonuçlarına benzeyen rastgele satırlar"""
+    rnd = random.Random(42)
+    data = {}
+    for k in range(keys):
+        model = f"{rnd.choice(['PC', 'EC', 'ZX', 'SK'])}{rnd.randint(50, 900)}-{rnd.randint(1, 9)}"
+        rows = []
+        for i in range(per_key):
+            domain = rnd.choice(DOMAINS)
+            title = " ".join(rnd.choice(WORDS) for _ in range(6))
+            rows.append({
+                "title": f"{model} {title}",
+                "url": f"https://{domain}/files/{rnd.randint(1000, 99999)}/{model.lower()}-{i}.pdf",
+                "snippet": " ".join(rnd.choice(WORDS) for _ in range(25)),
+                "position": i + 1,
+                "domain": domain,
+                "source": rnd.choice(["serper", "brave", "yandex"]),
+                "is_pdf": True,
+                "language": "en",
+                "discovered_at": "2026-10-16T10:00:00"
+            })
+        data[f"key-{k}"] = rows
+    return data
+
+
+def load_source_db(path: str, keys: int) -> Dict[str, List[Dict]]:
+    """Gerçek cache'ten örnek al"""
+    codec = CacheCodec(path)
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    try:
+        key_rows = conn.execute(
+            "SELECT cache_key FROM search_cache ORDER BY RANDOM() LIMIT ?", (keys,)
+        ).fetchall()
+        data = {}
+        for kr in key_rows:
+            rows = conn.execute('''
+                SELECT format_version, result_json FROM search_cache_results
+                WHERE cache_key = ? ORDER BY position
+            ''', (kr['cache_key'],)).fetchall()
+            if rows:
+                data[kr['cache_key']] = [codec.decode(r['format_version'], r['result_json']) for r in rows]
+        return data
+    finally:
+        conn.close()
+
+
+def build_db(path: str, data: Dict[str, List[Dict]], codec: CacheCodec) -> float:
+    """Satırları yaz, kodlama süresini (saniye) döndür"""
+    conn = sqlite3.connect(path)
+    conn.execute(DICTIONARY_TABLE_SQL)
+    conn.execute('''
+        CREATE TABLE search_cache_results (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, cache_key TEXT NOT NULL,
+            url_norm TEXT NOT NULL, position INTEGER NOT NULL,
+            result_json TEXT NOT NULL, format_version INTEGER DEFAULT 0,
+            UNIQUE(cache_key, url_norm)
+        )
+    ''')
+    conn.execute("CREATE INDEX idx_pos ON search_cache_results(cache_key, position)")
+    conn.commit()
+    conn.close()
+
+    encode_time = 0.0
+    rows = []
+    for key, results in data.items():
+        for pos, item in enumerate(results):
+            start = time.perf_counter()
+            fmt, payload = codec.encode(item)
+            encode_time += time.perf_counter() - start
+            rows.append((key, item["url"].lower(), pos, payload, fmt))
+
+    conn = sqlite3.connect(path)
+    conn.executemany('''
+        INSERT INTO search_cache_results (cache_key, url_norm, position, result_json, format_version)
+        VALUES (?, ?, ?, ?, ?)
+    ''', rows)
+    conn.commit()
+    conn.execute("VACUUM")
+    conn.close()
+    return encode_time
+
+
+def read_all(path: str, keys: List[str], codec: CacheCodec) -> Dict[str, float]:
+    """Her key için yeni bağlantıyla tüm sonuçları oku ve çöz"""
+    io_time = 0.0
+    decode_time = 0.0
+
+    for key in keys:
+        conn = sqlite3.connect(path)
+        conn.execute("PRAGMA cache_size = -64")  # Sayfa cache'i küçük (soğuk okuma)
+        start = time.perf_counter()
+        rows = conn.execute('''
+            SELECT format_version, result_json FROM search_cache_results
+            WHERE cache_key = ? ORDER BY position
+        ''', (key,)).fetchall()
+        io_time += time.perf_counter() - start
+        conn.close()
+
+        start = time.perf_counter()
+        for fmt, payload in rows:
+            codec.decode(fmt, payload)
+        decode_time += time.perf_counter() - start
+
+    return {"io_ms": io_time * 1000 / len(keys), "decode_ms": decode_time * 1000 / len(keys)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cache sıkıştırma benchmark")
+    parser.add_argument("--source-db", help="Örnekler için gerçek veritabanı (yoksa sentetik)")
+    parser.add_argument("--keys", type=int, default=200, help="Cache key sayısı")
+    parser.add_argument("--per-key", type=int, default=100, help="Key başına sonuç (sentetik)")
+    parser.add_argument("--disk-mbps", type=float, default=100.0, help="Disk okuma hızı (MB/s)")
+    parser.add_argument("--rounds", type=int, default=3, help="Okuma turu")
+    args = parser.parse_args()
+
+    data = load_source_db(args.source_db, args.keys) if args.source_db else synthetic_results(args.keys, args.per_key)
+    row_count = sum(len(v) for v in data.values())
+    keys = list(data)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_db = os.path.join(tmp, "json.db")
+        zlib_db = os.path.join(tmp, "zlib.db")
+
+        json_codec = CacheCodec(json_db, enabled=False)
+        json_encode = build_db(json_db, data, json_codec)
+
+        # Sözlük örneklerin yarısından eğitilir (diğer yarı "görülmemiş" veri)
+        dictionary = CacheCodec.build_dictionary(
+            json.dumps(item, ensure_ascii=False) for key in keys[::2] for item in data[key]
+        )
+        conn = sqlite3.connect(zlib_db)
+        conn.execute(DICTIONARY_TABLE_SQL)
+        conn.execute("INSERT INTO cache_dictionaries (dictionary) VALUES (?)", (dictionary,))
+        conn.commit()
+        conn.close()
+
+        zlib_codec = CacheCodec(zlib_db)
+        zlib_encode = build_db(zlib_db, data, zlib_codec)
+
+        json_size = os.path.getsize(json_db)
+        zlib_size = os.path.getsize(zlib_db)
+
+        json_reads = [read_all(json_db, keys, json_codec) for _ in range(args.rounds)]
+        zlib_reads = [read_all(zlib_db, keys, zlib_codec) for _ in range(args.rounds)]
+
+    def median(reads, field):
+        return statistics.median(r[field] for r in reads)
+
+    saved_bytes_per_key = (json_size - zlib_size) / len(keys)
+    saved_io_ms = saved_bytes_per_key / (args.disk_mbps * 1024 * 1024) * 1000
+    extra_decode_ms = median(zlib_reads, "decode_ms") - median(json_reads, "decode_ms")
+
+    print(f"Satır: {row_count}, key: {len(keys)}, sözlük: {len(dictionary)} byte")
+    print(f"{'':<22}{'JSON (0)':>14}{'zlib+dict (1)':>16}")
+    print(f"{'Dosya boyutu (KB)':<22}{json_size / 1024:>14.0f}{zlib_size / 1024:>16.0f}")
+    print(f"{'Kodlama (µs/satır)':<22}{json_encode * 1e6 / row_count:>14.1f}{zlib_encode * 1e6 / row_count:>16.1f}")
+    print(f"{'Okuma (ms/key)':<22}{median(json_reads, 'io_ms'):>14.3f}{median(zlib_reads, 'io_ms'):>16.3f}")
+    print(f"{'Çözme (ms/key)':<22}{median(json_reads, 'decode_ms'):>14.3f}{median(zlib_reads, 'decode_ms'):>16.3f}")
+    print()
+    print(f"Sıkıştırma oranı: {json_size / max(zlib_size, 1):.2f}x")
+    print(f"Key başına kazanılan I/O ({args.disk_mbps:.0f} MB/s disk): {saved_io_ms:.3f} ms")
+    print(f"Key başına ek çözme maliyeti: {extra_decode_ms:.3f} ms")
+    if extra_decode_ms > 0:
+        break_even = saved_bytes_per_key / (extra_decode_ms / 1000) / (1024 * 1024)
+        print(f"Başa baş disk hızı: {break_even:.1f} MB/s (daha yavaş diskte sıkıştırma kârlı)")
+    print("Sonuç:", "sıkıştırma kârlı" if saved_io_ms > extra_decode_ms else "çözme maliyeti I/O kazancından yüksek")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Cache Merge Kontrolü - ikinci kayıt okunan sonucu değiştiriyor mu
+
+Geçici bir veritabanında aynı cache key'ine iki farklı sonuç listesi yazılır
+ve multi-search'ün yaptığı gibi limit=count ile okunur. Son kaydın sonuçları
+önce servis edilmiyorsa (ör. yeni satırlar LIMIT'in arkasında kalıyorsa)
+veya soft TTL yenilemesi (replace=True) gelmeyen URL'leri kayıttan
+silmiyorsa çıkış kodu 1 olur.
+
+Kullanım:
+    python -m benchmarks.cache_merge
+    python -m benchmarks.cache_merge --count 50
+"""
+import argparse
+import os
+import sys
+import tempfile
+from typing import Dict, List
+
+from src.cache_manager import CacheManager
+from src.database import PEPCDatabase
+from src.db_pool import get_db_pool
+
+
+def results(prefix: str, count: int) -> List[Dict]:
+    return [
+        {"title": f"{prefix} {i}", "url": f"https://example.com/{prefix}/{i}.pdf", "source": "brave"}
+        for i in range(count)
+    ]
+
+
+def check(cache: CacheManager, count: int) -> List[str]:
+    """Sorunları açıklama listesi olarak döndür"""
+    args = dict(engine="brave", query="komatsu pc200 parts", language="en", doc_type="parts", page=1)
+    problems = []
+
+    old, new = results("old", count), results("new", count)
+    cache.save_to_cache(results=old, **args)
+    first = cache.get_cached_entry(limit=count, **args)
+    if [r["url"] for r in first["results"]] != [r["url"] for r in old]:
+        problems.append("ilk kayıt olduğu gibi okunmuyor")
+
+    cache.save_to_cache(results=new, **args)
+    second = cache.get_cached_entry(limit=count, **args)
+    if [r["url"] for r in second["results"]] != [r["url"] for r in new]:
+        problems.append("ikinci kaydın sonuçları önce servis edilmiyor")
+
+    merged = cache.get_cached_entry(**args)
+    if len(merged["results"]) != 2 * count:
+        problems.append(f"birleşik liste {len(merged['results'])} sonuç (beklenen {2 * count})")
+
+    # Eski URL'ler yeni sonuçlarda tekrar gelirse yeni sıraya taşınır
+    cache.save_to_cache(results=old[:1] + new[:1], **args)
+    third = cache.get_cached_entry(limit=2, **args)
+    if [r["url"] for r in third["results"]] != [old[0]["url"], new[0]["url"]]:
+        problems.append("tekrar gelen URL yeni sırasına taşınmıyor")
+
+    # Yenileme kaydı değiştirir: gelmeyen URL'ler silinir
+    fresh = results("fresh", count // 2) + new[:1]
+    cache.save_to_cache(results=fresh, replace=True, **args)
+    refreshed = cache.get_cached_entry(**args)
+    if [r["url"] for r in refreshed["results"]] != [r["url"] for r in fresh]:
+        problems.append("yenileme sonrası kayıt yenilenen sayfadan farklı (eski URL'ler kalmış)")
+
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cache merge okuma kontrolü")
+    parser.add_argument("--count", type=int, default=50, help="Kayıt başına sonuç sayısı")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "merge.db")
+        PEPCDatabase(path)
+        problems = check(CacheManager(path), args.count)
+        get_db_pool(path).close_thread_connections()
+
+    if problems:
+        print(f"{len(problems)} sorun:")
+        for problem in problems:
+            print(f"    {problem}")
+        sys.exit(1)
+    print("Son kayıt önce servis ediliyor, birleşik liste korunuyor, yenileme kaydı değiştiriyor")
+
+
+if __name__ == "__main__":
+    main()
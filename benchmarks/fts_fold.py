@@ -0,0 +1,73 @@
+"""
+FTS Katlama Kontrolü - büyük harfli Türkçe sorgular aynı satırları buluyor mu
+
+Bellekte pdf_catalog ve FTS tablosu trigger'larıyla kurulur, büyük/küçük
+harfli ve Türkçe karakterli örnek satırlar eklenir. Her sorgu çiftinin
+(ör. "İŞ MAKİNESİ" / "iş makinesi") MATCH ifadesi ve bulduğu satırlar
+karşılaştırılır; farklıysa veya hiç satır bulunmuyorsa çıkış kodu 1 olur.
+
+Kullanım:
+    python -m benchmarks.fts_fold
+"""
+import sqlite3
+import sys
+from typing import List
+
+from src.fts_index import build_match_query, fts_table_sql
+
+ROWS = [
+    ("İŞ MAKİNESİ YEDEK PARÇA KATALOĞU", "KOMATSU", "PC200-8", "is_makinesi.pdf"),
+    ("iş makinesi servis kılavuzu", "Hitachi", "ZX200", "zx200.pdf"),
+    ("KIRICI KIRMA ÜNİTESİ", "Montabert", "V45", "kirici.pdf"),
+    ("ЭКСКАВАТОР каталог запчастей", "Komatsu", "PC300", "pc300.pdf"),
+]
+
+QUERY_PAIRS = [
+    ("İŞ MAKİNESİ", "iş makinesi"),
+    ("KATALOĞU", "kataloğu"),
+    ("KIRICI ÜNİTESİ", "kırıcı ünitesi"),
+    ("İş Makİnesİ", "iş makinesi"),
+    ("ЭКСКАВАТОР", "экскаватор"),
+]
+
+
+def search(conn: sqlite3.Connection, match: str) -> List[int]:
+    return [row[0] for row in conn.execute(
+        "SELECT rowid FROM pdf_catalog_fts WHERE pdf_catalog_fts MATCH ? ORDER BY rowid", (match,)
+    )]
+
+
+def check(conn: sqlite3.Connection) -> List[str]:
+    """Sorunları açıklama listesi olarak döndür"""
+    problems = []
+    for upper, lower in QUERY_PAIRS:
+        upper_match, lower_match = build_match_query(upper), build_match_query(lower)
+        if upper_match != lower_match:
+            problems.append(f"{upper!r} → {upper_match}, {lower!r} → {lower_match}")
+            continue
+        found = search(conn, upper_match)
+        if not found:
+            problems.append(f"{upper!r} ({upper_match}) hiç satır bulmuyor")
+    return problems
+
+
+def main():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE pdf_catalog (id INTEGER PRIMARY KEY, title TEXT, brand TEXT, model TEXT, filename TEXT)")
+    for statement in fts_table_sql("pdf_catalog"):
+        conn.execute(statement)
+    conn.executemany("INSERT INTO pdf_catalog (title, brand, model, filename) VALUES (?, ?, ?, ?)", ROWS)
+
+    problems = check(conn)
+    conn.close()
+
+    if problems:
+        print(f"{len(problems)} sorun:")
+        for problem in problems:
+            print(f"    {problem}")
+        sys.exit(1)
+    print(f"{len(QUERY_PAIRS)} büyük/küçük harf sorgu çifti aynı ifadeye katlanıyor ve satır buluyor")
+
+
+if __name__ == "__main__":
+    main()
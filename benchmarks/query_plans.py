@@ -0,0 +1,294 @@
+"""
+Query Plans - sık sorguların EXPLAIN QUERY PLAN çıktısı (önce / sonra)
+
+Geçici bir veritabanı PEPCDatabase ile kurulur (migration'lar dahil) ve
+örnek verilerle doldurulur. Her sık sorgu için:
+    önce  : 012_hot_path_indexes öncesi index seti
+    sonra : güncel şema
+planları ve ortalama süreleri yazdırılır. Güncel şemada beklenen index'i
+kullanmayan, tabloyu baştan sona tarayan veya geçici B-tree ile sıralayan
+sorgu varsa çıkış kodu 1 olur. --check yalnızca güncel şemanın planlarını
+kontrol eder (önce/sonra karşılaştırması ve süre ölçümü yok); şema veya
+index değiştiren her değişiklikten önce çalıştırılır.
+
+Kullanım:
+    python -m benchmarks.query_plans --check
+    python -m benchmarks.query_plans
+    python -m benchmarks.query_plans --rows 200000 --repeat 50
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+from src.cache_eviction import EXPIRED_VICTIMS_SQL, PRIORITY_VICTIMS_SQL
+from src.database import PEPCDatabase
+from src.db_pool import get_db_pool
+from src.migrations import MIGRATIONS_DIR, split_statements
+from src.storage import attached_stores, route_ddl
+
+TODAY = "2026-10-16"
+
+# (ad, SQL, parametreler, beklenen index)
+HOT_QUERIES: List[Tuple[str, str, tuple, Optional[str]]] = [
+    (
+        "discovered_pdfs listesi (size_mb)",
+        "SELECT id, url, title, domain, size_mb FROM discovered_pdfs WHERE is_valid = 1 "
+        "ORDER BY size_mb DESC LIMIT 50 OFFSET 0",
+        (),
+        "idx_discovered_pdfs_valid_size"
+    ),
+    (
+        "discovered_pdfs listesi (discovered_at)",
+        "SELECT id, url, title, domain, size_mb FROM discovered_pdfs WHERE is_valid = 1 "
+        "ORDER BY discovered_at DESC LIMIT 50 OFFSET 0",
+        (),
+        "idx_discovered_pdfs_valid_date"
+    ),
+    (
+        "discovered_pdfs keyset sayfası (size_mb)",
+        "SELECT id, url, title, domain, size_mb FROM discovered_pdfs WHERE is_valid = 1 "
+        "AND size_mb IS NOT NULL AND (size_mb, id) < (?, ?) ORDER BY size_mb DESC, id DESC LIMIT 51",
+        (5.0, 10 ** 9),
+        "idx_discovered_pdfs_valid_size"
+    ),
+    (
+        "discovered_pdfs domain filtresi",
+        "SELECT DISTINCT domain FROM discovered_pdfs WHERE is_valid = 1 ORDER BY domain",
+        (),
+        "idx_discovered_pdfs_valid_domain"
+    ),
+    (
+        "discovered_pdfs marka filtresi",
+        "SELECT DISTINCT brand FROM discovered_pdfs WHERE is_valid = 1 AND brand IS NOT NULL ORDER BY brand",
+        (),
+        "idx_discovered_pdfs_valid_brand"
+    ),
+    (
+        "discovered_pdfs url_hash (upsert)",
+        "SELECT COUNT(*) FROM discovered_pdfs WHERE url_hash IN (?, ?, ?)",
+        ("a", "b", "c"),
+        "sqlite_autoindex_discovered_pdfs"
+    ),
+    (
+        "saved-searches query sayımı",
+        "SELECT COUNT(*) FROM search_logs WHERE query = ?",
+        ("komatsu PC200",),
+        "idx_search_logs_query"
+    ),
+    (
+        "saved-searches DISTINCT query",
+        "SELECT COUNT(DISTINCT query) FROM search_logs",
+        (),
+        "idx_search_logs_query"
+    ),
+    (
+        "kullanıcı arama geçmişi",
+        "SELECT * FROM search_logs WHERE user_id = ? ORDER BY created_at DESC LIMIT 20 OFFSET 0",
+        (7,),
+        "idx_search_logs_user_date"
+    ),
+    (
+        "dashboard bugünkü aramalar",
+        "SELECT COUNT(*) FROM search_logs WHERE created_at >= ? AND created_at < date(?, '+1 day')",
+        (TODAY, TODAY),
+        "idx_search_logs_date"
+    ),
+    (
+        "favori listesi",
+        "SELECT * FROM favorites WHERE user_id = ? ORDER BY added_at DESC LIMIT 20 OFFSET 0",
+        (7,),
+        "idx_favorites_user_date"
+    ),
+    (
+        "favori kontrolü",
+        "SELECT COUNT(*) FROM favorites WHERE user_id = ? AND pdf_url = ?",
+        (7, "https://example.com/7.pdf"),
+        "sqlite_autoindex_favorites"
+    ),
+    (
+        "katalog sayfa parçaları",
+        "SELECT item_number, part_no, description, qty, remarks FROM catalog_parts "
+        "WHERE catalog_id = ? AND page_number = ? ORDER BY item_number",
+        (3, 12),
+        "idx_catalog_parts_page_items"
+    ),
+    (
+        "dashboard bugünkü gelir",
+        "SELECT COALESCE(SUM(amount), 0) FROM payments "
+        "WHERE status = 'success' AND created_at >= ? AND created_at < date(?, '+1 day')",
+        (TODAY, TODAY),
+        "idx_payments_status_date"
+    ),
+    (
+        "cache tahliyesi (süresi dolmuş)",
+        EXPIRED_VICTIMS_SQL,
+        (100,),
+        "idx_cache_expires"
+    ),
+    (
+        "cache tahliyesi (GDSF önceliği)",
+        PRIORITY_VICTIMS_SQL,
+        (100,),
+        "idx_cache_priority"
+    ),
+]
+
+# 012 öncesinde init_database'in oluşturduğu, 012'nin kaldırdığı index'ler
+LEGACY_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_payments_status ON payments(status)",
+    "CREATE INDEX IF NOT EXISTS idx_search_logs_user ON search_logs(user_id)",
+    "CREATE INDEX IF NOT EXISTS idx_favorites_user ON favorites(user_id)",
+    "CREATE INDEX IF NOT EXISTS idx_catalog_parts_catalog ON catalog_parts(catalog_id)",
+]
+
+BRANDS = ["komatsu", "caterpillar", "volvo", "hitachi", "jcb", "doosan", "liebherr", None]
+_CREATE_INDEX_RE = re.compile(r"CREATE INDEX IF NOT EXISTS (\w+)", re.IGNORECASE)
+
+
+def build_db(path: str, rows: int) -> None:
+    PEPCDatabase(path)
+    rnd = random.Random(7)
+
+    def timestamp():
+        return f"2026-{rnd.randint(1, 10):02d}-{rnd.randint(1, 28):02d} {rnd.randint(0, 23):02d}:00:00"
+
+    conn = get_db_pool(path).acquire()
+    try:
+        conn.executemany(
+            "INSERT INTO discovered_pdfs (url_hash, url, title, domain, size_mb, brand, is_valid, discovered_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (f"h{i}", f"https://d{i % 300}.com/{i}.pdf", f"PDF {i}", f"d{i % 300}.com",
+                 rnd.random() * 50 if rnd.random() > 0.1 else None, rnd.choice(BRANDS),
+                 1 if rnd.random() > 0.05 else 0, timestamp())
+                for i in range(rows)
+            ]
+        )
+        conn.executemany(
+            "INSERT INTO search_logs (user_id, query, doc_type, result_count, created_at) VALUES (?, ?, ?, ?, ?)",
+            [
+                (rnd.randint(1, 500), f"{rnd.choice(BRANDS)} PC{rnd.randint(50, 900)}",
+                 "parts_catalog", rnd.randint(0, 100), timestamp())
+                for _ in range(rows)
+            ]
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO favorites (user_id, pdf_url, title, added_at) VALUES (?, ?, ?, ?)",
+            [(rnd.randint(1, 500), f"https://example.com/{i}.pdf", f"PDF {i}", timestamp()) for i in range(rows // 10)]
+        )
+        conn.executemany(
+            "INSERT INTO catalog_parts (catalog_id, page_number, item_number, part_no) VALUES (?, ?, ?, ?)",
+            [(rnd.randint(1, 50), rnd.randint(1, 400), rnd.randint(1, 40), f"P-{i}") for i in range(rows)]
+        )
+        conn.executemany(
+            "INSERT INTO payments (user_id, merchant_oid, package_type, amount, status, created_at) "
+            "VALUES (?, ?, 'credits_100', ?, ?, ?)",
+            [
+                (rnd.randint(1, 500), f"oid{i}", rnd.randint(1000, 50000),
+                 rnd.choice(["success", "failed", "pending"]), timestamp())
+                for i in range(rows // 10)
+            ]
+        )
+        conn.commit()
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+
+
+def new_index_names() -> List[str]:
+    path = os.path.join(MIGRATIONS_DIR, "012_hot_path_indexes.sql")
+    with open(path, encoding="utf-8") as f:
+        sql = f.read()
+    return [m.group(1) for s in split_statements(sql) for m in [_CREATE_INDEX_RE.search(s)] if m]
+
+
+def revert_to_legacy(path: str) -> None:
+    conn = get_db_pool(path).acquire()
+    try:
+        for name in new_index_names():
+            conn.execute(f"DROP INDEX IF EXISTS {name}")
+        stores = attached_stores(conn)
+        for statement in LEGACY_INDEXES:
+            conn.execute(route_ddl(statement, stores))
+        conn.commit()
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+
+
+def measure(path: str, repeat: int) -> Dict[str, Tuple[List[str], float]]:
+    conn = get_db_pool(path).acquire(row_factory=None)
+    result = {}
+    try:
+        for name, sql, params, _ in HOT_QUERIES:
+            plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+            start = time.perf_counter()
+            for _ in range(repeat):
+                conn.execute(sql, params).fetchall()
+            result[name] = (plan, (time.perf_counter() - start) * 1000 / repeat)
+    finally:
+        conn.close()
+    return result
+
+
+def check_plan(plan: List[str], expected: Optional[str]) -> Optional[str]:
+    """Plan sorunluysa açıklama döndür"""
+    text = " | ".join(plan)
+    if expected and expected not in text:
+        return f"{expected} kullanılmıyor"
+    if re.search(r"\bSCAN \w+\b(?! USING)", text) and "COVERING INDEX" not in text:
+        return "tablo taraması"
+    if "USE TEMP B-TREE" in text:
+        return "geçici B-tree sıralaması"
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sık sorguların index planları")
+    parser.add_argument("--rows", type=int, default=50000, help="Tablo başına satır sayısı")
+    parser.add_argument("--repeat", type=int, default=20, help="Süre ölçümü tekrar sayısı")
+    parser.add_argument("--check", action="store_true", help="Sadece güncel şemanın planlarını kontrol et")
+    args = parser.parse_args()
+    if args.check:
+        args.rows, args.repeat = min(args.rows, 5000), 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "plans.db")
+        build_db(path, args.rows)
+        after = measure(path, args.repeat)
+        if args.check:
+            before = after
+        else:
+            revert_to_legacy(path)
+            before = measure(path, args.repeat)
+        get_db_pool(path).close_thread_connections()
+
+    print(f"Satır: {args.rows}, tekrar: {args.repeat}\n")
+    failures = []
+    for name, _, _, expected in HOT_QUERIES:
+        plan_before, ms_before = before[name]
+        plan_after, ms_after = after[name]
+        problem = check_plan(plan_after, expected)
+        if problem:
+            failures.append((name, problem))
+
+        print(f"{name}  ({ms_before:.2f} ms → {ms_after:.2f} ms){'  !! ' + problem if problem else ''}")
+        if not args.check:
+            print(f"    önce : {' | '.join(plan_before)}")
+        print(f"    sonra: {' | '.join(plan_after)}")
+
+    if failures:
+        print(f"\n{len(failures)} sorgu beklenen planı kullanmıyor:")
+        for name, problem in failures:
+            print(f"    {name}: {problem}")
+        sys.exit(1)
+    print("\nTüm sorgular beklenen index'i kullanıyor")
+
+
+if __name__ == "__main__":
+    main()
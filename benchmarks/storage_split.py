@@ -0,0 +1,193 @@
+"""
+Storage Split Benchmark - tek dosya vs ayrı store dosyaları (yazma kilidi bekleme)
+
+Aynı yükü iki düzende çalıştırır:
+    single : tüm tablolar tek dosyada (DB_SPLIT_STORES=false, eski düzen)
+    split  : cache / log / keşif tabloları ayrı dosyalarda (src/storage.py)
+
+Yük: arka planda sürekli büyük cache merge'leri (CacheManager.save_to_cache)
+ve toplu search_logs flush'ları yapan thread'ler varken kredi / ödeme benzeri
+kısa transaction'lar (users UPDATE + credit_requests INSERT) çalışır. Kısa
+transaction'ın ilk yazma ifadesinde geçen süre yazma kilidi beklemesidir;
+tek dosyada toplu yazmaların commit'ini bekler, ayrı dosyalarda beklemez.
+
+Her düzen ayrı bir süreçte çalışır (DB_SPLIT_STORES import sırasında okunur).
+
+Kullanım:
+    python -m benchmarks.storage_split
+    python -m benchmarks.storage_split --seconds 20 --cache-results 500 --log-batch 2000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List
+
+LAYOUTS = {"single": "false", "split": "true"}
+BRANDS = ["komatsu", "caterpillar", "volvo", "hitachi", "jcb", "doosan", "liebherr", "case"]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run_layout(path: str, args) -> Dict[str, float]:
+    """Tek düzenin yükü (alt süreçte çalışır)"""
+    from src.cache_manager import CacheManager
+    from src.database import PEPCDatabase
+    from src.db_pool import get_db_pool
+
+    PEPCDatabase(path)
+    pool = get_db_pool(path)
+    conn = pool.acquire()
+    try:
+        conn.executemany(
+            "INSERT INTO users (username, email, hashed_password) VALUES (?, ?, ?)",
+            [(f"user{i}", f"user{i}@example.com", "x") for i in range(args.users)]
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+    stop = threading.Event()
+    counts = {"cache_merges": 0, "log_flushes": 0}
+
+    def cache_worker(seed: int):
+        rnd = random.Random(seed)
+        cache = CacheManager(path)
+        while not stop.is_set():
+            brand = rnd.choice(BRANDS)
+            results = [
+                {
+                    "title": f"{brand} parts catalog {i}",
+                    "url": f"https://example.com/{brand}/{rnd.randint(1, 10 ** 9)}.pdf",
+                    "description": "Spare parts catalog " * 8
+                }
+                for i in range(args.cache_results)
+            ]
+            cache.save_to_cache("serper", f"{brand} PC{rnd.randint(50, 900)}", results, "en", "parts_catalog", 1)
+            counts["cache_merges"] += 1
+
+    def log_worker(seed: int):
+        rnd = random.Random(seed)
+        while not stop.is_set():
+            rows = [
+                (rnd.randint(1, args.users), f"{rnd.choice(BRANDS)} EC{rnd.randint(100, 500)}",
+                 "parts_catalog", '["serper"]', rnd.randint(0, 100), 0, 1)
+                for _ in range(args.log_batch)
+            ]
+            conn = pool.acquire()
+            try:
+                conn.executemany('''
+                    INSERT INTO search_logs (user_id, query, doc_type, engines_used, result_count, is_cached, credits_used)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', rows)
+                conn.commit()
+            finally:
+                conn.close()
+            counts["log_flushes"] += 1
+
+    waits: List[float] = []
+    totals: List[float] = []
+
+    def transactional_worker(seed: int):
+        rnd = random.Random(seed)
+        while not stop.is_set():
+            user_id = rnd.randint(1, args.users)
+            conn = pool.acquire()
+            try:
+                start = time.perf_counter()
+                # İlk yazma ifadesi yazma kilidini alır (gerekirse busy_timeout kadar bekler)
+                conn.execute("UPDATE users SET credit_balance = credit_balance + 1 WHERE id = ?", (user_id,))
+                locked = time.perf_counter()
+                conn.execute(
+                    "INSERT INTO credit_requests (user_id, package_type, credit_amount, price_amount) VALUES (?, ?, ?, ?)",
+                    (user_id, "credits_100", 100, 4900)
+                )
+                conn.commit()
+                waits.append((locked - start) * 1000)
+                totals.append((time.perf_counter() - start) * 1000)
+            finally:
+                conn.close()
+            time.sleep(args.tx_interval_ms / 1000)
+
+    threads = (
+        [threading.Thread(target=cache_worker, args=(i,)) for i in range(args.cache_workers)]
+        + [threading.Thread(target=log_worker, args=(100 + i,)) for i in range(args.log_workers)]
+        + [threading.Thread(target=transactional_worker, args=(200 + i,)) for i in range(args.tx_workers)]
+    )
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    return {
+        "transactions": len(totals),
+        "wait_p50": statistics.median(waits) if waits else 0.0,
+        "wait_p95": percentile(waits, 95),
+        "wait_max": max(waits) if waits else 0.0,
+        "tx_p50": statistics.median(totals) if totals else 0.0,
+        "tx_p95": percentile(totals, 95),
+        **counts
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Store dosyası bölme kilit bekleme benchmark")
+    parser.add_argument("--seconds", type=float, default=10, help="Düzen başına süre (s)")
+    parser.add_argument("--users", type=int, default=1000, help="Kullanıcı sayısı")
+    parser.add_argument("--cache-workers", type=int, default=2, help="Cache merge thread sayısı")
+    parser.add_argument("--cache-results", type=int, default=300, help="Merge başına sonuç")
+    parser.add_argument("--log-workers", type=int, default=1, help="Log flush thread sayısı")
+    parser.add_argument("--log-batch", type=int, default=1000, help="Flush başına search_logs satırı")
+    parser.add_argument("--tx-workers", type=int, default=2, help="Kısa transaction thread sayısı")
+    parser.add_argument("--tx-interval-ms", type=float, default=5, help="Kısa transaction'lar arası bekleme")
+    parser.add_argument("--layout", choices=sorted(LAYOUTS), help=argparse.SUPPRESS)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.layout:
+        print(json.dumps(run_layout(args.db, args)))
+        return
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for layout, split in LAYOUTS.items():
+            env = {**os.environ, "DB_SPLIT_STORES": split}
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.storage_split", *sys.argv[1:],
+                 "--layout", layout, "--db", os.path.join(tmp, layout, "pepc.db")],
+                env=env, check=True, capture_output=True, text=True
+            ).stdout
+            results[layout] = json.loads(output.strip().splitlines()[-1])
+
+    print(f"Süre: {args.seconds}s, cache thread: {args.cache_workers} x {args.cache_results} sonuç, "
+          f"log thread: {args.log_workers} x {args.log_batch} satır, kısa tx thread: {args.tx_workers}")
+    print(f"{'':<28}{'single':>12}{'split':>12}")
+    rows = [
+        ("Kısa transaction", "transactions", "{:>12.0f}"),
+        ("Kilit bekleme p50 (ms)", "wait_p50", "{:>12.2f}"),
+        ("Kilit bekleme p95 (ms)", "wait_p95", "{:>12.2f}"),
+        ("Kilit bekleme max (ms)", "wait_max", "{:>12.2f}"),
+        ("Transaction p50 (ms)", "tx_p50", "{:>12.2f}"),
+        ("Transaction p95 (ms)", "tx_p95", "{:>12.2f}"),
+        ("Cache merge", "cache_merges", "{:>12.0f}"),
+        ("Log flush", "log_flushes", "{:>12.0f}"),
+    ]
+    for label, field, fmt in rows:
+        print(f"{label:<28}" + fmt.format(results["single"][field]) + fmt.format(results["split"][field]))
+
+
+if __name__ == "__main__":
+    main()
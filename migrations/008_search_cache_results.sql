@@ -0,0 +1,31 @@
+-- Migration: Search Cache Normalizasyonu
+-- Tarih: 2026-10-16
+-- Açıklama: search_cache.results JSON blob'u yerine URL bazlı search_cache_results tablosu
+--           Merge işlemi INSERT OR IGNORE, okuma sadece istenen sayfa
+
+CREATE TABLE IF NOT EXISTS search_cache_results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    cache_key TEXT NOT NULL REFERENCES search_cache(cache_key) ON DELETE CASCADE,
+    url_norm TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    result_json TEXT NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(cache_key, url_norm)
+);
+
+CREATE INDEX IF NOT EXISTS idx_cache_results_position ON search_cache_results(cache_key, position);
+
+-- Mevcut blob'ları satırlara aç
+INSERT OR IGNORE INTO search_cache_results (cache_key, url_norm, position, result_json)
+SELECT sc.cache_key, LOWER(TRIM(json_extract(j.value, '$.url'))), CAST(j.key AS INTEGER), j.value
+FROM search_cache sc, json_each(sc.results) j
+WHERE sc.results IS NOT NULL
+  AND COALESCE(TRIM(json_extract(j.value, '$.url')), '') != '';
+
+UPDATE search_cache SET
+    result_count = (SELECT COUNT(*) FROM search_cache_results r WHERE r.cache_key = search_cache.cache_key),
+    results = NULL
+WHERE results IS NOT NULL;
+
+-- Migration tamamlandı
+SELECT 'Migration completed: search_cache_results' as status;
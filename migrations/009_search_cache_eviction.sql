@@ -0,0 +1,29 @@
+-- Migration: Search Cache Byte Bütçesi (GDSF Tahliye)
+-- Tarih: 2026-10-16
+-- Açıklama: search_cache kayıtlarına boyut, hit sayısı, son erişim ve tahliye önceliği
+--           Tahliye arka planda batch'ler halinde, CACHE_MAX_BYTES altına iner
+--           (PEPCDatabase.init_database kolonları eksikse kendisi de ekler)
+
+ALTER TABLE search_cache ADD COLUMN size_bytes INTEGER DEFAULT 0;
+ALTER TABLE search_cache ADD COLUMN hit_count INTEGER DEFAULT 0;
+ALTER TABLE search_cache ADD COLUMN last_accessed_at DATETIME;
+ALTER TABLE search_cache ADD COLUMN priority REAL DEFAULT 0;
+
+-- Mevcut kayıtların boyutu (eski blob + satırlar)
+UPDATE search_cache SET size_bytes =
+    COALESCE(LENGTH(CAST(results AS BLOB)), 0) +
+    COALESCE((SELECT SUM(LENGTH(CAST(r.result_json AS BLOB)))
+              FROM search_cache_results r
+              WHERE r.cache_key = search_cache.cache_key), 0);
+
+-- Başlangıç GDSF önceliği: (0 hit + 1) * 1024 / boyut
+UPDATE search_cache SET priority = 1024.0 / MAX(size_bytes, 1);
+
+CREATE INDEX IF NOT EXISTS idx_cache_priority ON search_cache(priority);
+
+-- Boşalan sayfaların VACUUM'suz geri verilebilmesi için (tek seferlik, bakım penceresinde)
+PRAGMA auto_vacuum = INCREMENTAL;
+VACUUM;
+
+-- Migration tamamlandı
+SELECT 'Migration completed: search_cache eviction' as status;
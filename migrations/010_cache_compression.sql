@@ -0,0 +1,17 @@
+-- Migration: Cache Payload Sıkıştırma
+-- Tarih: 2026-10-16
+-- Açıklama: search_cache_results satırları için format_version kolonu ve zlib sözlük tablosu
+--           Mevcut satırlar format 0 (JSON) olarak kalır, arka plan işi
+--           (CacheManager.recompress_all) bunları sıkıştırılmış formata taşır
+
+ALTER TABLE search_cache_results ADD COLUMN format_version INTEGER DEFAULT 0;
+
+CREATE TABLE IF NOT EXISTS cache_dictionaries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    dictionary BLOB NOT NULL,
+    sample_count INTEGER,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Migration tamamlandı
+SELECT 'Migration completed: cache compression' as status;
@@ -0,0 +1,163 @@
+-- Migration: Tam Metin Arama (FTS5)
+-- Tarih: 2026-10-16
+-- Açıklama: pdf_catalog, discovered_pdfs ve scanned_pdfs için contentless FTS5 tabloları,
+--           senkron trigger'lar ve mevcut satırların indekslenmesi.
+--           unicode61 tokenizer'ın katlamadığı ı/ё harfleri trigger'larda katlanır
+--           (src/fts_index.py FOLD_MAP ile aynı olmalı)
+--           Tek sefer çalıştırılmalı; contentless tablolarda tekrar doldurma satırları çiftler
+
+-- pdf_catalog
+CREATE VIRTUAL TABLE IF NOT EXISTS pdf_catalog_fts USING fts5(
+    title, brand, model, filename, content='', prefix='2 3', tokenize="unicode61 remove_diacritics 2"
+);
+
+CREATE TRIGGER IF NOT EXISTS pdf_catalog_fts_ai AFTER INSERT ON pdf_catalog BEGIN
+    INSERT INTO pdf_catalog_fts (rowid, title, brand, model, filename) VALUES (
+        new.id,
+        replace(replace(replace(COALESCE(new.title, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+        replace(replace(replace(COALESCE(new.brand, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+        replace(replace(replace(COALESCE(new.model, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+        replace(replace(replace(COALESCE(new.filename, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е')
+    );
+END;
+
+CREATE TRIGGER IF NOT EXISTS pdf_catalog_fts_ad AFTER DELETE ON pdf_catalog BEGIN
+    INSERT INTO pdf_catalog_fts (pdf_catalog_fts, rowid, title, brand, model, filename) VALUES (
+        'delete', old.id,
+        replace(replace(replace(COALESCE(old.title, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+        replace(replace(replace(COALESCE(old.brand, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+        replace(replace(replace(COALESCE(old.model, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+        replace(replace(replace(COALESCE(old.filename, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е')
+    );
+END;
+
+CREATE TRIGGER IF NOT EXISTS pdf_catalog_fts_au AFTER UPDATE OF title, brand, model, filename ON pdf_catalog BEGIN
+    INSERT INTO pdf_catalog_fts (pdf_catalog_fts, rowid, title, brand, model, filename) VALUES (
+        'delete', old.id,
+        replace(replace(replace(COALESCE(old.title, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+        replace(replace(replace(COALESCE(old.brand, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+        replace(replace(replace(COALESCE(old.model, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+        replace(replace(replace(COALESCE(old.filename, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е')
+    );
+    INSERT INTO pdf_catalog_fts (rowid, title, brand, model, filename) VALUES (
+        new.id,
+        replace(replace(replace(COALESCE(new.title, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+        replace(replace(replace(COALESCE(new.brand, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+        replace(replace(replace(COALESCE(new.model, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+        replace(replace(replace(COALESCE(new.filename, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е')
+    );
+END;
+
+INSERT INTO pdf_catalog_fts (rowid, title, brand, model, filename)
+SELECT
+    id,
+    replace(replace(replace(COALESCE(title, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+    replace(replace(replace(COALESCE(brand, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+    replace(replace(replace(COALESCE(model, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+    replace(replace(replace(COALESCE(filename, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е')
+FROM pdf_catalog;
+
+-- discovered_pdfs
+CREATE VIRTUAL TABLE IF NOT EXISTS discovered_pdfs_fts USING fts5(
+    title, brand, model, domain, content='', prefix='2 3', tokenize="unicode61 remove_diacritics 2"
+);
+
+CREATE TRIGGER IF NOT EXISTS discovered_pdfs_fts_ai AFTER INSERT ON discovered_pdfs BEGIN
+    INSERT INTO discovered_pdfs_fts (rowid, title, brand, model, domain) VALUES (
+        new.id,
+        replace(replace(replace(COALESCE(new.title, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+        replace(replace(replace(COALESCE(new.brand, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+        replace(replace(replace(COALESCE(new.model, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+        replace(replace(replace(COALESCE(new.domain, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е')
+    );
+END;
+
+CREATE TRIGGER IF NOT EXISTS discovered_pdfs_fts_ad AFTER DELETE ON discovered_pdfs BEGIN
+    INSERT INTO discovered_pdfs_fts (discovered_pdfs_fts, rowid, title, brand, model, domain) VALUES (
+        'delete', old.id,
+        replace(replace(replace(COALESCE(old.title, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+        replace(replace(replace(COALESCE(old.brand, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+        replace(replace(replace(COALESCE(old.model, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+        replace(replace(replace(COALESCE(old.domain, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е')
+    );
+END;
+
+CREATE TRIGGER IF NOT EXISTS discovered_pdfs_fts_au AFTER UPDATE OF title, brand, model, domain ON discovered_pdfs BEGIN
+    INSERT INTO discovered_pdfs_fts (discovered_pdfs_fts, rowid, title, brand, model, domain) VALUES (
+        'delete', old.id,
+        replace(replace(replace(COALESCE(old.title, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+        replace(replace(replace(COALESCE(old.brand, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+        replace(replace(replace(COALESCE(old.model, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+        replace(replace(replace(COALESCE(old.domain, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е')
+    );
+    INSERT INTO discovered_pdfs_fts (rowid, title, brand, model, domain) VALUES (
+        new.id,
+        replace(replace(replace(COALESCE(new.title, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+        replace(replace(replace(COALESCE(new.brand, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+        replace(replace(replace(COALESCE(new.model, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+        replace(replace(replace(COALESCE(new.domain, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е')
+    );
+END;
+
+INSERT INTO discovered_pdfs_fts (rowid, title, brand, model, domain)
+SELECT
+    id,
+    replace(replace(replace(COALESCE(title, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+    replace(replace(replace(COALESCE(brand, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+    replace(replace(replace(COALESCE(model, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+    replace(replace(replace(COALESCE(domain, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е')
+FROM discovered_pdfs;
+
+-- scanned_pdfs
+CREATE VIRTUAL TABLE IF NOT EXISTS scanned_pdfs_fts USING fts5(
+    title, detected_brand, detected_model, snippet, content='', prefix='2 3', tokenize="unicode61 remove_diacritics 2"
+);
+
+CREATE TRIGGER IF NOT EXISTS scanned_pdfs_fts_ai AFTER INSERT ON scanned_pdfs BEGIN
+    INSERT INTO scanned_pdfs_fts (rowid, title, detected_brand, detected_model, snippet) VALUES (
+        new.id,
+        replace(replace(replace(COALESCE(new.title, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+        replace(replace(replace(COALESCE(new.detected_brand, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+        replace(replace(replace(COALESCE(new.detected_model, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+        replace(replace(replace(COALESCE(new.snippet, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е')
+    );
+END;
+
+CREATE TRIGGER IF NOT EXISTS scanned_pdfs_fts_ad AFTER DELETE ON scanned_pdfs BEGIN
+    INSERT INTO scanned_pdfs_fts (scanned_pdfs_fts, rowid, title, detected_brand, detected_model, snippet) VALUES (
+        'delete', old.id,
+        replace(replace(replace(COALESCE(old.title, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+        replace(replace(replace(COALESCE(old.detected_brand, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+        replace(replace(replace(COALESCE(old.detected_model, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+        replace(replace(replace(COALESCE(old.snippet, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е')
+    );
+END;
+
+CREATE TRIGGER IF NOT EXISTS scanned_pdfs_fts_au AFTER UPDATE OF title, detected_brand, detected_model, snippet ON scanned_pdfs BEGIN
+    INSERT INTO scanned_pdfs_fts (scanned_pdfs_fts, rowid, title, detected_brand, detected_model, snippet) VALUES (
+        'delete', old.id,
+        replace(replace(replace(COALESCE(old.title, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+        replace(replace(replace(COALESCE(old.detected_brand, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+        replace(replace(replace(COALESCE(old.detected_model, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+        replace(replace(replace(COALESCE(old.snippet, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е')
+    );
+    INSERT INTO scanned_pdfs_fts (rowid, title, detected_brand, detected_model, snippet) VALUES (
+        new.id,
+        replace(replace(replace(COALESCE(new.title, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+        replace(replace(replace(COALESCE(new.detected_brand, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+        replace(replace(replace(COALESCE(new.detected_model, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+        replace(replace(replace(COALESCE(new.snippet, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е')
+    );
+END;
+
+INSERT INTO scanned_pdfs_fts (rowid, title, detected_brand, detected_model, snippet)
+SELECT
+    id,
+    replace(replace(replace(COALESCE(title, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+    replace(replace(replace(COALESCE(detected_brand, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+    replace(replace(replace(COALESCE(detected_model, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е'),
+    replace(replace(replace(COALESCE(snippet, ''), 'ı', 'i'), 'ё', 'е'), 'Ё', 'е')
+FROM scanned_pdfs;
+
+-- Migration tamamlandı
+SELECT 'Migration completed: fts5 search' as status;
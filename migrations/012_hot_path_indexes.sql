@@ -0,0 +1,39 @@
+-- Migration: Sık Sorgular için Bileşik / Kapsayan Index'ler
+-- Tarih: 2026-10-16
+-- Açıklama: Admin listeleri, favoriler, kayıtlı aramalar ve katalog sayfa parçaları
+--           sorgularının tablo taraması ve geçici B-tree sıralaması yapmaması için
+--           bileşik index'ler. Tek kolonlu index'lerden yenilerinin ön eki olanlar
+--           kaldırılır (her yazmada fazladan index güncellemesi).
+--           src/migrations.py tarafından başlangıçta bir kez uygulanır.
+--           Planlar: python -m benchmarks.query_plans
+
+-- discovered_pdfs: admin listesi (is_valid = 1 + size_mb / discovered_at sıralaması)
+-- ve filtre açılır listeleri (DISTINCT domain / brand, index'ten okunur)
+-- url_hash zaten UNIQUE (otomatik index), upsert'ler onu kullanır
+CREATE INDEX IF NOT EXISTS idx_discovered_pdfs_valid_size ON discovered_pdfs(is_valid, size_mb);
+CREATE INDEX IF NOT EXISTS idx_discovered_pdfs_valid_date ON discovered_pdfs(is_valid, discovered_at);
+CREATE INDEX IF NOT EXISTS idx_discovered_pdfs_valid_domain ON discovered_pdfs(is_valid, domain);
+CREATE INDEX IF NOT EXISTS idx_discovered_pdfs_valid_brand ON discovered_pdfs(is_valid, brand);
+
+-- search_logs: kayıtlı aramalar (query başına sayım, DISTINCT query, query + doc_type)
+CREATE INDEX IF NOT EXISTS idx_search_logs_query ON search_logs(query, doc_type);
+
+-- search_logs: kullanıcının arama geçmişi (user_id + created_at DESC)
+CREATE INDEX IF NOT EXISTS idx_search_logs_user_date ON search_logs(user_id, created_at);
+DROP INDEX IF EXISTS idx_search_logs_user;
+
+-- favorites: liste (user_id + added_at DESC); (user_id, pdf_url) UNIQUE index'i
+-- kontrol ve silme sorgularını zaten karşılıyor
+CREATE INDEX IF NOT EXISTS idx_favorites_user_date ON favorites(user_id, added_at);
+DROP INDEX IF EXISTS idx_favorites_user;
+
+-- catalog_parts: sayfa parçaları (catalog_id + page_number, item_number sırasıyla)
+CREATE INDEX IF NOT EXISTS idx_catalog_parts_page_items ON catalog_parts(catalog_id, page_number, item_number);
+DROP INDEX IF EXISTS idx_catalog_parts_catalog;
+
+-- payments: dashboard günlük gelir (status + created_at aralığı)
+CREATE INDEX IF NOT EXISTS idx_payments_status_date ON payments(status, created_at);
+DROP INDEX IF EXISTS idx_payments_status;
+
+-- Migration tamamlandı
+SELECT 'Migration completed: hot path indexes' as status;
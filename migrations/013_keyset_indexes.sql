@@ -0,0 +1,24 @@
+-- Migration: Keyset Sayfalama Index'leri
+-- Tarih: 2026-10-16
+-- Açıklama: Cursor'lı liste endpoint'lerinin (sıralama kolonu, id) üzerinden
+--           index sırasıyla ilerlemesi için eksik sıralama index'leri
+--           (src/pagination.py). SQLite index'leri rowid'yi (id) zaten sonda
+--           taşır; (kolon, id) aralık sorguları ayrı bir id kolonu gerektirmez.
+--           src/migrations.py tarafından başlangıçta bir kez uygulanır.
+
+-- discovered_pdfs: admin listesinde başlığa göre sıralama
+-- (size_mb / discovered_at / domain için 012 index'leri kullanılır)
+CREATE INDEX IF NOT EXISTS idx_discovered_pdfs_valid_title ON discovered_pdfs(is_valid, title);
+
+-- payments: filtresiz admin ödeme listesi (status filtresi idx_payments_status_date kullanır)
+CREATE INDEX IF NOT EXISTS idx_payments_date ON payments(created_at);
+
+-- users: admin kullanıcı listesi
+CREATE INDEX IF NOT EXISTS idx_users_created ON users(created_at);
+
+-- user_catalogs: kullanıcının katalog listesi (user_id + created_at DESC)
+CREATE INDEX IF NOT EXISTS idx_user_catalogs_user_date ON user_catalogs(user_id, created_at);
+DROP INDEX IF EXISTS idx_user_catalogs_user;
+
+-- Migration tamamlandı
+SELECT 'Migration completed: keyset indexes' as status;
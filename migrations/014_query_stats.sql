@@ -0,0 +1,31 @@
+-- Migration: Sorgu İstatistikleri (Kayıtlı Aramalar)
+-- Tarih: 2026-10-16
+-- Açıklama: (normalize edilmiş sorgu, kategori) başına arama sayısı, marka ve son
+--           arama bilgileri. Log yazıcısı search_logs ile aynı transaction'da
+--           günceller (src/query_stats.py); mevcut loglar init_database sırasında
+--           backfill_query_stats ile işlenir (marka çıkarma Python'da yapılır).
+--           src/migrations.py tarafından başlangıçta bir kez uygulanır.
+
+CREATE TABLE IF NOT EXISTS query_stats (
+    query_key TEXT NOT NULL,           -- Küçük harf, tek boşluklu sorgu
+    category TEXT NOT NULL,            -- map_doc_type_to_category(doc_type)
+    query TEXT NOT NULL,               -- Son aramadaki yazımı
+    brand TEXT COLLATE NOCASE,         -- extract_brand_from_query (filtre büyük/küçük harf duyarsız)
+    doc_type TEXT,
+    search_count INTEGER NOT NULL DEFAULT 0,
+    first_seen DATETIME,
+    last_seen DATETIME,
+    last_result_count INTEGER,
+    last_user_id INTEGER,
+    last_engines_used TEXT,            -- JSON
+    PRIMARY KEY (query_key, category)
+);
+
+-- Sıralamalar: recent / popular / brand, filtreler: brand / category
+CREATE INDEX IF NOT EXISTS idx_query_stats_last_seen ON query_stats(last_seen);
+CREATE INDEX IF NOT EXISTS idx_query_stats_count ON query_stats(search_count);
+CREATE INDEX IF NOT EXISTS idx_query_stats_brand ON query_stats(brand, last_seen);
+CREATE INDEX IF NOT EXISTS idx_query_stats_category ON query_stats(category, last_seen);
+
+-- Migration tamamlandı
+SELECT 'Migration completed: query stats' as status;
@@ -0,0 +1,160 @@
+-- Migration: Dashboard Rollup Tabloları
+-- Tarih: 2026-10-16
+-- Açıklama: Saatlik / günlük metrik özetleri ve toplam sayaçlar. Dashboard ve trend
+--           grafikleri search_logs / payments / users / search_cache tablolarını
+--           taramak yerine bu tabloları okur (src/metrics.py).
+--           - Kaynak tablolardaki trigger'lar yalnızca metrics_hourly'yi günceller,
+--             metrics_daily metrics_hourly trigger'larıyla senkron kalır
+--           - Kovalar created_at ile aynı saat diliminde (UTC) tutulur
+--           - search_logs silmeleri (arşivleme) geçmiş rollup'ları değiştirmez
+--           Mevcut veriler bu migration içinde rollup'lara işlenir.
+--           src/migrations.py tarafından başlangıçta bir kez uygulanır.
+
+-- Saatlik metrikler (bucket: 'YYYY-MM-DD HH:00:00')
+-- metric: searches, searches_cached, searches_uncached, credits_spent,
+--         engine:<motor>, payments_success, revenue (kuruş), signups
+CREATE TABLE IF NOT EXISTS metrics_hourly (
+    bucket TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (bucket, metric)
+) WITHOUT ROWID;
+
+-- Günlük metrikler (bucket: 'YYYY-MM-DD')
+CREATE TABLE IF NOT EXISTS metrics_daily (
+    bucket TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (bucket, metric)
+) WITHOUT ROWID;
+
+-- Toplam sayaçlar (name: users, tier:<tier>, search_cache)
+CREATE TABLE IF NOT EXISTS stat_counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+-- metrics_hourly → metrics_daily
+CREATE TRIGGER IF NOT EXISTS metrics_hourly_ai AFTER INSERT ON metrics_hourly BEGIN
+    INSERT INTO metrics_daily (bucket, metric, value) VALUES (date(new.bucket), new.metric, new.value)
+        ON CONFLICT(bucket, metric) DO UPDATE SET value = metrics_daily.value + excluded.value;
+END;
+
+CREATE TRIGGER IF NOT EXISTS metrics_hourly_au AFTER UPDATE OF value ON metrics_hourly BEGIN
+    INSERT INTO metrics_daily (bucket, metric, value) VALUES (date(new.bucket), new.metric, new.value - old.value)
+        ON CONFLICT(bucket, metric) DO UPDATE SET value = metrics_daily.value + excluded.value;
+END;
+
+-- ================================================================
+-- MEVCUT VERİLERİN İŞLENMESİ
+-- ================================================================
+
+INSERT INTO metrics_hourly (bucket, metric, value)
+SELECT strftime('%Y-%m-%d %H:00:00', created_at), 'searches', COUNT(*)
+FROM search_logs WHERE created_at IS NOT NULL GROUP BY 1;
+
+INSERT INTO metrics_hourly (bucket, metric, value)
+SELECT strftime('%Y-%m-%d %H:00:00', created_at),
+       CASE WHEN is_cached THEN 'searches_cached' ELSE 'searches_uncached' END, COUNT(*)
+FROM search_logs WHERE created_at IS NOT NULL GROUP BY 1, 2;
+
+INSERT INTO metrics_hourly (bucket, metric, value)
+SELECT strftime('%Y-%m-%d %H:00:00', created_at), 'credits_spent', SUM(credits_used)
+FROM search_logs WHERE created_at IS NOT NULL GROUP BY 1 HAVING SUM(credits_used) > 0;
+
+INSERT INTO metrics_hourly (bucket, metric, value)
+SELECT strftime('%Y-%m-%d %H:00:00', s.created_at), 'engine:' || e.value, COUNT(*)
+FROM search_logs s, json_each(CASE WHEN json_valid(s.engines_used) THEN s.engines_used ELSE '[]' END) e
+WHERE s.created_at IS NOT NULL GROUP BY 1, 2;
+
+INSERT INTO metrics_hourly (bucket, metric, value)
+SELECT strftime('%Y-%m-%d %H:00:00', created_at), 'payments_success', COUNT(*)
+FROM payments WHERE status = 'success' AND created_at IS NOT NULL GROUP BY 1;
+
+INSERT INTO metrics_hourly (bucket, metric, value)
+SELECT strftime('%Y-%m-%d %H:00:00', created_at), 'revenue', SUM(amount)
+FROM payments WHERE status = 'success' AND created_at IS NOT NULL GROUP BY 1;
+
+INSERT INTO metrics_hourly (bucket, metric, value)
+SELECT strftime('%Y-%m-%d %H:00:00', created_at), 'signups', COUNT(*)
+FROM users WHERE created_at IS NOT NULL GROUP BY 1;
+
+INSERT INTO stat_counters (name, value) SELECT 'users', COUNT(*) FROM users;
+INSERT INTO stat_counters (name, value)
+SELECT 'tier:' || COALESCE(subscription_tier, 'free'), COUNT(*) FROM users GROUP BY 1;
+INSERT INTO stat_counters (name, value) SELECT 'search_cache', COUNT(*) FROM search_cache;
+
+-- ================================================================
+-- KAYNAK TABLO TRIGGER'LARI
+-- ================================================================
+
+-- search_logs: arama sayısı, cache isabeti, kredi, motor başına arama
+CREATE TRIGGER IF NOT EXISTS search_logs_metrics_ai AFTER INSERT ON search_logs BEGIN
+    INSERT INTO metrics_hourly (bucket, metric, value)
+    VALUES
+        (strftime('%Y-%m-%d %H:00:00', COALESCE(new.created_at, CURRENT_TIMESTAMP)), 'searches', 1),
+        (strftime('%Y-%m-%d %H:00:00', COALESCE(new.created_at, CURRENT_TIMESTAMP)),
+         CASE WHEN new.is_cached THEN 'searches_cached' ELSE 'searches_uncached' END, 1),
+        (strftime('%Y-%m-%d %H:00:00', COALESCE(new.created_at, CURRENT_TIMESTAMP)), 'credits_spent', COALESCE(new.credits_used, 0))
+        ON CONFLICT(bucket, metric) DO UPDATE SET value = metrics_hourly.value + excluded.value;
+    INSERT INTO metrics_hourly (bucket, metric, value)
+    SELECT strftime('%Y-%m-%d %H:00:00', COALESCE(new.created_at, CURRENT_TIMESTAMP)), 'engine:' || value, 1
+    FROM json_each(CASE WHEN json_valid(new.engines_used) THEN new.engines_used ELSE '[]' END) WHERE true
+        ON CONFLICT(bucket, metric) DO UPDATE SET value = metrics_hourly.value + excluded.value;
+END;
+
+-- payments: başarılı ödeme sayısı ve gelir (ödemenin created_at kovasına)
+CREATE TRIGGER IF NOT EXISTS payments_metrics_ai AFTER INSERT ON payments
+WHEN new.status = 'success' BEGIN
+    INSERT INTO metrics_hourly (bucket, metric, value)
+    VALUES
+        (strftime('%Y-%m-%d %H:00:00', COALESCE(new.created_at, CURRENT_TIMESTAMP)), 'payments_success', 1),
+        (strftime('%Y-%m-%d %H:00:00', COALESCE(new.created_at, CURRENT_TIMESTAMP)), 'revenue', new.amount)
+        ON CONFLICT(bucket, metric) DO UPDATE SET value = metrics_hourly.value + excluded.value;
+END;
+
+CREATE TRIGGER IF NOT EXISTS payments_metrics_au AFTER UPDATE OF status ON payments
+WHEN (new.status IS 'success') != (old.status IS 'success') BEGIN
+    INSERT INTO metrics_hourly (bucket, metric, value)
+    VALUES
+        (strftime('%Y-%m-%d %H:00:00', COALESCE(new.created_at, CURRENT_TIMESTAMP)), 'payments_success',
+         CASE WHEN new.status = 'success' THEN 1 ELSE -1 END),
+        (strftime('%Y-%m-%d %H:00:00', COALESCE(new.created_at, CURRENT_TIMESTAMP)), 'revenue',
+         CASE WHEN new.status = 'success' THEN new.amount ELSE -old.amount END)
+        ON CONFLICT(bucket, metric) DO UPDATE SET value = metrics_hourly.value + excluded.value;
+END;
+
+-- users: kayıtlar, toplam kullanıcı ve abonelik dağılımı
+CREATE TRIGGER IF NOT EXISTS users_metrics_ai AFTER INSERT ON users BEGIN
+    INSERT INTO metrics_hourly (bucket, metric, value)
+    VALUES (strftime('%Y-%m-%d %H:00:00', COALESCE(new.created_at, CURRENT_TIMESTAMP)), 'signups', 1)
+        ON CONFLICT(bucket, metric) DO UPDATE SET value = metrics_hourly.value + excluded.value;
+    INSERT INTO stat_counters (name, value) VALUES ('users', 1), ('tier:' || COALESCE(new.subscription_tier, 'free'), 1)
+        ON CONFLICT(name) DO UPDATE SET value = stat_counters.value + excluded.value;
+END;
+
+CREATE TRIGGER IF NOT EXISTS users_metrics_ad AFTER DELETE ON users BEGIN
+    INSERT INTO stat_counters (name, value) VALUES ('users', -1), ('tier:' || COALESCE(old.subscription_tier, 'free'), -1)
+        ON CONFLICT(name) DO UPDATE SET value = stat_counters.value + excluded.value;
+END;
+
+CREATE TRIGGER IF NOT EXISTS users_metrics_au AFTER UPDATE OF subscription_tier ON users
+WHEN new.subscription_tier IS NOT old.subscription_tier BEGIN
+    INSERT INTO stat_counters (name, value)
+    VALUES ('tier:' || COALESCE(old.subscription_tier, 'free'), -1), ('tier:' || COALESCE(new.subscription_tier, 'free'), 1)
+        ON CONFLICT(name) DO UPDATE SET value = stat_counters.value + excluded.value;
+END;
+
+-- search_cache: kayıt sayısı (upsert'in güncelleme yolu INSERT trigger'ını tetiklemez)
+CREATE TRIGGER IF NOT EXISTS search_cache_metrics_ai AFTER INSERT ON search_cache BEGIN
+    INSERT INTO stat_counters (name, value) VALUES ('search_cache', 1)
+        ON CONFLICT(name) DO UPDATE SET value = stat_counters.value + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS search_cache_metrics_ad AFTER DELETE ON search_cache BEGIN
+    INSERT INTO stat_counters (name, value) VALUES ('search_cache', -1)
+        ON CONFLICT(name) DO UPDATE SET value = stat_counters.value - 1;
+END;
+
+-- Migration tamamlandı
+SELECT 'Migration completed: metrics rollups' as status;
@@ -0,0 +1,15 @@
+-- Migration: Arşivleme Index'leri
+-- Tarih: 2026-10-16
+-- Açıklama: Eski satırları aylık arşiv dosyalarına taşıyan işin (src/archive.py)
+--           "en eski satırlar" sorguları için zaman kolonu index'leri.
+--           search_logs(created_at) init_database'de zaten var.
+--           scan_history için kaynak başına son tarama ana veritabanında kalır
+--           (MAX(id) GROUP BY source_id → idx_scan_history_source).
+--           src/migrations.py tarafından başlangıçta bir kez uygulanır.
+
+CREATE INDEX IF NOT EXISTS idx_admin_logs_date ON admin_logs(created_at);
+CREATE INDEX IF NOT EXISTS idx_catalog_progress_date ON catalog_analysis_progress(created_at);
+CREATE INDEX IF NOT EXISTS idx_scan_history_completed ON scan_history(completed_at);
+
+-- Migration tamamlandı
+SELECT 'Migration completed: archive indexes' as status;
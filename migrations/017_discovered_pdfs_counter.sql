@@ -0,0 +1,45 @@
+-- Migration: Kayıtlı Link Sayacı
+-- Tarih: 2026-10-16
+-- Açıklama: Geçerli discovered_pdfs satırlarının sayısı stat_counters'ta
+--           ('discovered_pdfs') trigger'larla tutulur. Admin listesinin
+--           count=estimate toplamı filtresiz isteklerde COUNT(*) yerine bu
+--           sayacı okur (src/pagination.py count_rows counter=).
+--           - Trigger'lar discovery store'undaki stat_counters'a yazar
+--             (src/storage.py), başlangıç değeri main'e yazılır; okumalar
+--             tüm dosyaları toplar (src/metrics.py)
+--           - Upsert'in güncelleme yolu INSERT trigger'ını tetiklemez
+--           src/migrations.py tarafından başlangıçta bir kez uygulanır.
+
+CREATE TABLE IF NOT EXISTS stat_counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS discovered_pdfs_counter_ai AFTER INSERT ON discovered_pdfs
+WHEN new.is_valid = 1 BEGIN
+    INSERT INTO stat_counters (name, value) VALUES ('discovered_pdfs', 1)
+        ON CONFLICT(name) DO UPDATE SET value = stat_counters.value + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS discovered_pdfs_counter_ad AFTER DELETE ON discovered_pdfs
+WHEN old.is_valid = 1 BEGIN
+    INSERT INTO stat_counters (name, value) VALUES ('discovered_pdfs', -1)
+        ON CONFLICT(name) DO UPDATE SET value = stat_counters.value - 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS discovered_pdfs_counter_au AFTER UPDATE OF is_valid ON discovered_pdfs
+WHEN (new.is_valid = 1) IS NOT (old.is_valid = 1) BEGIN
+    INSERT INTO stat_counters (name, value) VALUES ('discovered_pdfs', CASE WHEN new.is_valid = 1 THEN 1 ELSE -1 END)
+        ON CONFLICT(name) DO UPDATE SET value = stat_counters.value + excluded.value;
+END;
+
+-- ================================================================
+-- MEVCUT VERİLERİN İŞLENMESİ
+-- ================================================================
+
+INSERT INTO stat_counters (name, value)
+SELECT 'discovered_pdfs', COUNT(*) FROM discovered_pdfs WHERE is_valid = 1
+    ON CONFLICT(name) DO UPDATE SET value = stat_counters.value + excluded.value;
+
+-- Migration tamamlandı
+SELECT 'Migration completed: discovered pdfs counter' as status;
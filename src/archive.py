@@ -0,0 +1,491 @@
+"""
+Archive - sürekli büyüyen tabloların aylık arşiv dosyalarına taşınması
+
+search_logs, admin_logs, catalog_analysis_progress ve scan_history yalnızca
+eklenir ve kullanıcı / ödeme tablolarıyla aynı dosyada sınırsız büyür
+(dosya boyutu, sayfa cache baskısı, yedekleme süresi). Burada saklama
+süresini (RETENTION_DAYS) geçen satırlar ARCHIVE_DIR altındaki aylık
+SQLite dosyalarına taşınır:
+
+    data/archive/pepc-2026-03.db   (aynı tablo adları, aynı kolonlar)
+
+- Her batch (ARCHIVE_BATCH_SIZE satır, tek ay) yalnızca tablonun kendi
+  dosyasını kilitleyen kısa bir yazma transaction'ıdır; toplu yazma
+  thread'inde çalışır ve batch'ler arasında ARCHIVE_BATCH_PAUSE_MS
+  beklenir, yazıcılar bloklanmaz
+- Satırlar arşive INSERT OR IGNORE (id benzersiz) ile eklenir; iki dosyanın
+  commit'i arasında çökme olursa bir sonraki turda tekrar taşınır, çift
+  kayıt oluşmaz
+- scan_history'de kaynak başına son tarama ana veritabanında kalır
+  ("Yapıldı" listesi son tarama tarihini buradan okur)
+- Ana tabloya eklenen yeni kolonlar arşiv tablosuna da eklenir
+- metrics_* rollup'ları ve query_stats silmelerden etkilenmez
+
+Arşivlenmiş veriler ArchiveManager.query ile (canlı tablo dahil) okunur;
+kullanıcıya sayfalı gösterilenler ArchiveManager.page / count ile.
+"""
+import asyncio
+import logging
+import os
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.config import (
+    DATABASE_PATH, ARCHIVE_DIR, ARCHIVE_BATCH_SIZE, ARCHIVE_BATCH_PAUSE_MS, ARCHIVE_COUNT_CACHE_SIZE,
+    SEARCH_LOGS_RETENTION_DAYS, ADMIN_LOGS_RETENTION_DAYS,
+    CATALOG_PROGRESS_RETENTION_DAYS, SCAN_HISTORY_RETENTION_DAYS
+)
+from src.db_pool import get_db_pool
+from src.storage import begin_write, table_schema
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_SCHEMA = "archive"
+_ARCHIVE_FILE_RE = re.compile(r"^pepc-(\d{4}-\d{2})\.db$")
+# Biçimi bozuk zaman damgaları (ay çıkarılamaz) taşınmaz
+_TIMESTAMP_GLOB = "[0-9][0-9][0-9][0-9]-[0-9][0-9]*"
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """Tablo başına saklama kuralı"""
+    table: str
+    time_column: str
+    days: int  # 0 = taşıma yok
+    keep_latest_by: Optional[str] = None  # Bu kolonun her değeri için en son satır ana tabloda kalır
+    indexes: Tuple[Tuple[str, ...], ...] = ()  # Arşiv dosyalarında id / zaman dışındaki indeksler
+
+
+DEFAULT_POLICIES: Tuple[RetentionPolicy, ...] = (
+    # Kullanıcının arama geçmişi arşivden sayfa sayfa okunur (/api/search-logs)
+    RetentionPolicy("search_logs", "created_at", SEARCH_LOGS_RETENTION_DAYS, indexes=(("user_id", "created_at"),)),
+    RetentionPolicy("admin_logs", "created_at", ADMIN_LOGS_RETENTION_DAYS),
+    RetentionPolicy("catalog_analysis_progress", "created_at", CATALOG_PROGRESS_RETENTION_DAYS),
+    RetentionPolicy("scan_history", "completed_at", SCAN_HISTORY_RETENTION_DAYS, keep_latest_by="source_id"),
+)
+
+
+def _next_month(month: str) -> str:
+    """'YYYY-MM' → sonraki ayın ilk günü ('YYYY-MM-DD')"""
+    year, mon = int(month[:4]), int(month[5:7])
+    year, mon = (year + 1, 1) if mon == 12 else (year, mon + 1)
+    return f"{year:04d}-{mon:02d}-01"
+
+
+def _columns(conn, schema: str, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA {schema}.table_info({table})")]
+
+
+def _where_sql(where: str) -> str:
+    return f" WHERE {where}" if where else ""
+
+
+def _create_indexes(conn, schema: str, policy: RetentionPolicy) -> None:
+    for columns in policy.indexes:
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {schema}.idx_{policy.table}_{'_'.join(columns)} "
+            f"ON {policy.table}({', '.join(columns)})"
+        )
+
+
+class ArchiveManager:
+    """Saklama süresini geçen satırları aylık arşiv dosyalarına taşır ve okur"""
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        archive_dir: Optional[str] = None,
+        policies: Sequence[RetentionPolicy] = DEFAULT_POLICIES,
+        batch_size: int = ARCHIVE_BATCH_SIZE,
+        pause_ms: int = ARCHIVE_BATCH_PAUSE_MS
+    ):
+        self.db_path = db_path or DATABASE_PATH
+        if archive_dir is None:
+            # Varsayılan veritabanı dışındakiler (testler, benchmark) kendi yanlarına arşivler
+            archive_dir = ARCHIVE_DIR if self.db_path == DATABASE_PATH else os.path.join(
+                os.path.dirname(os.path.abspath(self.db_path)), "archive"
+            )
+        self.archive_dir = archive_dir
+        self.policies = {policy.table: policy for policy in policies}
+        self.batch_size = batch_size
+        self.pause_ms = pause_ms
+
+        self._running = False
+        self._indexed = False
+        self._lock = threading.Lock()
+        # (dosya, sorgu, parametreler) → (dosya sürümü, satır sayısı)
+        self._counts: "OrderedDict[Tuple, Tuple[Tuple[int, int], int]]" = OrderedDict()
+        self.stats = {
+            "runs": 0,
+            "archived": {table: 0 for table in self.policies},
+            "errors": 0,
+            "last_run": None,
+            "last_error": None
+        }
+
+    def archive_path(self, month: str) -> str:
+        return os.path.join(self.archive_dir, f"pepc-{month}.db")
+
+    def list_archives(self) -> List[Tuple[str, str]]:
+        """Mevcut arşiv dosyaları → [(ay, yol)] (eskiden yeniye)"""
+        if not os.path.isdir(self.archive_dir):
+            return []
+        archives = []
+        for name in os.listdir(self.archive_dir):
+            match = _ARCHIVE_FILE_RE.match(name)
+            if match:
+                archives.append((match.group(1), os.path.join(self.archive_dir, name)))
+        return sorted(archives)
+
+    def _cutoff(self, policy: RetentionPolicy) -> str:
+        moment = datetime.now(timezone.utc) - timedelta(days=policy.days)
+        return moment.strftime("%Y-%m-%d %H:%M:%S")
+
+    def retention_cutoff(self, table: str) -> Optional[str]:
+        """Bu zamandan eski satırlar arşive taşınmış olabilir (taşıma yoksa None)"""
+        policy = self.policies.get(table)
+        if not policy or policy.days <= 0:
+            return None
+        return self._cutoff(policy)
+
+    def _keep_clause(self, policy: RetentionPolicy) -> str:
+        if not policy.keep_latest_by:
+            return ""
+        return (
+            f" AND id NOT IN (SELECT MAX(id) FROM {policy.table}"
+            f" WHERE {policy.keep_latest_by} IS NOT NULL GROUP BY {policy.keep_latest_by})"
+        )
+
+    def _ensure_archive_table(self, conn, policy: RetentionPolicy) -> List[str]:
+        """Arşiv tablosunu oluştur / yeni kolonları ekle → ortak kolon listesi"""
+        table = policy.table
+        schema = table_schema(conn, table)
+        columns = _columns(conn, schema, table)
+        existing = _columns(conn, ARCHIVE_SCHEMA, table)
+
+        if not existing:
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {ARCHIVE_SCHEMA}.{table} AS SELECT * FROM {schema}.{table} WHERE 0")
+            conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {ARCHIVE_SCHEMA}.idx_{table}_id ON {table}(id)")
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {ARCHIVE_SCHEMA}.idx_{table}_time ON {table}({policy.time_column})"
+            )
+        else:
+            for column in columns:
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE {ARCHIVE_SCHEMA}.{table} ADD COLUMN {column}")
+        _create_indexes(conn, ARCHIVE_SCHEMA, policy)
+        return columns
+
+    def ensure_indexes(self) -> None:
+        """
+        Politikadaki ek indeksleri mevcut arşiv dosyalarına da ekle
+
+        Yeni batch almayan eski aylar _ensure_archive_table'dan geçmez;
+        yazıcı thread'inde çalıştırılmalı (get_async_db().write_bulk).
+        """
+        for _, path in self.list_archives():
+            conn = sqlite3.connect(path)
+            try:
+                for policy in self.policies.values():
+                    if policy.indexes and _columns(conn, "main", policy.table):
+                        _create_indexes(conn, "main", policy)
+                conn.commit()
+            finally:
+                conn.close()
+
+    def archive_batch(self, table: str) -> int:
+        """
+        En eski ayın saklama süresini geçmiş satırlarından bir batch taşı
+
+        Yazıcı thread'inde çalıştırılmalı (get_async_db().write_bulk).
+
+        Returns:
+            Taşınan satır sayısı (0 = taşınacak satır kalmadı)
+        """
+        policy = self.policies[table]
+        if policy.days <= 0:
+            return 0
+
+        col = policy.time_column
+        keep = self._keep_clause(policy)
+        cutoff = self._cutoff(policy)
+        conn = get_db_pool(self.db_path).acquire(row_factory=None)
+        attached = False
+        try:
+            row = conn.execute(
+                f"SELECT MIN({col}) FROM {table} WHERE {col} < ? AND {col} GLOB ?{keep}",
+                (cutoff, _TIMESTAMP_GLOB)
+            ).fetchone()
+            if not row[0]:
+                return 0
+
+            month = row[0][:7]
+            upper = min(cutoff, _next_month(month))
+            ids = [r[0] for r in conn.execute(
+                f"SELECT id FROM {table} WHERE {col} >= ? AND {col} < ?{keep} ORDER BY {col} LIMIT ?",
+                (row[0], upper, self.batch_size)
+            )]
+            if not ids:
+                return 0
+
+            os.makedirs(self.archive_dir, exist_ok=True)
+            conn.execute(f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA}", (self.archive_path(month),))
+            attached = True
+            columns = ", ".join(self._ensure_archive_table(conn, policy))
+            placeholders = ", ".join("?" for _ in ids)
+
+            schema = begin_write(conn, table)
+            conn.execute(
+                f"INSERT OR IGNORE INTO {ARCHIVE_SCHEMA}.{table} ({columns}) "
+                f"SELECT {columns} FROM {schema}.{table} WHERE id IN ({placeholders})",
+                ids
+            )
+            conn.execute(f"DELETE FROM {schema}.{table} WHERE id IN ({placeholders})", ids)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            if attached:
+                conn.execute(f"DETACH DATABASE {ARCHIVE_SCHEMA}")
+            conn.close()
+
+        with self._lock:
+            self.stats["archived"][table] += len(ids)
+        return len(ids)
+
+    def reclaim_space(self) -> None:
+        """Boşalan sayfaları dosyaya geri ver (auto_vacuum=INCREMENTAL ise)"""
+        conn = get_db_pool(self.db_path).acquire(row_factory=None)
+        try:
+            for schema in sorted({table_schema(conn, table) for table in self.policies}):
+                conn.execute(f"PRAGMA {schema}.incremental_vacuum(1000)").fetchall()
+        finally:
+            conn.close()
+
+    async def run(self, write: Callable) -> Dict[str, int]:
+        """
+        Tüm tabloların süresi geçen satırlarını batch'ler halinde taşı
+
+        Args:
+            write: Senkron fonksiyonu yazıcı thread'inde çalıştıran coroutine
+                   (ör. get_async_db().write_bulk)
+
+        Returns:
+            Tablo başına taşınan satır sayısı
+        """
+        with self._lock:
+            if self._running:
+                return {}
+            self._running = True
+
+        moved = {table: 0 for table in self.policies}
+        try:
+            if not self._indexed:
+                await write(self.ensure_indexes)
+                self._indexed = True
+
+            for table in self.policies:
+                while True:
+                    try:
+                        count = await write(self.archive_batch, table)
+                    except Exception as e:
+                        with self._lock:
+                            self.stats["errors"] += 1
+                            self.stats["last_error"] = f"{table}: {e}"
+                        logger.error(f"Arşivleme hatası ({table}): {e}")
+                        break
+                    if not count:
+                        break
+                    moved[table] += count
+                    await asyncio.sleep(self.pause_ms / 1000)
+
+            if any(moved.values()):
+                await write(self.reclaim_space)
+                logger.info(f"Arşivlendi: {moved}")
+        finally:
+            with self._lock:
+                self._running = False
+                self.stats["runs"] += 1
+                self.stats["last_run"] = datetime.now().isoformat()
+        return moved
+
+    def query(
+        self,
+        table: str,
+        where: str = "",
+        params: Sequence[Any] = (),
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        columns: str = "*",
+        include_live: bool = True
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Arşiv + canlı tablo satırlarını oku (analitik için)
+
+        Yalnızca [start, end) aralığıyla kesişen aylık dosyalar açılır
+        (salt okunur). Satırlar dosya sırasıyla (eskiden yeniye), canlı
+        tablo en son gelir; dosya içi sıra garanti değildir.
+
+        Args:
+            table: Arşivlenen tablo adı
+            where: Ek SQL koşulu (ör. "user_id = ?")
+            params: Koşul parametreleri
+            start: Başlangıç zamanı (dahil, 'YYYY-MM-DD[ HH:MM:SS]')
+            end: Bitiş zamanı (hariç)
+            columns: SELECT kolonları
+            include_live: Ana veritabanındaki satırlar da okunsun mu
+
+        Yields:
+            Satır dict'leri
+        """
+        if table not in self.policies:
+            raise ValueError(f"Arşivlenmeyen tablo: {table}")
+        col = self.policies[table].time_column
+
+        conditions, args = [], []
+        if start:
+            conditions.append(f"{col} >= ?")
+            args.append(start)
+        if end:
+            conditions.append(f"{col} < ?")
+            args.append(end)
+        if where:
+            conditions.append(f"({where})")
+            args.extend(params)
+        sql = f"SELECT {columns} FROM {table}"
+        if conditions:
+            sql += f" WHERE {' AND '.join(conditions)}"
+
+        for month, path in self.list_archives():
+            if (start and _next_month(month) <= start[:10]) or (end and f"{month}-01" >= end):
+                continue
+            conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+            conn.row_factory = sqlite3.Row
+            try:
+                if not _columns(conn, "main", table):
+                    continue
+                for row in conn.execute(sql, args):
+                    yield dict(row)
+            finally:
+                conn.close()
+
+        if include_live:
+            conn = get_db_pool(self.db_path).acquire(row_factory=sqlite3.Row)
+            try:
+                rows = conn.execute(sql, args).fetchall()
+            finally:
+                conn.close()
+            for row in rows:
+                yield dict(row)
+
+    def _file_count(self, conn, path: str, table: str, where: str, params: Sequence[Any]) -> int:
+        """Dosyadaki eşleşen satır sayısı; dosya değişmedikçe tekrar sayılmaz"""
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        key = (path, table, where, tuple(params))
+        with self._lock:
+            cached = self._counts.get(key)
+            if cached and cached[0] == version:
+                self._counts.move_to_end(key)
+                return cached[1]
+
+        count = conn.execute(f"SELECT COUNT(*) FROM {table}{_where_sql(where)}", params).fetchone()[0]
+        with self._lock:
+            self._counts[key] = (version, count)
+            self._counts.move_to_end(key)
+            while len(self._counts) > ARCHIVE_COUNT_CACHE_SIZE:
+                self._counts.popitem(last=False)
+        return count
+
+    def _open_archives(self, table: str) -> Iterator[Tuple[str, sqlite3.Connection]]:
+        """Tabloyu içeren arşiv dosyaları yeniden eskiye (salt okunur)"""
+        for _, path in reversed(self.list_archives()):
+            conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+            conn.row_factory = sqlite3.Row
+            try:
+                if _columns(conn, "main", table):
+                    yield path, conn
+            finally:
+                conn.close()
+
+    def count(self, table: str, where: str = "", params: Sequence[Any] = ()) -> int:
+        """Arşiv dosyalarındaki eşleşen satır sayısı (canlı tablo hariç)"""
+        if table not in self.policies:
+            raise ValueError(f"Arşivlenmeyen tablo: {table}")
+        return sum(
+            self._file_count(conn, path, table, where, params)
+            for path, conn in self._open_archives(table)
+        )
+
+    def page(
+        self,
+        table: str,
+        where: str = "",
+        params: Sequence[Any] = (),
+        limit: int = 20,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        Arşiv satırlarından bir sayfa (yeniden eskiye, canlı tablo hariç)
+
+        Dosyalar yeniden eskiye gezilir; sayfadan önce kalan dosyalar yalnızca
+        sayılır (cache'li), ORDER BY / LIMIT / OFFSET her dosyada SQL'de
+        uygulanır ve sayfa dolunca kalan dosyalar açılmaz. Koşul kolonları
+        politikadaki indekslerle (ör. search_logs (user_id, created_at))
+        örtüşmelidir.
+        """
+        if table not in self.policies:
+            raise ValueError(f"Arşivlenmeyen tablo: {table}")
+        col = self.policies[table].time_column
+
+        rows: List[Dict[str, Any]] = []
+        for path, conn in self._open_archives(table):
+            if len(rows) >= limit:
+                break
+            if offset:
+                count = self._file_count(conn, path, table, where, params)
+                if offset >= count:
+                    offset -= count
+                    continue
+            rows.extend(dict(row) for row in conn.execute(
+                f"SELECT * FROM {table}{_where_sql(where)} ORDER BY {col} DESC LIMIT ? OFFSET ?",
+                (*params, limit - len(rows), offset)
+            ))
+            offset = 0
+        return rows
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Arşivleme istatistikleri ve arşiv dosyaları"""
+        with self._lock:
+            stats = {**self.stats, "archived": dict(self.stats["archived"]), "running": self._running}
+        stats["policies"] = {
+            table: {"retention_days": policy.days, "time_column": policy.time_column}
+            for table, policy in self.policies.items()
+        }
+        stats["files"] = [
+            {"month": month, "size_bytes": os.path.getsize(path)}
+            for month, path in self.list_archives()
+        ]
+        return stats
+
+
+# Veritabanı dosyası başına tek arşivleyici
+_instances: Dict[str, ArchiveManager] = {}
+_instances_lock = threading.Lock()
+
+def get_archive_manager(db_path: Optional[str] = None) -> ArchiveManager:
+    """Veritabanı dosyası için ortak arşivleyiciyi al"""
+    path = db_path or DATABASE_PATH
+    instance = _instances.get(path)
+    if instance is None:
+        with _instances_lock:
+            instance = _instances.get(path)
+            if instance is None:
+                instance = _instances[path] = ArchiveManager(path)
+    return instance
@@ -0,0 +1,224 @@
+"""
+Async DB - async endpoint'ler için bloklamayan veritabanı erişimi
+
+sqlite3 çağrıları event loop üzerinde çalışınca yavaş bir sorgu (ör.
+saved-searches, admin listeleri) o sırada gelen tüm istekleri bekletir.
+Bu modül çağrıları ayrı thread'lere taşır:
+- Okumalar sınırlı bir ThreadPoolExecutor'da paralel çalışır (WAL sayesinde
+  okuyucular birbirini ve yazıcıyı beklemez)
+- Yazmalar tek bir yazıcı thread'inde sırayla çalışır; SQLite zaten tek
+  yazıcıya izin verdiği için busy_timeout beklemeleri ortadan kalkar
+- Store dosyaları ayrıysa (src/storage.py) cache / log / arşiv gibi toplu
+  yazmalar ikinci bir yazıcı thread'inde (write_bulk) çalışır; farklı
+  dosyalara yazdıkları için kullanıcı / ödeme yazmalarını sıraya sokmazlar
+- Kuyrukta bekleyen iş sayısı sınırlıdır (max_pending); yük altında istekler
+  executor kuyruğunu şişirmek yerine event loop'ta sıraya girer
+
+Her thread db_pool'dan kendi kalıcı bağlantılarını kullanır, mevcut
+veri sınıflarının metotları olduğu gibi çalıştırılabilir:
+
+    user = await async_db.run(user_manager.get_user_by_id, user_id)
+    rows = await async_db.fetch_all("SELECT * FROM favorites WHERE user_id = ?", (uid,))
+    await async_db.write(credit_manager.add_credits, user_id, 10, "bonus")
+    await async_db.write_bulk(log_writer.flush)
+"""
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.config import DATABASE_PATH, DB_EXECUTOR_READ_WORKERS, DB_EXECUTOR_MAX_PENDING
+from src.db_pool import get_db_pool
+from src.storage import store_paths
+
+
+class AsyncDatabase:
+    """Okuma executor'ı + tek yazıcı thread'i üzerinde async veritabanı cephesi"""
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        read_workers: int = DB_EXECUTOR_READ_WORKERS,
+        max_pending: int = DB_EXECUTOR_MAX_PENDING
+    ):
+        self.db_path = db_path or DATABASE_PATH
+        self.read_workers = read_workers
+        self.max_pending = max_pending
+
+        self._readers = ThreadPoolExecutor(max_workers=read_workers, thread_name_prefix="db-read")
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-write")
+        # Tek dosyalı düzende toplu yazmalar da aynı yazıcıda sıraya girer
+        self._bulk_writer = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-write-bulk")
+            if store_paths(self.db_path) else self._writer
+        )
+
+        # Semaphore oluşturulduğu event loop'a bağlıdır (benchmark/CLI ayrı loop açabilir)
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self._lock = threading.Lock()
+        self.stats = {
+            "reads": 0,
+            "writes": 0,
+            "bulk_writes": 0,
+            "errors": 0,
+            "queue_ms_total": 0.0,
+            "queue_ms_max": 0.0,
+            "exec_ms_total": 0.0,
+            "exec_ms_max": 0.0
+        }
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_pending)
+            self._slots_loop = loop
+        return self._slots
+
+    def _timed(self, func: Callable, submitted: float, kind: str) -> Callable:
+        """Kuyruk bekleme ve çalışma süresini ölçen sarmalayıcı"""
+        def call():
+            started = time.perf_counter()
+            try:
+                return func()
+            except Exception:
+                with self._lock:
+                    self.stats["errors"] += 1
+                raise
+            finally:
+                finished = time.perf_counter()
+                queue_ms = (started - submitted) * 1000
+                exec_ms = (finished - started) * 1000
+                with self._lock:
+                    self.stats[kind] += 1
+                    self.stats["queue_ms_total"] += queue_ms
+                    self.stats["queue_ms_max"] = max(self.stats["queue_ms_max"], queue_ms)
+                    self.stats["exec_ms_total"] += exec_ms
+                    self.stats["exec_ms_max"] = max(self.stats["exec_ms_max"], exec_ms)
+        return call
+
+    async def _submit(self, executor: ThreadPoolExecutor, kind: str, func: Callable, *args, **kwargs) -> Any:
+        call = functools.partial(func, *args, **kwargs)
+        async with self._get_slots():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, self._timed(call, time.perf_counter(), kind))
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Okuma ağırlıklı bir fonksiyonu okuma thread'lerinde çalıştır"""
+        return await self._submit(self._readers, "reads", func, *args, **kwargs)
+
+    async def write(self, func: Callable, *args, **kwargs) -> Any:
+        """Yazan bir fonksiyonu yazıcı thread'inde (sırayla) çalıştır"""
+        return await self._submit(self._writer, "writes", func, *args, **kwargs)
+
+    async def write_bulk(self, func: Callable, *args, **kwargs) -> Any:
+        """Store dosyalarına toplu yazan bir fonksiyonu (cache merge, log flush, arşiv) çalıştır"""
+        return await self._submit(self._bulk_writer, "bulk_writes", func, *args, **kwargs)
+
+    # -------------------------------------------------------------------------
+    # Tek sorgu yardımcıları
+    # -------------------------------------------------------------------------
+
+    def _fetch_all(self, sql: str, params: Sequence) -> List[Dict[str, Any]]:
+        conn = get_db_pool(self.db_path).acquire()
+        try:
+            return [dict(row) for row in conn.execute(sql, params).fetchall()]
+        finally:
+            conn.close()
+
+    def _fetch_one(self, sql: str, params: Sequence) -> Optional[Dict[str, Any]]:
+        conn = get_db_pool(self.db_path).acquire()
+        try:
+            row = conn.execute(sql, params).fetchone()
+            return dict(row) if row else None
+        finally:
+            conn.close()
+
+    def _fetch_value(self, sql: str, params: Sequence) -> Any:
+        conn = get_db_pool(self.db_path).acquire(row_factory=None)
+        try:
+            row = conn.execute(sql, params).fetchone()
+            return row[0] if row else None
+        finally:
+            conn.close()
+
+    def _execute(self, sql: str, params: Sequence) -> Tuple[int, Optional[int]]:
+        conn = get_db_pool(self.db_path).acquire()
+        try:
+            cursor = conn.execute(sql, params)
+            conn.commit()
+            return cursor.rowcount, cursor.lastrowid
+        finally:
+            conn.close()
+
+    def _execute_many(self, sql: str, seq_of_params: List[Sequence]) -> int:
+        conn = get_db_pool(self.db_path).acquire()
+        try:
+            cursor = conn.executemany(sql, seq_of_params)
+            conn.commit()
+            return cursor.rowcount
+        finally:
+            conn.close()
+
+    async def fetch_all(self, sql: str, params: Sequence = ()) -> List[Dict[str, Any]]:
+        """Tüm satırları dict listesi olarak döndür"""
+        return await self.run(self._fetch_all, sql, params)
+
+    async def fetch_one(self, sql: str, params: Sequence = ()) -> Optional[Dict[str, Any]]:
+        """İlk satırı dict olarak döndür (yoksa None)"""
+        return await self.run(self._fetch_one, sql, params)
+
+    async def fetch_value(self, sql: str, params: Sequence = ()) -> Any:
+        """İlk satırın ilk kolonunu döndür (COUNT vb.)"""
+        return await self.run(self._fetch_value, sql, params)
+
+    async def execute(self, sql: str, params: Sequence = ()) -> Tuple[int, Optional[int]]:
+        """Tek yazma sorgusu çalıştır ve commit et → (rowcount, lastrowid)"""
+        return await self.write(self._execute, sql, params)
+
+    async def execute_many(self, sql: str, seq_of_params: List[Sequence]) -> int:
+        """Aynı sorguyu çok parametreyle tek transaction'da çalıştır → rowcount"""
+        return await self.write(self._execute_many, sql, seq_of_params)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Executor istatistikleri (kuyruk bekleme ve çalışma süreleri)"""
+        with self._lock:
+            calls = self.stats["reads"] + self.stats["writes"] + self.stats["bulk_writes"]
+            return {
+                **self.stats,
+                "queue_ms_total": round(self.stats["queue_ms_total"], 3),
+                "queue_ms_max": round(self.stats["queue_ms_max"], 3),
+                "queue_ms_avg": round(self.stats["queue_ms_total"] / calls, 4) if calls else 0.0,
+                "exec_ms_total": round(self.stats["exec_ms_total"], 3),
+                "exec_ms_max": round(self.stats["exec_ms_max"], 3),
+                "exec_ms_avg": round(self.stats["exec_ms_total"] / calls, 4) if calls else 0.0,
+                "read_workers": self.read_workers,
+                "max_pending": self.max_pending,
+                "bulk_lane": self._bulk_writer is not self._writer
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Executor'ları kapat (bekleyen işler tamamlanır)"""
+        self._readers.shutdown(wait=wait)
+        self._writer.shutdown(wait=wait)
+        if self._bulk_writer is not self._writer:
+            self._bulk_writer.shutdown(wait=wait)
+
+
+# Veritabanı dosyası başına tek cephe
+_instances: Dict[str, AsyncDatabase] = {}
+_instances_lock = threading.Lock()
+
+def get_async_db(db_path: Optional[str] = None) -> AsyncDatabase:
+    """Veritabanı dosyası için ortak async cepheyi al"""
+    path = db_path or DATABASE_PATH
+    instance = _instances.get(path)
+    if instance is None:
+        with _instances_lock:
+            instance = _instances.get(path)
+            if instance is None:
+                instance = _instances[path] = AsyncDatabase(path)
+    return instance
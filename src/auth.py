@@ -12,6 +12,8 @@ from passlib.context import CryptContext
 
 from src.config import DATABASE_PATH
 from src.models import TokenData, SubscriptionTier, UserRole
+from src.db_pool import get_db_pool
+from src.pagination import KeysetSort, keyset_page, count_rows, resolve_count_mode, page_info
 
 
 # ================================================================
@@ -25,6 +27,9 @@ ACCESS_TOKEN_EXPIRE_HOURS = 24
 # Password hashing - pbkdf2_sha256 kullan (bcrypt uyumluluk sorunu nedeniyle)
 pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 
+# Admin kullanıcı listesi sıralaması (keyset)
+USERS_SORT = KeysetSort(column="created_at", key="created_at", nullable=True)
+
 
 # ================================================================
 # PASSWORD FUNCTIONS
@@ -124,9 +129,7 @@ class UserManager:
         self.db_path = db_path or DATABASE_PATH
     
     def _get_connection(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        return get_db_pool(self.db_path).acquire()
     
     def create_user(
         self,
@@ -361,45 +364,48 @@ class UserManager:
         per_page: int = 20,
         tier: str = None,
         role: str = None,
-        is_active: bool = None
+        is_active: bool = None,
+        cursor: Optional[str] = None,
+        count: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Kullanıcı listesi (admin için)
+        
+        cursor verilirse önceki yanıtın next_cursor'ından devam edilir (keyset),
+        count: exact / estimate / none (varsayılan: cursor'lı isteklerde estimate)
         """
+        count_mode = resolve_count_mode(count, cursor)
         conn = self._get_connection()
-        cursor = conn.cursor()
+        db_cursor = conn.cursor()
         
         try:
-            # Count query
-            count_query = "SELECT COUNT(*) FROM users WHERE 1=1"
-            list_query = "SELECT * FROM users WHERE 1=1"
+            conditions = []
             params = []
             
             if tier:
-                count_query += " AND subscription_tier = ?"
-                list_query += " AND subscription_tier = ?"
+                conditions.append("subscription_tier = ?")
                 params.append(tier)
             
             if role:
-                count_query += " AND role = ?"
-                list_query += " AND role = ?"
+                conditions.append("role = ?")
                 params.append(role)
             
             if is_active is not None:
-                count_query += " AND is_active = ?"
-                list_query += " AND is_active = ?"
+                conditions.append("is_active = ?")
                 params.append(is_active)
             
             # Total count
-            cursor.execute(count_query, params)
-            total = cursor.fetchone()[0]
+            total = count_rows(
+                db_cursor, "FROM users", conditions, params, count_mode,
+                counter=None if conditions else "users"
+            )
             
             # List with pagination
-            list_query += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
-            params.extend([per_page, (page - 1) * per_page])
-            
-            cursor.execute(list_query, params)
-            users = [dict(row) for row in cursor.fetchall()]
+            rows, next_cursor = keyset_page(
+                db_cursor, "SELECT * FROM users", conditions, params,
+                USERS_SORT, after=cursor, page=page, per_page=per_page
+            )
+            users = [dict(row) for row in rows]
             
             # Şifreleri kaldır
             for user in users:
@@ -407,10 +413,7 @@ class UserManager:
             
             return {
                 "items": users,
-                "total": total,
-                "page": page,
-                "per_page": per_page,
-                "pages": (total + per_page - 1) // per_page
+                **page_info(total, page, per_page, next_cursor, count_mode)
             }
         finally:
             conn.close()
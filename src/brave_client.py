@@ -7,6 +7,8 @@ import aiohttp
 from typing import List, Dict, Optional, Any
 
 from src.config import BRAVE_API_KEY
+from src.http_client import get_http_session
+from src.rate_limiter import get_rate_limiter
 
 
 def _get_brave_key_from_db():
@@ -31,12 +33,12 @@ class BraveSearchClient:
         self._session: Optional[aiohttp.ClientSession] = None
     
     async def _ensure_session(self):
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
+        # Paylaşımlı oturum: bağlantılar ve DNS cache'i istekler arasında korunur
+        self._session = get_http_session("api")
     
     async def close(self):
-        if self._session and not self._session.closed:
-            await self._session.close()
+        # Paylaşımlı oturum uygulama kapanışında kapatılır (src/http_client.py)
+        self._session = None
     
     async def search(
         self,
@@ -87,14 +89,19 @@ class BraveSearchClient:
         if freshness:
             params["freshness"] = freshness
         
+        limiter = get_rate_limiter().get("brave", self.api_key)
         try:
-            async with self._session.get(self.BASE_URL, headers=headers, params=params) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    error_text = await response.text()
-                    print(f"Brave API error {response.status}: {error_text}")
-                    return {"error": error_text, "status": response.status}
+            for attempt in range(limiter.max_retries + 1):
+                async with limiter.slot() as slot:
+                    async with self._session.get(self.BASE_URL, headers=headers, params=params) as response:
+                        if slot.report(response.status, response.headers.get("Retry-After")) and attempt < limiter.max_retries:
+                            continue
+                        if response.status == 200:
+                            return await response.json()
+                        else:
+                            error_text = await response.text()
+                            print(f"Brave API error {response.status}: {error_text}")
+                            return {"error": error_text, "status": response.status}
         except Exception as e:
             print(f"Brave API request failed: {e}")
             return {"error": str(e)}
@@ -0,0 +1,286 @@
+"""
+Bulk Upsert - keşfedilen PDF'ler ve premium sonuçlar için toplu kayıt hattı
+
+Eski akış her sonuç için SELECT + INSERT/UPDATE çalıştırıyordu (100 sonuç =
+200 sorgu, hepsi isteğin içinde). Burada:
+- url_hash'ler tek geçişte hesaplanır, batch içi tekrarlar atılır
+- Tek transaction'da tek bir INSERT ... ON CONFLICT(url_hash) DO UPDATE
+  executemany çalışır
+- İstek yolundaki kayıtlar enqueue() ile tampona alınır; arka plan işi
+  (run) tamponu periyodik olarak toplu yazma thread'inde boşaltır, yanıt
+  kayıt beklemez
+- Tampon sınırlıdır (BULK_UPSERT_MAX_PENDING); kilit / disk gibi geçici
+  hatalarda batch tampona geri konur, sınır aşılırsa en eski satırlar
+  atılır ve sayılır (veri hatalı batch'ler tekrar denenmez, atılır)
+
+Senkron çağıranlar (SourceDiscovery, FirecrawlGoogleScraper) upsert() ile
+aynı hattı doğrudan kullanır.
+"""
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from src.config import (
+    DATABASE_PATH, BULK_UPSERT_FLUSH_SECONDS, BULK_UPSERT_MAX_BATCH, BULK_UPSERT_MAX_PENDING
+)
+from src.db_pool import get_db_pool
+
+logger = logging.getLogger(__name__)
+
+# SQLite değişken limiti altında kalan IN (...) parça boyutu
+_IN_CHUNK = 500
+
+
+def discovered_url_hash(url: str) -> str:
+    """discovered_pdfs anahtarı (küçük harf, query string ve fragment hariç)"""
+    normalized = url.lower().split("?")[0].split("#")[0]
+    return hashlib.md5(normalized.encode()).hexdigest()
+
+
+def premium_url_hash(url: str) -> str:
+    """premium_results anahtarı (URL olduğu gibi)"""
+    return hashlib.md5(url.encode()).hexdigest()
+
+
+@dataclass(frozen=True)
+class UpsertTarget:
+    """Toplu upsert hedef tablosu"""
+    table: str
+    columns: Tuple[str, ...]  # url_hash hariç, satır dict'inden okunan kolonlar
+    on_conflict: str  # DO UPDATE SET ... kısmı
+    url_hash: Callable[[str], str]
+    defaults: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def sql(self) -> str:
+        columns = ("url_hash",) + self.columns
+        placeholders = ", ".join("?" for _ in columns)
+        return (
+            f"INSERT INTO {self.table} ({', '.join(columns)}) VALUES ({placeholders}) "
+            f"ON CONFLICT(url_hash) DO UPDATE SET {self.on_conflict}"
+        )
+
+
+DISCOVERED_PDFS = UpsertTarget(
+    table="discovered_pdfs",
+    columns=("url", "title", "domain", "source_path", "size_bytes", "size_mb",
+             "brand", "model", "category", "is_valid"),
+    on_conflict='''
+        last_checked = CURRENT_TIMESTAMP,
+        size_bytes = COALESCE(excluded.size_bytes, size_bytes),
+        size_mb = COALESCE(excluded.size_mb, size_mb)
+    ''',
+    url_hash=discovered_url_hash,
+    defaults={"is_valid": 1}
+)
+
+PREMIUM_RESULTS = UpsertTarget(
+    table="premium_results",
+    columns=("url", "title", "snippet", "platform", "domain", "query"),
+    on_conflict='''
+        last_seen = datetime('now'),
+        view_count = view_count + 1
+    ''',
+    url_hash=premium_url_hash
+)
+
+
+class BulkUpserter:
+    """Tek transaction'lı toplu upsert + istek dışı yazma tamponu"""
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_batch: int = BULK_UPSERT_MAX_BATCH,
+        flush_interval: float = BULK_UPSERT_FLUSH_SECONDS,
+        max_pending: int = BULK_UPSERT_MAX_PENDING
+    ):
+        self.db_path = db_path or DATABASE_PATH
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+
+        self._targets: Dict[str, UpsertTarget] = {}
+        self._pending: Deque[Tuple[str, Dict]] = deque()
+        self._lock = threading.Lock()
+        self._wake: Optional[asyncio.Event] = None
+
+        self.stats = {
+            "batches": 0,
+            "rows": 0,
+            "inserted": 0,
+            "updated": 0,
+            "errors": 0,
+            "dropped": 0,
+            "last_flush": None
+        }
+
+    def _prepare(self, target: UpsertTarget, rows: Iterable[Dict]) -> List[tuple]:
+        """url_hash hesapla, batch içi tekrarları at (ilk gelen kalır)"""
+        prepared = {}
+        for row in rows:
+            url = row.get("url")
+            if not url:
+                continue
+            url_hash = target.url_hash(url)
+            if url_hash in prepared:
+                continue
+            prepared[url_hash] = (url_hash,) + tuple(
+                row.get(col, target.defaults.get(col)) for col in target.columns
+            )
+        return list(prepared.values())
+
+    @staticmethod
+    def _count_existing(cursor, table: str, hashes: List[str]) -> int:
+        existing = 0
+        for i in range(0, len(hashes), _IN_CHUNK):
+            chunk = hashes[i:i + _IN_CHUNK]
+            cursor.execute(
+                f"SELECT COUNT(*) FROM {table} WHERE url_hash IN ({', '.join('?' for _ in chunk)})",
+                chunk
+            )
+            existing += cursor.fetchone()[0]
+        return existing
+
+    def upsert(self, target: UpsertTarget, rows: Iterable[Dict]) -> int:
+        """
+        Satırları tek transaction'da upsert et
+
+        Returns:
+            Yeni eklenen satır sayısı
+        """
+        values = self._prepare(target, rows)
+        if not values:
+            return 0
+
+        conn = get_db_pool(self.db_path).acquire(row_factory=None)
+        cursor = conn.cursor()
+        try:
+            existing = self._count_existing(cursor, target.table, [v[0] for v in values])
+            cursor.executemany(target.sql, values)
+            conn.commit()
+        except Exception:
+            with self._lock:
+                self.stats["errors"] += 1
+            raise
+        finally:
+            conn.close()
+
+        inserted = len(values) - existing
+        with self._lock:
+            self.stats["batches"] += 1
+            self.stats["rows"] += len(values)
+            self.stats["inserted"] += inserted
+            self.stats["updated"] += existing
+        return inserted
+
+    def enqueue(self, target: UpsertTarget, rows: Iterable[Dict]) -> int:
+        """
+        Satırları yazma tamponuna ekle (bloklamaz, run() boşaltır)
+
+        Returns:
+            Tampona eklenen satır sayısı
+        """
+        rows = [row for row in rows if row.get("url")]
+        if not rows:
+            return 0
+
+        with self._lock:
+            self._targets[target.table] = target
+            self._pending.extend((target.table, row) for row in rows)
+            self._trim()
+            full = len(self._pending) >= self.max_batch
+
+        if full and self._wake is not None:
+            self._wake.set()
+        return len(rows)
+
+    def _trim(self) -> None:
+        """Tampon sınırı aşıldıysa en eski satırları at (kilit altında çağrılır)"""
+        overflow = len(self._pending) - self.max_pending
+        for _ in range(max(overflow, 0)):
+            self._pending.popleft()
+            self.stats["dropped"] += 1
+
+    def flush(self) -> Dict[str, int]:
+        """Tampondaki tüm satırları yaz → tablo başına yeni eklenen sayısı"""
+        with self._lock:
+            if not self._pending:
+                return {}
+            batch, self._pending = self._pending, deque()
+
+        rows_by_table: Dict[str, List[Dict]] = {}
+        for table, row in batch:
+            rows_by_table.setdefault(table, []).append(row)
+
+        result = {}
+        failed: List[Tuple[str, Dict]] = []
+        for table, rows in rows_by_table.items():
+            try:
+                result[table] = self.upsert(self._targets[table], rows)
+            except sqlite3.OperationalError as e:
+                failed.extend((table, row) for row in rows)
+                logger.error(f"Toplu kayıt hatası ({table}, {len(rows)} satır, tekrar denenecek): {e}")
+                continue
+            except Exception as e:
+                with self._lock:
+                    self.stats["dropped"] += len(rows)
+                logger.error(f"Toplu kayıt hatası ({table}, {len(rows)} satır atıldı): {e}")
+                continue
+            logger.info(f"Toplu kayıt: {table} {len(rows)} satır, {result[table]} yeni")
+
+        with self._lock:
+            if failed:
+                # Geri koy, bir sonraki flush'ta tekrar denensin (sınır korunur)
+                self._pending.extendleft(reversed(failed))
+                self._trim()
+            self.stats["last_flush"] = datetime.now().isoformat()
+        return result
+
+    async def run(self, write: Callable) -> None:
+        """
+        Tamponu periyodik olarak boşalt (arka plan işi)
+
+        Args:
+            write: Senkron fonksiyonu yazıcı thread'inde çalıştıran coroutine
+                   (ör. get_async_db().write_bulk)
+        """
+        self._wake = asyncio.Event()
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+                if self._pending:
+                    await write(self.flush)
+        finally:
+            self._wake = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Toplu kayıt istatistikleri"""
+        with self._lock:
+            return {**self.stats, "pending_rows": len(self._pending)}
+
+
+# Veritabanı dosyası başına tek hat
+_instances: Dict[str, BulkUpserter] = {}
+_instances_lock = threading.Lock()
+
+def get_bulk_upserter(db_path: Optional[str] = None) -> BulkUpserter:
+    """Veritabanı dosyası için ortak toplu kayıt hattını al"""
+    path = db_path or DATABASE_PATH
+    instance = _instances.get(path)
+    if instance is None:
+        with _instances_lock:
+            instance = _instances.get(path)
+            if instance is None:
+                instance = _instances[path] = BulkUpserter(path)
+    return instance
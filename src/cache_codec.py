@@ -0,0 +1,188 @@
+"""
+Cache Codec - search_cache_results satırları için sıkıştırılmış payload
+
+Satır formatları (search_cache_results.format_version):
+    0 = JSON metni (ensure_ascii=False) - eski satırlar
+    1 = zlib (raw deflate), ön eki 4 byte sözlük id'si (0 = sözlüksüz)
+
+Tek bir sonuç satırı birkaç yüz byte olduğu için zlib tek başına az kazandırır;
+kendi cache'imizdeki satırlardan çıkarılan ortak bir sözlük (anahtarlar,
+sık domain/URL önekleri, kaynak adları) kullanılır. Sözlükler
+cache_dictionaries tablosunda saklanır ve asla değiştirilmez; yeni sözlük
+eğitilince yeni id alır, eski satırlar eski sözlükle okunmaya devam eder.
+"""
+import json
+import re
+import struct
+import threading
+import zlib
+from collections import Counter
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+from src.config import (
+    DATABASE_PATH, CACHE_COMPRESSION_ENABLED, CACHE_COMPRESSION_LEVEL, CACHE_DICT_MAX_BYTES
+)
+from src.db_pool import get_db_pool
+
+FORMAT_JSON = 0
+FORMAT_ZLIB = 1
+
+_HEADER = struct.Struct(">I")
+
+# Sözlük adayları: JSON anahtarları, URL önekleri ve kısa değerler
+_FRAGMENT_RE = re.compile(
+    r'"[a-z_]+": |https?://[^/"]+/|"[^"\\]{1,40}"'
+)
+
+
+class CacheCodec:
+    """Sonuç satırı kodlayıcı/çözücü (paylaşımlı zlib sözlüğü ile)"""
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        enabled: bool = CACHE_COMPRESSION_ENABLED,
+        level: int = CACHE_COMPRESSION_LEVEL
+    ):
+        self.db_path = db_path or DATABASE_PATH
+        self.enabled = enabled
+        self.level = level
+        self._dicts: Dict[int, bytes] = {}
+        self._active_id: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _get_connection(self):
+        return get_db_pool(self.db_path).acquire()
+
+    def _load_dictionaries(self) -> None:
+        conn = self._get_connection()
+        try:
+            rows = conn.execute("SELECT id, dictionary FROM cache_dictionaries ORDER BY id").fetchall()
+        finally:
+            conn.close()
+
+        with self._lock:
+            self._dicts = {row['id']: bytes(row['dictionary']) for row in rows}
+            self._active_id = rows[-1]['id'] if rows else 0
+
+    @property
+    def active_dict_id(self) -> int:
+        """Yeni satırların kodlandığı sözlük (0 = sözlüksüz)"""
+        if self._active_id is None:
+            self._load_dictionaries()
+        return self._active_id
+
+    def _get_dict(self, dict_id: int) -> bytes:
+        if dict_id == 0:
+            return b""
+        if dict_id not in self._dicts:
+            self._load_dictionaries()
+        return self._dicts[dict_id]
+
+    def encode(self, item: Any) -> Tuple[int, Union[str, bytes]]:
+        """Sonucu payload'a çevir → (format_version, payload)"""
+        if not self.enabled:
+            return FORMAT_JSON, json.dumps(item, ensure_ascii=False)
+
+        dict_id = self.active_dict_id
+        zdict = self._get_dict(dict_id)
+        text = json.dumps(item, ensure_ascii=False).encode("utf-8")
+
+        if zdict:
+            compressor = zlib.compressobj(self.level, zlib.DEFLATED, -15, zdict=zdict)
+        else:
+            compressor = zlib.compressobj(self.level, zlib.DEFLATED, -15)
+        return FORMAT_ZLIB, _HEADER.pack(dict_id) + compressor.compress(text) + compressor.flush()
+
+    def decode_text(self, format_version: int, payload: Union[str, bytes]) -> Union[str, bytes]:
+        """
+        Payload'ı JSON metnine çöz (format_version'a göre)
+
+        Sıkıştırılmış satırlar için UTF-8 bayt döner (json.loads doğrudan
+        kabul eder, ayrı bir decode adımına gerek yok).
+        """
+        if not format_version:
+            return payload
+
+        if format_version == FORMAT_ZLIB:
+            (dict_id,) = _HEADER.unpack_from(payload)
+            zdict = self._get_dict(dict_id)
+            if zdict:
+                decompressor = zlib.decompressobj(-15, zdict=zdict)
+            else:
+                decompressor = zlib.decompressobj(-15)
+            return decompressor.decompress(memoryview(payload)[_HEADER.size:]) + decompressor.flush()
+
+        raise ValueError(f"Bilinmeyen cache payload formatı: {format_version}")
+
+    def decode(self, format_version: int, payload: Union[str, bytes]) -> Any:
+        return json.loads(self.decode_text(format_version, payload))
+
+    @staticmethod
+    def build_dictionary(samples: Iterable[str], max_bytes: int = CACHE_DICT_MAX_BYTES) -> bytes:
+        """
+        Örnek JSON satırlarından zlib sözlüğü çıkar
+
+        Sık geçen parçalar seçilir (frekans x uzunluk); zlib sözlüğün
+        sonundaki baytlara daha kısa mesafeyle eriştiği için en sık
+        parçalar sona yazılır.
+        """
+        counts: Counter = Counter()
+        for text in samples:
+            counts.update(set(_FRAGMENT_RE.findall(text)))
+
+        ranked = sorted(
+            (frag for frag, n in counts.items() if n > 1),
+            key=lambda frag: counts[frag] * len(frag),
+            reverse=True
+        )
+
+        selected = []
+        size = 0
+        for frag in ranked:
+            encoded = frag.encode("utf-8")
+            if size + len(encoded) > max_bytes:
+                continue
+            selected.append(encoded)
+            size += len(encoded)
+
+        selected.sort(key=lambda frag: counts[frag.decode("utf-8")])
+        return b"".join(selected)
+
+    def train_dictionary(self, sample_limit: int = 5000) -> Optional[int]:
+        """
+        Cache'teki satırlardan yeni sözlük eğit ve aktif yap
+
+        Returns:
+            Yeni sözlük id'si (örnek yoksa None)
+        """
+        conn = self._get_connection()
+        try:
+            rows = conn.execute('''
+                SELECT format_version, result_json FROM search_cache_results
+                ORDER BY id DESC LIMIT ?
+            ''', (sample_limit,)).fetchall()
+
+            samples = [
+                json.dumps(self.decode(r['format_version'], r['result_json']), ensure_ascii=False)
+                for r in rows
+            ]
+            dictionary = self.build_dictionary(samples)
+            if not dictionary:
+                return None
+
+            cursor = conn.execute(
+                "INSERT INTO cache_dictionaries (dictionary, sample_count) VALUES (?, ?)",
+                (dictionary, len(samples))
+            )
+            conn.commit()
+            dict_id = cursor.lastrowid
+        finally:
+            conn.close()
+
+        self._load_dictionaries()
+        return dict_id
+
+    def active_header(self) -> bytes:
+        """Aktif sözlükle kodlanmış payload'ların ön eki (yeniden sıkıştırma sorgusu için)"""
+        return _HEADER.pack(self.active_dict_id)
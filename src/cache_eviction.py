@@ -0,0 +1,323 @@
+"""
+Cache Eviction - search_cache için byte bütçeli GDSF tahliye politikası
+
+GDSF (Greedy-Dual-Size-Frequency):
+    priority = L + (hit_count + 1) * 1024 / size_bytes
+
+Küçük ve sık okunan kayıtlar yüksek öncelik alır. L ("clock") son tahliye
+edilen kaydın önceliğidir; her tahliyede yükseldiği için uzun süredir
+dokunulmayan kayıtlar zamanla yaşlanır (LFU + aging).
+
+Hit sayıları her okumada SQLite'a yazılmaz, bellekte biriktirilip
+arka plan işinde toplu yazılır. Tahliye küçük batch'ler halinde toplu
+yazıcı thread'inde (async_db.write_bulk) yapılır, yazma kilidi uzun
+tutulmaz; boşalan sayfalar incremental_vacuum ile geri verilir (tam
+VACUUM gerekmez). Toplam boyut her batch'te SUM ile taranmaz, bellekte
+tutulan sayaç yazmalarla birlikte güncellenir.
+"""
+import asyncio
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, Optional, Union
+
+from src.config import (
+    CACHE_MAX_BYTES, CACHE_EVICTION_LOW_WATERMARK, CACHE_EVICTION_BATCH_SIZE
+)
+from src.memory_cache import MemoryCache
+from src.db_pool import get_db_pool
+from src.async_db import get_async_db
+from src.storage import table_schema
+
+# Kaydın byte boyutu (sonuç satırları) - sadece tam yeniden hesaplamada
+ENTRY_SIZE_SQL = '''
+    (SELECT COALESCE(SUM(LENGTH(CAST(result_json AS BLOB))), 0)
+     FROM search_cache_results WHERE cache_key = ?)
+'''
+
+
+def payload_size(payload: Union[str, bytes, None]) -> int:
+    """Sonuç payload'ının byte boyutu (ENTRY_SIZE_SQL ile aynı ölçü)"""
+    if payload is None:
+        return 0
+    if isinstance(payload, str):
+        return len(payload.encode("utf-8"))
+    return len(payload)
+
+# GDSF maliyeti: tüm kayıtlar için 1 (KB başına)
+COST_PER_KB = 1024.0
+
+# Tahliye adayları: önce süresi dolmuşlar (idx_cache_expires), sonra en
+# düşük öncelikliler (idx_cache_priority). Tek sorguda ikisini birden
+# sıralamak index kullanamaz, tüm tabloyu geçici B-tree'de sıralar.
+EXPIRED_VICTIMS_SQL = '''
+    SELECT cache_key, engine, query, size_bytes, hit_count, priority
+    FROM search_cache
+    WHERE expires_at < datetime('now')
+    ORDER BY expires_at
+    LIMIT ?
+'''
+PRIORITY_VICTIMS_SQL = '''
+    SELECT cache_key, engine, query, size_bytes, hit_count, priority
+    FROM search_cache
+    ORDER BY priority
+    LIMIT ?
+'''
+
+
+class CacheEvictor:
+    """search_cache için GDSF tahliye ve erişim sayacı"""
+
+    def __init__(
+        self,
+        db_path: str,
+        memory: MemoryCache,
+        max_bytes: int = CACHE_MAX_BYTES,
+        low_watermark: float = CACHE_EVICTION_LOW_WATERMARK,
+        batch_size: int = CACHE_EVICTION_BATCH_SIZE
+    ):
+        self.db_path = db_path
+        self.memory = memory
+        self.max_bytes = max_bytes
+        self.low_watermark = low_watermark
+        self.batch_size = batch_size
+
+        self._clock: Optional[float] = None
+        self._total_bytes: Optional[int] = None
+        self._evicting = False
+        self._pending_hits: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        self.stats = {
+            "runs": 0,
+            "evicted_entries": 0,
+            "evicted_bytes": 0,
+            "last_run": None
+        }
+        self._recent = deque(maxlen=20)
+
+    def _get_connection(self):
+        return get_db_pool(self.db_path).acquire()
+
+    @property
+    def clock(self) -> float:
+        """GDSF L değeri (yeniden başlatmada en düşük öncelikten devam eder)"""
+        if self._clock is None:
+            conn = self._get_connection()
+            try:
+                row = conn.execute("SELECT MIN(priority) AS p FROM search_cache").fetchone()
+                self._clock = row['p'] or 0.0
+            finally:
+                conn.close()
+        return self._clock
+
+    def record_hit(self, cache_key: str) -> None:
+        """Okumayı bellekte say (flush_hits ile yazılır)"""
+        with self._lock:
+            self._pending_hits[cache_key] = self._pending_hits.get(cache_key, 0) + 1
+
+    def update_entry(
+        self,
+        cursor,
+        cache_key: str,
+        added_bytes: Optional[int] = None,
+        extra_hits: int = 0
+    ) -> None:
+        """
+        Kaydın boyutunu ve önceliğini güncelle (yazma transaction'ı içinde)
+
+        added_bytes verilirse boyut yeni eklenen satırlar kadar artırılır;
+        verilmezse (blob açma, rekey gibi seyrek işlerde) key'in tüm
+        satırları üzerinden yeniden hesaplanır.
+        """
+        if added_bytes is None:
+            cursor.execute(f'''
+                UPDATE search_cache SET size_bytes = {ENTRY_SIZE_SQL}
+                WHERE cache_key = ?
+            ''', (cache_key, cache_key))
+        else:
+            cursor.execute(
+                "UPDATE search_cache SET size_bytes = size_bytes + ? WHERE cache_key = ?",
+                (added_bytes, cache_key)
+            )
+        cursor.execute('''
+            UPDATE search_cache SET
+                hit_count = hit_count + ?,
+                priority = ? + (hit_count + ? + 1) * ? / MAX(size_bytes, 1)
+            WHERE cache_key = ?
+        ''', (extra_hits, self.clock, extra_hits, COST_PER_KB, cache_key))
+
+    def flush_hits(self) -> int:
+        """Biriken hit sayılarını toplu yaz, öncelikleri güncelle"""
+        with self._lock:
+            pending, self._pending_hits = self._pending_hits, {}
+
+        if not pending:
+            return 0
+
+        now = datetime.now().isoformat()
+        clock = self.clock
+        conn = self._get_connection()
+        try:
+            conn.executemany('''
+                UPDATE search_cache SET
+                    hit_count = hit_count + ?,
+                    last_accessed_at = ?,
+                    priority = ? + (hit_count + ? + 1) * ? / MAX(size_bytes, 1)
+                WHERE cache_key = ?
+            ''', [
+                (hits, now, clock, hits, COST_PER_KB, key)
+                for key, hits in pending.items()
+            ])
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            # Kaybolmasın, bir sonraki turda tekrar denensin
+            with self._lock:
+                for key, hits in pending.items():
+                    self._pending_hits[key] = self._pending_hits.get(key, 0) + hits
+            print(f"Cache hit flush error: {e}")
+            return 0
+        finally:
+            conn.close()
+
+        return len(pending)
+
+    def get_total_bytes(self) -> int:
+        """Cache'in toplam byte boyutu (ilk çağrıda veya reset_total sonrası SUM ile okunur)"""
+        with self._lock:
+            if self._total_bytes is not None:
+                return self._total_bytes
+
+        conn = self._get_connection()
+        try:
+            row = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) AS total FROM search_cache").fetchone()
+        finally:
+            conn.close()
+
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = row['total']
+            return self._total_bytes
+
+    def add_bytes(self, delta: int) -> None:
+        """Commit edilmiş bir yazmanın boyut farkını toplam sayaca ekle"""
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes = max(self._total_bytes + delta, 0)
+
+    def reset_total(self) -> None:
+        """Toplu silme / yeniden hesaplama sonrası sayacı bir sonraki okumada SUM'dan kur"""
+        with self._lock:
+            self._total_bytes = None
+
+    def evict_batch(self) -> int:
+        """
+        Bütçe aşıldıysa en düşük öncelikli kayıtlardan bir batch tahliye et
+
+        Tahliye max_bytes aşılınca başlar, low_watermark altına inene kadar
+        sonraki çağrılarda devam eder.
+
+        Returns:
+            Bu batch'te tahliye edilen kayıt sayısı (0 = bütçe içinde)
+        """
+        total = self.get_total_bytes()
+        target = int(self.max_bytes * self.low_watermark)
+
+        if not self._evicting and total <= self.max_bytes:
+            return 0
+        if total <= target:
+            self._evicting = False
+            return 0
+        self._evicting = True
+
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        try:
+            # Süresi dolmuşlar önce, batch dolmazsa GDSF önceliği
+            candidates = cursor.execute(EXPIRED_VICTIMS_SQL, (self.batch_size,)).fetchall()
+            if len(candidates) < self.batch_size:
+                seen = {row['cache_key'] for row in candidates}
+                candidates += [
+                    row for row in cursor.execute(PRIORITY_VICTIMS_SQL, (self.batch_size,)).fetchall()
+                    if row['cache_key'] not in seen
+                ][:self.batch_size - len(candidates)]
+
+            victims = []
+            freed = 0
+            for row in candidates:
+                if total - freed <= target:
+                    break
+                victims.append(row)
+                freed += row['size_bytes'] or 0
+
+            if not victims:
+                self._evicting = False
+                return 0
+
+            keys = [(row['cache_key'],) for row in victims]
+            cursor.executemany("DELETE FROM search_cache_results WHERE cache_key = ?", keys)
+            cursor.executemany("DELETE FROM search_cache WHERE cache_key = ?", keys)
+            conn.commit()
+
+            # Boşalan sayfaları dosyaya geri ver (auto_vacuum=INCREMENTAL ise)
+            conn.execute(f"PRAGMA {table_schema(conn, 'search_cache')}.incremental_vacuum(1000)").fetchall()
+        except Exception as e:
+            conn.rollback()
+            print(f"Cache eviction error: {e}")
+            return 0
+        finally:
+            conn.close()
+
+        self.add_bytes(-freed)
+        self._clock = max(self.clock, max(row['priority'] or 0.0 for row in victims))
+
+        for row in victims:
+            self.memory.invalidate(row['cache_key'])
+            self._recent.append({
+                "engine": row['engine'],
+                "query": row['query'],
+                "size_bytes": row['size_bytes'],
+                "hit_count": row['hit_count'],
+                "evicted_at": datetime.now().isoformat()
+            })
+
+        self.stats["evicted_entries"] += len(victims)
+        self.stats["evicted_bytes"] += freed
+        return len(victims)
+
+    async def run(self, max_batches: int = 100, pause_seconds: float = 0.05) -> int:
+        """
+        Hit'leri yaz ve bütçe altına inene kadar tahliye et
+
+        Her batch (hit yazma, DELETE'ler, incremental_vacuum) toplu yazıcı
+        thread'inde çalışır; batch'ler arasında event loop'a nefes aldırır.
+        """
+        async_db = get_async_db(self.db_path)
+        await async_db.write_bulk(self.flush_hits)
+        evicted = 0
+        for _ in range(max_batches):
+            count = await async_db.write_bulk(self.evict_batch)
+            if not count:
+                break
+            evicted += count
+            await asyncio.sleep(pause_seconds)
+
+        self.stats["runs"] += 1
+        self.stats["last_run"] = datetime.now().isoformat()
+        return evicted
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Tahliye istatistikleri"""
+        with self._lock:
+            pending_hits = len(self._pending_hits)
+
+        return {
+            **self.stats,
+            "max_bytes": self.max_bytes,
+            "total_bytes": self.get_total_bytes(),
+            "low_watermark_bytes": int(self.max_bytes * self.low_watermark),
+            "clock": round(self.clock, 4),
+            "pending_hits": pending_hits,
+            "recent_evictions": list(self._recent)
+        }
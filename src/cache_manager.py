@@ -1,30 +1,60 @@
 """
 Search Cache Manager - 30 günlük önbellek yönetimi
+
+Depolama düzeni:
+    search_cache          -> cache entry (key, motor, sorgu, süre bilgisi)
+    search_cache_results  -> entry başına URL bazlı sonuç satırları
+                             UNIQUE(cache_key, url_norm)
+
+Eski kayıtlardaki `search_cache.results` JSON blob'u okunmaya devam eder,
+ilk yazmada satırlara açılır (bkz. migrate_legacy_results).
+
+Sonuç satırları format_version'a göre JSON metni veya paylaşımlı sözlüklü
+zlib payload'ı olarak saklanır (bkz. src/cache_codec.py).
+
+Disk bütçesi: kayıt başına size_bytes/hit_count/priority tutulur,
+CACHE_MAX_BYTES aşılınca GDSF ile tahliye edilir (bkz. src/cache_eviction.py).
 """
+import asyncio
 import sqlite3
 import json
 import hashlib
+import time
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 
-from src.config import DATABASE_PATH, CACHE_EXPIRY_DAYS
+from src.config import DATABASE_PATH, CACHE_TTL_DEFAULT, CACHE_TTL_BY_ENGINE, CACHE_RECOMPRESS_BATCH_SIZE
+from src.memory_cache import MemoryCache, get_memory_cache
+from src.cache_eviction import CacheEvictor, payload_size
+from src.cache_codec import CacheCodec
+from src.search.query_canonical import CANONICAL_VERSION, canonical_forms, canonicalize_query
+from src.db_pool import get_db_pool
+from src.async_db import get_async_db
 
 
 class CacheManager:
-    """Arama sonuçları için önbellek yönetimi"""
+    """Arama sonuçları için önbellek yönetimi (bellek LRU + SQLite)"""
     
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(self, db_path: Optional[str] = None, memory: Optional[MemoryCache] = None):
         self.db_path = db_path or DATABASE_PATH
-        self.expiry_days = CACHE_EXPIRY_DAYS
+        self.memory = memory or get_memory_cache()
+        self.eviction = CacheEvictor(self.db_path, self.memory)
+        self.codec = CacheCodec(self.db_path)
     
     def _get_connection(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        return get_db_pool(self.db_path).acquire()
     
     def _generate_cache_key(self, engine: str, query: str, language: str = None, doc_type: str = None, page: int = None) -> str:
-        """Benzersiz cache key oluştur - sayfa bazlı"""
-        key_parts = [engine, query.lower().strip()]
+        """Benzersiz cache key oluştur - sayfa bazlı, kanonik sorgu ile"""
+        return self._hash_key_parts(engine, canonicalize_query(query), language, doc_type, page)
+    
+    def _legacy_cache_key(self, engine: str, query: str, language: str = None, doc_type: str = None, page: int = None) -> str:
+        """Kanonikleştirme öncesi key formatı (rekey_entries için)"""
+        return self._hash_key_parts(engine, query.lower().strip(), language, doc_type, page)
+    
+    @staticmethod
+    def _hash_key_parts(engine: str, query_text: str, language: str = None, doc_type: str = None, page: int = None) -> str:
+        key_parts = [engine, query_text]
         if language:
             key_parts.append(language)
         if doc_type:
@@ -35,30 +65,207 @@ class CacheManager:
         key_string = "|".join(key_parts)
         return hashlib.md5(key_string.encode()).hexdigest()
     
+    @staticmethod
+    def _normalize_url(url: str) -> str:
+        """Merge için URL anahtarı (eski blob merge ile aynı kural)"""
+        return (url or "").strip().lower()
+    
+    def _explode_legacy_blob(self, cursor, cache_key: str, blob: str) -> int:
+        """Eski JSON blob'u search_cache_results satırlarına aç"""
+        rows = []
+        for position, item in enumerate(json.loads(blob)):
+            url_norm = self._normalize_url(item.get('url', ''))
+            if url_norm:
+                rows.append((cache_key, url_norm, position, *self.codec.encode(item)))
+        
+        cursor.executemany('''
+            INSERT OR IGNORE INTO search_cache_results (cache_key, url_norm, position, format_version, result_json)
+            VALUES (?, ?, ?, ?, ?)
+        ''', rows)
+        cursor.execute('''
+            UPDATE search_cache SET
+                results = NULL,
+                result_count = (SELECT COUNT(*) FROM search_cache_results WHERE cache_key = ?)
+            WHERE cache_key = ?
+        ''', (cache_key, cache_key))
+        return len(rows)
+    
+    def get_ttl(self, engine: str) -> Tuple[int, int]:
+        """Motor için (soft, hard) TTL saniyesi"""
+        ttl = {**CACHE_TTL_DEFAULT, **CACHE_TTL_BY_ENGINE.get(engine, {})}
+        return ttl["soft_seconds"], ttl["hard_seconds"]
+    
+    def get_cached_entry(
+        self,
+        engine: str,
+        query: str,
+        language: str = None,
+        doc_type: str = None,
+        page: int = None,
+        limit: int = None,
+        offset: int = 0
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Cache kaydını yaş bilgisiyle getir - sayfa bazlı
+        
+        Args:
+            limit: Döndürülecek maksimum sonuç (None = tümü)
+            offset: Atlanacak sonuç sayısı
+        
+        Returns:
+            {"results": List[Dict], "age_seconds": float, "stale": bool} veya None
+            (kayıt yok ya da hard TTL aşılmış)
+        """
+        cache_key = self._generate_cache_key(engine, query, language, doc_type, page)
+        slot = f"{offset}:{limit}"
+        
+        # 1. katman: bellek
+        entry = self.memory.get(cache_key, engine, slot)
+        
+        # 2. katman: SQLite
+        if entry is None:
+            entry = self._load_entry(cache_key, limit, offset)
+            if entry is None:
+                return None
+            self.memory.put(cache_key, engine, entry, entry["size_bytes"], slot)
+        
+        return self._entry_result(engine, cache_key, entry)
+    
+    async def get_cached_entry_async(
+        self,
+        engine: str,
+        query: str,
+        language: str = None,
+        doc_type: str = None,
+        page: int = None,
+        limit: int = None,
+        offset: int = 0
+    ) -> Optional[Dict[str, Any]]:
+        """
+        get_cached_entry'nin async hali
+        
+        Bellek katmanı event loop'ta okunur; ıskalanırsa SQLite okuması
+        async_db okuma thread'lerinde yapılır (event loop bloklanmaz).
+        """
+        cache_key = self._generate_cache_key(engine, query, language, doc_type, page)
+        slot = f"{offset}:{limit}"
+        
+        entry = self.memory.get(cache_key, engine, slot)
+        if entry is None:
+            entry = await get_async_db(self.db_path).run(self._load_entry, cache_key, limit, offset)
+            if entry is None:
+                return None
+            self.memory.put(cache_key, engine, entry, entry["size_bytes"], slot)
+        
+        return self._entry_result(engine, cache_key, entry)
+    
+    def _entry_result(self, engine: str, cache_key: str, entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Yüklenen entry'yi TTL'e göre değerlendir ve hit'i say"""
+        soft_ttl, hard_ttl = self.get_ttl(engine)
+        age_seconds = time.time() - entry["updated_ts"]
+        if age_seconds > hard_ttl:
+            return None
+        
+        self.eviction.record_hit(cache_key)
+        return {
+            "results": list(entry["results"]),
+            "age_seconds": age_seconds,
+            "stale": age_seconds > soft_ttl
+        }
+    
     def get_cached_results(
-        self, 
-        engine: str, 
-        query: str, 
-        language: str = None, 
+        self,
+        engine: str,
+        query: str,
+        language: str = None,
         doc_type: str = None,
-        page: int = None
+        page: int = None,
+        limit: int = None,
+        offset: int = 0
     ) -> Optional[List[Dict]]:
         """Cache'den sonuçları getir (varsa ve süresi dolmamışsa) - sayfa bazlı"""
+        entry = self.get_cached_entry(engine, query, language, doc_type, page, limit, offset)
+        return entry["results"] if entry else None
+    
+    def get_entry_age(
+        self,
+        engine: str,
+        query: str,
+        language: str = None,
+        doc_type: str = None,
+        page: int = None
+    ) -> Optional[float]:
+        """
+        Cache kaydının yaşını saniye olarak getir (sonuçları okumadan)
+        
+        Bellek katmanına ve hit/miss istatistiklerine dokunmaz;
+        ön ısıtma gibi arka plan işleri için.
+        
+        Returns:
+            Yaş (saniye) veya None (kayıt yok ya da hard TTL aşılmış)
+        """
         cache_key = self._generate_cache_key(engine, query, language, doc_type, page)
         
+        conn = self._get_connection()
+        try:
+            row = conn.execute('''
+                SELECT (julianday('now') - julianday(updated_at)) * 86400 AS age_seconds
+                FROM search_cache
+                WHERE cache_key = ? AND expires_at > datetime('now')
+            ''', (cache_key,)).fetchone()
+        finally:
+            conn.close()
+        
+        if not row:
+            return None
+        
+        age_seconds = row['age_seconds'] or 0.0
+        if age_seconds > self.get_ttl(engine)[1]:
+            return None
+        return age_seconds
+    
+    def _load_entry(self, cache_key: str, limit: int = None, offset: int = 0) -> Optional[Dict[str, Any]]:
+        """SQLite'tan entry ve istenen sonuç dilimini oku"""
         conn = self._get_connection()
         cursor = conn.cursor()
         
         try:
             cursor.execute('''
-                SELECT results FROM search_cache 
+                SELECT results, (julianday('now') - julianday(updated_at)) * 86400 AS age_seconds
+                FROM search_cache
                 WHERE cache_key = ? AND expires_at > datetime('now')
             ''', (cache_key,))
             
             row = cursor.fetchone()
-            if row:
-                return json.loads(row['results'])
-            return None
+            if not row:
+                return None
+            
+            if row['results'] is not None:
+                # Eski format (henüz satırlara açılmamış blob)
+                results = json.loads(row['results'])
+                end = offset + limit if limit is not None else None
+                results = results[offset:end]
+                size_bytes = len(row['results'])
+            else:
+                cursor.execute('''
+                    SELECT format_version, result_json FROM search_cache_results
+                    WHERE cache_key = ?
+                    ORDER BY position
+                    LIMIT ? OFFSET ?
+                ''', (cache_key, limit if limit is not None else -1, offset))
+                
+                results = []
+                size_bytes = 0
+                for r in cursor.fetchall():
+                    text = self.codec.decode_text(r['format_version'], r['result_json'])
+                    results.append(json.loads(text))
+                    size_bytes += len(text)
+            
+            return {
+                "results": results,
+                "updated_ts": time.time() - (row['age_seconds'] or 0),
+                "size_bytes": size_bytes
+            }
         finally:
             conn.close()
     
@@ -69,90 +276,426 @@ class CacheManager:
         results: List[Dict],
         language: str = None,
         doc_type: str = None,
-        page: int = None
+        page: int = None,
+        replace: bool = False
     ) -> bool:
-        """Sonuçları cache'e kaydet - sayfa bazlı, yeni sonuçlar eskilerle birleştirilir (merge)"""
+        """
+        Sonuçları cache'e kaydet - sayfa bazlı, yeni sonuçlar eskilerle birleştirilir (merge)
+        
+        Yeni sonuçlar listenin başına yazılır: key'deki en küçük pozisyonun
+        önüne (negatif pozisyonlar olabilir) sırayla yerleşir, zaten kayıtlı
+        URL'ler de öne taşınır. Okuma ORDER BY position LIMIT ile yapıldığı
+        için son kayıt her zaman önce servis edilir; eskide kalanlar arkada
+        birikir. Mevcut satırlar okunmaz, kaydırılmaz; maliyet yeni sonuç
+        sayısıyla orantılıdır.
+        
+        replace=True (soft TTL yenilemesi, ön ısıtma) kayıttaki sonuçları
+        yenileriyle değiştirir: bu kayıtta gelmeyen URL'ler silinir.
+        """
         cache_key = self._generate_cache_key(engine, query, language, doc_type, page)
-        expires_at = datetime.now() + timedelta(days=self.expiry_days)
+        expires_at = datetime.now() + timedelta(seconds=self.get_ttl(engine)[1])
         
         conn = self._get_connection()
         cursor = conn.cursor()
         
         try:
-            # Önce mevcut sonuçları al
             cursor.execute('''
-                SELECT results FROM search_cache WHERE cache_key = ?
+                INSERT INTO search_cache
+                (cache_key, engine, query, language, doc_type, results, result_count, expires_at, key_version)
+                VALUES (?, ?, ?, ?, ?, NULL, 0, ?, ?)
+                ON CONFLICT(cache_key) DO UPDATE SET
+                    updated_at = datetime('now'),
+                    expires_at = excluded.expires_at,
+                    key_version = excluded.key_version
+            ''', (cache_key, engine, query, language, doc_type, expires_at.isoformat(), CANONICAL_VERSION))
+            
+            # Eski blob varsa önce satırlara aç
+            cursor.execute("SELECT results FROM search_cache WHERE cache_key = ?", (cache_key,))
+            legacy = cursor.fetchone()['results']
+            if legacy is not None:
+                self._explode_legacy_blob(cursor, cache_key, legacy)
+            
+            # Aynı URL sonuçlarda iki kez geçerse ilki kalır
+            encoded = {}
+            for r in results:
+                url_norm = self._normalize_url(r.get('url', ''))
+                if url_norm and url_norm not in encoded:
+                    encoded[url_norm] = self.codec.encode(r)
+            
+            cursor.execute('''
+                SELECT COALESCE(MIN(position), 0) AS first_position
+                FROM search_cache_results WHERE cache_key = ?
             ''', (cache_key,))
+            first_position = cursor.fetchone()['first_position'] - len(encoded)
             
-            row = cursor.fetchone()
+            # Boyut, key'in tüm satırları yeniden toplanmadan eklenenler kadar artar
+            inserted = 0
+            added_bytes = 0
+            for offset, (url_norm, (format_version, payload)) in enumerate(encoded.items()):
+                position = first_position + offset
+                cursor.execute('''
+                    INSERT OR IGNORE INTO search_cache_results (cache_key, url_norm, position, format_version, result_json)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (cache_key, url_norm, position, format_version, payload))
+                if cursor.rowcount == 1:
+                    inserted += 1
+                    added_bytes += payload_size(payload)
+                else:
+                    # Zaten kayıtlı URL yeni sonucun sırasına taşınır
+                    cursor.execute(
+                        "UPDATE search_cache_results SET position = ? WHERE cache_key = ? AND url_norm = ?",
+                        (position, cache_key, url_norm)
+                    )
             
-            if row:
-                # Mevcut sonuçlar var - birleştir (merge)
-                existing_results = json.loads(row['results'])
-                existing_urls = {r.get('url', '').lower() for r in existing_results}
+            # Yenilemede bu kayıtta gelmeyenler (yeni sonuçların arkasında kalanlar) silinir
+            removed = 0
+            if replace:
+                last_position = first_position + len(encoded)
+                cursor.execute('''
+                    SELECT COUNT(*) AS removed, COALESCE(SUM(LENGTH(CAST(result_json AS BLOB))), 0) AS removed_bytes
+                    FROM search_cache_results WHERE cache_key = ? AND position >= ?
+                ''', (cache_key, last_position))
+                row = cursor.fetchone()
+                removed = row['removed']
+                added_bytes -= row['removed_bytes']
+                cursor.execute(
+                    "DELETE FROM search_cache_results WHERE cache_key = ? AND position >= ?",
+                    (cache_key, last_position)
+                )
+            
+            cursor.execute(
+                "UPDATE search_cache SET result_count = result_count + ? WHERE cache_key = ?",
+                (inserted - removed, cache_key)
+            )
+            # Eski blob açıldıysa boyut baştan hesaplanır
+            self.eviction.update_entry(
+                cursor, cache_key, added_bytes=None if legacy is not None else added_bytes
+            )
+            
+            conn.commit()
+            self.memory.invalidate(cache_key)
+            if legacy is not None:
+                self.eviction.reset_total()
+            else:
+                self.eviction.add_bytes(added_bytes)
+            
+            if inserted or removed:
+                print(f"Cache merge: +{inserted} yeni sonuç eklendi" + (f", -{removed} eski sonuç silindi" if removed else ""))
+            return True
+        except Exception as e:
+            conn.rollback()
+            print(f"Cache save error: {e}")
+            return False
+        finally:
+            conn.close()
+    
+    def migrate_legacy_results(self, batch_size: int = 200) -> int:
+        """
+        Eski JSON blob kayıtlarını search_cache_results satırlarına taşı
+        
+        Küçük batch'ler halinde çalışır, yazma kilidini uzun süre tutmaz.
+        
+        Returns:
+            Taşınan cache entry sayısı
+        """
+        migrated = 0
+        
+        while True:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            
+            try:
+                cursor.execute('''
+                    SELECT cache_key, results FROM search_cache
+                    WHERE results IS NOT NULL
+                    LIMIT ?
+                ''', (batch_size,))
+                rows = cursor.fetchall()
                 
-                # Yeni sonuçlardan sadece yeni URL'leri ekle
-                new_unique_results = []
-                for r in results:
-                    url = r.get('url', '').lower()
-                    if url and url not in existing_urls:
-                        new_unique_results.append(r)
-                        existing_urls.add(url)
+                if not rows:
+                    break
                 
-                # Birleştirilmiş sonuçlar
-                merged_results = existing_results + new_unique_results
+                for row in rows:
+                    self._explode_legacy_blob(cursor, row['cache_key'], row['results'])
+                    self.eviction.update_entry(cursor, row['cache_key'])
+                    self.memory.invalidate(row['cache_key'])
+                
+                conn.commit()
+                migrated += len(rows)
+            finally:
+                conn.close()
+        
+        if migrated:
+            self.eviction.reset_total()
+        return migrated
+    
+    def outdated_key_count(self) -> int:
+        """Eski kanonik sürümle key'lenmiş (rekey bekleyen) kayıt sayısı"""
+        conn = self._get_connection()
+        try:
+            return conn.execute(
+                "SELECT COUNT(*) FROM search_cache WHERE COALESCE(key_version, 0) < ?", (CANONICAL_VERSION,)
+            ).fetchone()[0]
+        finally:
+            conn.close()
+    
+    def rekey_entries(self, max_page: int = 50) -> Dict[str, int]:
+        """
+        Eski sürümle key'lenmiş kayıtları kanonik key'e taşı, aynı key'e düşenleri birleştir
+        
+        Key'ler ham sorgu metninden (ilk sürüm) veya kanonik biçimin bir
+        önceki sürümünden üretilmiş olabilir; tüm biçimler ve sayfalar
+        denenerek key geri bulunur (search_cache'te sayfa kolonu yok).
+        Birleştirmede en son güncellenen kayıt korunur, diğerlerinin
+        sonuçları INSERT OR IGNORE ile arkasına eklenir. İşlenen kayıtlar
+        key_version = CANONICAL_VERSION ile işaretlenir; eşleşmeyenler de
+        işaretlenir ve TTL ile düşer.
+        
+        Args:
+            max_page: Eski key eşleştirmesinde denenecek en büyük sayfa
+        
+        Returns:
+            entries, rekeyed, merged, unresolved sayıları
+        """
+        stats = {"entries": 0, "rekeyed": 0, "merged": 0, "unresolved": 0}
+        pages = [None] + list(range(1, max_page + 1))
+        
+        conn = self._get_connection()
+        try:
+            rows = conn.execute('''
+                SELECT cache_key, engine, query, language, doc_type, updated_at, expires_at, hit_count
+                FROM search_cache WHERE COALESCE(key_version, 0) < ?
+            ''', (CANONICAL_VERSION,)).fetchall()
+        finally:
+            conn.close()
+        
+        stats["entries"] = len(rows)
+        groups: Dict[str, List[sqlite3.Row]] = {}
+        done: List[str] = []
+        
+        for row in rows:
+            new_key = None
+            forms = canonical_forms(row['query'])
+            for page in pages:
+                args = (row['engine'], row['query'], row['language'], row['doc_type'], page)
+                keys = [self._legacy_cache_key(*args)] + [
+                    self._hash_key_parts(row['engine'], form, row['language'], row['doc_type'], page)
+                    for form in forms
+                ]
+                if row['cache_key'] in keys:
+                    new_key = self._generate_cache_key(*args)
+                    break
+            
+            if new_key is None:
+                stats["unresolved"] += 1
+                done.append(row['cache_key'])
+                continue
+            groups.setdefault(new_key, []).append(row)
+        
+        for new_key, members in groups.items():
+            if len(members) == 1 and members[0]['cache_key'] == new_key:
+                done.append(new_key)
+                continue
+            
+            # Yeni key'e güncel sürümle yazılmış kayıt da birleşmeye katılır
+            if all(r['cache_key'] != new_key for r in members):
+                conn = self._get_connection()
+                try:
+                    current = conn.execute('''
+                        SELECT cache_key, engine, query, language, doc_type, updated_at, expires_at, hit_count
+                        FROM search_cache WHERE cache_key = ?
+                    ''', (new_key,)).fetchone()
+                finally:
+                    conn.close()
+                if current:
+                    members.append(current)
+            
+            # En son güncellenen kayıt korunur
+            members.sort(key=lambda r: (r['updated_at'] or "", r['expires_at'] or ""), reverse=True)
+            keeper = members[0]['cache_key']
+            expires_at = max(r['expires_at'] for r in members)
+            
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            try:
+                for member in members:
+                    cursor.execute("SELECT results FROM search_cache WHERE cache_key = ?", (member['cache_key'],))
+                    legacy = cursor.fetchone()['results']
+                    if legacy:
+                        self._explode_legacy_blob(cursor, member['cache_key'], legacy)
+                
+                for member in members[1:]:
+                    cursor.execute('''
+                        SELECT COALESCE(MAX(position), -1) + 1 FROM search_cache_results WHERE cache_key = ?
+                    ''', (keeper,))
+                    base = cursor.fetchone()[0]
+                    cursor.execute('''
+                        INSERT OR IGNORE INTO search_cache_results (cache_key, url_norm, position, format_version, result_json)
+                        SELECT ?, url_norm, ? + position, format_version, result_json
+                        FROM search_cache_results WHERE cache_key = ?
+                        ORDER BY position
+                    ''', (keeper, base, member['cache_key']))
+                    cursor.execute("DELETE FROM search_cache_results WHERE cache_key = ?", (member['cache_key'],))
+                    cursor.execute("DELETE FROM search_cache WHERE cache_key = ?", (member['cache_key'],))
+                    stats["merged"] += 1
                 
                 cursor.execute('''
                     UPDATE search_cache SET
-                        results = ?,
-                        result_count = ?,
-                        updated_at = datetime('now'),
-                        expires_at = ?
+                        cache_key = ?,
+                        expires_at = ?,
+                        result_count = (SELECT COUNT(*) FROM search_cache_results WHERE cache_key = ?)
                     WHERE cache_key = ?
-                ''', (
-                    json.dumps(merged_results, ensure_ascii=False),
-                    len(merged_results),
-                    expires_at.isoformat(),
-                    cache_key
-                ))
-                
-                if new_unique_results:
-                    print(f"Cache merge: +{len(new_unique_results)} yeni sonuç eklendi (toplam: {len(merged_results)})")
-            else:
-                # Yeni kayıt
-                cursor.execute('''
-                    INSERT INTO search_cache 
-                    (cache_key, engine, query, language, doc_type, results, result_count, expires_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    cache_key,
-                    engine,
-                    query,
-                    language,
-                    doc_type,
-                    json.dumps(results, ensure_ascii=False),
-                    len(results),
-                    expires_at.isoformat()
-                ))
-                print(f"Cache new: {len(results)} sonuç kaydedildi")
+                ''', (new_key, expires_at, keeper, keeper))
+                cursor.execute(
+                    "UPDATE search_cache_results SET cache_key = ? WHERE cache_key = ?",
+                    (new_key, keeper)
+                )
+                done.append(new_key)
+                # Birleşen kayıtların hit'leri korunur
+                self.eviction.update_entry(
+                    cursor, new_key, extra_hits=sum(r['hit_count'] or 0 for r in members[1:])
+                )
+                conn.commit()
+                stats["rekeyed"] += 1
+            except Exception as e:
+                conn.rollback()
+                print(f"Cache rekey error ({new_key}): {e}")
+                continue
+            finally:
+                conn.close()
+            
+            for member in members:
+                self.memory.invalidate(member['cache_key'])
+            self.memory.invalidate(new_key)
+        
+        if done:
+            conn = self._get_connection()
+            try:
+                conn.executemany(
+                    "UPDATE search_cache SET key_version = ? WHERE cache_key = ?",
+                    [(CANONICAL_VERSION, key) for key in done]
+                )
+                conn.commit()
+            finally:
+                conn.close()
+        
+        if stats["rekeyed"]:
+            self.eviction.reset_total()
+        return stats
+    
+    def recompress_batch(self, after_id: int = 0, batch_size: int = CACHE_RECOMPRESS_BATCH_SIZE) -> Tuple[int, Optional[int]]:
+        """
+        Aktif formatta olmayan sonuç satırlarından bir batch'i yeniden kodla
+        
+        JSON satırlar ve eski sözlükle sıkıştırılmış satırlar aktif sözlüğe taşınır.
+        
+        Args:
+            after_id: Bu id'den sonraki satırlar (kaldığı yerden devam)
+            batch_size: Batch büyüklüğü
+        
+        Returns:
+            (yeniden kodlanan satır sayısı, son id veya bitti ise None)
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute('''
+                SELECT id, cache_key, format_version, result_json FROM search_cache_results
+                WHERE id > ? AND (format_version = 0 OR substr(result_json, 1, 4) != ?)
+                ORDER BY id
+                LIMIT ?
+            ''', (after_id, self.codec.active_header(), batch_size))
+            rows = cursor.fetchall()
+            
+            if not rows:
+                return 0, None
             
+            updates = []
+            size_deltas: Dict[str, int] = {}
+            for row in rows:
+                item = self.codec.decode(row['format_version'], row['result_json'])
+                format_version, payload = self.codec.encode(item)
+                updates.append((format_version, payload, row['id']))
+                delta = payload_size(payload) - payload_size(row['result_json'])
+                size_deltas[row['cache_key']] = size_deltas.get(row['cache_key'], 0) + delta
+            
+            cursor.executemany(
+                "UPDATE search_cache_results SET format_version = ?, result_json = ? WHERE id = ?",
+                updates
+            )
+            
+            cache_keys = set(size_deltas)
+            cursor.executemany(
+                "UPDATE search_cache SET size_bytes = size_bytes + ? WHERE cache_key = ?",
+                [(delta, key) for key, delta in size_deltas.items()]
+            )
             conn.commit()
-            return True
+            self.eviction.add_bytes(sum(size_deltas.values()))
+            
+            for key in cache_keys:
+                self.memory.invalidate(key)
+            
+            return len(rows), rows[-1]['id']
         except Exception as e:
-            print(f"Cache save error: {e}")
-            return False
+            conn.rollback()
+            print(f"Cache recompress error: {e}")
+            return 0, None
         finally:
             conn.close()
     
+    async def recompress_all(self, retrain: bool = False, min_samples: int = 500, pause_seconds: float = 0.05) -> Dict[str, Any]:
+        """
+        Tüm sonuç satırlarını aktif formata taşı (arka plan işi)
+        
+        Henüz sözlük yoksa ve yeterli örnek varsa önce sözlük eğitilir.
+        
+        Args:
+            retrain: Mevcut sözlük olsa da yenisini eğit
+            min_samples: Sözlük eğitimi için gereken minimum satır
+            pause_seconds: Batch'ler arası bekleme (diğer toplu yazmalara sıra vermek için)
+        
+        Sayım okuma thread'inde, sözlük eğitimi ve her batch toplu yazıcı
+        thread'inde çalışır; event loop bloklanmaz.
+        """
+        if not self.codec.enabled:
+            return {"message": "Compression disabled", "recompressed": 0}
+        
+        async_db = get_async_db(self.db_path)
+        
+        if retrain or not self.codec.active_dict_id:
+            total_rows = await async_db.fetch_value("SELECT COUNT(*) FROM search_cache_results")
+            if total_rows >= min_samples:
+                await async_db.write_bulk(self.codec.train_dictionary)
+        
+        recompressed = 0
+        after_id = 0
+        while True:
+            count, after_id = await async_db.write_bulk(self.recompress_batch, after_id)
+            if after_id is None:
+                break
+            recompressed += count
+            await asyncio.sleep(pause_seconds)
+        
+        return {"recompressed": recompressed, "dictionary_id": self.codec.active_dict_id}
+    
     def clear_expired_cache(self) -> int:
         """Süresi dolmuş cache kayıtlarını temizle"""
         conn = self._get_connection()
         cursor = conn.cursor()
         
         try:
+            cursor.execute('''
+                DELETE FROM search_cache_results WHERE cache_key IN (
+                    SELECT cache_key FROM search_cache WHERE expires_at < datetime('now')
+                )
+            ''')
             cursor.execute("DELETE FROM search_cache WHERE expires_at < datetime('now')")
             deleted_count = cursor.rowcount
             conn.commit()
+            if deleted_count:
+                self.memory.clear()
+                self.eviction.reset_total()
             return deleted_count
         finally:
             conn.close()
@@ -163,9 +706,16 @@ class CacheManager:
         cursor = conn.cursor()
         
         try:
+            cursor.execute('''
+                DELETE FROM search_cache_results WHERE cache_key IN (
+                    SELECT cache_key FROM search_cache WHERE engine = ?
+                )
+            ''', (engine,))
             cursor.execute("DELETE FROM search_cache WHERE engine = ?", (engine,))
             deleted_count = cursor.rowcount
             conn.commit()
+            self.memory.invalidate_engine(engine)
+            self.eviction.reset_total()
             return deleted_count
         finally:
             conn.close()
@@ -176,9 +726,12 @@ class CacheManager:
         cursor = conn.cursor()
         
         try:
+            cursor.execute("DELETE FROM search_cache_results")
             cursor.execute("DELETE FROM search_cache")
             deleted_count = cursor.rowcount
             conn.commit()
+            self.memory.clear()
+            self.eviction.reset_total()
             return deleted_count
         finally:
             conn.close()
@@ -196,7 +749,7 @@ class CacheManager:
             # Motor bazında
             cursor.execute('''
                 SELECT engine, COUNT(*) as count, SUM(result_count) as total_results
-                FROM search_cache 
+                FROM search_cache
                 WHERE expires_at > datetime('now')
                 GROUP BY engine
             ''')
@@ -213,8 +766,9 @@ class CacheManager:
                 'total_cached': total,
                 'expired': expired,
                 'active': total - expired,
-                'by_engine': by_engine
+                'by_engine': by_engine,
+                'memory': self.memory.get_stats(),
+                'eviction': self.eviction.get_stats()
             }
         finally:
             conn.close()
-
@@ -0,0 +1,321 @@
+"""
+Cache Warmer - search_logs popülerliğine göre cache ön ısıtma
+
+Akış:
+1. search_logs'tan sık ve yakın zamanda aranan sorgular çıkarılır
+2. Her sorgu multi-search ile aynı şekilde (build_search_query) yeniden kurulur
+3. Motor/dil/sayfa kombinasyonlarından cache'te olmayan veya stale olanlar bulunur
+4. API kredi bütçesi ve eşzamanlılık limiti içinde önceden çekilir
+
+Kullanım:
+    python -m src.cache_warmer --top 50 --budget 200 --concurrency 4
+    python -m src.cache_warmer --dry-run
+"""
+import asyncio
+import argparse
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Dict, Optional, Any, Tuple
+
+from src.config import (
+    DATABASE_PATH, SEARCH_ENGINES,
+    CACHE_WARMUP_TOP_N, CACHE_WARMUP_BUDGET, CACHE_WARMUP_CONCURRENCY,
+    CACHE_WARMUP_LOOKBACK_DAYS, CACHE_WARMUP_ENGINE_COST
+)
+from src.data.brands import BRAND_LIST, get_brand_aliases
+from src.search.query_builder import build_search_query
+from src.search.query_canonical import canonicalize_query
+from src.utils import map_doc_type_to_category
+from src.db_pool import get_db_pool
+from src.async_db import get_async_db
+
+logger = logging.getLogger(__name__)
+
+# multi-search ile aynı parametreler (cache key'lerinin eşleşmesi için)
+WARMUP_LANGUAGES = ["en"]
+WARMUP_PAGES = [1]
+WARMUP_COUNT_PER_ENGINE = 50
+
+
+@dataclass
+class PopularQuery:
+    query: str
+    doc_type: Optional[str]
+    search_count: int
+    last_seen: str
+    engines: List[str]
+    score: float = 0.0
+
+
+@dataclass
+class WarmupTask:
+    engine: str
+    query: str
+    language: str
+    category: str
+    page: int
+    cost: int
+    reason: str  # missing, stale
+
+
+def split_logged_query(logged_query: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    search_logs.query'yi (marka, model) olarak ayır
+
+    multi-search logu "marka model" veya serbest metin olarak yazar.
+    Marka, kullanıcının yazdığı haliyle (alias dahil) korunur.
+    """
+    text = logged_query.strip()
+    text_lower = text.lower()
+
+    best = None
+    for brand in BRAND_LIST:
+        for alias in get_brand_aliases(brand):
+            alias_lower = alias.lower()
+            if text_lower == alias_lower or text_lower.startswith(alias_lower + " "):
+                if best is None or len(alias_lower) > len(best):
+                    best = alias_lower
+
+    if best is None:
+        return None, text or None
+
+    model = text[len(best):].strip()
+    return text[:len(best)], model or None
+
+
+class CacheWarmer:
+    """search_logs tabanlı cache ön ısıtıcı"""
+
+    def __init__(self, coordinator, db_path: Optional[str] = None):
+        self.coordinator = coordinator
+        self.cache = coordinator.cache
+        self.db_path = db_path or DATABASE_PATH
+
+    def _get_connection(self):
+        return get_db_pool(self.db_path).acquire()
+
+    def get_popular_queries(
+        self,
+        top_n: int = CACHE_WARMUP_TOP_N,
+        lookback_days: int = CACHE_WARMUP_LOOKBACK_DAYS
+    ) -> List[PopularQuery]:
+        """
+        Sıklık ve yakınlığa göre en popüler sorguları getir
+
+        Skor = arama sayısı / (1 + son aramadan bu yana geçen gün)
+        """
+        conn = self._get_connection()
+
+        try:
+            rows = conn.execute('''
+                SELECT query, doc_type, COUNT(*) AS search_count,
+                       MAX(created_at) AS last_seen, MAX(id) AS last_id
+                FROM search_logs
+                WHERE created_at > datetime('now', ?)
+                  AND doc_type IS NOT 'scan_source'
+                  AND query != ''
+                GROUP BY query, doc_type
+                ORDER BY search_count DESC
+                LIMIT ?
+            ''', (f"-{lookback_days} days", top_n * 5)).fetchall()
+
+            if not rows:
+                return []
+
+            # Son aramada kullanılan motorlar
+            placeholders = ",".join("?" * len(rows))
+            engines_by_id = {
+                r['id']: r['engines_used']
+                for r in conn.execute(
+                    f"SELECT id, engines_used FROM search_logs WHERE id IN ({placeholders})",
+                    [row['last_id'] for row in rows]
+                )
+            }
+        finally:
+            conn.close()
+
+        now = datetime.utcnow()
+        popular = []
+
+        for row in rows:
+            try:
+                engines = json.loads(engines_by_id.get(row['last_id']) or "[]")
+            except (TypeError, ValueError):
+                engines = []
+
+            try:
+                age_days = (now - datetime.fromisoformat(row['last_seen'])).total_seconds() / 86400
+            except (TypeError, ValueError):
+                age_days = lookback_days
+
+            popular.append(PopularQuery(
+                query=row['query'],
+                doc_type=row['doc_type'],
+                search_count=row['search_count'],
+                last_seen=row['last_seen'],
+                engines=engines,
+                score=row['search_count'] / (1 + max(age_days, 0))
+            ))
+
+        popular.sort(key=lambda q: q.score, reverse=True)
+        return popular[:top_n]
+
+    def plan(self, popular: List[PopularQuery]) -> List[WarmupTask]:
+        """Cache'te eksik veya stale olan motor/dil/sayfa kombinasyonlarını bul"""
+        default_engines = [name for name, config in SEARCH_ENGINES.items() if config.get("enabled", True)]
+        tasks = []
+        seen = set()
+
+        for pq in popular:
+            brand, model = split_logged_query(pq.query)
+            category = map_doc_type_to_category(pq.doc_type)
+            engines = [e for e in (pq.engines or default_engines) if e in self.coordinator.engines]
+
+            for language in WARMUP_LANGUAGES:
+                query = build_search_query(
+                    brand=brand,
+                    model=model,
+                    category=category,
+                    max_terms=4,
+                    engine="google",
+                    language=language
+                )
+
+                for engine in engines:
+                    for page in WARMUP_PAGES:
+                        key = (engine, canonicalize_query(query), language, category, page)
+                        if key in seen:
+                            continue
+                        seen.add(key)
+
+                        age = self.cache.get_entry_age(engine, query, language, category, page)
+                        if age is None:
+                            reason = "missing"
+                        elif age > self.cache.get_ttl(engine)[0]:
+                            reason = "stale"
+                        else:
+                            continue
+
+                        tasks.append(WarmupTask(
+                            engine=engine,
+                            query=query,
+                            language=language,
+                            category=category,
+                            page=page,
+                            cost=CACHE_WARMUP_ENGINE_COST.get(engine, 1),
+                            reason=reason
+                        ))
+
+        return tasks
+
+    async def run(
+        self,
+        top_n: int = CACHE_WARMUP_TOP_N,
+        budget: int = CACHE_WARMUP_BUDGET,
+        concurrency: int = CACHE_WARMUP_CONCURRENCY,
+        dry_run: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Ön ısıtmayı çalıştır
+
+        Args:
+            top_n: Değerlendirilecek popüler sorgu sayısı
+            budget: Harcanabilecek toplam API kredisi
+            concurrency: Aynı anda çalışan upstream çağrı sayısı
+            dry_run: Sadece planla, API çağrısı yapma
+
+        Returns:
+            Çalışma istatistikleri
+        """
+        if not self.cache:
+            return {"message": "Cache disabled"}
+
+        # Log taraması ve plan (görev başına bir cache yaşı sorgusu) okuma thread'lerinde
+        async_db = get_async_db(self.db_path)
+        popular = await async_db.run(self.get_popular_queries, top_n)
+        tasks = await async_db.run(self.plan, popular)
+
+        # Bütçeye sığanları seç (plan popülerlik sırasında)
+        selected = []
+        spent = 0
+        for task in tasks:
+            if spent + task.cost > budget:
+                continue
+            selected.append(task)
+            spent += task.cost
+
+        stats = {
+            "popular_queries": len(popular),
+            "candidates": len(tasks),
+            "selected": len(selected),
+            "skipped_budget": len(tasks) - len(selected),
+            "credits_planned": spent,
+            "warmed": 0,
+            "failed": 0,
+            "dry_run": dry_run
+        }
+
+        if dry_run or not selected:
+            return stats
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def warm(task: WarmupTask):
+            async with semaphore:
+                result = await self.coordinator.search_single_engine(
+                    engine_name=task.engine,
+                    query=task.query,
+                    count=WARMUP_COUNT_PER_ENGINE,
+                    language=task.language,
+                    doc_type=task.category,
+                    use_cache=False,
+                    page=task.page,
+                    refresh=True
+                )
+                return result
+
+        results = await asyncio.gather(*(warm(t) for t in selected), return_exceptions=True)
+
+        for task, result in zip(selected, results):
+            if isinstance(result, Exception) or result.get("error"):
+                stats["failed"] += 1
+                error = result if isinstance(result, Exception) else result.get("error")
+                logger.warning(f"Ön ısıtma hatası {task.engine} '{task.query}': {error}")
+            else:
+                stats["warmed"] += 1
+
+        logger.info(
+            f"Cache ön ısıtma: {stats['warmed']} ısıtıldı, {stats['failed']} hata, "
+            f"{stats['credits_planned']}/{budget} kredi"
+        )
+        return stats
+
+
+async def _main(args) -> None:
+    from src.multi_search import MultiSearchCoordinator
+
+    coordinator = MultiSearchCoordinator(use_cache=True)
+    try:
+        warmer = CacheWarmer(coordinator)
+        stats = await warmer.run(
+            top_n=args.top,
+            budget=args.budget,
+            concurrency=args.concurrency,
+            dry_run=args.dry_run
+        )
+        print(json.dumps(stats, ensure_ascii=False, indent=2))
+    finally:
+        await coordinator.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="search_logs tabanlı cache ön ısıtma")
+    parser.add_argument("--top", type=int, default=CACHE_WARMUP_TOP_N, help="Popüler sorgu sayısı")
+    parser.add_argument("--budget", type=int, default=CACHE_WARMUP_BUDGET, help="API kredi bütçesi")
+    parser.add_argument("--concurrency", type=int, default=CACHE_WARMUP_CONCURRENCY, help="Eşzamanlı çağrı")
+    parser.add_argument("--dry-run", action="store_true", help="Sadece planla, API çağrısı yapma")
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(parser.parse_args()))
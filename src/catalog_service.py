@@ -8,7 +8,6 @@ import uuid
 import base64
 import asyncio
 import logging
-import sqlite3
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Generator
@@ -21,6 +20,8 @@ import anthropic
 load_dotenv(Path(__file__).parent.parent / ".env")
 
 from src.config import DATABASE_PATH
+from src.db_pool import get_db_pool
+from src.pagination import KeysetSort, keyset_page, count_rows, resolve_count_mode, page_info
 
 # Logging
 logger = logging.getLogger(__name__)
@@ -29,6 +30,9 @@ logger = logging.getLogger(__name__)
 UPLOADS_DIR = Path(__file__).parent.parent / "uploads"
 UPLOADS_DIR.mkdir(exist_ok=True)
 
+# Katalog listesi sıralaması (keyset)
+CATALOGS_SORT = KeysetSort(column="created_at", key="created_at", nullable=True)
+
 
 class CatalogService:
     """Katalog yükleme ve analiz servisi"""
@@ -45,9 +49,7 @@ class CatalogService:
             logger.warning("[CatalogService] ANTHROPIC_API_KEY ayarlanmamış!")
     
     def _get_connection(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        return get_db_pool(self.db_path).acquire()
     
     # ============================================
     # YÜKLEME
@@ -465,37 +467,42 @@ JSON formatında yanıt ver:
     # KATALOG LİSTELEME
     # ============================================
     
-    def get_user_catalogs(self, user_id: int, page: int = 1, per_page: int = 20) -> Dict:
-        """Kullanıcının kataloglarını listele"""
+    def get_user_catalogs(
+        self,
+        user_id: int,
+        page: int = 1,
+        per_page: int = 20,
+        cursor: Optional[str] = None,
+        count: Optional[str] = None
+    ) -> Dict:
+        """Kullanıcının kataloglarını listele (cursor: önceki yanıtın next_cursor'ı)"""
+        count_mode = resolve_count_mode(count, cursor)
         conn = self._get_connection()
-        cursor = conn.cursor()
+        db_cursor = conn.cursor()
         
         try:
+            conditions = ["user_id = ?"]
+            params = [user_id]
+            
             # Toplam sayı
-            cursor.execute("""
-                SELECT COUNT(*) FROM user_catalogs WHERE user_id = ?
-            """, (user_id,))
-            total = cursor.fetchone()[0]
+            total = count_rows(db_cursor, "FROM user_catalogs", conditions, params, count_mode)
             
             # Kataloglar
-            cursor.execute("""
-                SELECT id, filename, original_name, file_size, total_pages,
-                       brand, model, catalog_type, status, progress, progress_message,
-                       created_at, analyzed_at, last_viewed
-                FROM user_catalogs
-                WHERE user_id = ?
-                ORDER BY created_at DESC
-                LIMIT ? OFFSET ?
-            """, (user_id, per_page, (page - 1) * per_page))
+            rows, next_cursor = keyset_page(
+                db_cursor,
+                """SELECT id, filename, original_name, file_size, total_pages,
+                          brand, model, catalog_type, status, progress, progress_message,
+                          created_at, analyzed_at, last_viewed
+                   FROM user_catalogs""",
+                conditions, params, CATALOGS_SORT,
+                after=cursor, page=page, per_page=per_page
+            )
             
-            catalogs = [dict(row) for row in cursor.fetchall()]
+            catalogs = [dict(row) for row in rows]
             
             return {
                 "items": catalogs,
-                "total": total,
-                "page": page,
-                "per_page": per_page,
-                "pages": (total + per_page - 1) // per_page
+                **page_info(total, page, per_page, next_cursor, count_mode)
             }
         finally:
             conn.close()
@@ -22,9 +22,196 @@ SEARCHAPI_KEY = os.getenv("SEARCHAPI_KEY", "")
 # =============================================================================
 DATABASE_PATH = os.path.join("data", "pepc.db")
 
+# SQLite bağlantı havuzu (thread başına kalıcı bağlantı)
+DB_BUSY_TIMEOUT_MS = int(os.getenv("DB_BUSY_TIMEOUT_MS", 5000))
+DB_CACHE_SIZE_KB = int(os.getenv("DB_CACHE_SIZE_KB", 16 * 1024))  # Bağlantı başına 16 MB sayfa cache'i
+DB_MMAP_SIZE = int(os.getenv("DB_MMAP_SIZE", 256 * 1024 * 1024))  # 256 MB
+DB_POOL_MAX_IDLE_PER_THREAD = int(os.getenv("DB_POOL_MAX_IDLE_PER_THREAD", 4))
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 256))
+
+# Cache / log / keşif tabloları ayrı dosyalarda (pepc_cache.db, pepc_logs.db,
+# pepc_discovery.db), ana dosyaya ATTACH edilir; kullanıcı / ödeme yazmaları
+# bu tabloların yazma kilidini beklemez
+DB_SPLIT_STORES = os.getenv("DB_SPLIT_STORES", "true").lower() == "true"
+
+# auto_vacuum=INCREMENTAL olmadan oluşturulmuş dosyalar başlangıçta bir kez
+# VACUUM ile dönüştürülür (aksi halde incremental_vacuum boşalan sayfaları geri vermez)
+DB_CONVERT_AUTO_VACUUM = os.getenv("DB_CONVERT_AUTO_VACUUM", "true").lower() == "true"
+
+# Async endpoint'ler için veritabanı executor'ı (okuma thread'leri + tek yazıcı thread)
+DB_EXECUTOR_READ_WORKERS = int(os.getenv("DB_EXECUTOR_READ_WORKERS", 4))
+DB_EXECUTOR_MAX_PENDING = int(os.getenv("DB_EXECUTOR_MAX_PENDING", 256))  # Kuyrukta bekleyebilecek iş sayısı
+
+# Arama sonuçlarının toplu kaydı (discovered_pdfs / premium_results upsert hattı)
+BULK_UPSERT_FLUSH_SECONDS = float(os.getenv("BULK_UPSERT_FLUSH_SECONDS", 2))
+BULK_UPSERT_MAX_BATCH = int(os.getenv("BULK_UPSERT_MAX_BATCH", 1000))  # Dolunca beklemeden yazılır
+BULK_UPSERT_MAX_PENDING = int(os.getenv("BULK_UPSERT_MAX_PENDING", 20000))  # Tampon sınırı, aşılınca en eskiler atılır
+
+# search_logs / admin_logs yazma tamponu (write-behind)
+LOG_FLUSH_ROWS = int(os.getenv("LOG_FLUSH_ROWS", 100))  # Bu kadar satır birikince hemen yaz
+LOG_FLUSH_INTERVAL_MS = int(os.getenv("LOG_FLUSH_INTERVAL_MS", 1000))  # Çökmede kaybolabilecek en uzun pencere
+LOG_MAX_BUFFER_ROWS = int(os.getenv("LOG_MAX_BUFFER_ROWS", 10000))  # Bellek sınırı (aşılırsa en eski satırlar atılır)
+
+# Liste endpoint'leri: count=estimate ile dönen toplamların en fazla yaşı
+PAGINATION_COUNT_CACHE_SECONDS = int(os.getenv("PAGINATION_COUNT_CACHE_SECONDS", 60))
+# Kayıtlı link listesinin domain / marka filtre seçeneklerinin en fazla yaşı
+DISCOVERED_PDFS_FILTERS_CACHE_SECONDS = int(os.getenv("DISCOVERED_PDFS_FILTERS_CACHE_SECONDS", 300))
+
+# Eski log / geçmiş satırlarının aylık arşiv dosyalarına taşınması (0 = taşıma yok)
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", os.path.join("data", "archive"))
+SEARCH_LOGS_RETENTION_DAYS = int(os.getenv("SEARCH_LOGS_RETENTION_DAYS", 180))
+ADMIN_LOGS_RETENTION_DAYS = int(os.getenv("ADMIN_LOGS_RETENTION_DAYS", 365))
+CATALOG_PROGRESS_RETENTION_DAYS = int(os.getenv("CATALOG_PROGRESS_RETENTION_DAYS", 30))
+SCAN_HISTORY_RETENTION_DAYS = int(os.getenv("SCAN_HISTORY_RETENTION_DAYS", 180))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", 500))  # Tek yazma transaction'ında taşınan satır
+ARCHIVE_BATCH_PAUSE_MS = int(os.getenv("ARCHIVE_BATCH_PAUSE_MS", 50))  # Batch'ler arası diğer yazıcılara bırakılan süre
+ARCHIVE_INTERVAL_HOURS = int(os.getenv("ARCHIVE_INTERVAL_HOURS", 24))
+ARCHIVE_COUNT_CACHE_SIZE = int(os.getenv("ARCHIVE_COUNT_CACHE_SIZE", 1024))  # Dosya başına cache'lenen arşiv sayımları
+
 # Cache Configuration
 CACHE_EXPIRY_DAYS = 3650  # Sonuçları 10 yıl sakla (pratik olarak sonsuza kadar)
 
+# Stale-while-revalidate: soft TTL aşılınca cache hemen sunulur ve arka planda
+# yenilenir, hard TTL aşılınca kayıt yok sayılır (canlı arama yapılır)
+CACHE_TTL_DEFAULT = {
+    "soft_seconds": 7 * 24 * 3600,  # 7 gün
+    "hard_seconds": CACHE_EXPIRY_DAYS * 24 * 3600,
+}
+CACHE_TTL_BY_ENGINE = {
+    "serper": {"soft_seconds": 3 * 24 * 3600},
+    "serper_premium": {"soft_seconds": 3 * 24 * 3600},
+    "searchapi_google": {"soft_seconds": 3 * 24 * 3600},
+    "searchapi_baidu": {"soft_seconds": 30 * 24 * 3600},
+    "searchapi_naver": {"soft_seconds": 30 * 24 * 3600},
+}
+
+# Arka plan cache yenileme kuyruğu
+CACHE_REFRESH_QUEUE_SIZE = int(os.getenv("CACHE_REFRESH_QUEUE_SIZE", 100))
+CACHE_REFRESH_WORKERS = int(os.getenv("CACHE_REFRESH_WORKERS", 2))
+
+# Cache disk bütçesi (GDSF tahliye)
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", 256 * 1024 * 1024))  # 256 MB
+CACHE_EVICTION_LOW_WATERMARK = float(os.getenv("CACHE_EVICTION_LOW_WATERMARK", 0.9))
+CACHE_EVICTION_BATCH_SIZE = int(os.getenv("CACHE_EVICTION_BATCH_SIZE", 100))
+CACHE_EVICTION_INTERVAL_SECONDS = int(os.getenv("CACHE_EVICTION_INTERVAL_SECONDS", 300))
+
+# Cache payload sıkıştırma (zlib + paylaşımlı sözlük)
+# Varsayılan kapalı: benchmarks/cache_compression.py'de çözme maliyeti kazanılan
+# I/O'dan yüksek çıktı (key başına ~0.9 ms). Yavaş diskte benchmark net kazanç
+# gösterirse açın; kapalıyken de sıkıştırılmış satırlar okunabilir
+CACHE_COMPRESSION_ENABLED = os.getenv("CACHE_COMPRESSION_ENABLED", "false").lower() == "true"
+CACHE_COMPRESSION_LEVEL = int(os.getenv("CACHE_COMPRESSION_LEVEL", 6))
+CACHE_DICT_MAX_BYTES = 32 * 1024  # zlib sözlük penceresi
+CACHE_RECOMPRESS_BATCH_SIZE = int(os.getenv("CACHE_RECOMPRESS_BATCH_SIZE", 500))
+CACHE_RECOMPRESS_INTERVAL_HOURS = int(os.getenv("CACHE_RECOMPRESS_INTERVAL_HOURS", 24))
+
+# Cache ön ısıtma (search_logs popülerliğine göre)
+CACHE_WARMUP_ON_STARTUP = os.getenv("CACHE_WARMUP_ON_STARTUP", "false").lower() == "true"
+CACHE_WARMUP_INTERVAL_HOURS = int(os.getenv("CACHE_WARMUP_INTERVAL_HOURS", 24))
+CACHE_WARMUP_TOP_N = int(os.getenv("CACHE_WARMUP_TOP_N", 50))
+CACHE_WARMUP_BUDGET = int(os.getenv("CACHE_WARMUP_BUDGET", 200))  # API kredisi
+CACHE_WARMUP_CONCURRENCY = int(os.getenv("CACHE_WARMUP_CONCURRENCY", 4))
+CACHE_WARMUP_LOOKBACK_DAYS = int(os.getenv("CACHE_WARMUP_LOOKBACK_DAYS", 30))
+# Motor başına tahmini API kredisi (50 sonuç = sayfalı çağrılar)
+CACHE_WARMUP_ENGINE_COST = {
+    "serper": 5,
+    "brave": 3,
+    "yandex": 1,
+    "searchapi_bing": 1,
+    "searchapi_google": 1,
+    "searchapi_baidu": 1,
+    "searchapi_naver": 1,
+}
+
+# Bellek içi LRU katmanı (search_cache önünde)
+MEMORY_CACHE_MAX_BYTES = int(os.getenv("MEMORY_CACHE_MAX_BYTES", 64 * 1024 * 1024))  # 64 MB
+MEMORY_CACHE_TTL_SECONDS = int(os.getenv("MEMORY_CACHE_TTL_SECONDS", 600))  # 10 dakika
+
+# =============================================================================
+# HTTP Client Configuration
+# =============================================================================
+# Paylaşımlı aiohttp oturumları (src/http_client.py): DNS cache, keep-alive ve
+# happy-eyeballs tüm istekler arasında paylaşılır
+HTTP_DNS_CACHE_TTL = int(os.getenv("HTTP_DNS_CACHE_TTL", 300))  # saniye
+HTTP_KEEPALIVE_TIMEOUT = int(os.getenv("HTTP_KEEPALIVE_TIMEOUT", 60))  # Boştaki bağlantının ömrü (saniye)
+HTTP_HAPPY_EYEBALLS_DELAY = float(os.getenv("HTTP_HAPPY_EYEBALLS_DELAY", 0.25))  # IPv6 → IPv4 geçiş gecikmesi
+# Amaç başına bağlantı havuzu: limit (toplam), limit_per_host, timeout (saniye, istek başına geçersiz kılınabilir)
+HTTP_POOLS = {
+    # Arama / scraping API'leri: az sayıda host, host başına yüksek eşzamanlılık
+    "api": {
+        "limit": int(os.getenv("HTTP_API_LIMIT", 100)),
+        "limit_per_host": int(os.getenv("HTTP_API_LIMIT_PER_HOST", 32)),
+        "timeout": 30,
+    },
+    # Üretici sitelerinde dizin gezme: çok sayıda host, host başına nazik
+    "crawl": {
+        "limit": int(os.getenv("HTTP_CRAWL_LIMIT", 100)),
+        "limit_per_host": int(os.getenv("HTTP_CRAWL_LIMIT_PER_HOST", 10)),
+        "timeout": 30,
+    },
+    # PDF HEAD / Range / indirme
+    "pdf": {
+        "limit": int(os.getenv("HTTP_PDF_LIMIT", 100)),
+        "limit_per_host": int(os.getenv("HTTP_PDF_LIMIT_PER_HOST", 5)),
+        "timeout": 60,
+    },
+}
+
+# =============================================================================
+# Multi-Search Deadline / Hedging
+# =============================================================================
+# Çoklu motor aramasında süre bütçesi (saniye, 0 = sınırsız). Bütçe dolunca
+# bitmemiş motorlar beklenmez, yanıt "partial" işaretlenir; geç kalan
+# istekler arka planda tamamlanıp cache'i doldurur
+SEARCH_DEADLINE_SECONDS = float(os.getenv("SEARCH_DEADLINE_SECONDS", 8))
+# Motor gecikme penceresi (son N upstream çağrı) ve yüzdelik için en az örnek
+SEARCH_LATENCY_WINDOW = int(os.getenv("SEARCH_LATENCY_WINDOW", 200))
+SEARCH_LATENCY_MIN_SAMPLES = int(os.getenv("SEARCH_LATENCY_MIN_SAMPLES", 20))
+# Hedge: p95'i bu eşiği aşan motorlara, istek p75 süresini geçince yedek istek
+# gönderilir; önce biten kullanılır, diğeri iptal edilir (ek kota harcar)
+SEARCH_HEDGE_ENABLED = os.getenv("SEARCH_HEDGE_ENABLED", "true").lower() == "true"
+SEARCH_HEDGE_P95_SECONDS = float(os.getenv("SEARCH_HEDGE_P95_SECONDS", 4))
+SEARCH_HEDGE_DELAY_PERCENTILE = float(os.getenv("SEARCH_HEDGE_DELAY_PERCENTILE", 75))
+
+# =============================================================================
+# Rate Limiting (arama / scraping API kotaları)
+# =============================================================================
+# Motor (API anahtarı) başına token bucket + AIMD eşzamanlılık (src/rate_limiter.py)
+# qps: saniyedeki istek, burst: kova kapasitesi, concurrency: en fazla eşzamanlı istek
+ENGINE_RATE_LIMITS = {
+    "serper": {
+        "qps": float(os.getenv("SERPER_QPS", 5)),
+        "burst": int(os.getenv("SERPER_BURST", 10)),
+        "concurrency": int(os.getenv("SERPER_CONCURRENCY", 10)),
+    },
+    "brave": {
+        "qps": float(os.getenv("BRAVE_QPS", 5)),
+        "burst": int(os.getenv("BRAVE_BURST", 5)),
+        "concurrency": int(os.getenv("BRAVE_CONCURRENCY", 5)),
+    },
+    # Bing / Google / Baidu / Naver aynı SearchApi anahtarını ve kotasını paylaşır
+    "searchapi": {
+        "qps": float(os.getenv("SEARCHAPI_QPS", 5)),
+        "burst": int(os.getenv("SEARCHAPI_BURST", 10)),
+        "concurrency": int(os.getenv("SEARCHAPI_CONCURRENCY", 10)),
+    },
+    "yandex": {
+        "qps": float(os.getenv("YANDEX_QPS", 5)),
+        "burst": int(os.getenv("YANDEX_BURST", 5)),
+        "concurrency": int(os.getenv("YANDEX_CONCURRENCY", 10)),
+    },
+    "firecrawl": {
+        "qps": float(os.getenv("FIRECRAWL_QPS", 1)),
+        "burst": int(os.getenv("FIRECRAWL_BURST", 2)),
+        "concurrency": int(os.getenv("FIRECRAWL_CONCURRENCY", 2)),
+    },
+}
+# 429 sonrası aynı isteğin en fazla tekrar sayısı (Retry-After kadar beklenir)
+RATE_LIMIT_MAX_RETRIES = int(os.getenv("RATE_LIMIT_MAX_RETRIES", 2))
+# Retry-After yoksa geri çekilme: ilk bekleme ve üst sınır (saniye)
+RATE_LIMIT_BACKOFF_SECONDS = float(os.getenv("RATE_LIMIT_BACKOFF_SECONDS", 1))
+RATE_LIMIT_MAX_BACKOFF_SECONDS = float(os.getenv("RATE_LIMIT_MAX_BACKOFF_SECONDS", 60))
+
 # =============================================================================
 # Thumbnail Configuration
 # =============================================================================
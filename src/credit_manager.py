@@ -2,12 +2,13 @@
 Credit Manager - Kredi Yönetimi
 Tier bazlı erişim kontrolü ve kredi hesaplama/düşme
 """
-import sqlite3
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
 from src.config import DATABASE_PATH
 from src.settings_manager import get_settings_manager
+from src.db_pool import get_db_pool
+from src.log_writer import get_log_writer
 
 
 # ================================================================
@@ -59,9 +60,7 @@ class CreditManager:
         self.settings = get_settings_manager()
     
     def _get_connection(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        return get_db_pool(self.db_path).acquire()
     
     def get_tier_config(self, tier: str) -> Dict[str, Any]:
         """Tier yapılandırmasını al"""
@@ -284,36 +283,12 @@ class CreditManager:
         is_cached: bool,
         ip_address: str = None,
         user_agent: str = None
-    ) -> int:
-        """Arama logla"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        try:
-            import json
-            
-            cursor.execute("""
-                INSERT INTO search_logs 
-                (user_id, query, doc_type, engines_used, result_count, 
-                 credits_used, is_cached, ip_address, user_agent)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                user_id,
-                query,
-                doc_type,
-                json.dumps(engines_used),
-                result_count,
-                credits_used,
-                is_cached,
-                ip_address,
-                user_agent
-            ))
-            
-            log_id = cursor.lastrowid
-            conn.commit()
-            return log_id
-        finally:
-            conn.close()
+    ) -> None:
+        """Arama logla (write-behind tampon, toplu yazılır)"""
+        get_log_writer(self.db_path).log_search(
+            user_id, query, doc_type, engines_used, result_count,
+            credits_used, is_cached, ip_address, user_agent
+        )
     
     def get_pricing(self) -> Dict[str, Any]:
         """Fiyatlandırma bilgilerini al (frontend için)"""
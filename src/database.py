@@ -1,30 +1,45 @@
-import sqlite3
 import os
 import json
 from datetime import datetime
 from typing import List, Dict, Optional, Any
 
-from src.config import DATABASE_PATH
+from src.config import DATABASE_PATH, DB_CONVERT_AUTO_VACUUM
+from src.db_pool import get_db_pool
+from src.fts_index import ensure_fts_tables, build_match_query, combine_match_queries, fts_rank_subquery
+from src.migrations import apply_migrations, convert_auto_vacuum, split_statements
+from src.query_stats import backfill_query_stats
+from src.storage import attached_stores, migrate_to_stores, route_ddl, table_schema
 
 class PEPCDatabase:
     """SQLite veritabanı yönetimi - Gelişmiş Sürüm"""
     
+    # db_path → fts_enabled (init_database tamamlanmış dosyalar)
+    _initialized: Dict[str, bool] = {}
+    
     def __init__(self, db_path: Optional[str] = None):
         self.db_path = db_path or os.getenv('DATABASE_PATH') or DATABASE_PATH
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        self.init_database()
+        
+        # Şema kurulumu ve migration'lar süreç başına bir kez
+        if self.db_path in self._initialized:
+            self.fts_enabled = self._initialized[self.db_path]
+        else:
+            self.init_database()
+            self._initialized[self.db_path] = self.fts_enabled
     
     def get_connection(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        return get_db_pool(self.db_path).acquire()
 
     def init_database(self):
         """Tabloları oluştur"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        cursor.executescript('''
+        # Tek dosyalı eski veritabanlarında cache / log / keşif tablolarını kendi dosyalarına taşı
+        stores = attached_stores(conn)
+        migrate_to_stores(conn)
+        
+        schema_sql = '''
             -- PDF Kaynakları (Siteler)
             CREATE TABLE IF NOT EXISTS pdf_sources (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -94,11 +109,36 @@ class PEPCDatabase:
                 result_count INTEGER DEFAULT 0,
                 page_count INTEGER,
                 file_size_bytes INTEGER,
+                size_bytes INTEGER DEFAULT 0,  -- Sonuç satırlarının toplam boyutu
+                hit_count INTEGER DEFAULT 0,
+                last_accessed_at DATETIME,
+                priority REAL DEFAULT 0,  -- GDSF tahliye önceliği
+                key_version INTEGER DEFAULT 0,  -- cache_key'i üreten kanonik sorgu sürümü
                 created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
                 updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
                 expires_at DATETIME NOT NULL
             );
             
+            -- Search Cache Sonuçları (URL bazlı, merge = INSERT OR IGNORE)
+            CREATE TABLE IF NOT EXISTS search_cache_results (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                cache_key TEXT NOT NULL REFERENCES search_cache(cache_key) ON DELETE CASCADE,
+                url_norm TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                result_json TEXT NOT NULL,  -- format_version'a göre JSON metni veya sıkıştırılmış BLOB
+                format_version INTEGER DEFAULT 0,  -- 0: JSON, 1: zlib + sözlük
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(cache_key, url_norm)
+            );
+            
+            -- Cache sıkıştırma sözlükleri (değişmez, yeni sözlük = yeni id)
+            CREATE TABLE IF NOT EXISTS cache_dictionaries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                dictionary BLOB NOT NULL,
+                sample_count INTEGER,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            );
+            
             -- ================================================================
             -- KULLANICI VE KREDİ SİSTEMİ TABLOLARI
             -- ================================================================
@@ -391,29 +431,76 @@ class PEPCDatabase:
             CREATE INDEX IF NOT EXISTS idx_queue_status ON task_queue(status);
             CREATE INDEX IF NOT EXISTS idx_cache_key ON search_cache(cache_key);
             CREATE INDEX IF NOT EXISTS idx_cache_expires ON search_cache(expires_at);
+            CREATE INDEX IF NOT EXISTS idx_cache_results_position ON search_cache_results(cache_key, position);
             CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
             CREATE INDEX IF NOT EXISTS idx_users_tier ON users(subscription_tier);
             CREATE INDEX IF NOT EXISTS idx_settings_category ON settings(category);
             CREATE INDEX IF NOT EXISTS idx_payments_user ON payments(user_id);
-            CREATE INDEX IF NOT EXISTS idx_payments_status ON payments(status);
-            CREATE INDEX IF NOT EXISTS idx_search_logs_user ON search_logs(user_id);
             CREATE INDEX IF NOT EXISTS idx_search_logs_date ON search_logs(created_at);
             CREATE INDEX IF NOT EXISTS idx_password_tokens_user ON password_reset_tokens(user_id);
             CREATE INDEX IF NOT EXISTS idx_password_tokens_token ON password_reset_tokens(token);
-            CREATE INDEX IF NOT EXISTS idx_favorites_user ON favorites(user_id);
             
             -- Katalog tabloları index'leri
-            CREATE INDEX IF NOT EXISTS idx_user_catalogs_user ON user_catalogs(user_id);
             CREATE INDEX IF NOT EXISTS idx_user_catalogs_status ON user_catalogs(status);
             CREATE INDEX IF NOT EXISTS idx_catalog_rules_catalog ON catalog_rules(catalog_id);
             CREATE INDEX IF NOT EXISTS idx_catalog_categories_catalog ON catalog_categories(catalog_id);
-            CREATE INDEX IF NOT EXISTS idx_catalog_parts_catalog ON catalog_parts(catalog_id);
             CREATE INDEX IF NOT EXISTS idx_catalog_parts_page ON catalog_parts(page_number);
             CREATE INDEX IF NOT EXISTS idx_catalog_fingerprints_catalog ON catalog_fingerprints(catalog_id);
-        ''')
+        '''
+        # Store tablolarının DDL'i kendi dosyalarına yönlendirilir
+        for statement in split_statements(schema_sql):
+            cursor.execute(route_ddl(statement, stores))
+        
+        # Eski veritabanlarına sonradan eklenen kolonlar
+        added = self._ensure_columns(cursor, "search_cache", {
+            "size_bytes": "INTEGER DEFAULT 0",
+            "hit_count": "INTEGER DEFAULT 0",
+            "last_accessed_at": "DATETIME",
+            "priority": "REAL DEFAULT 0",
+            "key_version": "INTEGER DEFAULT 0"
+        })
+        if "size_bytes" in added:
+            # Mevcut kayıtların boyutu ve başlangıç GDSF önceliği
+            cursor.execute('''
+                UPDATE search_cache SET size_bytes =
+                    COALESCE(LENGTH(CAST(results AS BLOB)), 0) +
+                    COALESCE((SELECT SUM(LENGTH(CAST(r.result_json AS BLOB)))
+                              FROM search_cache_results r
+                              WHERE r.cache_key = search_cache.cache_key), 0)
+            ''')
+            cursor.execute("UPDATE search_cache SET priority = 1024.0 / MAX(size_bytes, 1)")
+        cursor.execute(route_ddl("CREATE INDEX IF NOT EXISTS idx_cache_priority ON search_cache(priority)", stores))
+        self._ensure_columns(cursor, "search_cache_results", {
+            "format_version": "INTEGER DEFAULT 0"
+        })
+        
+        # Tam metin arama indeksleri (pdf_catalog, discovered_pdfs, scanned_pdfs)
+        self.fts_enabled = ensure_fts_tables(cursor)
         
         conn.commit()
-        conn.close()
+        
+        # migrations/ altındaki sürümlü değişiklikler (schema_version)
+        try:
+            apply_migrations(conn)
+            # Kayıtlı arama istatistikleri (tablo boşsa mevcut loglardan)
+            backfill_query_stats(conn)
+            # 009 öncesi dosyalarda incremental_vacuum'un çalışması için
+            if DB_CONVERT_AUTO_VACUUM:
+                convert_auto_vacuum(conn)
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def _ensure_columns(cursor, table: str, columns: Dict[str, str]) -> List[str]:
+        """Tabloda olmayan kolonları ALTER TABLE ile ekle, eklenenleri döndür"""
+        schema = table_schema(cursor, table)
+        existing = {row[1] for row in cursor.execute(f"PRAGMA {schema}.table_info({table})")}
+        added = []
+        for name, ddl in columns.items():
+            if name not in existing:
+                cursor.execute(f"ALTER TABLE {schema}.{table} ADD COLUMN {name} {ddl}")
+                added.append(name)
+        return added
 
     def add_pdf(self, data: Dict[str, Any]) -> int:
         """PDF'i veritabanına ekle veya güncelle"""
@@ -514,24 +601,52 @@ class PEPCDatabase:
         conn.close()
 
     def search_catalog(self, filters: Dict, limit: int = 20, offset: int = 0) -> List[Dict]:
-        """Katalogda filtreli arama yap"""
+        """
+        Katalogda filtreli arama yap
+        
+        brand/model/title filtreleri FTS5 indeksinde aranır ve sonuçlar
+        bm25 ile sıralanır (title filtresi tüm metin kolonlarında aranır).
+        FTS5 yoksa LIKE ile taranır.
+        """
         conn = self.get_connection()
         cursor = conn.cursor()
         
+        text_filters = {k: v for k, v in filters.items() if v and k in ['brand', 'model', 'title']}
+        match = None
+        if self.fts_enabled and text_filters:
+            match = combine_match_queries(
+                build_match_query(text_filters.get('brand'), ['brand']),
+                build_match_query(text_filters.get('model'), ['model']),
+                build_match_query(text_filters.get('title'))
+            )
+        
         # active ve pending durumundaki PDF'leri getir (broken hariç)
-        query = "SELECT * FROM pdf_catalog WHERE status IN ('active', 'pending')"
-        params = []
+        if match:
+            query = f"""
+                SELECT c.* FROM pdf_catalog c
+                JOIN {fts_rank_subquery('pdf_catalog')} fts ON fts.rowid = c.id
+                WHERE c.status IN ('active', 'pending')
+            """
+            params = [match]
+        else:
+            query = "SELECT * FROM pdf_catalog c WHERE status IN ('active', 'pending')"
+            params = []
         
         for key, value in filters.items():
             if value:
                 if key in ['brand', 'model', 'title']:
+                    if match:
+                        continue
                     query += f" AND {key} LIKE ?"
                     params.append(f"%{value}%")
                 else:
-                    query += f" AND {key} = ?"
+                    query += f" AND c.{key} = ?"
                     params.append(value)
         
-        query += " ORDER BY status ASC, discovered_at DESC LIMIT ? OFFSET ?"
+        if match:
+            query += " ORDER BY fts.rank, c.discovered_at DESC LIMIT ? OFFSET ?"
+        else:
+            query += " ORDER BY status ASC, discovered_at DESC LIMIT ? OFFSET ?"
         params.extend([limit, offset])
         
         cursor.execute(query, params)
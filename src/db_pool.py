@@ -0,0 +1,226 @@
+"""
+SQLite Connection Pool - Tüm veri sınıflarının ortak bağlantı yöneticisi
+
+Her işlem için sqlite3.connect + PRAGMA kurulumu yerine thread başına kalıcı
+bağlantılar tutulur:
+- WAL, synchronous=NORMAL, mmap_size, cache_size, busy_timeout bir kez ayarlanır
+- sqlite3'ün bağlantı başına prepared statement cache'i (cached_statements)
+  bağlantı yaşadığı sürece sıcak kalır
+- conn.close() bağlantıyı kapatmaz, açık transaction'ı geri alıp havuza iade eder
+
+Mevcut kod değişmeden çalışır:
+    conn = get_db_pool().acquire()
+    try:
+        ...
+        conn.commit()
+    finally:
+        conn.close()   # havuza iade
+
+Bağlantılar thread'e bağlıdır (sqlite3 check_same_thread); iç içe acquire
+çağrıları aynı thread'de ayrı bağlantılar alır, transaction'lar karışmaz.
+
+Cache / log / keşif store dosyaları (src/storage.py) her bağlantıya ATTACH
+edilir ve aynı PRAGMA'larla açılır.
+"""
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from src.config import (
+    DATABASE_PATH, DB_BUSY_TIMEOUT_MS, DB_CACHE_SIZE_KB, DB_MMAP_SIZE,
+    DB_POOL_MAX_IDLE_PER_THREAD, DB_STATEMENT_CACHE_SIZE
+)
+from src.storage import store_paths
+
+_DEFAULT = object()
+
+
+class PooledConnection(sqlite3.Connection):
+    """close() çağrısında havuza dönen sqlite3 bağlantısı"""
+
+    _pool: Optional["ConnectionPool"] = None
+    _in_use: bool = False
+
+    def close(self) -> None:
+        if self._pool is None:
+            super().close()
+        elif self._in_use:
+            self._pool._release(self)
+
+    def close_physical(self) -> None:
+        """Bağlantıyı gerçekten kapat"""
+        self._pool = None
+        super().close()
+
+
+class ConnectionPool:
+    """Tek bir veritabanı dosyası için thread başına bağlantı havuzu"""
+
+    def __init__(
+        self,
+        db_path: str,
+        max_idle_per_thread: int = DB_POOL_MAX_IDLE_PER_THREAD,
+        busy_timeout_ms: int = DB_BUSY_TIMEOUT_MS,
+        cache_size_kb: int = DB_CACHE_SIZE_KB,
+        mmap_size: int = DB_MMAP_SIZE,
+        statement_cache_size: int = DB_STATEMENT_CACHE_SIZE,
+        attachments: Optional[Dict[str, str]] = None
+    ):
+        self.db_path = db_path
+        self.attachments = attachments or {}
+        self.max_idle_per_thread = max_idle_per_thread
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cache_size_kb = cache_size_kb
+        self.mmap_size = mmap_size
+        self.statement_cache_size = statement_cache_size
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._in_use = 0
+        self._idle = 0
+        self.stats = {
+            "acquired": 0,
+            "created": 0,
+            "reused": 0,
+            "discarded": 0,
+            "wait_ms_total": 0.0,
+            "wait_ms_max": 0.0
+        }
+
+    def _idle_list(self) -> List[PooledConnection]:
+        idle = getattr(self._local, "idle", None)
+        if idle is None:
+            idle = self._local.idle = []
+        return idle
+
+    def _connect(self) -> PooledConnection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout_ms / 1000,
+            factory=PooledConnection,
+            cached_statements=self.statement_cache_size
+        )
+        for schema, path in self.attachments.items():
+            conn.execute(f"ATTACH DATABASE ? AS {schema}", (path,))
+
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        for schema in ["main", *self.attachments]:
+            # Yeni dosyada WAL'dan önce ayarlanmalı; mevcut veritabanlarında etkisizdir
+            # ama yazma kilidi ister (yük altında açılan bağlantıyı bekletir)
+            if conn.execute(f"PRAGMA {schema}.page_count").fetchone()[0] == 0:
+                conn.execute(f"PRAGMA {schema}.auto_vacuum = INCREMENTAL")
+            conn.execute(f"PRAGMA {schema}.journal_mode = WAL")
+            conn.execute(f"PRAGMA {schema}.synchronous = NORMAL")
+            conn.execute(f"PRAGMA {schema}.cache_size = -{int(self.cache_size_kb)}")
+            conn.execute(f"PRAGMA {schema}.mmap_size = {int(self.mmap_size)}")
+        conn._pool = self
+        return conn
+
+    def acquire(self, row_factory: Optional[Callable] = _DEFAULT) -> sqlite3.Connection:
+        """
+        Havuzdan bağlantı al (yoksa oluştur)
+
+        Args:
+            row_factory: Bağlantının row_factory'si (varsayılan sqlite3.Row,
+                         tuple satırlar için None)
+        """
+        start = time.perf_counter()
+        idle = self._idle_list()
+
+        if idle:
+            conn = idle.pop()
+            reused = True
+        else:
+            conn = self._connect()
+            reused = False
+
+        conn.row_factory = sqlite3.Row if row_factory is _DEFAULT else row_factory
+        conn._in_use = True
+        wait_ms = (time.perf_counter() - start) * 1000
+
+        with self._lock:
+            self.stats["acquired"] += 1
+            self.stats["reused" if reused else "created"] += 1
+            self.stats["wait_ms_total"] += wait_ms
+            self.stats["wait_ms_max"] = max(self.stats["wait_ms_max"], wait_ms)
+            self._in_use += 1
+            if reused:
+                self._idle -= 1
+
+        return conn
+
+    def _release(self, conn: PooledConnection) -> None:
+        conn._in_use = False
+
+        # close() öncesi commit edilmemiş değişiklikler eskisi gibi atılır
+        if conn.in_transaction:
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                conn.close_physical()
+                with self._lock:
+                    self._in_use -= 1
+                    self.stats["discarded"] += 1
+                return
+
+        idle = self._idle_list()
+        keep = len(idle) < self.max_idle_per_thread
+        if keep:
+            idle.append(conn)
+        else:
+            conn.close_physical()
+
+        with self._lock:
+            self._in_use -= 1
+            if keep:
+                self._idle += 1
+            else:
+                self.stats["discarded"] += 1
+
+    def close_thread_connections(self) -> int:
+        """Çağıran thread'in boştaki bağlantılarını kapat"""
+        idle = self._idle_list()
+        count = len(idle)
+        while idle:
+            idle.pop().close_physical()
+        with self._lock:
+            self._idle -= count
+        return count
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Havuz istatistikleri (bağlantı bekleme süresi dahil)"""
+        with self._lock:
+            acquired = self.stats["acquired"]
+            return {
+                **self.stats,
+                "wait_ms_total": round(self.stats["wait_ms_total"], 3),
+                "wait_ms_max": round(self.stats["wait_ms_max"], 3),
+                "wait_ms_avg": round(self.stats["wait_ms_total"] / acquired, 4) if acquired else 0.0,
+                "attached": list(self.attachments),
+                "in_use": self._in_use,
+                "idle": self._idle,
+                "reuse_ratio": round(self.stats["reused"] / acquired, 4) if acquired else 0.0
+            }
+
+
+# Veritabanı dosyası başına havuz
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+def get_db_pool(db_path: Optional[str] = None) -> ConnectionPool:
+    """Veritabanı dosyası için ortak havuzu al"""
+    path = db_path or DATABASE_PATH
+    pool = _pools.get(path)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(path)
+            if pool is None:
+                pool = _pools[path] = ConnectionPool(path, attachments=store_paths(path))
+    return pool
+
+
+def get_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Tüm havuzların istatistikleri"""
+    return {path: pool.get_stats() for path, pool in list(_pools.items())}
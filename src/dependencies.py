@@ -7,6 +7,7 @@ from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from src.auth import decode_token, get_user_manager
+from src.async_db import get_async_db
 from src.models import TokenData, UserRole
 
 
@@ -34,7 +35,7 @@ async def get_current_user_optional(
             return None
         
         user_manager = get_user_manager()
-        user = user_manager.get_user_by_id(token_data.user_id)
+        user = await get_async_db().run(user_manager.get_user_by_id, token_data.user_id)
         
         if not user or not user.get("is_active"):
             return None
@@ -76,7 +77,7 @@ async def get_current_user(
             )
         
         user_manager = get_user_manager()
-        user = user_manager.get_user_by_id(token_data.user_id)
+        user = await get_async_db().run(user_manager.get_user_by_id, token_data.user_id)
         
         if not user:
             raise HTTPException(
@@ -12,6 +12,8 @@ import re
 import logging
 from bs4 import BeautifulSoup
 
+from src.http_client import get_http_session
+
 logger = logging.getLogger(__name__)
 
 
@@ -105,47 +107,47 @@ async def scrape_directory(
         visited.add(current_url)
         
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-                }
+            session = get_http_session("crawl")
+            headers = {
+                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+            }
+            
+            async with session.get(
+                current_url,
+                timeout=aiohttp.ClientTimeout(total=timeout),
+                headers=headers
+            ) as response:
+                if response.status != 200:
+                    return
                 
-                async with session.get(
-                    current_url,
-                    timeout=aiohttp.ClientTimeout(total=timeout),
-                    headers=headers
-                ) as response:
-                    if response.status != 200:
-                        return
-                    
-                    html = await response.text()
-                    
-                    # Directory listing kontrolü
-                    if not is_directory_listing(html):
-                        return
-                    
-                    # PDF'leri çıkar
-                    pdfs = extract_pdf_links(html, current_url)
-                    for pdf in pdfs:
-                        if len(all_pdfs) >= max_pdfs:
-                            break
-                        all_pdfs.append(pdf)
-                    
-                    # Alt dizinleri bul ve takip et
-                    if follow_subdirs:
-                        soup = BeautifulSoup(html, 'html.parser')
-                        for link in soup.find_all('a', href=True):
-                            href = link['href']
-                            
-                            # Üst dizin linklerini atla
-                            if href in ['../', '../', '/', '.']:
-                                continue
-                            
-                            # Dizin linki mi? (/ ile bitiyor)
-                            if href.endswith('/'):
-                                subdir_url = urljoin(current_url, href)
-                                await crawl(subdir_url, depth + 1)
-        
+                html = await response.text()
+                
+                # Directory listing kontrolü
+                if not is_directory_listing(html):
+                    return
+                
+                # PDF'leri çıkar
+                pdfs = extract_pdf_links(html, current_url)
+                for pdf in pdfs:
+                    if len(all_pdfs) >= max_pdfs:
+                        break
+                    all_pdfs.append(pdf)
+                
+                # Alt dizinleri bul ve takip et
+                if follow_subdirs:
+                    soup = BeautifulSoup(html, 'html.parser')
+                    for link in soup.find_all('a', href=True):
+                        href = link['href']
+                        
+                        # Üst dizin linklerini atla
+                        if href in ['../', '../', '/', '.']:
+                            continue
+                        
+                        # Dizin linki mi? (/ ile bitiyor)
+                        if href.endswith('/'):
+                            subdir_url = urljoin(current_url, href)
+                            await crawl(subdir_url, depth + 1)
+
         except asyncio.TimeoutError:
             logger.warning(f"Timeout: {current_url}")
         except Exception as e:
@@ -0,0 +1,81 @@
+"""
+Engine Latency - motor başına gecikme dağılımı
+
+Multi-search'te yanıt süresini en yavaş motor belirliyor. Hedge (yedek istek)
+kararı ve admin istatistikleri için her motorun son upstream çağrı süreleri
+kayan bir pencerede tutulur; p50 / p95 bu pencereden hesaplanır. Cache'ten
+dönen yanıtlar ölçüme katılmaz.
+"""
+import math
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+
+def _percentile(ordered: List[float], pct: float) -> Optional[float]:
+    """Sıralı listede nearest-rank yüzdelik"""
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class EngineLatencyTracker:
+    """Motor başına son N upstream süresi (tek event loop içinde)"""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: Dict[str, Deque[float]] = {}
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def _ensure(self, engine: str) -> None:
+        if engine not in self._samples:
+            self._samples[engine] = deque(maxlen=self.window)
+            self.stats[engine] = {
+                "calls": 0,       # Tamamlanan upstream çağrı
+                "errors": 0,
+                "late": 0,        # Süre bütçesi dolduğunda bitmemiş
+                "hedged": 0,      # Yedek istek gönderilen
+                "hedge_wins": 0   # Yedek isteğin önce bittiği
+            }
+
+    def record(self, engine: str, seconds: float, ok: bool = True) -> None:
+        """Tamamlanan bir upstream çağrının süresini kaydet"""
+        self._ensure(engine)
+        self._samples[engine].append(seconds)
+        self.stats[engine]["calls"] += 1
+        if not ok:
+            self.stats[engine]["errors"] += 1
+
+    def count(self, engine: str, field: str) -> None:
+        """late / hedged / hedge_wins sayaçlarını artır"""
+        self._ensure(engine)
+        self.stats[engine][field] += 1
+
+    def percentile(self, engine: str, pct: float) -> Optional[float]:
+        """
+        Motorun gecikme yüzdeliği (saniye)
+
+        Returns:
+            Yeterli örnek (min_samples) yoksa None
+        """
+        samples = self._samples.get(engine)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        return _percentile(sorted(samples), pct)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Motor başına çağrı sayıları ve p50 / p95 / p99"""
+        result = {}
+        for engine, stats in self.stats.items():
+            ordered = sorted(self._samples[engine])
+            result[engine] = {
+                **stats,
+                "samples": len(ordered),
+                **{
+                    f"p{pct}": round(value, 3) if value is not None else None
+                    for pct in (50, 95, 99)
+                    for value in [_percentile(ordered, pct)]
+                }
+            }
+        return result
@@ -14,13 +14,17 @@ Eski yöntem: 16 kredi = 80 sonuç
 import asyncio
 import aiohttp
 import re
-import hashlib
 import os
 from typing import List, Dict, Optional
 from urllib.parse import quote, urlparse, unquote
 from dataclasses import dataclass
 import logging
 
+from src.bulk_upsert import PREMIUM_RESULTS, get_bulk_upserter
+from src.async_db import get_async_db
+from src.http_client import get_http_session
+from src.rate_limiter import get_rate_limiter
+
 logger = logging.getLogger(__name__)
 
 
@@ -67,6 +71,7 @@ class FirecrawlGoogleScraper:
     """
     
     BASE_URL = "https://api.firecrawl.dev/v1/scrape"
+    TIMEOUT = aiohttp.ClientTimeout(total=60)  # Google sayfasını render etmek API varsayılanından uzun sürer
     
     # Document pattern'leri - gerçek doküman sayfalarını bulmak için
     DOC_PATTERNS = [
@@ -80,13 +85,12 @@ class FirecrawlGoogleScraper:
         self.session: Optional[aiohttp.ClientSession] = None
     
     async def _ensure_session(self):
-        if not self.session or self.session.closed:
-            timeout = aiohttp.ClientTimeout(total=60)
-            self.session = aiohttp.ClientSession(timeout=timeout)
+        # Paylaşımlı oturum: bağlantılar ve DNS cache'i istekler arasında korunur
+        self.session = get_http_session("api")
     
     async def close(self):
-        if self.session and not self.session.closed:
-            await self.session.close()
+        # Paylaşımlı oturum uygulama kapanışında kapatılır (src/http_client.py)
+        self.session = None
     
     def _build_google_url(self, search_terms: str, sites: List[str] = None, num: int = 100) -> str:
         """Google arama URL'i oluştur"""
@@ -304,8 +308,11 @@ class FirecrawlGoogleScraper:
             "formats": ["markdown"]
         }
         
+        limiter = get_rate_limiter().get("firecrawl", self.api_key)
         try:
-            async with self.session.post(self.BASE_URL, headers=headers, json=payload) as response:
+            async with limiter.slot() as slot, \
+                    self.session.post(self.BASE_URL, headers=headers, json=payload, timeout=self.TIMEOUT) as response:
+                slot.report(response.status, response.headers.get("Retry-After"))
                 if response.status == 200:
                     data = await response.json()
                     markdown = data.get("data", {}).get("markdown", "")
@@ -335,9 +342,9 @@ class FirecrawlGoogleScraper:
                     
                     logger.info(f"Premium Google scrape: {stats['total']} sonuç, 1 kredi")
                     
-                    # Veritabanına kaydet
+                    # Veritabanına kaydet (yazıcı thread'inde)
                     if self.db:
-                        self._save_results(result_dicts)
+                        await get_async_db().write_bulk(self._save_results, result_dicts)
                     
                     return {"results": result_dicts, "stats": stats}
                 
@@ -351,45 +358,25 @@ class FirecrawlGoogleScraper:
             return {"results": [], "stats": {"error": str(e)}}
     
     def _save_results(self, results: List[Dict]) -> int:
-        """Sonuçları veritabanına kaydet"""
+        """Sonuçları veritabanına kaydet (tek transaction'da toplu upsert)"""
         if not self.db or not results:
             return 0
         
-        saved = 0
-        
         try:
-            conn = self.db.get_connection()
-            for r in results:
-                url_hash = hashlib.md5(r['url'].encode()).hexdigest()
-                cursor = conn.execute(
-                    "SELECT id FROM premium_results WHERE url_hash = ?", 
-                    (url_hash,)
-                )
-                
-                if cursor.fetchone():
-                    conn.execute("""
-                        UPDATE premium_results 
-                        SET last_seen = datetime('now'), view_count = view_count + 1 
-                        WHERE url_hash = ?
-                    """, (url_hash,))
-                else:
-                    conn.execute("""
-                        INSERT INTO premium_results 
-                        (url_hash, url, title, snippet, platform, domain, query)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        url_hash, r['url'], r.get('title', '')[:500],
-                        r.get('snippet', '')[:1000], r.get('platform', ''),
-                        r.get('domain', ''), r.get('query', '')
-                    ))
-                    saved += 1
-            
-            conn.commit()
-            conn.close()
+            return get_bulk_upserter(self.db.db_path).upsert(PREMIUM_RESULTS, [
+                {
+                    "url": r['url'],
+                    "title": r.get('title', '')[:500],
+                    "snippet": r.get('snippet', '')[:1000],
+                    "platform": r.get('platform', ''),
+                    "domain": r.get('domain', ''),
+                    "query": r.get('query', '')
+                }
+                for r in results
+            ])
         except Exception as e:
             logger.error(f"Kayıt hatası: {e}")
-        
-        return saved
+            return 0
 
 
 # Test fonksiyonu
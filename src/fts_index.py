@@ -0,0 +1,198 @@
+"""
+FTS Index - pdf_catalog, discovered_pdfs ve scanned_pdfs için FTS5 tam metin indeksi
+
+LIKE '%terim%' filtreleri indeks kullanamaz, her aramada tablo baştan sona
+taranır. Her tablo için contentless bir FTS5 tablosu (<tablo>_fts, rowid =
+tablonun id'si) tutulur ve trigger'larla senkron kalır; aramalar indeks
+üzerinden yapılır ve bm25 ile sıralanır.
+
+Tokenizer: unicode61 remove_diacritics 2
+- Türkçe: ş/ç/ğ/ö/ü ve İ/I katlanır ("PARÇA KATALOĞU" → "parca katalogu")
+- Rusça: Kiril harfleri küçük harfe çevrilir
+- Model numaraları: "PC200-8" → "pc200" "8" tokenları; sorgu tarafında
+  ardışık phrase olarak aranır, "PC200" de "PC200-8"i bulur
+unicode61'in katlamadığı harfler (ı, ё) ve sorguda .lower() ile bölünen İ
+hem trigger'larda hem sorguda aynı şekilde katlanır (FOLD_MAP).
+"""
+import re
+import sqlite3
+import unicodedata
+from typing import Dict, List, Optional
+
+from src.storage import attached_stores, route_ddl, table_schema
+
+# Tablo → indekslenen kolonlar ve bm25 ağırlıkları (aynı sırada)
+FTS_TABLES: Dict[str, Dict] = {
+    "pdf_catalog": {
+        "columns": ["title", "brand", "model", "filename"],
+        "weights": [1.0, 2.0, 3.0, 0.5]
+    },
+    "discovered_pdfs": {
+        "columns": ["title", "brand", "model", "domain"],
+        "weights": [1.0, 2.0, 3.0, 0.5]
+    },
+    "scanned_pdfs": {
+        "columns": ["title", "detected_brand", "detected_model", "snippet"],
+        "weights": [1.0, 2.0, 3.0, 0.3]
+    },
+}
+
+FTS_TOKENIZE = "unicode61 remove_diacritics 2"
+
+# Tokenizer'ın katlamadığı harfler; "İ" sorgu tarafında .lower() ile "i" +
+# U+0307 olur, işaret kelimeyi böldüğü için önce "i"ye katlanır
+FOLD_MAP = {"ı": "i", "İ": "i", "ё": "е", "Ё": "е"}
+
+_TERM_RE = re.compile(r'"([^"]+)"|(\S+)')
+_PART_RE = re.compile(r"[^\W_]+")
+_ALNUM_SPLIT_RE = re.compile(r"\d+|[^\W\d_]+")
+
+
+def fts_fold(text: Optional[str]) -> str:
+    """Metni indekse yazılan biçime katla"""
+    text = text or ""
+    for src, dst in FOLD_MAP.items():
+        text = text.replace(src, dst)
+    return text
+
+
+def _fold_sql(expr: str) -> str:
+    sql = f"COALESCE({expr}, '')"
+    for src, dst in FOLD_MAP.items():
+        sql = f"replace({sql}, '{src}', '{dst}')"
+    return sql
+
+
+def fts_table_sql(table: str) -> List[str]:
+    """FTS tablosu ve senkron trigger'larının DDL'i"""
+    columns = FTS_TABLES[table]["columns"]
+    fts = f"{table}_fts"
+    col_list = ", ".join(columns)
+    new_values = ", ".join(_fold_sql(f"new.{c}") for c in columns)
+    old_values = ", ".join(_fold_sql(f"old.{c}") for c in columns)
+
+    return [
+        f'''CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+            {col_list}, content='', prefix='2 3', tokenize="{FTS_TOKENIZE}"
+        )''',
+        f'''CREATE TRIGGER IF NOT EXISTS {table}_fts_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts} (rowid, {col_list}) VALUES (new.id, {new_values});
+        END''',
+        f'''CREATE TRIGGER IF NOT EXISTS {table}_fts_ad AFTER DELETE ON {table} BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_values});
+        END''',
+        f'''CREATE TRIGGER IF NOT EXISTS {table}_fts_au AFTER UPDATE OF {col_list} ON {table} BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_values});
+            INSERT INTO {fts} (rowid, {col_list}) VALUES (new.id, {new_values});
+        END''',
+    ]
+
+
+def ensure_fts_tables(cursor) -> bool:
+    """
+    FTS tablolarını ve trigger'larını oluştur, yeni tabloları mevcut satırlarla doldur
+
+    FTS tablosu indekslediği tablonun dosyasında tutulur (src/storage.py).
+
+    Returns:
+        FTS5 kullanılabilir mi (derlenmemişse LIKE aramasına düşülür)
+    """
+    stores = attached_stores(cursor)
+
+    try:
+        for table, spec in FTS_TABLES.items():
+            schema = table_schema(cursor, table)
+            exists = cursor.execute(
+                f"SELECT 1 FROM {schema}.sqlite_master WHERE type = 'table' AND name = ?", (f"{table}_fts",)
+            ).fetchone()
+
+            for statement in fts_table_sql(table):
+                cursor.execute(route_ddl(statement, stores))
+
+            if not exists:
+                columns = spec["columns"]
+                cursor.execute(f'''
+                    INSERT INTO {table}_fts (rowid, {", ".join(columns)})
+                    SELECT id, {", ".join(_fold_sql(c) for c in columns)} FROM {table}
+                ''')
+    except sqlite3.OperationalError as e:
+        if "fts5" in str(e):
+            print(f"FTS5 kullanılamıyor, LIKE aramasına düşülecek: {e}")
+            return False
+        raise
+
+    return True
+
+
+def _strip_marks(text: str) -> str:
+    """Ayrık birleşen işaretleri (ör. "i̇"deki U+0307) at; tokenizer da atar"""
+    return "".join(ch for ch in text if unicodedata.category(ch) != "Mn")
+
+
+def _term_expr(term: str, prefix: bool) -> Optional[str]:
+    parts = _PART_RE.findall(_strip_marks(fts_fold(term).lower()))
+    if not parts:
+        return None
+
+    star = "*" if prefix else ""
+    phrase = f'"{" ".join(parts)}"{star}'
+
+    # "PC200" ↔ "PC 200": harf/rakam sınırından bölünmüş alternatif
+    split = [p for part in parts for p in _ALNUM_SPLIT_RE.findall(part)]
+    if len(split) > len(parts):
+        return f'({phrase} OR "{" ".join(split)}"{star})'
+    return phrase
+
+
+def build_match_query(text: Optional[str], columns: Optional[List[str]] = None) -> Optional[str]:
+    """
+    Kullanıcı metninden FTS5 MATCH ifadesi oluştur
+
+    Kelimeler AND ile bağlanır ve önek olarak aranır; tırnaklı ifadeler
+    tam phrase olarak aranır. FTS5 operatörleri (OR, NEAR, *, :) kullanıcı
+    girdisinden taşınmaz.
+
+    Args:
+        text: Arama metni
+        columns: Sadece bu kolonlarda ara (None = tümü)
+
+    Returns:
+        MATCH ifadesi (aranacak token yoksa None)
+    """
+    if not text:
+        return None
+
+    terms = []
+    for quoted, word in _TERM_RE.findall(text):
+        expr = _term_expr(quoted or word, prefix=not quoted)
+        if expr:
+            terms.append(expr)
+
+    if not terms:
+        return None
+
+    query = " AND ".join(terms)
+    if columns:
+        return f"{{{' '.join(columns)}}} : ({query})"
+    return query
+
+
+def combine_match_queries(*queries: Optional[str]) -> Optional[str]:
+    """Birden fazla MATCH ifadesini AND ile birleştir (None'lar atlanır)"""
+    parts = [f"({q})" for q in queries if q]
+    return " AND ".join(parts) if parts else None
+
+
+def fts_rank_subquery(table: str) -> str:
+    """
+    MATCH eden rowid'ler ve bm25 skoru için alt sorgu (tek parametre: MATCH ifadesi)
+
+        FROM discovered_pdfs d
+        JOIN {fts_rank_subquery("discovered_pdfs")} fts ON fts.rowid = d.id
+        ORDER BY fts.rank
+
+    bm25 negatif döner, küçük değer daha iyi eşleşmedir (ASC sıralanır).
+    """
+    fts = f"{table}_fts"
+    weights = ", ".join(str(w) for w in FTS_TABLES[table]["weights"])
+    return f"(SELECT rowid, bm25({fts}, {weights}) AS rank FROM {fts} WHERE {fts} MATCH ?)"
@@ -0,0 +1,169 @@
+"""
+HTTP Client - giden istekler için paylaşımlı aiohttp oturumları
+
+Arama istemcileri (Serper, Brave, SearchApi, Firecrawl), tarayıcılar ve PDF
+yardımcıları kendi ClientSession'larını açıyordu; bazıları her çağrıda (PDF
+boyutu, dizin başına crawl). Her yeni oturum boş bir bağlantı havuzu ve DNS
+cache'i ile başlar: her istek yeniden DNS çözümü + TCP + TLS el sıkışması öder.
+
+Burada süreç genelinde amaç başına tek oturum tutulur (HTTP_POOLS):
+    api    arama / scraping API'leri (az host, host başına yüksek limit)
+    crawl  üretici sitelerinde dizin gezme (çok host, host başına nazik)
+    pdf    PDF HEAD / Range / indirme
+
+- Keep-alive bağlantıları ve DNS cache'i (HTTP_DNS_CACHE_TTL) istekler
+  arasında paylaşılır, IPv6/IPv4 için happy-eyeballs kullanılır
+- Toplam ve host başına bağlantı limiti havuz başınadır; bir crawl patlaması
+  arama API'lerinin bağlantılarını tüketmez
+- Oturumlar ilk kullanımda oluşturulur; uygulama başlangıcında start(),
+  kapanışta close() çağrılır. İstemcilerin close()'u paylaşımlı oturumu
+  kapatmaz
+
+Oturumlar oluşturuldukları event loop'a bağlıdır; farklı bir loop'tan
+(CLI, benchmark) çağrılırsa o loop için yeni oturumlar açılır.
+"""
+import asyncio
+import inspect
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+from src.config import HTTP_POOLS, HTTP_DNS_CACHE_TTL, HTTP_KEEPALIVE_TIMEOUT, HTTP_HAPPY_EYEBALLS_DELAY
+
+logger = logging.getLogger(__name__)
+
+# happy_eyeballs_delay aiohttp 3.10+ ile geldi
+_HAPPY_EYEBALLS = "happy_eyeballs_delay" in inspect.signature(aiohttp.TCPConnector).parameters
+
+
+class HttpClientRegistry:
+    """Amaç başına paylaşımlı aiohttp oturumları"""
+
+    def __init__(self, pools: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.pools = pools or HTTP_POOLS
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self._lock = threading.Lock()
+        self.stats = {
+            purpose: {
+                "sessions": 0,
+                "requests": 0,
+                "connections_created": 0,
+                "connections_reused": 0,
+                "dns_hits": 0,
+                "dns_misses": 0
+            }
+            for purpose in self.pools
+        }
+
+    def _trace_config(self, purpose: str) -> aiohttp.TraceConfig:
+        """Bağlantı / DNS yeniden kullanımını sayan trace"""
+        trace = aiohttp.TraceConfig()
+
+        def counter(field: str):
+            async def handler(session, context, params):
+                with self._lock:
+                    self.stats[purpose][field] += 1
+            return handler
+
+        trace.on_request_start.append(counter("requests"))
+        trace.on_connection_create_end.append(counter("connections_created"))
+        trace.on_connection_reuseconn.append(counter("connections_reused"))
+        trace.on_dns_cache_hit.append(counter("dns_hits"))
+        trace.on_dns_cache_miss.append(counter("dns_misses"))
+        return trace
+
+    def _create(self, purpose: str) -> aiohttp.ClientSession:
+        spec = self.pools[purpose]
+        options = {
+            "limit": spec["limit"],
+            "limit_per_host": spec["limit_per_host"],
+            "ttl_dns_cache": HTTP_DNS_CACHE_TTL,
+            "keepalive_timeout": HTTP_KEEPALIVE_TIMEOUT,
+        }
+        if _HAPPY_EYEBALLS:
+            options["happy_eyeballs_delay"] = HTTP_HAPPY_EYEBALLS_DELAY
+
+        with self._lock:
+            self.stats[purpose]["sessions"] += 1
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(**options),
+            timeout=aiohttp.ClientTimeout(total=spec["timeout"]),
+            trace_configs=[self._trace_config(purpose)]
+        )
+
+    def session(self, purpose: str = "api") -> aiohttp.ClientSession:
+        """
+        Amacın paylaşımlı oturumunu al (yoksa oluştur)
+
+        Args:
+            purpose: HTTP_POOLS anahtarı (api, crawl, pdf)
+
+        Returns:
+            Kapatılmaması gereken paylaşımlı ClientSession
+        """
+        if purpose not in self.pools:
+            raise ValueError(f"Bilinmeyen HTTP havuzu: {purpose}")
+
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Önceki loop'un oturumları o loop'la birlikte kapanır
+            self._sessions = {}
+            self._loop = loop
+
+        session = self._sessions.get(purpose)
+        if session is None or session.closed:
+            session = self._sessions[purpose] = self._create(purpose)
+        return session
+
+    async def start(self) -> None:
+        """Tüm havuzların oturumlarını oluştur (uygulama başlangıcı)"""
+        for purpose in self.pools:
+            self.session(purpose)
+
+    async def close(self) -> None:
+        """Açık oturumları kapat (uygulama kapanışı)"""
+        sessions, self._sessions = self._sessions, {}
+        for session in sessions.values():
+            if not session.closed:
+                await session.close()
+        if sessions:
+            # SSL bağlantılarının düzgün kapanması için (aiohttp önerisi)
+            await asyncio.sleep(0.25)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Havuz başına oturum, istek ve bağlantı / DNS yeniden kullanım sayıları"""
+        with self._lock:
+            result = {}
+            for purpose, stats in self.stats.items():
+                connections = stats["connections_created"] + stats["connections_reused"]
+                session = self._sessions.get(purpose)
+                result[purpose] = {
+                    **stats,
+                    "limit": self.pools[purpose]["limit"],
+                    "limit_per_host": self.pools[purpose]["limit_per_host"],
+                    "open": session is not None and not session.closed,
+                    "reuse_ratio": round(stats["connections_reused"] / connections, 4) if connections else 0.0
+                }
+            return result
+
+
+_registry: Optional[HttpClientRegistry] = None
+_registry_lock = threading.Lock()
+
+def get_http_registry() -> HttpClientRegistry:
+    """Süreç genelindeki HTTP oturum kaydını al"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = HttpClientRegistry()
+    return _registry
+
+
+def get_http_session(purpose: str = "api") -> aiohttp.ClientSession:
+    """Amacın paylaşımlı oturumu (kısayol)"""
+    return get_http_registry().session(purpose)
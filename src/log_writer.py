@@ -0,0 +1,231 @@
+"""
+Log Writer - search_logs ve admin_logs için write-behind tampon
+
+Her arama isteği kendi bağlantısını açıp tek satırlık bir INSERT commit
+ediyordu; her commit SQLite yazma kilidini alır ve kredi/ödeme gibi
+kullanıcıya dönük transaction'larla yarışır. Burada satırlar bellekte
+biriktirilir ve:
+- LOG_FLUSH_ROWS satır birikince veya
+- LOG_FLUSH_INTERVAL_MS dolunca
+tek transaction'da (tablo başına tek executemany) yazılır. Yazma, toplu
+yazma thread'inde (get_async_db().write_bulk) çalışır; log dosyası ayrıysa
+kullanıcı / ödeme yazmalarıyla kilit yarışına girmez.
+
+Tampon sınırlıdır (LOG_MAX_BUFFER_ROWS); disk yavaşlarsa en eski satırlar
+atılır ve sayılır. Kapanışta tampon boşaltılır; çökmede en fazla bir
+flush penceresi kaybolur. created_at kuyruğa alınırken doldurulur
+(CURRENT_TIMESTAMP ile aynı biçim, UTC), gecikmeli yazım zamanı kaydırmaz.
+search_logs satırları aynı transaction'da query_stats'a da işlenir.
+"""
+import asyncio
+import json
+import logging
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from src.config import DATABASE_PATH, LOG_FLUSH_ROWS, LOG_FLUSH_INTERVAL_MS, LOG_MAX_BUFFER_ROWS
+from src.db_pool import get_db_pool
+from src.query_stats import update_query_stats
+
+logger = logging.getLogger(__name__)
+
+LOG_TABLES: Dict[str, Tuple[str, ...]] = {
+    "search_logs": (
+        "user_id", "query", "doc_type", "engines_used", "result_count",
+        "credits_used", "is_cached", "ip_address", "user_agent", "created_at"
+    ),
+    "admin_logs": (
+        "admin_id", "action", "target_table", "target_id",
+        "old_value", "new_value", "ip_address", "created_at"
+    ),
+}
+
+# search_logs satırından query_stats'a giden kolonlar
+_QUERY_STATS_COLUMNS = [
+    LOG_TABLES["search_logs"].index(col)
+    for col in ("user_id", "query", "doc_type", "engines_used", "result_count", "created_at")
+]
+
+
+def _timestamp() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+class BufferedLogWriter:
+    """Sınırlı bellekli, periyodik toplu log yazıcı"""
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        flush_rows: int = LOG_FLUSH_ROWS,
+        flush_interval_ms: int = LOG_FLUSH_INTERVAL_MS,
+        max_buffer_rows: int = LOG_MAX_BUFFER_ROWS
+    ):
+        self.db_path = db_path or DATABASE_PATH
+        self.flush_rows = flush_rows
+        self.flush_interval_ms = flush_interval_ms
+        self.max_buffer_rows = max_buffer_rows
+
+        self._buffer: Deque[Tuple[str, tuple]] = deque()
+        self._lock = threading.Lock()
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.stats = {
+            "queued": 0,
+            "written": 0,
+            "dropped": 0,
+            "flushes": 0,
+            "errors": 0,
+            "last_flush": None
+        }
+
+    def _append(self, table: str, row: tuple) -> None:
+        with self._lock:
+            if len(self._buffer) >= self.max_buffer_rows:
+                self._buffer.popleft()
+                self.stats["dropped"] += 1
+            self._buffer.append((table, row))
+            self.stats["queued"] += 1
+            due = len(self._buffer) >= self.flush_rows
+
+        loop, wake = self._loop, self._wake
+        if due and wake is not None and not loop.is_closed():
+            # Yazıcı thread'lerinden de çağrılabilir
+            loop.call_soon_threadsafe(wake.set)
+
+    def log_search(
+        self,
+        user_id: Optional[int],
+        query: str,
+        doc_type: Optional[str],
+        engines_used: Optional[List[str]],
+        result_count: int,
+        credits_used: int = 0,
+        is_cached: bool = False,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None
+    ) -> None:
+        """search_logs satırını kuyruğa al"""
+        self._append("search_logs", (
+            user_id,
+            query,
+            doc_type,
+            json.dumps(engines_used or []),
+            result_count,
+            credits_used,
+            is_cached,
+            ip_address,
+            user_agent[:500] if user_agent else None,  # Max 500 karakter
+            _timestamp()
+        ))
+
+    def log_admin(
+        self,
+        admin_id: int,
+        action: str,
+        target_table: Optional[str] = None,
+        target_id: Optional[int] = None,
+        old_value: Any = None,
+        new_value: Any = None,
+        ip_address: Optional[str] = None
+    ) -> None:
+        """admin_logs satırını kuyruğa al (dict/list değerler JSON'a çevrilir)"""
+        def encode(value):
+            if value is None or isinstance(value, str):
+                return value
+            return json.dumps(value, ensure_ascii=False, default=str)
+
+        self._append("admin_logs", (
+            admin_id, action, target_table, target_id,
+            encode(old_value), encode(new_value), ip_address, _timestamp()
+        ))
+
+    def flush(self) -> int:
+        """Tampondaki satırları tek transaction'da yaz → yazılan satır sayısı"""
+        with self._lock:
+            if not self._buffer:
+                return 0
+            batch, self._buffer = self._buffer, deque()
+
+        rows_by_table: Dict[str, List[tuple]] = {}
+        for table, row in batch:
+            rows_by_table.setdefault(table, []).append(row)
+
+        conn = get_db_pool(self.db_path).acquire(row_factory=None)
+        try:
+            for table, rows in rows_by_table.items():
+                columns = LOG_TABLES[table]
+                conn.executemany(
+                    f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+                    rows
+                )
+                if table == "search_logs":
+                    # Kayıtlı arama istatistikleri aynı transaction'da
+                    update_query_stats(conn, (tuple(row[i] for i in _QUERY_STATS_COLUMNS) for row in rows))
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            # Geri koy, bir sonraki flush'ta tekrar denensin (sınır korunur)
+            with self._lock:
+                self._buffer.extendleft(reversed(batch))
+                overflow = len(self._buffer) - self.max_buffer_rows
+                for _ in range(max(overflow, 0)):
+                    self._buffer.popleft()
+                    self.stats["dropped"] += 1
+                self.stats["errors"] += 1
+            logger.error(f"Log flush hatası ({len(batch)} satır): {e}")
+            return 0
+        finally:
+            conn.close()
+
+        with self._lock:
+            self.stats["written"] += len(batch)
+            self.stats["flushes"] += 1
+            self.stats["last_flush"] = datetime.now().isoformat()
+        return len(batch)
+
+    async def run(self, write: Callable) -> None:
+        """
+        Tamponu periyodik olarak boşalt (arka plan işi)
+
+        Args:
+            write: Senkron fonksiyonu yazıcı thread'inde çalıştıran coroutine
+                   (ör. get_async_db().write_bulk)
+        """
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval_ms / 1000)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+                if self._buffer:
+                    await write(self.flush)
+        finally:
+            self._wake = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Log tamponu istatistikleri"""
+        with self._lock:
+            return {**self.stats, "buffered": len(self._buffer)}
+
+
+# Veritabanı dosyası başına tek yazıcı
+_instances: Dict[str, BufferedLogWriter] = {}
+_instances_lock = threading.Lock()
+
+def get_log_writer(db_path: Optional[str] = None) -> BufferedLogWriter:
+    """Veritabanı dosyası için ortak log yazıcısını al"""
+    path = db_path or DATABASE_PATH
+    instance = _instances.get(path)
+    if instance is None:
+        with _instances_lock:
+            instance = _instances.get(path)
+            if instance is None:
+                instance = _instances[path] = BufferedLogWriter(path)
+    return instance
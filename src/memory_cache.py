@@ -0,0 +1,146 @@
+"""
+In-Memory LRU Cache - search_cache tablosunun önündeki bellek katmanı
+
+Decode edilmiş sonuç listelerini byte bütçesi ve TTL ile process içinde tutar.
+Sık aranan sorgular SQLite'a ve json.loads'a hiç uğramaz.
+"""
+import time
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple, Set
+
+from src.config import MEMORY_CACHE_MAX_BYTES, MEMORY_CACHE_TTL_SECONDS
+
+
+class MemoryCache:
+    """Byte bütçeli, TTL'li LRU önbellek (thread-safe)"""
+
+    def __init__(self, max_bytes: int, ttl_seconds: int):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        # (cache_key, slot) -> (engine, value, size_bytes, stored_at)
+        # slot: aynı key'in farklı sayfa dilimleri (offset/limit) için
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[str, Any, int, float]]" = OrderedDict()
+        self._slots: Dict[str, Set[Tuple[str, str]]] = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+        # Motor bazlı istatistikler
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _engine_stats(self, engine: str) -> Dict[str, int]:
+        if engine not in self._stats:
+            self._stats[engine] = {"hits": 0, "misses": 0, "evictions": 0}
+        return self._stats[engine]
+
+    def _remove(self, entry_key: Tuple[str, str]) -> None:
+        """Kilit altında çağrılmalı"""
+        entry = self._entries.pop(entry_key, None)
+        if entry:
+            self._total_bytes -= entry[2]
+            slots = self._slots.get(entry_key[0])
+            if slots is not None:
+                slots.discard(entry_key)
+                if not slots:
+                    del self._slots[entry_key[0]]
+
+    def get(self, cache_key: str, engine: str, slot: str = "") -> Optional[Any]:
+        """Bellekten kaydı getir, yoksa veya süresi dolmuşsa None (değer paylaşımlıdır, değiştirmeyin)"""
+        entry_key = (cache_key, slot)
+        with self._lock:
+            stats = self._engine_stats(engine)
+            entry = self._entries.get(entry_key)
+
+            if entry is None:
+                stats["misses"] += 1
+                return None
+
+            if time.monotonic() - entry[3] > self.ttl_seconds:
+                self._remove(entry_key)
+                stats["misses"] += 1
+                return None
+
+            self._entries.move_to_end(entry_key)
+            stats["hits"] += 1
+            return entry[1]
+
+    def put(self, cache_key: str, engine: str, value: Any, size_bytes: int, slot: str = "") -> None:
+        """Kaydı belleğe koy, bütçe aşılırsa en eski kayıtları çıkar"""
+        # Tek başına bütçeyi aşan kayıtları hiç tutma
+        if size_bytes > self.max_bytes:
+            return
+
+        entry_key = (cache_key, slot)
+        with self._lock:
+            self._remove(entry_key)
+            self._entries[entry_key] = (engine, value, size_bytes, time.monotonic())
+            self._slots.setdefault(cache_key, set()).add(entry_key)
+            self._total_bytes += size_bytes
+
+            while self._total_bytes > self.max_bytes and self._entries:
+                old_key = next(iter(self._entries))
+                self._engine_stats(self._entries[old_key][0])["evictions"] += 1
+                self._remove(old_key)
+
+    def invalidate(self, cache_key: str) -> None:
+        """Bir key'in tüm dilimlerini geçersiz kıl"""
+        with self._lock:
+            for entry_key in list(self._slots.get(cache_key, ())):
+                self._remove(entry_key)
+
+    def invalidate_engine(self, engine: str) -> int:
+        """Bir motora ait tüm kayıtları geçersiz kıl"""
+        with self._lock:
+            keys = [key for key, entry in self._entries.items() if entry[0] == engine]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self) -> int:
+        """Tüm bellek katmanını temizle"""
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            self._slots.clear()
+            self._total_bytes = 0
+            return count
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Bellek katmanı istatistikleri (motor bazında hit/miss oranı)"""
+        with self._lock:
+            by_engine = {}
+            total_hits = 0
+            total_misses = 0
+
+            for engine, stats in self._stats.items():
+                lookups = stats["hits"] + stats["misses"]
+                total_hits += stats["hits"]
+                total_misses += stats["misses"]
+                by_engine[engine] = {
+                    **stats,
+                    "hit_ratio": round(stats["hits"] / lookups, 4) if lookups else 0.0
+                }
+
+            total_lookups = total_hits + total_misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": total_hits,
+                "misses": total_misses,
+                "hit_ratio": round(total_hits / total_lookups, 4) if total_lookups else 0.0,
+                "by_engine": by_engine
+            }
+
+
+# Singleton instance
+_memory_cache = None
+
+def get_memory_cache() -> MemoryCache:
+    """MemoryCache singleton instance'ı al"""
+    global _memory_cache
+    if _memory_cache is None:
+        _memory_cache = MemoryCache(MEMORY_CACHE_MAX_BYTES, MEMORY_CACHE_TTL_SECONDS)
+    return _memory_cache
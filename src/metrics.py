@@ -0,0 +1,177 @@
+"""
+Metrics - dashboard sayaçları ve saatlik / günlük rollup okuma
+
+Rollup tabloları (metrics_hourly, metrics_daily, stat_counters) kaynak
+tablolardaki trigger'larla artımlı güncellenir (015_metrics_rollups).
+Dashboard her yüklemede users / search_cache üzerinde COUNT(*) ve
+DATE(created_at) taramaları yerine birkaç birincil anahtar okuması yapar;
+maliyet tablo boyutundan bağımsızdır.
+
+Kovalar created_at ile aynı saat diliminde (UTC) tutulur. Store dosyalarına
+taşınan tabloların trigger'ları kendi dosyalarındaki rollup tablolarına
+yazar (src/storage.py); okumalar tüm dosyalardaki değerleri toplar.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.storage import schemas_with_table
+
+# granularity → (tablo, kova adımı, kova biçimi)
+GRANULARITIES = {
+    "hour": ("metrics_hourly", timedelta(hours=1), "%Y-%m-%d %H:00:00"),
+    "day": ("metrics_daily", timedelta(days=1), "%Y-%m-%d"),
+}
+
+METRICS = (
+    "searches", "searches_cached", "searches_uncached", "credits_spent",
+    "payments_success", "revenue", "signups"
+)
+ENGINE_PREFIX = "engine:"
+
+# Tek istekte döndürülecek en fazla kova (ör. 90 günlük saatlik seri)
+MAX_SERIES_POINTS = 24 * 93
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _floor(moment: datetime, granularity: str) -> datetime:
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    if granularity == "hour":
+        return moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _sum_across_schemas(
+    cursor,
+    table: str,
+    keys: str,
+    where: str = "",
+    params: Sequence[Any] = ()
+) -> List[Tuple]:
+    """Tablonun bulunduğu tüm dosyalardan (keys..., SUM(value)) satırları"""
+    schemas = schemas_with_table(cursor, table)
+    if not schemas:
+        return []
+    union = " UNION ALL ".join(f"SELECT {keys}, value FROM {schema}.{table} {where}" for schema in schemas)
+    cursor.execute(f"SELECT {keys}, SUM(value) FROM ({union}) GROUP BY {keys}", list(params) * len(schemas))
+    return cursor.fetchall()
+
+
+def get_counters(cursor) -> Dict[str, int]:
+    """stat_counters → {ad: değer}"""
+    return {row[0]: row[1] for row in _sum_across_schemas(cursor, "stat_counters", "name")}
+
+
+def get_counter(cursor, name: str) -> Optional[int]:
+    """Tek bir stat_counters değeri (sayaç hiç yazılmamışsa None)"""
+    rows = _sum_across_schemas(cursor, "stat_counters", "name", "WHERE name = ?", (name,))
+    return rows[0][1] if rows else None
+
+
+def get_day_metrics(cursor, day: str) -> Dict[str, int]:
+    """Bir günün (YYYY-MM-DD) tüm metrikleri"""
+    rows = _sum_across_schemas(cursor, "metrics_daily", "metric", "WHERE bucket = ?", (day,))
+    return {row[0]: row[1] for row in rows}
+
+
+def get_dashboard_stats(cursor) -> Dict[str, Any]:
+    """Admin dashboard özeti (bugün = UTC günü)"""
+    counters = get_counters(cursor)
+    today = get_day_metrics(cursor, utc_now().strftime("%Y-%m-%d"))
+
+    tier_distribution = {
+        name[len("tier:"):]: value
+        for name, value in counters.items()
+        if name.startswith("tier:") and value
+    }
+    total_users = counters.get("users", 0)
+
+    return {
+        "total_users": total_users,
+        "active_subscriptions": total_users - tier_distribution.get("free", 0),
+        "today_searches": today.get("searches", 0),
+        "today_revenue": today.get("revenue", 0),
+        "today_cached_searches": today.get("searches_cached", 0),
+        "today_credits_spent": today.get("credits_spent", 0),
+        "today_signups": today.get("signups", 0),
+        "cache_entries": counters.get("search_cache", 0),
+        "tier_distribution": tier_distribution
+    }
+
+
+def get_timeseries(
+    cursor,
+    metrics: List[str],
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    granularity: str = "day"
+) -> Dict[str, Any]:
+    """
+    Metrik zaman serisi (boş kovalar 0 ile doldurulur)
+
+    Args:
+        metrics: METRICS içinden adlar, "engine:<motor>" veya tüm motorlar için "engine:*"
+        start: Başlangıç (dahil, varsayılan: 30 gün / 48 saat önce)
+        end: Bitiş (dahil, varsayılan: şimdi)
+        granularity: hour veya day
+
+    Returns:
+        {"granularity", "buckets": [...], "series": {metrik: [değerler]}}
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Geçersiz granularity: {granularity} (hour, day)")
+    table, step, fmt = GRANULARITIES[granularity]
+
+    names = []
+    engine_wildcard = False
+    for metric in metrics:
+        if metric == f"{ENGINE_PREFIX}*":
+            engine_wildcard = True
+        elif metric in METRICS or (metric.startswith(ENGINE_PREFIX) and len(metric) > len(ENGINE_PREFIX)):
+            names.append(metric)
+        else:
+            raise ValueError(f"Bilinmeyen metrik: {metric}")
+    if not names and not engine_wildcard:
+        raise ValueError("En az bir metrik gerekli")
+
+    end = _floor(end or utc_now(), granularity)
+    start = _floor(start or end - (step * 47 if granularity == "hour" else timedelta(days=29)), granularity)
+    if start > end:
+        raise ValueError("start, end'den sonra olamaz")
+
+    points = int((end - start) / step) + 1
+    if points > MAX_SERIES_POINTS:
+        raise ValueError(f"Aralık çok geniş: {points} kova (en fazla {MAX_SERIES_POINTS})")
+
+    buckets = [(start + step * i).strftime(fmt) for i in range(points)]
+    index = {bucket: i for i, bucket in enumerate(buckets)}
+
+    conditions = []
+    params: List[Any] = [buckets[0], buckets[-1]]
+    if names:
+        conditions.append(f"metric IN ({', '.join('?' for _ in names)})")
+        params.extend(names)
+    if engine_wildcard:
+        conditions.append("metric LIKE ?")
+        params.append(f"{ENGINE_PREFIX}%")
+
+    rows = _sum_across_schemas(
+        cursor, table, "bucket, metric",
+        f"WHERE bucket >= ? AND bucket <= ? AND ({' OR '.join(conditions)})", params
+    )
+
+    series = {name: [0] * points for name in names}
+    for bucket, metric, value in rows:
+        if bucket in index:
+            series.setdefault(metric, [0] * points)[index[bucket]] = value
+
+    return {
+        "granularity": granularity,
+        "start": buckets[0],
+        "end": buckets[-1],
+        "buckets": buckets,
+        "series": series
+    }
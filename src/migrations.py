@@ -0,0 +1,219 @@
+"""
+Migrations - migrations/NNN_ad.sql dosyaları için sürümlü şema uygulayıcı
+
+Şema init_database içindeki CREATE IF NOT EXISTS betiğiyle kurulur;
+migrations/ altındaki dosyalar ise elle çalıştırılıyordu. Burada:
+- schema_version tablosu uygulanan migration'ları (sürüm, ad, checksum) tutar
+- Dosyalar sürüm sırasıyla, her biri kendi transaction'ında bir kez uygulanır
+- BEGIN IMMEDIATE ile alınan yazma kilidi altında tekrar kontrol edilir;
+  aynı anda açılan birden fazla süreç aynı migration'ı iki kez çalıştırmaz
+
+BASELINE_VERSION'a kadar olan migration'ların (001-011) etkisi init_database
+tarafından zaten kuruluyor; schema_version tablosu ilk oluşturulduğunda bunlar
+çalıştırılmadan "baseline" olarak işaretlenir.
+
+Migration dosyaları transaction içinde çalışır, VACUUM içeremez. Şemasız
+CREATE / ALTER ifadeleri tablonun store dosyasına yönlendirilir (src/storage.py).
+
+009'daki "PRAGMA auto_vacuum = INCREMENTAL; VACUUM;" adımı baseline kapsamında
+kaldığı için mevcut veritabanlarında hiç çalışmaz. Bu dönüşüm migration'lardan
+sonra convert_auto_vacuum ile (transaction dışında) yapılır.
+"""
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+from dataclasses import dataclass
+from typing import List, Optional
+
+from src.storage import attached_stores, route_ddl
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+
+# init_database şemasının kapsadığı son migration
+BASELINE_VERSION = 11
+
+_FILENAME_RE = re.compile(r"^(\d+)_(\w+)\.sql$")
+
+
+@dataclass(frozen=True)
+class Migration:
+    """Tek bir migration dosyası"""
+    version: int
+    name: str
+    path: str
+
+    @property
+    def sql(self) -> str:
+        with open(self.path, encoding="utf-8") as f:
+            return f.read()
+
+    @property
+    def checksum(self) -> str:
+        return hashlib.md5(self.sql.encode()).hexdigest()
+
+
+def discover_migrations(directory: str = MIGRATIONS_DIR) -> List[Migration]:
+    """Dizindeki NNN_ad.sql dosyalarını sürüm sırasıyla listele"""
+    if not os.path.isdir(directory):
+        return []
+
+    migrations = []
+    for filename in os.listdir(directory):
+        match = _FILENAME_RE.match(filename)
+        if match:
+            migrations.append(Migration(
+                version=int(match.group(1)),
+                name=match.group(2),
+                path=os.path.join(directory, filename)
+            ))
+    migrations.sort(key=lambda m: m.version)
+    return migrations
+
+
+def split_statements(sql: str) -> List[str]:
+    """SQL betiğini tek tek çalıştırılabilir ifadelere böl (trigger gövdeleri bölünmez)"""
+    statements = []
+    buffer = ""
+    for line in sql.splitlines(keepends=True):
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            statement = buffer.strip()
+            if statement:
+                statements.append(statement)
+            buffer = ""
+    return statements
+
+
+def ensure_schema_version_table(conn, migrations: List[Migration], baseline: int = BASELINE_VERSION) -> None:
+    """schema_version tablosunu oluştur; yeni oluşturulduysa baseline'ı işaretle"""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'"
+    ).fetchone()
+    if exists:
+        return
+
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            checksum TEXT,
+            baseline BOOLEAN DEFAULT 0,
+            applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.executemany(
+        "INSERT OR IGNORE INTO schema_version (version, name, checksum, baseline) VALUES (?, ?, ?, 1)",
+        [(m.version, m.name, m.checksum) for m in migrations if m.version <= baseline]
+    )
+    conn.commit()
+
+
+def current_version(conn) -> int:
+    """Uygulanmış en yüksek migration sürümü (tablo yoksa 0)"""
+    try:
+        row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return row[0] or 0
+
+
+def apply_migrations(
+    conn,
+    directory: str = MIGRATIONS_DIR,
+    target: Optional[int] = None,
+    baseline: int = BASELINE_VERSION
+) -> List[Migration]:
+    """
+    Bekleyen migration'ları sırayla uygula
+
+    Args:
+        conn: sqlite3 bağlantısı (açık transaction olmamalı)
+        directory: Migration dizini
+        target: Bu sürüme kadar uygula (None = hepsi)
+        baseline: schema_version ilk oluşturulurken uygulanmış sayılacak son sürüm
+
+    Returns:
+        Bu çağrıda uygulanan migration'lar
+    """
+    migrations = discover_migrations(directory)
+    ensure_schema_version_table(conn, migrations, baseline)
+
+    applied = {
+        row[0]: row[1] for row in conn.execute("SELECT version, checksum FROM schema_version")
+    }
+    for migration in migrations:
+        if migration.version in applied and applied[migration.version] != migration.checksum:
+            logger.warning(f"Migration {migration.version:03d}_{migration.name} uygulandıktan sonra değiştirilmiş")
+
+    stores = attached_stores(conn)
+    done = []
+    for migration in migrations:
+        if migration.version in applied:
+            continue
+        if target is not None and migration.version > target:
+            break
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Kilit alınana kadar başka bir süreç uygulamış olabilir
+            if conn.execute(
+                "SELECT 1 FROM schema_version WHERE version = ?", (migration.version,)
+            ).fetchone():
+                conn.rollback()
+                continue
+
+            for statement in split_statements(migration.sql):
+                conn.execute(route_ddl(statement, stores))
+            conn.execute(
+                "INSERT INTO schema_version (version, name, checksum) VALUES (?, ?, ?)",
+                (migration.version, migration.name, migration.checksum)
+            )
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Migration {migration.version:03d}_{migration.name} başarısız: {e}")
+            raise
+
+        logger.info(f"Migration uygulandı: {migration.version:03d}_{migration.name}")
+        done.append(migration)
+
+    return done
+
+
+def convert_auto_vacuum(conn) -> List[str]:
+    """
+    auto_vacuum=INCREMENTAL olmayan dolu dosyaları dönüştür (tek seferlik VACUUM)
+
+    Yeni dosyalarda db_pool ayarı ilk bağlantıda yapar; mevcut dosyalarda ayar
+    ancak VACUUM ile etkinleşir. Dönüştürülmemiş dosyada incremental_vacuum
+    hiçbir şey yapmaz. Dosya meşgulse (başka süreç okuyor/yazıyor) bir sonraki
+    başlangıca bırakılır.
+
+    Args:
+        conn: sqlite3 bağlantısı (açık transaction olmamalı)
+
+    Returns:
+        Dönüştürülen şemalar
+    """
+    converted = []
+    for schema in ["main", *attached_stores(conn)]:
+        if conn.execute(f"PRAGMA {schema}.auto_vacuum").fetchone()[0] == 2:
+            continue
+        if conn.execute(f"PRAGMA {schema}.page_count").fetchone()[0] == 0:
+            continue
+
+        try:
+            conn.execute(f"PRAGMA {schema}.auto_vacuum = INCREMENTAL")
+            conn.execute(f"VACUUM {schema}")
+        except sqlite3.OperationalError as e:
+            logger.warning(f"{schema} auto_vacuum dönüşümü ertelendi: {e}")
+            continue
+
+        logger.info(f"{schema} auto_vacuum=INCREMENTAL olarak dönüştürüldü")
+        converted.append(schema)
+
+    return converted
@@ -3,11 +3,22 @@ Multi-Engine Search Coordinator
 Tüm arama motorlarını koordine eden ana sınıf
 """
 import asyncio
+import time
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
-from src.config import SEARCH_ENGINES
+from src.config import (
+    SEARCH_ENGINES, CACHE_REFRESH_QUEUE_SIZE, CACHE_REFRESH_WORKERS,
+    SEARCH_DEADLINE_SECONDS, SEARCH_LATENCY_WINDOW, SEARCH_LATENCY_MIN_SAMPLES,
+    SEARCH_HEDGE_ENABLED, SEARCH_HEDGE_P95_SECONDS, SEARCH_HEDGE_DELAY_PERCENTILE
+)
 from src.cache_manager import CacheManager
+from src.engine_latency import EngineLatencyTracker
+from src.async_db import get_async_db
+from src.single_flight import SingleFlight
+from src.refresh_queue import RefreshQueue
+from src.search.query_canonical import canonicalize_query
+from src.search.query_plan import QueryPlan, PlanItem
 from src.serper_client import SerperClient
 from src.brave_client import BraveSearchClient
 from src.yandex_client import YandexSearchClient
@@ -20,6 +31,9 @@ class MultiSearchCoordinator:
     def __init__(self, use_cache: bool = True):
         self.use_cache = use_cache
         self.cache = CacheManager() if use_cache else None
+        self.single_flight = SingleFlight()
+        self.refresh_queue = RefreshQueue(CACHE_REFRESH_QUEUE_SIZE, CACHE_REFRESH_WORKERS)
+        self.latency = EngineLatencyTracker(SEARCH_LATENCY_WINDOW, SEARCH_LATENCY_MIN_SAMPLES)
         
         # Arama motorları istemcileri
         self.serper = SerperClient()
@@ -47,6 +61,7 @@ class MultiSearchCoordinator:
     
     async def close(self):
         """Tüm session'ları kapat"""
+        await self.refresh_queue.close()
         await self.serper.close()
         await self.brave.close()
         if self.yandex:
@@ -61,11 +76,16 @@ class MultiSearchCoordinator:
         language: str = "en",
         doc_type: str = None,
         use_cache: bool = True,
-        page: int = None
+        page: int = None,
+        refresh: bool = False
     ) -> Dict[str, Any]:
         """
         Tek bir motor ile arama yap - sayfa bazlı cache
         
+        Args:
+            refresh: API sonucu cache kaydındaki sonuçların yerine geçer
+                     (eskilerle birleştirilmez; use_cache=False ile ön ısıtma)
+        
         Returns:
             {
                 "engine": str,
@@ -75,28 +95,100 @@ class MultiSearchCoordinator:
                 "error": str or None
             }
         """
-        # Cache kontrolü - sayfa bazlı
+        flight_key = (engine_name, canonicalize_query(query), language, doc_type, page, count)
+        
+        def fetch(replace: bool = refresh):
+            return self.single_flight.do(
+                flight_key,
+                lambda: self._fetch_hedged(engine_name, query, count, language, doc_type, page, replace=replace)
+            )
+        
+        # Cache kontrolü - sayfa bazlı (SQLite okuması event loop dışında)
         if self.use_cache and use_cache:
-            cached_results = self.cache.get_cached_results(
+            cached = await self.cache.get_cached_entry_async(
                 engine=engine_name,
                 query=query,
                 language=language,
                 doc_type=doc_type,
-                page=page
+                page=page,
+                limit=count
             )
-            if cached_results is not None:
+            if cached is not None:
+                # Soft TTL aşıldı: eski sonucu hemen dön, arka planda yenile
+                # (yenilenen sayfa kaydın sonuçlarının yerine geçer)
+                if cached["stale"]:
+                    self.refresh_queue.submit(flight_key, lambda: fetch(replace=True))
+                
                 return {
                     "engine": engine_name,
                     "engine_name": SEARCH_ENGINES.get(engine_name, {}).get("name", engine_name),
-                    "results": cached_results,
-                    "count": len(cached_results),
+                    "results": cached["results"],
+                    "count": len(cached["results"]),
                     "cached": True,
+                    "stale": cached["stale"],
                     "error": None
                 }
         
-        # API'den ara
+        # API'den ara - aynı anda gelen özdeş istekler tek upstream çağrıyı paylaşır
+        result = await fetch()
+        return {**result, "results": list(result["results"])}
+    
+    def _hedge_delay(self, engine_name: str) -> Optional[float]:
+        """Motorun kuyruk gecikmesi kötüyse yedek isteğin gönderileceği süre"""
+        if not SEARCH_HEDGE_ENABLED:
+            return None
+        p95 = self.latency.percentile(engine_name, 95)
+        if p95 is None or p95 < SEARCH_HEDGE_P95_SECONDS:
+            return None
+        return self.latency.percentile(engine_name, SEARCH_HEDGE_DELAY_PERCENTILE)
+    
+    async def _fetch_hedged(self, engine_name: str, *args, **kwargs) -> Dict[str, Any]:
+        """
+        Motor çağrısı + gerekirse hedge (yedek) istek
+        
+        p95'i SEARCH_HEDGE_P95_SECONDS'ı aşan motorlarda ilk istek motorun
+        p75 süresinde bitmezse aynı istek bir kez daha gönderilir. Hatasız
+        önce biten sonuç kullanılır, diğeri iptal edilir.
+        """
+        delay = self._hedge_delay(engine_name)
+        tasks = [asyncio.ensure_future(self._fetch_engine(engine_name, *args, **kwargs))]
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done:
+                    self.latency.count(engine_name, "hedged")
+                    tasks.append(asyncio.ensure_future(self._fetch_engine(engine_name, *args, **kwargs)))
+            
+            result = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    if not result["error"]:
+                        if task is not tasks[0]:
+                            self.latency.count(engine_name, "hedge_wins")
+                        return result
+            return result
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    async def _fetch_engine(
+        self,
+        engine_name: str,
+        query: str,
+        count: int,
+        language: str,
+        doc_type: str = None,
+        page: int = None,
+        replace: bool = False
+    ) -> Dict[str, Any]:
+        """Motor API'sini çağır ve sonucu cache'e yaz (single-flight lideri çalıştırır)"""
         results = []
         error = None
+        started = time.monotonic()
         
         try:
             if engine_name == "serper":
@@ -119,19 +211,31 @@ class MultiSearchCoordinator:
             elif engine_name == "searchapi_naver":
                 # Naver ile ara (Kore için)
                 results = await self.searchapi.search_naver(query, count=count)
+            elif engine_name == "serper_premium":
+                # Premium site araması: site: sorgusu, page gerçek Serper sayfasıdır
+                data = await self.serper.search(query, num=count, hl=language, page=page or 1)
+                error = data.get("error")
+                results = [
+                    {"title": item.get("title", ""), "url": item["link"], "description": item.get("snippet", ""), "source": "serper", "language": language}
+                    for item in data.get("organic", []) if item.get("link")
+                ]
         except Exception as e:
             error = str(e)
             print(f"Error searching {engine_name}: {e}")
         
+        self.latency.record(engine_name, time.monotonic() - started, ok=error is None)
+        
         # Cache'e kaydet - sayfa bazlı
         if self.use_cache and results and not error:
-            self.cache.save_to_cache(
+            await get_async_db(self.cache.db_path).write_bulk(
+                self.cache.save_to_cache,
                 engine=engine_name,
                 query=query,
                 results=results,
                 language=language,
                 doc_type=doc_type,
-                page=page
+                page=page,
+                replace=replace
             )
         
         return {
@@ -151,11 +255,16 @@ class MultiSearchCoordinator:
         doc_type: str = None,
         engines: List[str] = None,
         use_cache: bool = True,
-        page: int = None
+        page: int = None,
+        deadline: float = None
     ) -> Dict[str, Any]:
         """
         Tüm motorlarla paralel arama yap - sayfa bazlı cache
         
+        Motorlar bittikçe sonuçları toplanır; süre bütçesi dolduğunda bitmemiş
+        motorlar beklenmez ve yanıt partial işaretlenir. Geç kalan istekler
+        (single-flight görevleri) arka planda tamamlanıp cache'e yazılır.
+        
         Args:
             query: Arama sorgusu
             count_per_engine: Her motor için sonuç sayısı
@@ -164,6 +273,7 @@ class MultiSearchCoordinator:
             engines: Kullanılacak motorlar (None = hepsi)
             use_cache: Cache kullan
             page: Sayfa numarası (cache key için)
+            deadline: Süre bütçesi (saniye, None = SEARCH_DEADLINE_SECONDS, 0 = sınırsız)
             
         Returns:
             {
@@ -176,40 +286,99 @@ class MultiSearchCoordinator:
                 },
                 "total_results": int,
                 "merged_results": List[Dict],
-                "search_time": float
+                "search_time": float,
+                "partial": bool,
+                "pending_engines": List[str]
             }
         """
         start_time = datetime.now()
         
-        # Hangi motorları kullanacağız (None veya boş liste ise tüm aktif motorları kullan)
+        # Tek dilli plan: motor sırası birleştirme önceliğini belirler
+        plan = QueryPlan()
+        for engine_name in self.resolve_engines(engines):
+            plan.add(language, engine_name, query, language, doc_type, count_per_engine, page)
+        
+        await self.run_plan(plan, use_cache=use_cache, deadline=deadline)
+        
+        search_time = (datetime.now() - start_time).total_seconds()
+        return self.summarize_plan(plan.items, query, language, doc_type, search_time)
+    
+    def resolve_engines(self, engines: List[str] = None) -> List[str]:
+        """İstenen motorlardan kullanılabilir olanlar (None veya boş liste = tüm aktif motorlar)"""
         if not engines:
             engines = [name for name, config in SEARCH_ENGINES.items() if config.get("enabled", True)]
+        return [name for name in engines if name in self.engines]
+    
+    async def run_plan(self, plan: QueryPlan, use_cache: bool = True, deadline: float = None) -> QueryPlan:
+        """
+        Plandaki benzersiz sorguları eşzamanlı çalıştır, sonuçları girişlere dağıt
         
-        # Paralel arama görevleri
-        tasks = []
-        for engine_name in engines:
-            if engine_name in self.engines:
-                task = self.search_single_engine(
-                    engine_name=engine_name,
-                    query=query,
-                    count=count_per_engine,
-                    language=language,
-                    doc_type=doc_type,
-                    use_cache=use_cache,
-                    page=page
-                )
-                tasks.append(task)
-        
-        # Paralel çalıştır
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Sonuçları düzenle
+        Motor kotaları rate limiter'da uygulanır. Süre bütçesi dolunca
+        bitmemiş sorguların yalnızca bekleyicisi iptal edilir; upstream çağrı
+        (shield'lı single-flight görevi) sürer ve cache'i doldurur, girişler
+        late işaretlenir.
+        
+        Args:
+            plan: Sorgu planı
+            use_cache: Cache kullan
+            deadline: Süre bütçesi (saniye, None = SEARCH_DEADLINE_SECONDS, 0 = sınırsız)
+            
+        Returns:
+            Aynı plan (girişlerin result / late alanları dolu)
+        """
+        budget = SEARCH_DEADLINE_SECONDS if deadline is None else deadline
+        
+        tasks = {
+            key: asyncio.ensure_future(self.search_single_engine(
+                engine_name=planned.engine,
+                query=planned.query,
+                count=planned.count,
+                language=planned.language,
+                doc_type=planned.doc_type,
+                use_cache=use_cache,
+                page=planned.page
+            ))
+            for key, planned in plan.unique.items()
+        }
+        
+        pending = set()
+        if tasks:
+            _, pending = await asyncio.wait(tasks.values(), timeout=budget or None)
+        for key, task in tasks.items():
+            if task in pending:
+                task.cancel()
+                self.latency.count(plan.unique[key].engine, "late")
+            elif task.exception() is not None:
+                print(f"Search exception: {task.exception()}")
+        
+        for item in plan.items:
+            task = tasks[item.query.key]
+            if task in pending:
+                item.late = True
+            elif task.exception() is None:
+                result = task.result()
+                item.result = {**result, "results": list(result["results"])}
+        return plan
+    
+    def summarize_plan(
+        self,
+        items: List[PlanItem],
+        query: str,
+        language: str,
+        doc_type: str = None,
+        search_time: float = 0
+    ) -> Dict[str, Any]:
+        """Plan girişlerini search_all_engines yanıtına çevir (plan sırasıyla birleştirme)"""
         engine_results = {}
         all_results = []
+        pending_engines = []
         
-        for result in results:
-            if isinstance(result, Exception):
-                print(f"Search exception: {result}")
+        for plan_item in items:
+            if plan_item.late:
+                pending_engines.append(plan_item.query.engine)
+                continue
+            result = plan_item.result
+            if result is None:
                 continue
             
             engine_name = result.get("engine")
@@ -229,8 +398,6 @@ class MultiSearchCoordinator:
                 seen_urls.add(url)
                 merged_results.append(item)
         
-        search_time = (datetime.now() - start_time).total_seconds()
-        
         return {
             "query": query,
             "language": language,
@@ -238,7 +405,88 @@ class MultiSearchCoordinator:
             "engines": engine_results,
             "total_results": len(merged_results),
             "merged_results": merged_results,
-            "search_time": search_time
+            "search_time": search_time,
+            "partial": bool(pending_engines),
+            "pending_engines": pending_engines
+        }
+    
+    async def search_premium_sites(
+        self,
+        base_query: str,
+        sites: List[str],
+        pages: int = 5,
+        per_page: int = 10,
+        use_cache: bool = True,
+        deadline: float = None
+    ) -> Dict[str, Any]:
+        """
+        Premium sitelerde (Scribd, Issuu, ...) Serper site: araması - eşzamanlı
+        
+        Siteler paralel aranır, bir sitenin sayfaları sırayla çekilir: eksik
+        gelen ilk sayfadan sonra o site için istek gönderilmez (sonraki
+        sayfalar boş / tekrar olur, kredi harcanmaz). Süre bütçesi dolarsa
+        sitelerin o ana kadar gelen sayfaları döner. Sayfalar organik
+        sonuçlar gibi sayfa bazlı cache'lenir (engine: serper_premium).
+        
+        Args:
+            base_query: Site öneki olmadan sorgu (marka, model, kategori)
+            sites: Premium site domain'leri
+            pages: Site başına en fazla sayfa
+            per_page: Sayfa başına sonuç (Serper max 10)
+            use_cache: Cache kullan
+            deadline: Süre bütçesi (saniye, None = SEARCH_DEADLINE_SECONDS, 0 = sınırsız)
+            
+        Returns:
+            {"results": List[Dict], "sites": {site: count}, "partial": bool, "pending_sites": List[str], "search_time": float}
+        """
+        start_time = datetime.now()
+        budget = SEARCH_DEADLINE_SECONDS if deadline is None else deadline
+        
+        async def fetch_page(site_query: str, page: int) -> List[Dict]:
+            result = await self.search_single_engine(
+                engine_name="serper_premium",
+                query=site_query,
+                count=per_page,
+                language="en",
+                use_cache=use_cache,
+                page=page
+            )
+            return result["results"]
+        
+        # Site başına gelen sonuçlar (süre dolsa da tamamlanan sayfalar korunur)
+        collected: Dict[str, List[Dict]] = {site: [] for site in sites}
+        
+        async def fetch_site(site: str) -> None:
+            site_query = f"site:{site} {base_query}"
+            for page in range(1, pages + 1):
+                results = await fetch_page(site_query, page)
+                collected[site].extend(results)
+                if len(results) < per_page:
+                    break  # Sonraki sayfalar bu sayfadan sonrası, boş / tekrar
+        
+        tasks = {asyncio.ensure_future(fetch_site(site)): site for site in sites}
+        pending = set()
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=budget or None)
+        for task in pending:
+            task.cancel()
+        
+        results = []
+        site_counts = {}
+        for task, site in tasks.items():
+            if task not in pending and task.exception() is not None:
+                print(f"Premium search exception ({site}): {task.exception()}")
+            if collected[site]:
+                site_counts[site] = len(collected[site])
+                results.extend(collected[site])
+        
+        pending_sites = [site for task, site in tasks.items() if task in pending]
+        return {
+            "results": results,
+            "sites": site_counts,
+            "partial": bool(pending_sites),
+            "pending_sites": pending_sites,
+            "search_time": (datetime.now() - start_time).total_seconds()
         }
     
     async def search_site_all_engines(
@@ -323,8 +571,17 @@ class MultiSearchCoordinator:
     def get_cache_stats(self) -> Dict[str, Any]:
         """Cache istatistiklerini getir"""
         if self.cache:
-            return self.cache.get_cache_stats()
-        return {"message": "Cache disabled"}
+            return {
+                **self.cache.get_cache_stats(),
+                "single_flight": self.single_flight.get_stats(),
+                "refresh_queue": self.refresh_queue.get_stats(),
+                "engine_latency": self.latency.get_stats()
+            }
+        return {
+            "message": "Cache disabled",
+            "single_flight": self.single_flight.get_stats(),
+            "engine_latency": self.latency.get_stats()
+        }
     
     def clear_cache(self, engine: str = None) -> int:
         """Cache temizle"""
@@ -335,6 +592,12 @@ class MultiSearchCoordinator:
             return self.cache.clear_engine_cache(engine)
         return self.cache.clear_all_cache()
     
+    def rekey_cache(self) -> Dict[str, int]:
+        """Cache kayıtlarını kanonik sorgu key'ine taşı ve birleştir"""
+        if not self.cache:
+            return {}
+        return self.cache.rekey_entries()
+    
     def refresh_cache(self, engine: str = None) -> int:
         """Süresi dolmuş cache'i temizle"""
         if not self.cache:
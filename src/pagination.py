@@ -0,0 +1,237 @@
+"""
+Pagination - keyset (cursor) sayfalama ve toplam sayı yardımcıları
+
+LIMIT ? OFFSET ? derin sayfalarda önceki tüm satırları okuyup atar; ayrıca
+her sayfada ayrı bir COUNT(*) tüm tabloyu sayar. Burada:
+- Sayfalar (sıralama kolonu, id) çifti üzerinden ilerler:
+      WHERE (size_mb, id) < (?, ?) ORDER BY size_mb DESC, id DESC LIMIT n
+  bileşik index ile her sayfa sabit sürededir
+- Cursor opak bir base64 JSON'dur (son satırın değeri + id + sıralama);
+  başka bir sıralamayla kullanılırsa reddedilir
+- NULL değerler her iki yönde de sona düşer (NULLS LAST): önce NULL olmayan
+  değerler, ardından NULL'lar id sırasıyla gelir
+- Toplam sayı isteğe bağlıdır: exact (COUNT(*)), estimate veya none.
+  estimate filtresiz listelerde trigger'larla tutulan stat_counters
+  sayacından (ör. users, discovered_pdfs; tablo boyutundan bağımsız tek
+  okuma), filtreli listelerde en fazla PAGINATION_COUNT_CACHE_SECONDS eski
+  önbelleğe alınmış COUNT(*)'tan gelir
+
+Cursor'suz sayfa 1 de keyset sorgusuyla çekilir; page > 1 (eski istemciler)
+aynı sıralamayla OFFSET'e düşer. Her iki durumda da yanıt next_cursor içerir.
+"""
+import base64
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.config import PAGINATION_COUNT_CACHE_SECONDS
+from src.metrics import get_counter
+
+COUNT_MODES = ("exact", "estimate", "none")
+
+
+class PaginationError(ValueError):
+    """Geçersiz sayfalama parametresi (API'de 400 döner)"""
+    pass
+
+
+class InvalidCursor(PaginationError):
+    """Çözülemeyen veya farklı sıralamaya ait cursor"""
+    pass
+
+
+@dataclass(frozen=True)
+class KeysetSort:
+    """Keyset sıralaması: kolon + benzersiz id"""
+    column: str  # SQL ifadesi (ör. "p.created_at")
+    key: str  # Sonuç satırındaki kolon adı (ör. "created_at")
+    descending: bool = True
+    nullable: bool = False
+    id_column: str = "id"
+    id_key: str = "id"
+
+    @property
+    def signature(self) -> str:
+        return f"{self.key}:{'desc' if self.descending else 'asc'}"
+
+    @property
+    def order_by(self) -> str:
+        direction = "DESC" if self.descending else "ASC"
+        nulls = " NULLS LAST" if self.nullable else ""
+        return f"{self.column} {direction}{nulls}, {self.id_column} {direction}"
+
+
+def encode_cursor(sort: KeysetSort, row: Any) -> str:
+    """Satırdan bir sonraki sayfanın cursor'ını oluştur"""
+    payload = {"s": sort.signature, "v": row[sort.key], "id": row[sort.id_key]}
+    raw = json.dumps(payload, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(sort: KeysetSort, cursor: str) -> Dict[str, Any]:
+    """Cursor'ı çöz → {"v": son değer, "id": son id}"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value, last_id = payload["v"], int(payload["id"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor(f"Geçersiz cursor: {e}")
+
+    if payload.get("s") != sort.signature:
+        raise InvalidCursor("Cursor farklı bir sıralamaya ait")
+    return {"v": value, "id": last_id}
+
+
+def _where(conditions: Sequence[str]) -> str:
+    return f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+
+def keyset_page(
+    cursor,
+    select_sql: str,
+    conditions: Sequence[str],
+    params: Sequence[Any],
+    sort: KeysetSort,
+    after: Optional[str] = None,
+    page: int = 1,
+    per_page: int = 20
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Bir sayfa satır çek
+
+    Args:
+        cursor: sqlite3 cursor (satırlar sort.key / sort.id_key ile okunabilmeli)
+        select_sql: "SELECT ... FROM ..." (WHERE / ORDER BY / LIMIT olmadan)
+        conditions: AND ile bağlanacak filtre koşulları
+        params: Koşul parametreleri
+        sort: Sıralama
+        after: Önceki yanıtın next_cursor'ı
+        page: Cursor yoksa sayfa numarası (> 1 ise OFFSET kullanılır)
+        per_page: Sayfa boyutu
+
+    Returns:
+        (satırlar, next_cursor) - son sayfada next_cursor None
+    """
+    conditions, params = list(conditions), list(params)
+    direction = "DESC" if sort.descending else "ASC"
+    op = "<" if sort.descending else ">"
+
+    def fetch(extra: List[str], extra_params: List[Any], order_by: str, limit: int, offset: int = 0) -> List[Any]:
+        sql = f"{select_sql} {_where(conditions + extra)} ORDER BY {order_by} LIMIT ?"
+        args = params + extra_params + [limit]
+        if offset:
+            sql += " OFFSET ?"
+            args.append(offset)
+        cursor.execute(sql, args)
+        return cursor.fetchall()
+
+    if after is None and page > 1:
+        rows = fetch([], [], sort.order_by, per_page + 1, (page - 1) * per_page)
+    else:
+        state = decode_cursor(sort, after) if after else None
+        in_nulls = state is not None and state["v"] is None
+        rows = []
+
+        if not in_nulls:
+            extra, extra_params = [], []
+            if sort.nullable:
+                extra.append(f"{sort.column} IS NOT NULL")
+            if state:
+                extra.append(f"({sort.column}, {sort.id_column}) {op} (?, ?)")
+                extra_params.extend([state["v"], state["id"]])
+            rows = fetch(extra, extra_params, f"{sort.column} {direction}, {sort.id_column} {direction}", per_page + 1)
+
+        if sort.nullable and len(rows) <= per_page:
+            extra, extra_params = [f"{sort.column} IS NULL"], []
+            if in_nulls:
+                extra.append(f"{sort.id_column} {op} ?")
+                extra_params.append(state["id"])
+            rows += fetch(extra, extra_params, f"{sort.id_column} {direction}", per_page + 1 - len(rows))
+
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    return rows, (encode_cursor(sort, rows[-1]) if has_more and rows else None)
+
+
+# (sql, params) → (zaman, sayı)
+_count_cache: Dict[Tuple[str, tuple], Tuple[float, int]] = {}
+_count_cache_lock = threading.Lock()
+_COUNT_CACHE_MAX_ENTRIES = 1024
+
+def count_rows(
+    cursor,
+    from_sql: str,
+    conditions: Sequence[str],
+    params: Sequence[Any],
+    mode: str = "exact",
+    counter: Optional[str] = None
+) -> Optional[int]:
+    """
+    Toplam satır sayısı
+
+    Args:
+        from_sql: "FROM ..." kısmı
+        mode: exact (her seferinde COUNT), estimate (sayaçtan veya önbellekten,
+              en fazla PAGINATION_COUNT_CACHE_SECONDS eski), none (sayma)
+        counter: Koşulların tamamını sayan stat_counters adı; yalnızca
+                 çağıran filtre uygulamıyorsa verilmeli (estimate'te okunur)
+
+    Returns:
+        Satır sayısı (mode=none ise None)
+    """
+    if mode == "none":
+        return None
+
+    if mode == "estimate" and counter:
+        value = get_counter(cursor, counter)
+        if value is not None:
+            return value
+
+    sql = f"SELECT COUNT(*) {from_sql} {_where(conditions)}"
+    key = (sql, tuple(params))
+    now = time.monotonic()
+
+    if mode == "estimate":
+        with _count_cache_lock:
+            cached = _count_cache.get(key)
+        if cached and now - cached[0] < PAGINATION_COUNT_CACHE_SECONDS:
+            return cached[1]
+
+    cursor.execute(sql, list(params))
+    total = cursor.fetchone()[0]
+
+    with _count_cache_lock:
+        if len(_count_cache) >= _COUNT_CACHE_MAX_ENTRIES:
+            _count_cache.clear()
+        _count_cache[key] = (now, total)
+    return total
+
+
+def resolve_count_mode(count: Optional[str], after: Optional[str]) -> str:
+    """Varsayılan sayım modu: cursor'lı isteklerde estimate, diğerlerinde exact"""
+    if count is None:
+        return "estimate" if after else "exact"
+    if count not in COUNT_MODES:
+        raise PaginationError(f"Geçersiz count: {count} ({', '.join(COUNT_MODES)})")
+    return count
+
+
+def page_info(
+    total: Optional[int],
+    page: int,
+    per_page: int,
+    next_cursor: Optional[str],
+    count_mode: str,
+    pages_key: str = "pages"
+) -> Dict[str, Any]:
+    """Liste yanıtlarının ortak sayfalama alanları (pages_key: endpoint'in eski alan adı)"""
+    return {
+        "total": total,
+        "total_is_estimate": count_mode == "estimate",
+        "page": page,
+        "per_page": per_page,
+        pages_key: (total + per_page - 1) // per_page if total is not None else None,
+        "next_cursor": next_cursor
+    }
@@ -7,13 +7,13 @@ import hmac
 import hashlib
 import json
 import time
-import sqlite3
 import requests
 from typing import Dict, Optional, Any
 from datetime import datetime, timedelta
 
 from src.config import DATABASE_PATH
 from src.settings_manager import get_settings_manager
+from src.db_pool import get_db_pool
 
 
 # Paket tanımları
@@ -55,9 +55,7 @@ class PayTRClient:
         self.db_path = DATABASE_PATH
     
     def _get_connection(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        return get_db_pool(self.db_path).acquire()
     
     def _get_config(self) -> Dict[str, str]:
         """PayTR yapılandırmasını al"""
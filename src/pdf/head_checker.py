@@ -11,6 +11,8 @@ from dataclasses import dataclass
 import logging
 from urllib.parse import urlparse
 
+from src.http_client import get_http_session
+
 logger = logging.getLogger(__name__)
 
 
@@ -48,16 +50,14 @@ async def get_pdf_info(
     
     Args:
         url: PDF URL'si
-        session: Mevcut aiohttp session (opsiyonel)
+        session: aiohttp session (varsayılan: paylaşımlı pdf oturumu)
         timeout: İstek timeout süresi (saniye)
     
     Returns:
         PDFInfo objesi
     """
-    close_session = False
     if session is None:
-        session = aiohttp.ClientSession()
-        close_session = True
+        session = get_http_session("pdf")
     
     try:
         headers = {
@@ -96,9 +96,6 @@ async def get_pdf_info(
         return PDFInfo(url=url, error=f"Connection error: {str(e)[:50]}")
     except Exception as e:
         return PDFInfo(url=url, error=str(e)[:50])
-    finally:
-        if close_session:
-            await session.close()
 
 
 async def get_bulk_pdf_info(
@@ -125,18 +122,17 @@ async def get_bulk_pdf_info(
             info = await get_pdf_info(url, session, timeout)
             return url, info
     
-    connector = aiohttp.TCPConnector(limit=max_concurrent, limit_per_host=5)
-    
-    async with aiohttp.ClientSession(connector=connector) as session:
-        tasks = [fetch_with_semaphore(url, session) for url in urls]
-        
-        for coro in asyncio.as_completed(tasks):
-            try:
-                url, info = await coro
-                results[url] = info
-            except Exception as e:
-                logger.error(f"Bulk PDF info error: {e}")
+    # Host başına limit paylaşımlı pdf havuzunda (HTTP_POOLS)
+    session = get_http_session("pdf")
+    tasks = [fetch_with_semaphore(url, session) for url in urls]
     
+    for coro in asyncio.as_completed(tasks):
+        try:
+            url, info = await coro
+            results[url] = info
+        except Exception as e:
+            logger.error(f"Bulk PDF info error: {e}")
+
     return results
 
 
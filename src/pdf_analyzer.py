@@ -7,6 +7,8 @@ import asyncio
 import aiohttp
 from typing import Optional, Dict, List
 
+from src.http_client import get_http_session
+
 
 async def get_pdf_page_count_fast(url: str, timeout: int = 15) -> Optional[int]:
     """
@@ -21,45 +23,45 @@ async def get_pdf_page_count_fast(url: str, timeout: int = 15) -> Optional[int]:
         Sayfa sayısı veya None
     """
     try:
-        async with aiohttp.ClientSession() as session:
-            # 1. Önce dosya boyutunu al (HEAD request)
-            async with session.head(url, timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
-                if resp.status != 200:
-                    return None
-                
-                content_length = resp.headers.get("Content-Length")
-                if not content_length:
-                    return None
-                
-                file_size = int(content_length)
-                
-                # Çok küçük dosyalar için direkt oku
-                if file_size < 10000:
-                    return await _read_full_pdf_count(session, url, timeout)
-            
-            # 2. Son 5KB'ı oku (Cross-Reference Table burada)
-            # PDF dosyalarında sayfa sayısı bilgisi genellikle sonda bulunur
-            start_byte = max(0, file_size - 5120)
-            headers = {"Range": f"bytes={start_byte}-{file_size - 1}"}
-            
-            async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
-                if resp.status not in (200, 206):
-                    return None
-                
-                content = await resp.read()
-                
-                # /Count değerini ara
-                # PDF'de sayfa sayısı: /Count 245 veya /Count245
-                matches = re.findall(rb'/Count\s*(\d+)', content)
-                
-                if matches:
-                    # En büyük değer genelde toplam sayfa
-                    counts = [int(m) for m in matches]
-                    return max(counts)
-                
-                # Bulunamadıysa baştan da dene
-                return await _read_pdf_header_count(session, url, timeout)
-                
+        session = get_http_session("pdf")
+        # 1. Önce dosya boyutunu al (HEAD request)
+        async with session.head(url, timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+            if resp.status != 200:
+                return None
+            
+            content_length = resp.headers.get("Content-Length")
+            if not content_length:
+                return None
+            
+            file_size = int(content_length)
+            
+            # Çok küçük dosyalar için direkt oku
+            if file_size < 10000:
+                return await _read_full_pdf_count(session, url, timeout)
+        
+        # 2. Son 5KB'ı oku (Cross-Reference Table burada)
+        # PDF dosyalarında sayfa sayısı bilgisi genellikle sonda bulunur
+        start_byte = max(0, file_size - 5120)
+        headers = {"Range": f"bytes={start_byte}-{file_size - 1}"}
+        
+        async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+            if resp.status not in (200, 206):
+                return None
+            
+            content = await resp.read()
+            
+            # /Count değerini ara
+            # PDF'de sayfa sayısı: /Count 245 veya /Count245
+            matches = re.findall(rb'/Count\s*(\d+)', content)
+            
+            if matches:
+                # En büyük değer genelde toplam sayfa
+                counts = [int(m) for m in matches]
+                return max(counts)
+            
+            # Bulunamadıysa baştan da dene
+            return await _read_pdf_header_count(session, url, timeout)
+            
     except asyncio.TimeoutError:
         return None
     except Exception as e:
@@ -126,16 +128,16 @@ async def get_pdf_file_size(url: str, timeout: int = 10) -> Optional[int]:
         Dosya boyutu (bytes) veya None
     """
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.head(url, timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
-                if resp.status != 200:
-                    return None
-                
-                content_length = resp.headers.get("Content-Length")
-                if content_length:
-                    return int(content_length)
-                
+        session = get_http_session("pdf")
+        async with session.head(url, timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+            if resp.status != 200:
                 return None
+            
+            content_length = resp.headers.get("Content-Length")
+            if content_length:
+                return int(content_length)
+            
+            return None
     except:
         return None
 
@@ -148,22 +150,22 @@ async def analyze_pdf(url: str) -> Dict[str, Optional[int]]:
         {"page_count": int|None, "file_size": int|None}
     """
     try:
-        async with aiohttp.ClientSession() as session:
-            # HEAD request ile boyut al
-            file_size = None
-            async with session.head(url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
-                if resp.status == 200:
-                    content_length = resp.headers.get("Content-Length")
-                    if content_length:
-                        file_size = int(content_length)
-            
-            # Sayfa sayısı
-            page_count = await get_pdf_page_count_fast(url)
-            
-            return {
-                "page_count": page_count,
-                "file_size": file_size
-            }
+        session = get_http_session("pdf")
+        # HEAD request ile boyut al
+        file_size = None
+        async with session.head(url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
+            if resp.status == 200:
+                content_length = resp.headers.get("Content-Length")
+                if content_length:
+                    file_size = int(content_length)
+        
+        # Sayfa sayısı
+        page_count = await get_pdf_page_count_fast(url)
+        
+        return {
+            "page_count": page_count,
+            "file_size": file_size
+        }
     except:
         return {"page_count": None, "file_size": None}
 
@@ -210,11 +212,11 @@ def update_cache_with_metadata(db_path: str, url: str, page_count: int, file_siz
         page_count: Sayfa sayısı
         file_size: Dosya boyutu
     """
-    import sqlite3
     import json
+    from src.db_pool import get_db_pool
     
     try:
-        conn = sqlite3.connect(db_path)
+        conn = get_db_pool(db_path).acquire(row_factory=None)
         cursor = conn.cursor()
         
         # search_cache tablosundaki results JSON'larını güncelle
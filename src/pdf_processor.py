@@ -6,6 +6,8 @@ import logging
 from typing import Tuple, Optional
 from pathlib import Path
 
+from src.http_client import get_http_session
+
 logger = logging.getLogger(__name__)
 
 class PDFProcessor:
@@ -49,16 +51,16 @@ class PDFProcessor:
     async def _download_file(self, url: str, dest: str) -> bool:
         """Dosyayı asenkron olarak indirir"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=30) as response:
-                    if response.status == 200:
-                        f = await aiofiles.open(dest, mode='wb')
-                        await f.write(await response.read())
-                        await f.close()
-                        return True
-                    else:
-                        logger.warning(f"İndirme başarısız ({response.status}): {url}")
-                        return False
+            session = get_http_session("pdf")
+            async with session.get(url, timeout=30) as response:
+                if response.status == 200:
+                    f = await aiofiles.open(dest, mode='wb')
+                    await f.write(await response.read())
+                    await f.close()
+                    return True
+                else:
+                    logger.warning(f"İndirme başarısız ({response.status}): {url}")
+                    return False
         except Exception as e:
             logger.error(f"İndirme hatası: {e}")
             return False
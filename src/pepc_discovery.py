@@ -36,8 +36,9 @@ class PEPCDiscovery:
             "zh": "cn", "ja": "jp", "ko": "kr", "ar": "sa"
         }
 
-        total_discovered = 0
-        
+        # Sorgular önce toplanır; Serper istekleri motorun limiter'ı (QPS +
+        # eşzamanlılık) ile aynı anda gönderilir, sabit bekleme yok
+        jobs = []
         for brand in brands:
             brand_variants = BRANDS.get(brand.lower(), [brand])
             for doc_type in doc_types:
@@ -52,36 +53,44 @@ class PEPCDiscovery:
                             if equipment_types:
                                 # Sadece ilk ekipman tipini ekle (sorgu sayısını azaltmak için)
                                 query += f" {equipment_types[0]}"
-                                
-                            logger.info(f"Sorgulanıyor: {query} ({lang})")
-                            try:
-                                results = await self.client.search_pdfs(
-                                    query=query,
-                                    gl=lang_to_country.get(lang, "us"),
-                                    hl=lang
-                                )
-                                
-                                for r in results:
-                                    # Veritabanına 'pending' olarak ekle
-                                    pdf_id = self.db.add_pdf({
-                                        "url": r.url,
-                                        "title": r.title,
-                                        "brand": brand,
-                                        "doc_type": doc_type,
-                                        "language": lang,
-                                        "domain": r.domain,
-                                        "status": "pending"
-                                    })
-                                    
-                                    if pdf_id > 0:
-                                        # İşleme görevini kuyruğa ekle
-                                        self.db.add_task("processing", {"pdf_id": pdf_id, "url": r.url})
-                                        total_discovered += 1
-                                        
-                            except Exception as e:
-                                logger.error(f"Sorgu hatası '{query}': {e}")
-                            
-                            await asyncio.sleep(1) # Rate limiting
+                            jobs.append((brand, doc_type, lang, query))
+        
+        async def fetch(lang: str, query: str) -> List[SearchResult]:
+            logger.info(f"Sorgulanıyor: {query} ({lang})")
+            try:
+                return await self.client.search_pdfs(
+                    query=query,
+                    gl=lang_to_country.get(lang, "us"),
+                    hl=lang
+                )
+            except Exception as e:
+                logger.error(f"Sorgu hatası '{query}': {e}")
+                return []
+        
+        all_results = await asyncio.gather(*(fetch(lang, query) for _, _, lang, query in jobs))
+        
+        total_discovered = 0
+        for (brand, doc_type, lang, query), results in zip(jobs, all_results):
+            try:
+                for r in results:
+                    # Veritabanına 'pending' olarak ekle
+                    pdf_id = self.db.add_pdf({
+                        "url": r.url,
+                        "title": r.title,
+                        "brand": brand,
+                        "doc_type": doc_type,
+                        "language": lang,
+                        "domain": r.domain,
+                        "status": "pending"
+                    })
+                    
+                    if pdf_id > 0:
+                        # İşleme görevini kuyruğa ekle
+                        self.db.add_task("processing", {"pdf_id": pdf_id, "url": r.url})
+                        total_discovered += 1
+                        
+            except Exception as e:
+                logger.error(f"Sorgu hatası '{query}': {e}")
         
         # Session'ı kapat
         await self.client.close()
@@ -0,0 +1,154 @@
+"""
+Query Stats - kayıtlı aramalar için artımlı güncellenen sorgu istatistikleri
+
+/api/saved-searches her satır için ayrı COUNT(*) çalıştırıyor (N+1), marka /
+kategori dağılımı için de eşleşen tüm search_logs satırlarını okuyup markayı
+Python'da çıkarıyordu. Burada (normalize edilmiş sorgu, kategori) başına tek
+bir satır tutulur:
+- marka (extract_brand_from_query) ve kategori (map_doc_type_to_category)
+  satır eklenirken bir kez hesaplanır
+- search_count, first_seen / last_seen ve son aramanın result_count,
+  user_id, engines_used değerleri
+Log yazıcısı (src/log_writer.py) search_logs satırlarını yazdığı
+transaction'da bu tabloyu da günceller; endpoint'ler index'li tek okuma yapar.
+
+Tablo 014_query_stats migration'ı ile oluşturulur; boşsa init_database
+sırasında mevcut search_logs'tan doldurulur (backfill_query_stats).
+"""
+import logging
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple
+
+from src.utils import extract_brand_from_query, map_doc_type_to_category
+
+logger = logging.getLogger(__name__)
+
+# Backfill sırasında tek seferde okunan search_logs satırı
+BACKFILL_CHUNK = 5000
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+UPSERT_SQL = '''
+    INSERT INTO query_stats (
+        query_key, category, query, brand, doc_type, search_count,
+        first_seen, last_seen, last_result_count, last_user_id, last_engines_used
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(query_key, category) DO UPDATE SET
+        search_count = query_stats.search_count + excluded.search_count,
+        first_seen = MIN(query_stats.first_seen, excluded.first_seen),
+        query = CASE WHEN excluded.last_seen >= query_stats.last_seen THEN excluded.query ELSE query_stats.query END,
+        doc_type = CASE WHEN excluded.last_seen >= query_stats.last_seen THEN excluded.doc_type ELSE query_stats.doc_type END,
+        last_result_count = CASE WHEN excluded.last_seen >= query_stats.last_seen THEN excluded.last_result_count ELSE query_stats.last_result_count END,
+        last_user_id = CASE WHEN excluded.last_seen >= query_stats.last_seen THEN excluded.last_user_id ELSE query_stats.last_user_id END,
+        last_engines_used = CASE WHEN excluded.last_seen >= query_stats.last_seen THEN excluded.last_engines_used ELSE query_stats.last_engines_used END,
+        last_seen = MAX(query_stats.last_seen, excluded.last_seen)
+'''
+
+
+def normalize_query(query: Optional[str]) -> str:
+    """Sorgu anahtarı: küçük harf, kırpılmış, tek boşluklu"""
+    return _WHITESPACE_RE.sub(" ", (query or "").strip()).lower()
+
+
+@lru_cache(maxsize=4096)
+def _brand(query_key: str) -> Optional[str]:
+    return extract_brand_from_query(query_key)
+
+
+def _aggregate(rows: Iterable[Tuple]) -> Dict[Tuple[str, str], list]:
+    """
+    (user_id, query, doc_type, engines_used, result_count, created_at) satırlarını
+    (query_key, category) başına topla
+    """
+    stats: Dict[Tuple[str, str], list] = {}
+    for user_id, query, doc_type, engines_used, result_count, created_at in rows:
+        query_key = normalize_query(query)
+        if not query_key:
+            continue
+        category = map_doc_type_to_category(doc_type)
+        created_at = created_at or ""
+        key = (query_key, category)
+
+        entry = stats.get(key)
+        if entry is None:
+            stats[key] = [
+                query_key, category, query, _brand(query_key), doc_type, 1,
+                created_at, created_at, result_count, user_id, engines_used
+            ]
+            continue
+
+        entry[5] += 1
+        if created_at < entry[6]:
+            entry[6] = created_at
+        if created_at >= entry[7]:
+            entry[2], entry[4] = query, doc_type
+            entry[7], entry[8], entry[9], entry[10] = created_at, result_count, user_id, engines_used
+    return stats
+
+
+def update_query_stats(conn, rows: Iterable[Tuple]) -> int:
+    """
+    Yeni search_logs satırlarını query_stats'a işle (çağıranın transaction'ında)
+
+    Args:
+        conn: sqlite3 bağlantısı
+        rows: (user_id, query, doc_type, engines_used, result_count, created_at)
+
+    Returns:
+        Güncellenen (sorgu, kategori) sayısı
+    """
+    stats = _aggregate(rows)
+    if stats:
+        conn.executemany(UPSERT_SQL, list(stats.values()))
+    return len(stats)
+
+
+def backfill_query_stats(conn) -> int:
+    """
+    query_stats boşsa mevcut search_logs'tan doldur
+
+    Yazma kilidi altında kontrol edilir; aynı anda açılan başka bir süreç
+    tabloyu doldurduysa tekrar sayılmaz.
+
+    Returns:
+        Oluşturulan satır sayısı
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if conn.execute("SELECT 1 FROM query_stats LIMIT 1").fetchone():
+            conn.rollback()
+            return 0
+
+        stats: Dict[Tuple[str, str], list] = {}
+        last_id = 0
+        while True:
+            rows = conn.execute('''
+                SELECT id, user_id, query, doc_type, engines_used, result_count, created_at
+                FROM search_logs WHERE id > ? ORDER BY id LIMIT ?
+            ''', (last_id, BACKFILL_CHUNK)).fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            for key, entry in _aggregate(tuple(row[1:]) for row in rows).items():
+                current = stats.get(key)
+                if current is None:
+                    stats[key] = entry
+                    continue
+                current[5] += entry[5]
+                current[6] = min(current[6], entry[6])
+                if entry[7] >= current[7]:
+                    current[2], current[4] = entry[2], entry[4]
+                    current[7:] = entry[7:]
+
+        if stats:
+            conn.executemany(UPSERT_SQL, list(stats.values()))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    if stats:
+        logger.info(f"query_stats dolduruldu: {len(stats)} sorgu ({last_id} log satırına kadar)")
+    return len(stats)
@@ -0,0 +1,351 @@
+"""
+Rate Limiter - arama / scraping API'leri için motor başına hız ve eşzamanlılık kontrolü
+
+Her sağlayıcının (Serper, Brave, SearchApi, Yandex, Firecrawl) kendi QPS ve
+eşzamanlı istek kotası var. Önceden toplu keşif sabit asyncio.sleep(1) /
+sleep(0.3) ile yavaşlatılıyor, multi-search ise motorlara sınırsız
+asyncio.gather ile gidiyordu: ya kota boşa harcanıyor ya da 429 alınıyordu.
+
+Motor + API anahtarı başına bir EngineLimiter (ENGINE_RATE_LIMITS):
+- Token bucket: saniyede qps jeton, en fazla burst birikir; istekler FIFO
+  sırayla jeton bekler
+- AIMD eşzamanlılık: her başarılı yanıtta pencere +1/pencere büyür (en fazla
+  concurrency), 429 / 5xx'te yarıya iner (en az 1). Aynı anda dönen 429'lar
+  pencereyi yalnızca bir kez küçültür
+- Retry-After (saniye veya HTTP tarihi) gelirse motorun tüm istekleri o ana
+  kadar durur; başlık yoksa üstel geri çekilme uygulanır
+
+Kullanım:
+    limiter = get_rate_limiter().get("serper", api_key)
+    async with limiter.slot() as slot:
+        async with session.post(...) as response:
+            if slot.report(response.status, response.headers.get("Retry-After")):
+                ...  # 429 / 503: yeniden denenebilir
+
+İlkel nesneler (bekleme kuyruğu, kilit) event loop'a bağlıdır; farklı bir
+loop'tan (CLI, benchmark) kullanılırsa o loop için yeniden oluşturulur.
+"""
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from src.config import (
+    ENGINE_RATE_LIMITS,
+    RATE_LIMIT_MAX_RETRIES,
+    RATE_LIMIT_BACKOFF_SECONDS,
+    RATE_LIMIT_MAX_BACKOFF_SECONDS
+)
+
+logger = logging.getLogger(__name__)
+
+# Yeniden denenebilir kısıtlama yanıtları; diğer 5xx'ler yalnızca geri çekilir
+RETRYABLE_STATUSES = (429, 503)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Retry-After başlığını saniyeye çevir
+
+    Args:
+        value: "120" veya "Wed, 21 Oct 2026 07:28:00 GMT"
+
+    Returns:
+        Bekleme süresi (0..RATE_LIMIT_MAX_BACKOFF_SECONDS) veya None
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        seconds = (when - datetime.now(timezone.utc)).total_seconds()
+    return min(max(seconds, 0.0), RATE_LIMIT_MAX_BACKOFF_SECONDS)
+
+
+class RateLimitSlot:
+    """Alınmış tek bir istek hakkı; yanıt durumu report() ile bildirilir"""
+
+    def __init__(self, limiter: "EngineLimiter", started: float):
+        self.limiter = limiter
+        self.started = started
+        self.status: Optional[int] = None
+        self.throttled = False
+        self.reported = False
+
+    def report(self, status: int, retry_after: Optional[str] = None) -> bool:
+        """
+        Yanıt durumunu limiter'a bildir
+
+        Args:
+            status: HTTP durum kodu
+            retry_after: Retry-After başlığı (varsa)
+
+        Returns:
+            İstek yeniden denenebilir bir kısıtlamaya takıldıysa True (429 / 503)
+        """
+        self.reported = True
+        self.status = status
+        self.throttled = self.limiter._on_response(self.started, status, retry_after)
+        return self.throttled and status in RETRYABLE_STATUSES
+
+
+class EngineLimiter:
+    """Tek motor / API anahtarı için token bucket + AIMD eşzamanlılık"""
+
+    def __init__(self, name: str, qps: float, burst: int, concurrency: int):
+        self.name = name
+        self.rate = qps
+        self.burst = max(1, burst)
+        self.max_concurrency = max(1, concurrency)
+        self.max_retries = RATE_LIMIT_MAX_RETRIES
+
+        # AIMD penceresi: başlangıçta kota kadar
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self.tokens = float(self.burst)
+        self.paused_until = 0.0
+
+        self._refilled_at = time.monotonic()
+        self._last_decrease = 0.0
+        self._backoff_streak = 0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._token_lock: Optional[asyncio.Lock] = None
+
+        self.stats = {
+            "requests": 0,
+            "throttled": 0,
+            "timeouts": 0,
+            "decreases": 0,
+            "wait_seconds": 0.0,
+            "max_wait_seconds": 0.0
+        }
+
+    def _bind(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Önceki loop'un bekleyenleri o loop'la birlikte gider
+            self._loop = loop
+            self._waiters = deque()
+            self._token_lock = asyncio.Lock()
+            self.in_flight = 0
+        return loop
+
+    def _window(self) -> int:
+        return max(1, int(self.limit))
+
+    def _wake(self) -> None:
+        """Pencerede yer varsa sıradaki bekleyenlere hak ver"""
+        while self._waiters and self.in_flight < self._window():
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    async def _acquire_slot(self) -> None:
+        loop = self._bind()
+        if not self._waiters and self.in_flight < self._window():
+            self.in_flight += 1
+            return
+
+        waiter = loop.create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Hak verilmişti ama kullanılmayacak
+                self._release_slot()
+            else:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            raise
+
+    def _release_slot(self) -> None:
+        self.in_flight = max(0, self.in_flight - 1)
+        self._wake()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        self.tokens = min(float(self.burst), self.tokens + elapsed * self.rate)
+
+    async def _take_token(self) -> None:
+        """Duraklama bitene ve jeton birikene kadar bekle (FIFO)"""
+        async with self._token_lock:
+            while True:
+                now = time.monotonic()
+                if self.paused_until > now:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                if self.rate <= 0:
+                    return
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def _on_response(self, started: float, status: int, retry_after: Optional[str]) -> bool:
+        """AIMD güncellemesi; kısıtlama (429 / 5xx) ise True"""
+        if status == 429 or status >= 500:
+            now = time.monotonic()
+            self.stats["throttled"] += 1
+
+            # Aynı pencerede gönderilmiş isteklerin 429'ları tek bir azaltma sayılır
+            if started >= self._last_decrease:
+                self.limit = max(1.0, self.limit / 2)
+                self._last_decrease = now
+                self.stats["decreases"] += 1
+
+            delay = parse_retry_after(retry_after)
+            if delay is None:
+                delay = min(
+                    RATE_LIMIT_BACKOFF_SECONDS * (2 ** self._backoff_streak),
+                    RATE_LIMIT_MAX_BACKOFF_SECONDS
+                )
+            self._backoff_streak += 1
+            if now + delay > self.paused_until:
+                self.paused_until = now + delay
+                # Duraklama sonrası biriken jetonlarla patlama yapma
+                self.tokens = 0.0
+                self._refilled_at = self.paused_until
+                logger.warning(f"{self.name} kısıtlandı ({status}), {delay:.1f}s bekleniyor")
+            return True
+
+        self._backoff_streak = 0
+        if self.limit < self.max_concurrency:
+            self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+            self._wake()
+        return False
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        Bir istek hakkı al: eşzamanlılık penceresi + jeton
+
+        Gövde içinde report() çağrılmazsa istek başarılı sayılır; zaman aşımı
+        tıkanıklık olarak pencereyi küçültür.
+        """
+        queued_at = time.monotonic()
+        await self._acquire_slot()
+        try:
+            await self._take_token()
+        except BaseException:
+            self._release_slot()
+            raise
+
+        started = time.monotonic()
+        waited = started - queued_at
+        self.stats["requests"] += 1
+        self.stats["wait_seconds"] += waited
+        self.stats["max_wait_seconds"] = max(self.stats["max_wait_seconds"], waited)
+
+        slot = RateLimitSlot(self, started)
+        try:
+            yield slot
+        except asyncio.TimeoutError:
+            if not slot.reported:
+                self.stats["timeouts"] += 1
+                if started >= self._last_decrease:
+                    self.limit = max(1.0, self.limit / 2)
+                    self._last_decrease = time.monotonic()
+                    self.stats["decreases"] += 1
+            raise
+        else:
+            if not slot.reported:
+                self._on_response(started, 200, None)
+        finally:
+            self._release_slot()
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        requests = self.stats["requests"]
+        return {
+            **self.stats,
+            "wait_seconds": round(self.stats["wait_seconds"], 3),
+            "max_wait_seconds": round(self.stats["max_wait_seconds"], 3),
+            "avg_wait_ms": round(self.stats["wait_seconds"] / requests * 1000, 1) if requests else 0.0,
+            "qps": self.rate,
+            "burst": self.burst,
+            "concurrency": round(self.limit, 2),
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "paused_for": round(max(0.0, self.paused_until - now), 2)
+        }
+
+
+class RateLimiter:
+    """Motor + API anahtarı başına EngineLimiter kaydı"""
+
+    def __init__(self, limits: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.limits = limits or ENGINE_RATE_LIMITS
+        self._limiters: Dict[Tuple[str, str], EngineLimiter] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key_id(api_key: Optional[str]) -> str:
+        # Anahtarın kendisi istatistiklerde görünmesin
+        return hashlib.sha1(api_key.encode()).hexdigest()[:8] if api_key else "default"
+
+    def get(self, engine: str, api_key: Optional[str] = None) -> EngineLimiter:
+        """
+        Motorun (ve anahtarın) limiter'ını al (yoksa oluştur)
+
+        Args:
+            engine: ENGINE_RATE_LIMITS anahtarı (serper, brave, searchapi, yandex, firecrawl)
+            api_key: Kota anahtar başınaysa API anahtarı
+
+        Returns:
+            Paylaşımlı EngineLimiter
+        """
+        if engine not in self.limits:
+            raise ValueError(f"Bilinmeyen rate limit motoru: {engine}")
+
+        key = (engine, self._key_id(api_key))
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            with self._lock:
+                limiter = self._limiters.get(key)
+                if limiter is None:
+                    spec = self.limits[engine]
+                    limiter = self._limiters[key] = EngineLimiter(
+                        f"{engine}:{key[1]}", spec["qps"], spec["burst"], spec["concurrency"]
+                    )
+        return limiter
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Limiter başına istek, kısıtlama, bekleme ve güncel pencere bilgisi"""
+        with self._lock:
+            limiters = list(self._limiters.values())
+        return {limiter.name: limiter.get_stats() for limiter in limiters}
+
+
+_rate_limiter: Optional[RateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+def get_rate_limiter() -> RateLimiter:
+    """Süreç genelindeki rate limiter'ı al"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                _rate_limiter = RateLimiter()
+    return _rate_limiter
@@ -0,0 +1,92 @@
+"""
+Refresh Queue - Arka plan cache yenileme kuyruğu
+
+Stale-while-revalidate için: soft TTL'i geçmiş kayıtlar kullanıcıya hemen
+sunulur, yenileme işi bu sınırlı kuyruğa atılır. Kuyruk doluysa iş düşürülür
+(bir sonraki stale okuma tekrar dener), aynı key iki kez kuyruğa girmez.
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshQueue:
+    """Sınırlı boyutlu, key bazlı tekilleştirilmiş arka plan iş kuyruğu"""
+
+    def __init__(self, maxsize: int = 100, workers: int = 2):
+        self.maxsize = maxsize
+        self.worker_count = workers
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._pending: Set[Hashable] = set()
+        self.stats = {
+            "scheduled": 0,
+            "deduplicated": 0,
+            "dropped": 0,
+            "completed": 0,
+            "failed": 0
+        }
+
+    def _ensure_workers(self) -> None:
+        """Worker'ları ilk kullanımda (çalışan event loop içinde) başlat"""
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._workers = [w for w in self._workers if not w.done()]
+        while len(self._workers) < self.worker_count:
+            self._workers.append(asyncio.create_task(self._worker()))
+
+    def submit(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> bool:
+        """
+        Yenileme işini kuyruğa ekle
+
+        Returns:
+            İş kuyruğa alındıysa True (zaten bekliyorsa veya kuyruk doluysa False)
+        """
+        if key in self._pending:
+            self.stats["deduplicated"] += 1
+            return False
+
+        self._ensure_workers()
+
+        try:
+            self._queue.put_nowait((key, func))
+        except asyncio.QueueFull:
+            self.stats["dropped"] += 1
+            return False
+
+        self._pending.add(key)
+        self.stats["scheduled"] += 1
+        return True
+
+    async def _worker(self) -> None:
+        while True:
+            key, func = await self._queue.get()
+            try:
+                await func()
+                self.stats["completed"] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["failed"] += 1
+                logger.warning(f"Cache yenileme hatası ({key}): {e}")
+            finally:
+                self._pending.discard(key)
+                self._queue.task_done()
+
+    async def close(self) -> None:
+        """Worker'ları durdur (bekleyen işler atılır)"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Kuyruk istatistikleri"""
+        return {
+            **self.stats,
+            "pending": len(self._pending),
+            "maxsize": self.maxsize,
+            "workers": self.worker_count
+        }
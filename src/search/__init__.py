@@ -2,11 +2,15 @@
 PDF Katalog Arama Sistemi - Arama Modülleri
 """
 from .query_builder import build_search_query, build_or_clause
+from .query_canonical import canonicalize_query, canonical_forms, query_tokens
 from .aggregator import MultiEngineAggregator
 
 __all__ = [
     'build_search_query',
     'build_or_clause',
+    'canonicalize_query',
+    'canonical_forms',
+    'query_tokens',
     'MultiEngineAggregator'
 ]
 
@@ -8,6 +8,8 @@ from typing import List, Dict, Optional, Any
 import logging
 
 from src.data.domains import is_excluded_domain
+from src.http_client import get_http_session
+from src.rate_limiter import get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -36,12 +38,12 @@ class BraveSearchClient:
         self._session: Optional[aiohttp.ClientSession] = None
     
     async def _ensure_session(self):
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
+        # Paylaşımlı oturum: bağlantılar ve DNS cache'i istekler arasında korunur
+        self._session = get_http_session("api")
     
     async def close(self):
-        if self._session and not self._session.closed:
-            await self._session.close()
+        # Paylaşımlı oturum uygulama kapanışında kapatılır (src/http_client.py)
+        self._session = None
     
     async def search(
         self,
@@ -92,14 +94,19 @@ class BraveSearchClient:
         if freshness:
             params["freshness"] = freshness
         
+        limiter = get_rate_limiter().get("brave", self.api_key)
         try:
-            async with self._session.get(self.BASE_URL, headers=headers, params=params) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    error_text = await response.text()
-                    logger.error(f"Brave API error {response.status}: {error_text}")
-                    return {"error": error_text, "status": response.status}
+            for attempt in range(limiter.max_retries + 1):
+                async with limiter.slot() as slot:
+                    async with self._session.get(self.BASE_URL, headers=headers, params=params) as response:
+                        if slot.report(response.status, response.headers.get("Retry-After")) and attempt < limiter.max_retries:
+                            continue
+                        if response.status == 200:
+                            return await response.json()
+                        else:
+                            error_text = await response.text()
+                            logger.error(f"Brave API error {response.status}: {error_text}")
+                            return {"error": error_text, "status": response.status}
         except Exception as e:
             logger.error(f"Brave API request failed: {e}")
             return {"error": str(e)}
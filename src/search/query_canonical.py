@@ -0,0 +1,234 @@
+"""
+Sorgu Kanonikleştirici - Cache key için normalize token multiset'i
+
+Aynı aramanın farklı yazımları tek cache kaydına düşsün diye:
+- Büyük/küçük harf ve boşluk farkları yok sayılır
+- Terim sırası önemsizdir (sıralı token multiset)
+- Model numaraları tek token olur: "EC-210", "ec 210", "EC210" → ec210,
+  "PC200-8", "pc 200 8", "PC200 - 8" → pc2008
+- Marka alias'ları ana markaya katlanır: "cat" → caterpillar, "jd" → john deere
+
+Tırnaklı ifadeler tek token olarak kalır (motor için anlamı farklıdır),
+operatörler (filetype:pdf, mime:pdf, site:...) olduğu gibi korunur.
+
+Boolean sorgularda (OR / AND / |, parantez, -hariç) terim sırası anlam
+taşır: "volvo OR cat manual" ile "cat OR volvo manual" farklı sorgulardır.
+Bu sorgular normalize edilir ama sıralanmaz, operatörler aynen kalır.
+
+Kanonik biçim değiştikçe CANONICAL_VERSION artar; eski sürümlerin
+biçimleri canonical_forms ile üretilir, böylece cache kayıtları yeni
+key'e taşınabilir (CacheManager.rekey_entries).
+
+Örnek:
+    '"Volvo" "ec-210" "parts" catalog filetype:pdf'
+    '"volvo" "EC210" "parts" filetype:pdf catalog'
+    → '"ec210" "parts" "volvo" catalog filetype:pdf'
+"""
+import re
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from src.data.brands import BRAND_ALIASES
+
+# Tırnaklı ifade veya tırnaksız metin parçası
+_SEGMENT_RE = re.compile(r'"([^"]*)"|([^"]+)')
+
+# Rakamın yanındaki tire (boşluklu olsa da) model numarasının parçasıdır
+_MODEL_DASH_RE = re.compile(r'(?<=\d)\s*-\s*(?=\w)|(?<=\w)\s*-\s*(?=\d)')
+
+# Sırası anlam taşıyan boolean sözdizimi (tırnak dışında)
+_BOOLEAN_OPERATOR_RE = re.compile(r'(?<!\S)(?:OR|AND|\|)(?!\S)|[()|]')
+_EXCLUSION_RE = re.compile(r'(?<!\S)-(?=\w)')
+
+
+@dataclass(frozen=True)
+class _Rules:
+    """Kanonik biçimin bir sürümünün kuralları"""
+    split_dashes: bool  # Tireli model parçaları ayrı kelime (False: tire silinir)
+    merge_series: bool  # "pc200 8" → pc2008 (harf+rakam modelin ardındaki kısa sayı)
+    keep_boolean_order: bool  # Boolean sorgular sıralanmaz
+
+
+# Sürüm → kurallar; eski sürümler yalnızca eski key'leri bulmak için
+_RULES = {
+    1: _Rules(split_dashes=False, merge_series=False, keep_boolean_order=False),
+    2: _Rules(split_dashes=True, merge_series=False, keep_boolean_order=True),
+    3: _Rules(split_dashes=False, merge_series=True, keep_boolean_order=True),
+}
+CANONICAL_VERSION = max(_RULES)
+
+# Model serisi eki en fazla bu kadar rakam ("PC200-8", "D155AX-6"); yıllar birleşmez
+_SERIES_MAX_DIGITS = 2
+
+
+def _build_alias_index() -> Tuple[dict, int]:
+    """Alias kelime dizisi → ana marka eşlemesi"""
+    index = {}
+    for brand, aliases in BRAND_ALIASES.items():
+        for alias in aliases + [brand]:
+            index[tuple(alias.lower().split())] = brand
+    max_words = max(len(words) for words in index)
+    return index, max_words
+
+
+_ALIAS_INDEX, _ALIAS_MAX_WORDS = _build_alias_index()
+
+
+def _fold_brands(words: List[str]) -> List[Tuple[str, bool]]:
+    """
+    Kelime dizisindeki marka alias'larını ana markaya katla (en uzun eşleşme)
+
+    Returns:
+        (kelime, marka_mı) listesi
+    """
+    folded = []
+    i = 0
+    while i < len(words):
+        for size in range(min(_ALIAS_MAX_WORDS, len(words) - i), 0, -1):
+            brand = _ALIAS_INDEX.get(tuple(words[i:i + size]))
+            if brand:
+                folded.append((brand, True))
+                i += size
+                break
+        else:
+            folded.append((words[i], False))
+            i += 1
+    return folded
+
+
+def _is_operator(word: str) -> bool:
+    return ":" in word
+
+
+def _merge_model_parts(items: List[Tuple[str, bool]], rules: _Rules) -> List[str]:
+    """
+    Model numarası parçalarını tek kelimede birleştir
+
+    Rakam içeren kelimelerdeki tire silinir, boşlukla ayrılmış parçalar
+    birleştirilir (marka ve operatörlere dokunmaz): "ec 210" → ec210,
+    "320 d" → 320d, "pc200-8" / "pc 200 8" / "pc200 - 8" → pc2008
+    """
+    words: List[Tuple[str, bool]] = []
+    for word, is_brand in items:
+        if (
+            "-" in word and any(c.isdigit() for c in word)
+            and not is_brand and not _is_operator(word) and not word.startswith("-")
+        ):
+            if rules.split_dashes:
+                words.extend((part, False) for part in word.split("-"))
+            else:
+                words.append((word.replace("-", ""), False))
+        else:
+            words.append((word, is_brand))
+
+    merged: List[Tuple[str, bool]] = []
+
+    for word, is_brand in words:
+        if not word or word == "-":
+            continue
+
+        if merged and not is_brand and not merged[-1][1] and not _is_operator(word):
+            prev = merged[-1][0]
+            prefix = prev.isalpha() and len(prev) <= 3 and word[0].isdigit()
+            suffix = prev[-1].isdigit() and word.isalpha() and len(word) == 1
+            series = (
+                rules.merge_series and word.isdigit() and len(word) <= _SERIES_MAX_DIGITS
+                and any(c.isdigit() for c in prev) and any(c.isalpha() for c in prev)
+            )
+            if (prefix or suffix or series) and not _is_operator(prev):
+                merged[-1] = (prev + word, False)
+                continue
+
+        merged.append((word, is_brand))
+
+    return [word for word, _ in merged]
+
+
+def _normalize_segment(text: str, rules: _Rules) -> List[str]:
+    """Bir metin parçasını normalize kelime listesine çevir"""
+    text = _MODEL_DASH_RE.sub("-", text.lower())
+    return _merge_model_parts(_fold_brands(text.split()), rules)
+
+
+def _is_boolean(query: str) -> bool:
+    """Tırnak dışında OR / AND / |, parantez veya -hariç var mı"""
+    for match in _SEGMENT_RE.finditer(query or ""):
+        bare = match.group(2)
+        if bare is None:
+            continue
+        bare = _MODEL_DASH_RE.sub("-", bare)
+        if _BOOLEAN_OPERATOR_RE.search(bare) or _EXCLUSION_RE.search(bare):
+            return True
+    return False
+
+
+def _normalize_boolean_segment(text: str, rules: _Rules) -> List[str]:
+    """Operatörleri aynen bırakıp aralarındaki metni normalize et"""
+    tokens = []
+    position = 0
+    for match in _BOOLEAN_OPERATOR_RE.finditer(text):
+        tokens.extend(_normalize_segment(text[position:match.start()], rules))
+        tokens.append(match.group(0))
+        position = match.end()
+    tokens.extend(_normalize_segment(text[position:], rules))
+    return tokens
+
+
+def query_tokens(query: str, version: int = CANONICAL_VERSION) -> List[str]:
+    """
+    Sorguyu normalize token listesine çevir
+
+    Tırnaklı ifadeler '"..."' biçiminde tek token, diğer kelimeler ayrı token.
+    Boolean olmayan sorgularda tokenlar sıralanır, boolean sorgularda
+    yazıldığı sırada kalır.
+    """
+    rules = _RULES[version]
+    boolean = rules.keep_boolean_order and _is_boolean(query)
+    tokens = []
+
+    for match in _SEGMENT_RE.finditer(query or ""):
+        quoted, bare = match.groups()
+        if quoted is not None:
+            words = _normalize_segment(quoted, rules)
+            if words:
+                tokens.append(f'"{" ".join(words)}"')
+        elif boolean:
+            tokens.extend(_normalize_boolean_segment(bare, rules))
+        else:
+            tokens.extend(_normalize_segment(bare, rules))
+
+    return tokens if boolean else sorted(tokens)
+
+
+def canonicalize_query(query: str, version: int = CANONICAL_VERSION) -> str:
+    """Cache key'de kullanılacak kanonik sorgu metni"""
+    return " ".join(query_tokens(query, version))
+
+
+def canonical_forms(query: str) -> List[str]:
+    """Sorgunun tüm kanonik sürümlerdeki biçimleri (güncel önce, tekrarsız)"""
+    forms = []
+    for version in sorted(_RULES, reverse=True):
+        form = canonicalize_query(query, version)
+        if form not in forms:
+            forms.append(form)
+    return forms
+
+
+if __name__ == "__main__":
+    examples = [
+        '"volvo" "EC210" "parts" catalog filetype:pdf',
+        '"Volvo" "ec-210" "parts" filetype:pdf catalog',
+        '"volvo ce" "EC 210" "parts" catalog filetype:pdf',
+        '"cat" "320 D" "service" manual filetype:pdf',
+        '"caterpillar" "320D" "service" manual filetype:pdf',
+        '"komatsu" "PC200 - 8" "запчастей" mime:pdf',
+        'komatsu pc 200 8 manual',
+        'komatsu PC200-8 manual',
+        'volvo ec210 2019 manual',
+        'volvo OR cat manual',
+        'cat OR volvo manual',
+        '(volvo OR cat) manual -used',
+    ]
+    for q in examples:
+        print(f"{q}\n  → {canonicalize_query(q)}\n")
@@ -0,0 +1,132 @@
+"""
+Sorgu Planı - arama uç noktalarının tüm motor sorgularını baştan çıkarır
+
+/api/multi-search diller üzerinde, /live-search doc_type × dil × sorgu kalıbı
+üzerinde sırayla dönüp her motor çağrısını tek tek bekliyordu: N dil ≈ N tur
+gecikme. Plan önce tüm (motor, sorgu) çiftlerini üretir:
+
+- Her giriş bir etiket taşır (dil, doc_type...); çağıran sonuçları buna göre
+  gruplar
+- Özdeş sorgular (motor, kanonik sorgu, dil, doc_type, sayfa, adet) bir kez
+  çalıştırılır, sonuç tüm girişlere dağıtılır
+- MultiSearchCoordinator.run_plan benzersiz sorguları aynı anda çalıştırır;
+  motor kotaları rate limiter'da, süre bütçesi search_all_engines'takiyle aynı
+- Sonuçlar tamamlanma sırasına değil plan sırasına göre döner, birleştirme
+  (ilk bulunan URL kalır) her çalıştırmada aynı sonucu verir
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from .query_builder import build_search_query
+from .query_canonical import canonicalize_query
+
+
+@dataclass(frozen=True)
+class PlannedQuery:
+    """Tek bir motor çağrısı (search_single_engine argümanları)"""
+    engine: str
+    query: str
+    language: str = "en"
+    doc_type: Optional[str] = None
+    count: int = 20
+    page: Optional[int] = None
+
+    @property
+    def key(self) -> Tuple:
+        """Tekilleştirme anahtarı (single-flight key'i ile aynı)"""
+        return (self.engine, canonicalize_query(self.query), self.language, self.doc_type, self.page, self.count)
+
+
+@dataclass
+class PlanItem:
+    """Plandaki giriş ve çalıştırma sonucu"""
+    tag: Hashable
+    query: PlannedQuery
+    result: Optional[Dict[str, Any]] = None  # search_single_engine yanıtı
+    late: bool = False                       # Süre bütçesinde yetişmedi
+
+
+class QueryPlan:
+    """Etiketli, sıralı ve tekilleştirilmiş motor sorguları"""
+
+    def __init__(self):
+        self.items: List[PlanItem] = []
+        self.unique: Dict[Tuple, PlannedQuery] = {}
+
+    def add(
+        self,
+        tag: Hashable,
+        engine: str,
+        query: str,
+        language: str = "en",
+        doc_type: Optional[str] = None,
+        count: int = 20,
+        page: Optional[int] = None
+    ) -> PlannedQuery:
+        """
+        Plana sorgu ekle
+
+        Args:
+            tag: Çağıranın gruplama etiketi (ör. dil)
+            engine: Motor adı (MultiSearchCoordinator.engines)
+            query: Motor sorgusu
+            language: Dil kodu
+            doc_type: Cache key'ine giren döküman tipi
+            count: Sonuç sayısı
+            page: Sayfa (cache key için)
+
+        Returns:
+            Eklenen sorgu (özdeşi varsa mevcut olan)
+        """
+        planned = PlannedQuery(engine, query, language, doc_type, count, page)
+        planned = self.unique.setdefault(planned.key, planned)
+        self.items.append(PlanItem(tag, planned))
+        return planned
+
+    @property
+    def deduplicated(self) -> int:
+        """Tekrar ettiği için çalıştırılmayacak giriş sayısı"""
+        return len(self.items) - len(self.unique)
+
+    def tagged(self, tag: Hashable) -> List[PlanItem]:
+        """Etiketin girişleri (plan sırasıyla)"""
+        return [item for item in self.items if item.tag == tag]
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "planned": len(self.items),
+            "executed": len(self.unique),
+            "deduplicated": self.deduplicated,
+            "late": sum(1 for item in self.items if item.late)
+        }
+
+
+def build_multi_search_plan(
+    brand: Optional[str],
+    model: Optional[str],
+    category: str,
+    languages: Iterable[str],
+    engines: Iterable[str],
+    count: int = 50,
+    page: Optional[int] = None
+) -> QueryPlan:
+    """
+    Marka / model / kategori / dil → motor sorguları (etiket: dil)
+
+    Her dil için build_search_query ile dil varyantlı sorgu üretilir ve her
+    motora eklenir; tekrar eden diller tek kez aranır.
+    """
+    plan = QueryPlan()
+    engines = list(engines)
+    for language in dict.fromkeys(languages):
+        query = build_search_query(
+            brand=brand,
+            model=model,
+            category=category,
+            max_terms=4,
+            engine="google",
+            language=language
+        )
+        for engine in engines:
+            plan.add(language, engine, query, language, category, count, page)
+    return plan
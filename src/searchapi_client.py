@@ -8,6 +8,8 @@ import aiohttp
 from typing import List, Dict, Optional, Any
 
 from src.config import SEARCHAPI_KEY
+from src.http_client import get_http_session
+from src.rate_limiter import get_rate_limiter
 
 
 def _get_searchapi_key_from_db():
@@ -32,12 +34,12 @@ class SearchApiClient:
         self._session: Optional[aiohttp.ClientSession] = None
     
     async def _ensure_session(self):
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
+        # Paylaşımlı oturum: bağlantılar ve DNS cache'i istekler arasında korunur
+        self._session = get_http_session("api")
     
     async def close(self):
-        if self._session and not self._session.closed:
-            await self._session.close()
+        # Paylaşımlı oturum uygulama kapanışında kapatılır (src/http_client.py)
+        self._session = None
     
     async def search(
         self,
@@ -74,14 +76,20 @@ class SearchApiClient:
         if language:
             params["hl"] = language
         
+        # Tüm SearchApi motorları aynı anahtarın kotasını paylaşır
+        limiter = get_rate_limiter().get("searchapi", self.api_key)
         try:
-            async with self._session.get(self.BASE_URL, params=params) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    error_text = await response.text()
-                    print(f"SearchApi error {response.status}: {error_text}")
-                    return {"error": error_text, "status": response.status}
+            for attempt in range(limiter.max_retries + 1):
+                async with limiter.slot() as slot:
+                    async with self._session.get(self.BASE_URL, params=params) as response:
+                        if slot.report(response.status, response.headers.get("Retry-After")) and attempt < limiter.max_retries:
+                            continue
+                        if response.status == 200:
+                            return await response.json()
+                        else:
+                            error_text = await response.text()
+                            print(f"SearchApi error {response.status}: {error_text}")
+                            return {"error": error_text, "status": response.status}
         except Exception as e:
             print(f"SearchApi request failed: {e}")
             return {"error": str(e)}
@@ -7,6 +7,8 @@ from urllib.parse import urlparse
 from datetime import datetime
 import logging
 from src.keywords import EXCLUDED_DOMAINS
+from src.http_client import get_http_session
+from src.rate_limiter import get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -61,12 +63,12 @@ class SerperClient:
         self.request_count = 0
     
     async def _ensure_session(self):
-        if not self.session or self.session.closed:
-            self.session = aiohttp.ClientSession()
+        # Paylaşımlı oturum: bağlantılar ve DNS cache'i istekler arasında korunur
+        self.session = get_http_session("api")
     
     async def close(self):
-        if self.session and not self.session.closed:
-            await self.session.close()
+        # Paylaşımlı oturum uygulama kapanışında kapatılır (src/http_client.py)
+        self.session = None
     
     async def __aenter__(self):
         await self._ensure_session()
@@ -92,15 +94,20 @@ class SerperClient:
             **kwargs
         }
         
+        limiter = get_rate_limiter().get("serper", self.api_key)
         try:
-            async with self.session.post(url, headers=self.headers, json=payload) as response:
-                self.request_count += 1
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    error_text = await response.text()
-                    logger.error(f"Serper API Hatası {response.status}: {error_text}")
-                    return {"organic": [], "error": error_text}
+            for attempt in range(limiter.max_retries + 1):
+                async with limiter.slot() as slot:
+                    async with self.session.post(url, headers=self.headers, json=payload) as response:
+                        self.request_count += 1
+                        if slot.report(response.status, response.headers.get("Retry-After")) and attempt < limiter.max_retries:
+                            continue
+                        if response.status == 200:
+                            return await response.json()
+                        else:
+                            error_text = await response.text()
+                            logger.error(f"Serper API Hatası {response.status}: {error_text}")
+                            return {"organic": [], "error": error_text}
         except Exception as e:
             logger.error(f"İstek hatası: {e}")
             return {"organic": [], "error": str(e)}
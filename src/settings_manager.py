@@ -8,6 +8,7 @@ from datetime import datetime
 
 from src.config import DATABASE_PATH
 from src.encryption import encrypt, decrypt, mask_value, is_encrypted
+from src.db_pool import get_db_pool
 
 
 # Varsayılan ayarlar (ilk kurulum için)
@@ -69,9 +70,7 @@ class SettingsManager:
         self.db_path = db_path or DATABASE_PATH
     
     def _get_connection(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        return get_db_pool(self.db_path).acquire()
     
     def init_default_settings(self):
         """Varsayılan ayarları yükle (ilk kurulum)"""
@@ -0,0 +1,60 @@
+"""
+Single-Flight - Aynı anda gelen özdeş isteklerin birleştirilmesi
+
+Aynı key için uçuşta olan bir coroutine varsa yeni çağıranlar yeni bir
+upstream çağrı başlatmaz, mevcut görevin sonucunu bekler.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Key bazlı istek birleştirici (tek event loop içinde)"""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.stats = {
+            "calls": 0,      # Toplam çağrı
+            "executed": 0,   # Gerçekten çalıştırılan (upstream'e giden)
+            "shared": 0,     # Uçuştaki sonuca bağlanan (tasarruf edilen)
+            "errors": 0
+        }
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Key için func'ı tek sefer çalıştır, eşzamanlı çağıranlar sonucu paylaşır
+
+        Args:
+            key: İstek anahtarı
+            func: Coroutine üreten fonksiyon (sadece lider çağırır)
+
+        Returns:
+            func sonucu (tüm bekleyenler için aynı nesne)
+        """
+        self.stats["calls"] += 1
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats["shared"] += 1
+        else:
+            self.stats["executed"] += 1
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._finish(k, t))
+
+        # shield: bir çağıranın iptali diğerlerinin beklediği görevi iptal etmesin
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            self.stats["errors"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Birleştirme istatistikleri"""
+        return {
+            **self.stats,
+            "inflight": len(self._inflight),
+            "saved_upstream_calls": self.stats["shared"]
+        }
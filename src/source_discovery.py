@@ -12,13 +12,17 @@ Maliyet: 1 kredi / map çağrısı
 import asyncio
 import aiohttp
 import os
-import hashlib
 from typing import List, Dict, Optional, Set, Tuple, AsyncGenerator
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from urllib.parse import urlparse, urljoin
 import logging
 
+from src.bulk_upsert import DISCOVERED_PDFS, discovered_url_hash, get_bulk_upserter
+from src.async_db import get_async_db
+from src.http_client import get_http_session
+from src.rate_limiter import get_rate_limiter
+
 logger = logging.getLogger(__name__)
 
 
@@ -104,8 +108,7 @@ class SourceDiscovery:
     
     def _get_url_hash(self, url: str) -> str:
         """URL'den benzersiz hash oluştur"""
-        normalized = url.lower().split("?")[0].split("#")[0]
-        return hashlib.md5(normalized.encode()).hexdigest()
+        return discovered_url_hash(url)
     
     def save_discovered_pdf(self, pdf: 'DiscoveredPDF', brand: str = None, model: str = None, category: str = None) -> bool:
         """
@@ -115,48 +118,37 @@ class SourceDiscovery:
             True: Yeni kayıt eklendi
             False: Zaten var (güncellendi)
         """
-        if not self.db:
-            return False
+        return self.save_discovered_pdfs([pdf], brand, model, category) > 0
+    
+    def save_discovered_pdfs(self, pdfs: List['DiscoveredPDF'], brand: str = None, model: str = None, category: str = None) -> int:
+        """
+        Keşfedilen PDF'leri tek transaction'da toplu kaydet (ON CONFLICT upsert)
+        
+        Returns:
+            Yeni eklenen kayıt sayısı
+        """
+        if not self.db or not pdfs:
+            return 0
         
         try:
-            conn = self.db.get_connection()
-            cursor = conn.cursor()
-            
-            url_hash = self._get_url_hash(pdf.url)
-            
-            # Var mı kontrol et
-            cursor.execute("SELECT id FROM discovered_pdfs WHERE url_hash = ?", (url_hash,))
-            existing = cursor.fetchone()
-            
-            if existing:
-                # Güncelle (last_checked)
-                cursor.execute("""
-                    UPDATE discovered_pdfs 
-                    SET last_checked = CURRENT_TIMESTAMP,
-                        size_bytes = COALESCE(?, size_bytes),
-                        size_mb = COALESCE(?, size_mb)
-                    WHERE url_hash = ?
-                """, (pdf.size_bytes, pdf.size_mb, url_hash))
-                conn.commit()
-                conn.close()
-                return False
-            else:
-                # Yeni kayıt
-                cursor.execute("""
-                    INSERT INTO discovered_pdfs 
-                    (url_hash, url, title, domain, source_path, size_bytes, size_mb, brand, model, category, is_valid)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    url_hash, pdf.url, pdf.title, pdf.source_domain, pdf.source_path,
-                    pdf.size_bytes, pdf.size_mb, brand, model, category, pdf.is_valid
-                ))
-                conn.commit()
-                conn.close()
-                return True
-                
+            return get_bulk_upserter(self.db.db_path).upsert(DISCOVERED_PDFS, [
+                {
+                    "url": pdf.url,
+                    "title": pdf.title,
+                    "domain": pdf.source_domain,
+                    "source_path": pdf.source_path,
+                    "size_bytes": pdf.size_bytes,
+                    "size_mb": pdf.size_mb,
+                    "brand": brand,
+                    "model": model,
+                    "category": category,
+                    "is_valid": pdf.is_valid
+                }
+                for pdf in pdfs
+            ])
         except Exception as e:
             logger.error(f"PDF kaydetme hatası: {e}")
-            return False
+            return 0
     
     def save_scanned_domain(self, domain: str, pdf_count: int) -> None:
         """Taranan domain'i kaydet"""
@@ -195,14 +187,12 @@ class SourceDiscovery:
             return 0
     
     async def _ensure_session(self):
-        if not self.session or self.session.closed:
-            timeout = aiohttp.ClientTimeout(total=120)
-            connector = aiohttp.TCPConnector(limit=100, limit_per_host=10)
-            self.session = aiohttp.ClientSession(timeout=timeout, connector=connector)
+        # Paylaşımlı oturum: bağlantılar ve DNS cache'i istekler arasında korunur
+        self.session = get_http_session("api")
     
     async def close(self):
-        if self.session and not self.session.closed:
-            await self.session.close()
+        # Paylaşımlı oturum uygulama kapanışında kapatılır (src/http_client.py)
+        self.session = None
     
     # =========================================
     # DOMAIN EXTRACTION
@@ -316,12 +306,15 @@ class SourceDiscovery:
             "limit": 5000  # Max limit
         }
         
+        limiter = get_rate_limiter().get("firecrawl", self.api_key)
         try:
-            async with self.session.post(
+            async with limiter.slot() as slot, self.session.post(
                 self.FIRECRAWL_MAP_URL,
                 headers=headers,
-                json=payload
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=120)  # Büyük sitelerin haritası uzun sürer
             ) as response:
+                slot.report(response.status, response.headers.get("Retry-After"))
                 if response.status == 200:
                     data = await response.json()
                     # Firecrawl yanıtı sürüme göre değişebiliyor:
@@ -387,14 +380,12 @@ class SourceDiscovery:
         Returns:
             (size_bytes, is_valid)
         """
-        await self._ensure_session()
-        
         try:
             headers = {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
             }
             
-            async with self.session.head(
+            async with get_http_session("pdf").head(
                 url,
                 headers=headers,
                 allow_redirects=True,
@@ -552,11 +543,8 @@ class SourceDiscovery:
                 
                 all_pdfs = await self._enrich_pdfs_with_size(all_pdfs, on_progress=size_progress)
             
-            # Veritabanına kaydet
-            new_count = 0
-            for pdf in all_pdfs:
-                if self.save_discovered_pdf(pdf):
-                    new_count += 1
+            # Veritabanına kaydet (toplu, yazıcı thread'inde)
+            new_count = await get_async_db().write_bulk(self.save_discovered_pdfs, all_pdfs)
             
             # Domain'i kaydet
             self.save_scanned_domain(domain.domain, len(all_pdfs))
@@ -652,11 +640,8 @@ class SourceDiscovery:
                     # Boyutlu PDF'leri gönder
                     yield {"type": "pdfs_updated", "data": {"pdfs": [p.to_dict() for p in batch]}}
             
-            # Veritabanına kaydet
-            new_count = 0
-            for pdf in all_pdfs:
-                if self.save_discovered_pdf(pdf):
-                    new_count += 1
+            # Veritabanına kaydet (toplu, yazıcı thread'inde)
+            new_count = await get_async_db().write_bulk(self.save_discovered_pdfs, all_pdfs)
             
             # Domain'i kaydet
             self.save_scanned_domain(domain.domain, len(all_pdfs))
@@ -20,6 +20,10 @@ from urllib.parse import urlparse, urljoin
 from dataclasses import dataclass
 import logging
 
+from src.fts_index import build_match_query, fts_rank_subquery
+from src.http_client import get_http_session
+from src.rate_limiter import get_rate_limiter
+
 logger = logging.getLogger(__name__)
 
 # Bilinen marka listesi (brand detection için)
@@ -66,13 +70,12 @@ class SourceScanner:
         self.session: Optional[aiohttp.ClientSession] = None
     
     async def _ensure_session(self):
-        if not self.session or self.session.closed:
-            timeout = aiohttp.ClientTimeout(total=30)
-            self.session = aiohttp.ClientSession(timeout=timeout)
+        # Paylaşımlı oturum: bağlantılar ve DNS cache'i istekler arasında korunur
+        self.session = get_http_session("api")
     
     async def close(self):
-        if self.session and not self.session.closed:
-            await self.session.close()
+        # Paylaşımlı oturum uygulama kapanışında kapatılır (src/http_client.py)
+        self.session = None
     
     # =========================================
     # PATH EXTRACTION
@@ -273,15 +276,34 @@ class SourceScanner:
         finally:
             conn.close()
     
-    def get_scanned_pdfs(self, source_id: int) -> List[Dict]:
-        """Bir kaynaktan bulunan PDF'leri getir"""
+    def get_scanned_pdfs(self, source_id: int, query: Optional[str] = None) -> List[Dict]:
+        """
+        Bir kaynaktan bulunan PDF'leri getir
+        
+        query verilirse FTS5 indeksinde aranır ve bm25 ile sıralanır.
+        """
+        match = build_match_query(query) if getattr(self.db, "fts_enabled", False) else None
         conn = self.db.get_connection()
         try:
-            cursor = conn.execute("""
-                SELECT * FROM scanned_pdfs 
-                WHERE source_id = ?
-                ORDER BY discovered_at DESC
-            """, (source_id,))
+            if match:
+                cursor = conn.execute(f"""
+                    SELECT s.* FROM scanned_pdfs s
+                    JOIN {fts_rank_subquery('scanned_pdfs')} fts ON fts.rowid = s.id
+                    WHERE s.source_id = ?
+                    ORDER BY fts.rank, s.discovered_at DESC
+                """, (match, source_id))
+            elif query:
+                cursor = conn.execute("""
+                    SELECT * FROM scanned_pdfs 
+                    WHERE source_id = ? AND (title LIKE ? OR snippet LIKE ?)
+                    ORDER BY discovered_at DESC
+                """, (source_id, f"%{query}%", f"%{query}%"))
+            else:
+                cursor = conn.execute("""
+                    SELECT * FROM scanned_pdfs 
+                    WHERE source_id = ?
+                    ORDER BY discovered_at DESC
+                """, (source_id,))
             return [dict(row) for row in cursor.fetchall()]
         finally:
             conn.close()
@@ -453,7 +475,9 @@ class SourceScanner:
                 "num": num
             }
             
-            async with self.session.post(url, headers=headers, json=payload) as response:
+            limiter = get_rate_limiter().get("serper", self.serper_api_key)
+            async with limiter.slot() as slot, self.session.post(url, headers=headers, json=payload) as response:
+                slot.report(response.status, response.headers.get("Retry-After"))
                 if response.status == 200:
                     data = await response.json()
                     return data.get("organic", [])
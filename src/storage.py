@@ -0,0 +1,258 @@
+"""
+Storage - cache / log / keşif tablolarının ayrı SQLite dosyalarına bölünmesi
+
+Yazma hacminin çoğu search_cache, search_logs ve discovered_pdfs'e gider;
+hepsi users / payments / credit_requests ile aynı dosyayı ve aynı yazma
+kilidini paylaşınca büyük bir cache merge'ü login veya ödeme callback'ini
+bekletir. SQLite'ta yazma kilidi dosya başınadır; bu tablolar ayrı
+dosyalara taşınır ve havuzdaki her bağlantıya ATTACH edilir:
+
+    data/pepc.db            users, payments, credit_requests, katalog ... (main)
+    data/pepc_cache.db      search_cache, search_cache_results, cache_dictionaries
+    data/pepc_logs.db       search_logs, admin_logs, query_stats
+    data/pepc_discovery.db  discovered_pdfs (+ FTS), premium_results
+
+- Şemasız tablo adları ATTACH sırasıyla çözülür; mevcut sorgular
+  (JOIN'ler dahil) değişmeden çalışır
+- Bir transaction yalnızca yazdığı dosyaların kilidini alır; mevcut
+  yazmaların hiçbiri iki dosyaya birden yazmaz (dosyalar arası commit WAL'da
+  atomik değildir)
+- CREATE INDEX / TRIGGER ve ALTER TABLE şemasız yazılınca main'de aranır;
+  init_database ve migration'lar ifadeleri route_ddl ile tablonun dosyasına
+  yönlendirir
+- Trigger'lar yalnızca kendi dosyalarındaki tablolara yazabilir; taşınan
+  tabloların rollup trigger'ları için her dosyada kendi metrics_* /
+  stat_counters tabloları bulunur (src/metrics.py tüm dosyaları toplar)
+
+Mevcut tek dosyalı veritabanları init_database sırasında taşınır
+(migrate_to_stores); DB_SPLIT_STORES=false ile eski düzen korunur.
+"""
+import logging
+import os
+import re
+from typing import Dict, List, Tuple
+
+from src.config import DB_SPLIT_STORES
+
+logger = logging.getLogger(__name__)
+
+STORES: Dict[str, Tuple[str, ...]] = {
+    "cache": ("search_cache", "search_cache_results", "cache_dictionaries"),
+    "logs": ("search_logs", "admin_logs", "query_stats"),
+    "discovery": ("discovered_pdfs", "discovered_pdfs_fts", "premium_results"),
+}
+
+TABLE_STORES: Dict[str, str] = {table: store for store, tables in STORES.items() for table in tables}
+
+# Taşınan tabloların trigger'larının yazdığı tablolar (015_metrics_rollups ile aynı şema)
+_METRICS_TABLE_SQL = '''
+    CREATE TABLE IF NOT EXISTS {store}.{table} (
+        bucket TEXT NOT NULL,
+        metric TEXT NOT NULL,
+        value INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (bucket, metric)
+    ) WITHOUT ROWID
+'''
+_METRICS_CASCADE_SQL = '''
+    CREATE TRIGGER IF NOT EXISTS {store}.metrics_hourly_{suffix} AFTER {event} ON metrics_hourly BEGIN
+        INSERT INTO metrics_daily (bucket, metric, value) VALUES (date(new.bucket), new.metric, {value})
+            ON CONFLICT(bucket, metric) DO UPDATE SET value = metrics_daily.value + excluded.value;
+    END
+'''
+_COUNTERS_TABLE_SQL = '''
+    CREATE TABLE IF NOT EXISTS {store}.stat_counters (
+        name TEXT PRIMARY KEY,
+        value INTEGER NOT NULL DEFAULT 0
+    ) WITHOUT ROWID
+'''
+STORE_SCHEMA: Dict[str, List[str]] = {
+    "cache": [
+        _COUNTERS_TABLE_SQL.format(store="cache"),
+    ],
+    "discovery": [
+        _COUNTERS_TABLE_SQL.format(store="discovery"),
+    ],
+    "logs": [
+        _METRICS_TABLE_SQL.format(store="logs", table="metrics_hourly"),
+        _METRICS_TABLE_SQL.format(store="logs", table="metrics_daily"),
+        _METRICS_CASCADE_SQL.format(store="logs", suffix="ai", event="INSERT", value="new.value"),
+        _METRICS_CASCADE_SQL.format(store="logs", suffix="au", event="UPDATE OF value", value="new.value - old.value"),
+    ],
+}
+
+_LEADING_COMMENTS = r"^(?P<head>\s*(?:--[^\n]*\n\s*)*"
+_CREATE_RE = re.compile(
+    _LEADING_COMMENTS + r"CREATE\s+(?:UNIQUE\s+|VIRTUAL\s+)?(?P<kind>TABLE|INDEX|TRIGGER)\s+)"
+    r"(?P<exists>IF\s+NOT\s+EXISTS\s+)?(?P<name>\w+)",
+    re.IGNORECASE
+)
+_ALTER_RE = re.compile(_LEADING_COMMENTS + r"ALTER\s+TABLE\s+)(?P<name>\w+)", re.IGNORECASE)
+_ON_TABLE_RE = re.compile(r"\bON\s+(\w+)", re.IGNORECASE)
+
+
+def store_paths(db_path: str) -> Dict[str, str]:
+    """Ana dosyanın yanındaki store dosyaları → {şema: yol} (bölme kapalıysa boş)"""
+    if not DB_SPLIT_STORES or db_path == ":memory:":
+        return {}
+    base, ext = os.path.splitext(db_path)
+    return {store: f"{base}_{store}{ext or '.db'}" for store in STORES}
+
+
+def attached_stores(conn) -> Dict[str, str]:
+    """Bağlantıya ATTACH edilmiş store'lar → {şema: yol}"""
+    return {row[1]: row[2] for row in conn.execute("PRAGMA database_list") if row[1] in STORES}
+
+
+def table_schema(conn, table: str) -> str:
+    """Tablonun bulunduğu şema (store ATTACH edilmemişse main)"""
+    store = TABLE_STORES.get(table)
+    if store and store in attached_stores(conn):
+        return store
+    return "main"
+
+
+def begin_write(conn, table: str) -> str:
+    """
+    Yalnızca tablonun dosyasının yazma kilidini alarak transaction başlat
+
+    BEGIN IMMEDIATE bağlantıya ATTACH edilmiş tüm dosyaları kilitler; bir
+    store'a yazan periyodik işler (arşivleme vb.) bunun yerine ertelenmiş
+    BEGIN + boş bir DELETE ile yalnızca kendi dosyalarını kilitler.
+
+    Returns:
+        Tablonun şeması
+    """
+    schema = table_schema(conn, table)
+    conn.execute("BEGIN")
+    conn.execute(f"DELETE FROM {schema}.{table} WHERE 0")
+    return schema
+
+
+def schemas_with_table(conn, table: str) -> List[str]:
+    """Tabloyu içeren tüm şemalar (main önce)"""
+    schemas = []
+    for row in conn.execute("PRAGMA database_list").fetchall():
+        if row[1] == "temp":
+            continue
+        if conn.execute(
+            f"SELECT 1 FROM {row[1]}.sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone():
+            schemas.append(row[1])
+    return schemas
+
+
+def qualify_ddl(statement: str, schema: str, if_not_exists: bool = False) -> str:
+    """CREATE TABLE / INDEX / TRIGGER veya ALTER TABLE ifadesinin nesne adına şema ekle"""
+    match = _CREATE_RE.match(statement)
+    if match:
+        exists = match.group("exists") or ("IF NOT EXISTS " if if_not_exists else "")
+        return f"{match.group('head')}{exists}{schema}.{match.group('name')}{statement[match.end():]}"
+    match = _ALTER_RE.match(statement)
+    if match:
+        return f"{match.group('head')}{schema}.{match.group('name')}{statement[match.end():]}"
+    return statement
+
+
+def route_ddl(statement: str, stores) -> str:
+    """
+    Şemasız DDL'i hedef tablonun store'una yönlendir
+
+    Args:
+        statement: Tek SQL ifadesi
+        stores: Bağlantıya ATTACH edilmiş store adları
+
+    Returns:
+        Store tablosuna ait CREATE / ALTER ise şemalı ifade, değilse aynısı
+    """
+    target = None
+    match = _CREATE_RE.match(statement)
+    if match:
+        if match.group("kind").upper() == "TABLE":
+            target = match.group("name")
+        else:
+            on_table = _ON_TABLE_RE.search(statement, match.end())
+            target = on_table.group(1) if on_table else None
+    else:
+        match = _ALTER_RE.match(statement)
+        if match:
+            target = match.group("name")
+
+    store = TABLE_STORES.get(target) if target else None
+    if store is None or store not in stores:
+        return statement
+    return qualify_ddl(statement, store)
+
+
+def ensure_store_schema(conn) -> None:
+    """Store'ların rollup tablolarını oluştur"""
+    for store in attached_stores(conn):
+        for statement in STORE_SCHEMA.get(store, []):
+            conn.execute(statement)
+    conn.commit()
+
+
+def _columns(conn, schema: str, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA {schema}.table_info({table})")]
+
+
+def migrate_to_stores(conn) -> Dict[str, int]:
+    """
+    Hâlâ main'de duran store tablolarını kendi dosyalarına taşı
+
+    Her tablo kendi BEGIN IMMEDIATE transaction'ında taşınır: tablo ve
+    index'leri store'da oluşturulur, satırlar kopyalanır, trigger'lar
+    kopyalamadan sonra kurulur (rollup'lar iki kez sayılmaz) ve main'deki
+    tablo silinir. Satırlar INSERT OR IGNORE ile eklendiği için yarıda
+    kalan bir taşıma sonraki açılışta tamamlanır. FTS tabloları kopyalanmaz,
+    ensure_fts_tables hedef dosyada yeniden oluşturup doldurur.
+
+    Returns:
+        Tablo başına taşınan satır sayısı
+    """
+    stores = attached_stores(conn)
+    if not stores:
+        return {}
+    ensure_store_schema(conn)
+
+    moved = {}
+    for table, store in TABLE_STORES.items():
+        if store not in stores:
+            continue
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT sql FROM main.sqlite_master WHERE type = 'table' AND name = ?", (table,)
+            ).fetchone()
+            if row is None:
+                conn.rollback()
+                continue
+
+            if row[0].upper().startswith("CREATE VIRTUAL TABLE"):
+                conn.execute(f"DROP TABLE main.{table}")
+                conn.commit()
+                continue
+
+            objects = conn.execute('''
+                SELECT sql FROM main.sqlite_master
+                WHERE tbl_name = ? AND type IN ('index', 'trigger') AND sql IS NOT NULL
+                ORDER BY type = 'trigger'
+            ''', (table,)).fetchall()
+
+            conn.execute(qualify_ddl(row[0], store, if_not_exists=True))
+            target_columns = set(_columns(conn, store, table))
+            columns = ", ".join(c for c in _columns(conn, "main", table) if c in target_columns)
+            count = conn.execute(
+                f"INSERT OR IGNORE INTO {store}.{table} ({columns}) SELECT {columns} FROM main.{table}"
+            ).rowcount
+            for (sql,) in objects:
+                conn.execute(qualify_ddl(sql, store, if_not_exists=True))
+            conn.execute(f"DROP TABLE main.{table}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        moved[table] = count
+        logger.info(f"{table} → {stores[store]} ({count} satır)")
+    return moved
@@ -6,6 +6,7 @@ import aiohttp
 from typing import Optional, Dict
 from src.data.brands import BRAND_LIST, get_brand_aliases
 from src.data.categories import CATEGORY_MAPPING, CATEGORY_LABELS
+from src.http_client import get_http_session
 
 
 def setup_logging():
@@ -22,10 +23,8 @@ def setup_logging():
 
 async def get_pdf_size(url: str, session: aiohttp.ClientSession = None) -> Optional[int]:
     """Tek PDF'in boyutunu HEAD request ile al"""
-    close_session = False
     if session is None:
-        session = aiohttp.ClientSession()
-        close_session = True
+        session = get_http_session("pdf")
     
     try:
         async with session.head(url, timeout=aiohttp.ClientTimeout(total=10), allow_redirects=True) as response:
@@ -35,23 +34,20 @@ async def get_pdf_size(url: str, session: aiohttp.ClientSession = None) -> Optio
             return None
     except Exception:
         return None
-    finally:
-        if close_session:
-            await session.close()
 
 
 async def get_multiple_pdf_sizes(urls: list) -> Dict[str, Optional[int]]:
     """Birden fazla PDF'in boyutunu paralel olarak al"""
     import asyncio
     
-    async with aiohttp.ClientSession() as session:
-        tasks = [get_pdf_size(url, session) for url in urls]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        return {
-            url: (size if isinstance(size, int) else None) 
-            for url, size in zip(urls, results)
-        }
+    session = get_http_session("pdf")
+    tasks = [get_pdf_size(url, session) for url in urls]
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    
+    return {
+        url: (size if isinstance(size, int) else None) 
+        for url, size in zip(urls, results)
+    }
 
 
 def extract_brand_from_query(query: str) -> Optional[str]:
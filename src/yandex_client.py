@@ -2,20 +2,45 @@
 Yandex Search API Client
 IAM Token Authentication ile çalışır
 https://yandex.cloud/en/docs/search-api/
+
+Tamamen async: searchAsync operasyonu başlatılır ve sonucu asyncio.sleep ile
+artan aralıklarla (üstel geri çekilme) sorgulanır; bekleme sırasında event
+loop diğer istekleri işler. IAM token süresi dolana kadar cache'lenir ve
+eşzamanlı aramalar tek bir token isteğini paylaşır. search_many birden çok
+operasyonu aynı anda başlatır, sonuçları tamamlanma sırasıyla döndürür.
 """
+import asyncio
 import jwt
 import time
-import requests
 import json
 import base64
+import logging
 import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, AsyncIterator, Iterable, Optional, Tuple
+
+from src.http_client import get_http_session
+from src.rate_limiter import get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+IAM_TOKEN_URL = "https://iam.api.cloud.yandex.net/iam/v1/tokens"
+SEARCH_ASYNC_URL = "https://searchapi.api.cloud.yandex.net/v2/web/searchAsync"
+OPERATION_URL = "https://operation.api.cloud.yandex.net/operations/{operation_id}"
 
 
 class YandexSearchClient:
     """Yandex Search API istemcisi - IAM Token Authentication"""
     
+    # Operasyon sorgulama: ilk bekleme, çarpan, en uzun bekleme ve toplam süre (saniye)
+    POLL_INITIAL = 0.3
+    POLL_FACTOR = 1.6
+    POLL_MAX = 2.0
+    OPERATION_TIMEOUT = 30
+    # Token süresi dolmadan bu kadar önce yenilenir (saniye)
+    TOKEN_REFRESH_MARGIN = 300
+    
     def __init__(self):
         key_path = Path(__file__).parent.parent / "authorized_key.json"
         with open(key_path, "r") as f:
@@ -27,35 +52,117 @@ class YandexSearchClient:
         self.folder_id = "b1gtkbakcmv86et9lq9r"
         self._token = None
         self._token_expires = 0
+        self._token_lock = asyncio.Lock()
     
-    def _get_iam_token(self):
-        """IAM token al veya cache'den döndür"""
-        now = int(time.time())
-        if self._token and now < self._token_expires - 60:
+    @staticmethod
+    def _parse_expires_at(value: Optional[str]) -> Optional[float]:
+        """IAM yanıtındaki expiresAt (RFC 3339, nanosaniyeli olabilir) → epoch"""
+        if not value:
+            return None
+        try:
+            moment = datetime.strptime(value[:19], "%Y-%m-%dT%H:%M:%S")
+            return moment.replace(tzinfo=timezone.utc).timestamp()
+        except ValueError:
+            return None
+    
+    async def _get_iam_token(self) -> str:
+        """IAM token al veya cache'den döndür (eşzamanlı çağıranlar tek isteği bekler)"""
+        if self._token and time.time() < self._token_expires - self.TOKEN_REFRESH_MARGIN:
             return self._token
         
+        async with self._token_lock:
+            now = int(time.time())
+            if self._token and now < self._token_expires - self.TOKEN_REFRESH_MARGIN:
+                return self._token
+            
+            payload = {
+                'aud': IAM_TOKEN_URL,
+                'iss': self.service_account_id,
+                'iat': now,
+                'exp': now + 3600
+            }
+            
+            encoded = jwt.encode(
+                payload, 
+                self.private_key, 
+                algorithm='PS256', 
+                headers={'kid': self.key_id}
+            )
+            
+            async with get_http_session("api").post(IAM_TOKEN_URL, json={'jwt': encoded}) as response:
+                response.raise_for_status()
+                data = await response.json()
+            
+            self._token = data['iamToken']
+            self._token_expires = self._parse_expires_at(data.get('expiresAt')) or now + 3600
+            return self._token
+    
+    async def _start_operation(self, token: str, query: str, search_type: str, page: int, per_page: int) -> Optional[str]:
+        """searchAsync operasyonunu başlat → operasyon id"""
+        # Kota klasör başınadır; sorgulama (operations) istekleri ayrı sayılır
+        limiter = get_rate_limiter().get("yandex", self.folder_id)
         payload = {
-            'aud': 'https://iam.api.cloud.yandex.net/iam/v1/tokens',
-            'iss': self.service_account_id,
-            'iat': now,
-            'exp': now + 3600
+            "query": {
+                "searchType": search_type,
+                "queryText": query
+            },
+            "folderId": self.folder_id,
+            "responseFormat": "FORMAT_XML",
+            "groupings": {
+                "groupBy": "GROUPS_BY_DOC",
+                "docsInGroup": 1,
+                "groupsOnPage": min(per_page, 100),  # Max 100
+                "page": page
+            }
         }
         
-        encoded = jwt.encode(
-            payload, 
-            self.private_key, 
-            algorithm='PS256', 
-            headers={'kid': self.key_id}
-        )
+        for attempt in range(limiter.max_retries + 1):
+            async with limiter.slot() as slot, get_http_session("api").post(
+                SEARCH_ASYNC_URL,
+                headers={"Authorization": f"Bearer {token}"},
+                json=payload
+            ) as response:
+                if slot.report(response.status, response.headers.get("Retry-After")) and attempt < limiter.max_retries:
+                    continue
+                if response.status != 200:
+                    logger.error(f"Yandex API error: {response.status} - {await response.text()}")
+                    return None
+                operation = await response.json()
+                break
         
-        response = requests.post(
-            'https://iam.api.cloud.yandex.net/iam/v1/tokens',
-            json={'jwt': encoded}
-        )
+        operation_id = operation.get('id')
+        if not operation_id:
+            logger.error(f"Yandex API: Operation ID alınamadı - {operation}")
+        return operation_id
+    
+    async def _wait_operation(self, token: str, operation_id: str) -> Optional[Dict]:
+        """Operasyon tamamlanana kadar artan aralıklarla sorgula → operasyon yanıtı"""
+        session = get_http_session("api")
+        deadline = time.monotonic() + self.OPERATION_TIMEOUT
+        delay = self.POLL_INITIAL
         
-        self._token = response.json()['iamToken']
-        self._token_expires = now + 3600
-        return self._token
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning(f"Yandex operasyonu zaman aşımına uğradı: {operation_id}")
+                return None
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * self.POLL_FACTOR, self.POLL_MAX)
+            
+            async with session.get(
+                OPERATION_URL.format(operation_id=operation_id),
+                headers={"Authorization": f"Bearer {token}"}
+            ) as response:
+                # 429 / 5xx geçicidir, bir sonraki turda tekrar sorulur
+                if response.status == 429 or response.status >= 500:
+                    continue
+                if response.status != 200:
+                    logger.error(f"Yandex operasyon hatası: {response.status} - {await response.text()}")
+                    return None
+                result = await response.json()
+            
+            if result.get('done'):
+                return result
     
     async def search(self, query: str, search_type: str = "SEARCH_TYPE_RU", page: int = 0, per_page: int = 100) -> list:
         """
@@ -68,64 +175,53 @@ class YandexSearchClient:
             per_page: Sayfa başına sonuç (max 100)
         """
         try:
-            token = self._get_iam_token()
-            
-            # Async arama başlat
-            response = requests.post(
-                "https://searchapi.api.cloud.yandex.net/v2/web/searchAsync",
-                headers={
-                    "Authorization": f"Bearer {token}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "query": {
-                        "searchType": search_type,
-                        "queryText": query
-                    },
-                    "folderId": self.folder_id,
-                    "responseFormat": "FORMAT_XML",
-                    "groupings": {
-                        "groupBy": "GROUPS_BY_DOC",
-                        "docsInGroup": 1,
-                        "groupsOnPage": min(per_page, 100),  # Max 100
-                        "page": page
-                    }
-                },
-                timeout=30
-            )
+            token = await self._get_iam_token()
             
-            if response.status_code != 200:
-                print(f"Yandex API error: {response.status_code} - {response.text}")
+            operation_id = await self._start_operation(token, query, search_type, page, per_page)
+            if not operation_id:
                 return []
             
-            operation = response.json()
-            operation_id = operation.get('id')
-            
-            if not operation_id:
-                print(f"Yandex API: Operation ID alınamadı - {operation}")
+            result = await self._wait_operation(token, operation_id)
+            if not result:
                 return []
             
-            # Sonucu bekle (max 30 saniye)
-            for _ in range(30):
-                time.sleep(1)
-                result = requests.get(
-                    f"https://operation.api.cloud.yandex.net/operations/{operation_id}",
-                    headers={"Authorization": f"Bearer {token}"},
-                    timeout=30
-                ).json()
-                
-                if result.get('done'):
-                    raw_data = result.get('response', {}).get('rawData', '')
-                    if raw_data:
-                        xml_content = base64.b64decode(raw_data).decode('utf-8')
-                        return self._parse_xml(xml_content)
-                    return []
+            if 'error' in result:
+                logger.error(f"Yandex operasyon hatası: {result['error']}")
+                return []
             
+            raw_data = result.get('response', {}).get('rawData', '')
+            if raw_data:
+                xml_content = base64.b64decode(raw_data).decode('utf-8')
+                return self._parse_xml(xml_content)
             return []
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
-            print(f"Yandex search error: {e}")
+            logger.error(f"Yandex search error: {e}")
             return []
     
+    async def search_many(self, searches: Iterable[Dict[str, Any]]) -> AsyncIterator[Tuple[int, list]]:
+        """
+        Birden çok aramayı aynı anda başlat, sonuçları tamamlanma sırasıyla döndür
+        
+        Args:
+            searches: search() argümanları (ör. {"query": ..., "page": 1})
+        
+        Yields:
+            (searches içindeki sıra, sonuçlar)
+        """
+        async def run(index: int, kwargs: Dict[str, Any]) -> Tuple[int, list]:
+            return index, await self.search(**kwargs)
+        
+        tasks = [asyncio.ensure_future(run(i, kwargs)) for i, kwargs in enumerate(searches)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Tüketici erken bıraktıysa kalan operasyonları bekleme
+            for task in tasks:
+                task.cancel()
+    
     def _parse_xml(self, xml_content: str) -> list:
         """XML'den sonuçları parse et"""
         results = []
@@ -178,17 +274,34 @@ class YandexSearchClient:
         # Varsayılan olarak SEARCH_TYPE_RU kullan (en geniş sonuçlar)
         search_type = search_type_map.get(language, "SEARCH_TYPE_RU")
         
-        # Pagination ile sonuçları topla
-        all_results = []
+        # Pagination ile sonuçları topla: gereken sayfalar aynı anda istenir,
+        # eksik kalırsa (kısa sayfa gelmediyse) sonraki dalga başlatılır
+        per_page = 50
         max_pages = min((count // 10) + 1, 5)  # Max 5 sayfa
+        pages: Dict[int, list] = {}
+        next_page = 0
         
-        for page in range(max_pages):
-            results = await self.search(pdf_query, search_type=search_type, page=page, per_page=50)
-            if not results:
+        while next_page < max_pages:
+            collected = sum(len(r) for r in pages.values())
+            wave = range(next_page, min(max_pages, next_page + max(1, -(-(count - collected) // per_page))))
+            async for index, results in self.search_many(
+                {"query": pdf_query, "search_type": search_type, "page": page, "per_page": per_page}
+                for page in wave
+            ):
+                pages[wave[index]] = results
+            next_page = wave[-1] + 1
+            
+            if any(len(pages[page]) < per_page for page in wave):
+                break
+            if sum(len(r) for r in pages.values()) >= count:
                 break
-            all_results.extend(results)
-            if len(all_results) >= count:
+        
+        # Sayfa sırası korunur (tamamlanma sırası değil)
+        all_results = []
+        for page in sorted(pages):
+            if not pages[page]:
                 break
+            all_results.extend(pages[page])
         
         # PDF sonuçlarını filtrele ve formatla
         pdf_results = []